@@ -40,6 +40,16 @@ from views.docker_mgmt import docker_bp
 from views.docker_exec import docker_exec_bp
 from views.network_mgmt import network_bp
 from views.metrics import metrics_bp
+from views.prometheus import prometheus_bp
+from views.alerts import alerts_bp
+from views.jobs import jobs_bp
+from views.bulk import bulk_bp
+from views.drain import drain_bp
+from views.warm_pool import warm_pool_bp
+from views.numa import numa_bp
+from views.hugepages import hugepages_bp
+from views.capacity import capacity_bp
+from views import offload, perf
 from views.files import files_bp
 from views.kubernetes import k8s_bp
 from views.images import images_bp
@@ -49,6 +59,7 @@ from views.openshift import ocp_bp
 from views.openshift_agent import agent_bp
 from views.settings import settings_bp
 from views.bmc import bmc_bp
+from views.libvirt_pool import get_connection
 
 app = Flask(__name__, static_folder='frontend/dist/assets', static_url_path='/assets')
 
@@ -97,6 +108,16 @@ app.register_blueprint(docker_bp)
 app.register_blueprint(docker_exec_bp)
 app.register_blueprint(network_bp)
 app.register_blueprint(metrics_bp)
+app.register_blueprint(prometheus_bp)
+app.register_blueprint(alerts_bp)
+app.register_blueprint(jobs_bp)
+app.register_blueprint(bulk_bp)
+app.register_blueprint(drain_bp)
+app.register_blueprint(warm_pool_bp)
+app.register_blueprint(numa_bp)
+app.register_blueprint(hugepages_bp)
+app.register_blueprint(capacity_bp)
+app.register_blueprint(perf.perf_bp)
 app.register_blueprint(files_bp)
 app.register_blueprint(k8s_bp)
 app.register_blueprint(images_bp)
@@ -107,6 +128,13 @@ app.register_blueprint(agent_bp)
 app.register_blueprint(settings_bp)
 app.register_blueprint(bmc_bp)
 
+# libvirt calls from greenlets run on a native thread pool (see views/offload.py);
+# installed first so perf's timings include the wait for a pool thread
+offload.install()
+
+# Per-endpoint latency histograms + Server-Timing breakdown (see views/perf.py)
+perf.init_app(app)
+
 # Apply WebSocket fix AFTER blueprint registration so it wraps the fully
 # configured Flask app.
 app.wsgi_app = _WebSocketWSGIFix(app.wsgi_app)
@@ -123,7 +151,7 @@ def index():
     if os.path.exists(os.path.join(build_dir, 'index.html')):
         return send_from_directory(build_dir, 'index.html')
     # Fallback if React build is missing
-    conn = libvirt.open('qemu:///system')
+    conn = get_connection()
     host_info = {}
     if conn:
         try:
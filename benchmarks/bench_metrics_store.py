@@ -0,0 +1,82 @@
+"""
+Benchmark: /api/metrics/dashboard history query latency against the tiered
+host metrics store (views/metrics_store.py) for 1 h, 7 d and 365 d windows.
+
+Fills every tier to its retention limit with synthetic samples in a
+temporary directory (nothing touches the real .metrics.ring), then times
+a read-only TieredStore.query() plus the list conversion the dashboard
+does, as a worker serving /api/metrics/dashboard would.  views.metrics is
+not imported so its collector thread cannot write into the benchmark store.
+
+    python benchmarks/bench_metrics_store.py [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from views import metrics_store
+
+WINDOWS  = (('1h', 3600), ('7d', 7 * 86400), ('365d', 365 * 86400))
+SERIES   = 7    # len(metrics.HOST_SERIES)
+INTERVAL = 15   # metrics.INTERVAL
+
+
+def _fill(store, now):
+    """Write each tier directly, as if the collector had run for a year."""
+    nseries = store.series
+    rng = np.random.default_rng(0)
+    for i, (step, retention, ring) in enumerate(store.tiers):
+        n  = ring.length - 1
+        ts = np.arange(now - n * step, now, step, dtype=np.int64) // step * step
+        rows = nseries if i == 0 else nseries * 3
+        vals = rng.random((rows, n)) * 100
+        for j in range(n):
+            ring.append(int(ts[j]), vals[:, j])
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('--repeat', type=int, default=20)
+    args = ap.parse_args()
+
+    metrics_store.RING_PATH = os.path.join(tempfile.mkdtemp(), 'metrics.ring')
+    metrics_store.LOCK_PATH = metrics_store.RING_PATH + '.lock'
+
+    now = int(time.time())
+    t0 = time.perf_counter()
+    _fill(metrics_store.TieredStore(SERIES, INTERVAL, writable=True), now)
+    print(f'filled tiers in {time.perf_counter() - t0:.1f} s')
+
+    reader = metrics_store.TieredStore(SERIES, INTERVAL)
+
+    def query(cutoff):
+        step, ts, vals = reader.query(cutoff, now)
+        ts = ts.tolist()
+        return step, [list(zip(ts, col)) for col in vals.tolist()]
+
+    print(f"{'window':>7} {'step s':>7} {'points':>7} {'median ms':>10}")
+    for label, window in WINDOWS:
+        step, series = query(now - window)
+        t = _time(lambda: query(now - window), args.repeat)
+        print(f"{label:>7} {step:>7} {len(series[0]):>7} {t * 1e3:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
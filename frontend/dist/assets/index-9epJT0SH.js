@@ -72,7 +72,7 @@ Error generating stack: `+i.message+`
 `);return o===-1?"":a.stack.slice(o+1)})();try{if(!n.stack)n.stack=i;else if(i){const o=i.indexOf(`
 `),l=o===-1?-1:i.indexOf(`
 `,o+1),c=l===-1?"":i.slice(l+1);String(n.stack).endsWith(c)||(n.stack+=`
-`+i)}}catch{}}throw n}}_request(t,r){typeof t=="string"?(r=r||{},r.url=t):r=t||{},r=po(this.defaults,r);const{transitional:n,paramsSerializer:a,headers:i}=r;n!==void 0&&v0.assertOptions(n,{silentJSONParsing:Tn.transitional(Tn.boolean),forcedJSONParsing:Tn.transitional(Tn.boolean),clarifyTimeoutError:Tn.transitional(Tn.boolean),legacyInterceptorReqResOrdering:Tn.transitional(Tn.boolean)},!1),a!=null&&(Y.isFunction(a)?r.paramsSerializer={serialize:a}:v0.assertOptions(a,{encode:Tn.function,serialize:Tn.function},!0)),r.allowAbsoluteUrls!==void 0||(this.defaults.allowAbsoluteUrls!==void 0?r.allowAbsoluteUrls=this.defaults.allowAbsoluteUrls:r.allowAbsoluteUrls=!0),v0.assertOptions(r,{baseUrl:Tn.spelling("baseURL"),withXsrfToken:Tn.spelling("withXSRFToken")},!0),r.method=(r.method||this.defaults.method||"get").toLowerCase();let o=i&&Y.merge(i.common,i[r.method]);i&&Y.forEach(["delete","get","head","post","put","patch","common"],g=>{delete i[g]}),r.headers=dn.concat(o,i);const l=[];let c=!0;this.interceptors.request.forEach(function(v){if(typeof v.runWhen=="function"&&v.runWhen(r)===!1)return;c=c&&v.synchronous;const p=r.transitional||Zb;p&&p.legacyInterceptorReqResOrdering?l.unshift(v.fulfilled,v.rejected):l.push(v.fulfilled,v.rejected)});const u=[];this.interceptors.response.forEach(function(v){u.push(v.fulfilled,v.rejected)});let d,f=0,h;if(!c){const g=[jj.bind(this),void 0];for(g.unshift(...l),g.push(...u),h=g.length,d=Promise.resolve(r);f<h;)d=d.then(g[f++],g[f++]);return d}h=l.length;let x=r;for(;f<h;){const g=l[f++],v=l[f++];try{x=g(x)}catch(p){v.call(this,p);break}}try{d=jj.call(this,x)}catch(g){return Promise.reject(g)}for(f=0,h=u.length;f<h;)d=d.then(u[f++],u[f++]);return d}getUri(t){t=po(this.defaults,t);const r=IC(t.baseURL,t.url,t.allowAbsoluteUrls);return MC(r,t.params,t.paramsSerializer)}};Y.forEach(["delete","get","head","options"],function(t){ao.prototype[t]=function(r,n){return this.request(po(n||{},{method:t,url:r,data:(n||{}).data}))}});Y.forEach(["post","put","patch"],function(t){function r(n){return function(i,o,l){return this.request(po(l||{},{method:t,headers:n?{"Content-Type":"multipart/form-data"}:{},url:i,data:o}))}}ao.prototype[t]=r(),ao.prototype[t+"Form"]=r(!0)});let _F=class XC{constructor(t){if(typeof t!="function")throw new TypeError("executor must be a function.");let r;this.promise=new Promise(function(i){r=i});const n=this;this.promise.then(a=>{if(!n._listeners)return;let i=n._listeners.length;for(;i-- >0;)n._listeners[i](a);n._listeners=null}),this.promise.then=a=>{let i;const o=new Promise(l=>{n.subscribe(l),i=l}).then(a);return o.cancel=function(){n.unsubscribe(i)},o},t(function(i,o,l){n.reason||(n.reason=new Xd(i,o,l),r(n.reason))})}throwIfRequested(){if(this.reason)throw this.reason}subscribe(t){if(this.reason){t(this.reason);return}this._listeners?this._listeners.push(t):this._listeners=[t]}unsubscribe(t){if(!this._listeners)return;const r=this._listeners.indexOf(t);r!==-1&&this._listeners.splice(r,1)}toAbortSignal(){const t=new AbortController,r=n=>{t.abort(n)};return this.subscribe(r),t.signal.unsubscribe=()=>this.unsubscribe(r),t.signal}static source(){let t;return{token:new XC(function(a){t=a}),cancel:t}}};function wF(e){return function(r){return e.apply(null,r)}}function jF(e){return Y.isObject(e)&&e.isAxiosError===!0}const ly={Continue:100,SwitchingProtocols:101,Processing:102,EarlyHints:103,Ok:200,Created:201,Accepted:202,NonAuthoritativeInformation:203,NoContent:204,ResetContent:205,PartialContent:206,MultiStatus:207,AlreadyReported:208,ImUsed:226,MultipleChoices:300,MovedPermanently:301,Found:302,SeeOther:303,NotModified:304,UseProxy:305,Unused:306,TemporaryRedirect:307,PermanentRedirect:308,BadRequest:400,Unauthorized:401,PaymentRequired:402,Forbidden:403,NotFound:404,MethodNotAllowed:405,NotAcceptable:406,ProxyAuthenticationRequired:407,RequestTimeout:408,Conflict:409,Gone:410,LengthRequired:411,PreconditionFailed:412,PayloadTooLarge:413,UriTooLong:414,UnsupportedMediaType:415,RangeNotSatisfiable:416,ExpectationFailed:417,ImATeapot:418,MisdirectedRequest:421,UnprocessableEntity:422,Locked:423,FailedDependency:424,TooEarly:425,UpgradeRequired:426,PreconditionRequired:428,TooManyRequests:429,RequestHeaderFieldsTooLarge:431,UnavailableForLegalReasons:451,InternalServerError:500,NotImplemented:501,BadGateway:502,ServiceUnavailable:503,GatewayTimeout:504,HttpVersionNotSupported:505,VariantAlsoNegotiates:506,InsufficientStorage:507,LoopDetected:508,NotExtended:510,NetworkAuthenticationRequired:511,WebServerIsDown:521,ConnectionTimedOut:522,OriginIsUnreachable:523,TimeoutOccurred:524,SslHandshakeFailed:525,InvalidSslCertificate:526};Object.entries(ly).forEach(([e,t])=>{ly[t]=e});function UC(e){const t=new ao(e),r=wC(ao.prototype.request,t);return Y.extend(r,ao.prototype,t,{allOwnKeys:!0}),Y.extend(r,t,null,{allOwnKeys:!0}),r.create=function(a){return UC(po(e,a))},r}const Gt=UC(Kd);Gt.Axios=ao;Gt.CanceledError=Xd;Gt.CancelToken=_F;Gt.isCancel=FC;Gt.VERSION=KC;Gt.toFormData=Tp;Gt.AxiosError=Ke;Gt.Cancel=Gt.CanceledError;Gt.all=function(t){return Promise.all(t)};Gt.spread=wF;Gt.isAxiosError=jF;Gt.mergeConfig=po;Gt.AxiosHeaders=dn;Gt.formToJSON=e=>$C(Y.isHTMLForm(e)?new FormData(e):e);Gt.getAdapter=BC.getAdapter;Gt.HttpStatusCode=ly;Gt.default=Gt;const{Axios:Ihe,AxiosError:Lhe,CanceledError:zhe,isCancel:Bhe,CancelToken:Khe,VERSION:Xhe,all:Uhe,Cancel:Hhe,isAxiosError:Whe,spread:Vhe,toFormData:Ghe,AxiosHeaders:Qhe,HttpStatusCode:qhe,formToJSON:Yhe,getAdapter:Zhe,mergeConfig:Jhe}=Gt,Q=Gt.create({baseURL:"/api",withCredentials:!0});Q.interceptors.response.use(e=>e,e=>(e.response?.status===401&&window.location.pathname!=="/login"&&(window.location.href="/login"),Promise.reject(e)));/**
+`+i)}}catch{}}throw n}}_request(t,r){typeof t=="string"?(r=r||{},r.url=t):r=t||{},r=po(this.defaults,r);const{transitional:n,paramsSerializer:a,headers:i}=r;n!==void 0&&v0.assertOptions(n,{silentJSONParsing:Tn.transitional(Tn.boolean),forcedJSONParsing:Tn.transitional(Tn.boolean),clarifyTimeoutError:Tn.transitional(Tn.boolean),legacyInterceptorReqResOrdering:Tn.transitional(Tn.boolean)},!1),a!=null&&(Y.isFunction(a)?r.paramsSerializer={serialize:a}:v0.assertOptions(a,{encode:Tn.function,serialize:Tn.function},!0)),r.allowAbsoluteUrls!==void 0||(this.defaults.allowAbsoluteUrls!==void 0?r.allowAbsoluteUrls=this.defaults.allowAbsoluteUrls:r.allowAbsoluteUrls=!0),v0.assertOptions(r,{baseUrl:Tn.spelling("baseURL"),withXsrfToken:Tn.spelling("withXSRFToken")},!0),r.method=(r.method||this.defaults.method||"get").toLowerCase();let o=i&&Y.merge(i.common,i[r.method]);i&&Y.forEach(["delete","get","head","post","put","patch","common"],g=>{delete i[g]}),r.headers=dn.concat(o,i);const l=[];let c=!0;this.interceptors.request.forEach(function(v){if(typeof v.runWhen=="function"&&v.runWhen(r)===!1)return;c=c&&v.synchronous;const p=r.transitional||Zb;p&&p.legacyInterceptorReqResOrdering?l.unshift(v.fulfilled,v.rejected):l.push(v.fulfilled,v.rejected)});const u=[];this.interceptors.response.forEach(function(v){u.push(v.fulfilled,v.rejected)});let d,f=0,h;if(!c){const g=[jj.bind(this),void 0];for(g.unshift(...l),g.push(...u),h=g.length,d=Promise.resolve(r);f<h;)d=d.then(g[f++],g[f++]);return d}h=l.length;let x=r;for(;f<h;){const g=l[f++],v=l[f++];try{x=g(x)}catch(p){v.call(this,p);break}}try{d=jj.call(this,x)}catch(g){return Promise.reject(g)}for(f=0,h=u.length;f<h;)d=d.then(u[f++],u[f++]);return d}getUri(t){t=po(this.defaults,t);const r=IC(t.baseURL,t.url,t.allowAbsoluteUrls);return MC(r,t.params,t.paramsSerializer)}};Y.forEach(["delete","get","head","options"],function(t){ao.prototype[t]=function(r,n){return this.request(po(n||{},{method:t,url:r,data:(n||{}).data}))}});Y.forEach(["post","put","patch"],function(t){function r(n){return function(i,o,l){return this.request(po(l||{},{method:t,headers:n?{"Content-Type":"multipart/form-data"}:{},url:i,data:o}))}}ao.prototype[t]=r(),ao.prototype[t+"Form"]=r(!0)});let _F=class XC{constructor(t){if(typeof t!="function")throw new TypeError("executor must be a function.");let r;this.promise=new Promise(function(i){r=i});const n=this;this.promise.then(a=>{if(!n._listeners)return;let i=n._listeners.length;for(;i-- >0;)n._listeners[i](a);n._listeners=null}),this.promise.then=a=>{let i;const o=new Promise(l=>{n.subscribe(l),i=l}).then(a);return o.cancel=function(){n.unsubscribe(i)},o},t(function(i,o,l){n.reason||(n.reason=new Xd(i,o,l),r(n.reason))})}throwIfRequested(){if(this.reason)throw this.reason}subscribe(t){if(this.reason){t(this.reason);return}this._listeners?this._listeners.push(t):this._listeners=[t]}unsubscribe(t){if(!this._listeners)return;const r=this._listeners.indexOf(t);r!==-1&&this._listeners.splice(r,1)}toAbortSignal(){const t=new AbortController,r=n=>{t.abort(n)};return this.subscribe(r),t.signal.unsubscribe=()=>this.unsubscribe(r),t.signal}static source(){let t;return{token:new XC(function(a){t=a}),cancel:t}}};function wF(e){return function(r){return e.apply(null,r)}}function jF(e){return Y.isObject(e)&&e.isAxiosError===!0}const ly={Continue:100,SwitchingProtocols:101,Processing:102,EarlyHints:103,Ok:200,Created:201,Accepted:202,NonAuthoritativeInformation:203,NoContent:204,ResetContent:205,PartialContent:206,MultiStatus:207,AlreadyReported:208,ImUsed:226,MultipleChoices:300,MovedPermanently:301,Found:302,SeeOther:303,NotModified:304,UseProxy:305,Unused:306,TemporaryRedirect:307,PermanentRedirect:308,BadRequest:400,Unauthorized:401,PaymentRequired:402,Forbidden:403,NotFound:404,MethodNotAllowed:405,NotAcceptable:406,ProxyAuthenticationRequired:407,RequestTimeout:408,Conflict:409,Gone:410,LengthRequired:411,PreconditionFailed:412,PayloadTooLarge:413,UriTooLong:414,UnsupportedMediaType:415,RangeNotSatisfiable:416,ExpectationFailed:417,ImATeapot:418,MisdirectedRequest:421,UnprocessableEntity:422,Locked:423,FailedDependency:424,TooEarly:425,UpgradeRequired:426,PreconditionRequired:428,TooManyRequests:429,RequestHeaderFieldsTooLarge:431,UnavailableForLegalReasons:451,InternalServerError:500,NotImplemented:501,BadGateway:502,ServiceUnavailable:503,GatewayTimeout:504,HttpVersionNotSupported:505,VariantAlsoNegotiates:506,InsufficientStorage:507,LoopDetected:508,NotExtended:510,NetworkAuthenticationRequired:511,WebServerIsDown:521,ConnectionTimedOut:522,OriginIsUnreachable:523,TimeoutOccurred:524,SslHandshakeFailed:525,InvalidSslCertificate:526};Object.entries(ly).forEach(([e,t])=>{ly[t]=e});function UC(e){const t=new ao(e),r=wC(ao.prototype.request,t);return Y.extend(r,ao.prototype,t,{allOwnKeys:!0}),Y.extend(r,t,null,{allOwnKeys:!0}),r.create=function(a){return UC(po(e,a))},r}const Gt=UC(Kd);Gt.Axios=ao;Gt.CanceledError=Xd;Gt.CancelToken=_F;Gt.isCancel=FC;Gt.VERSION=KC;Gt.toFormData=Tp;Gt.AxiosError=Ke;Gt.Cancel=Gt.CanceledError;Gt.all=function(t){return Promise.all(t)};Gt.spread=wF;Gt.isAxiosError=jF;Gt.mergeConfig=po;Gt.AxiosHeaders=dn;Gt.formToJSON=e=>$C(Y.isHTMLForm(e)?new FormData(e):e);Gt.getAdapter=BC.getAdapter;Gt.HttpStatusCode=ly;Gt.default=Gt;const{Axios:Ihe,AxiosError:Lhe,CanceledError:zhe,isCancel:Bhe,CancelToken:Khe,VERSION:Xhe,all:Uhe,Cancel:Hhe,isAxiosError:Whe,spread:Vhe,toFormData:Ghe,AxiosHeaders:Qhe,HttpStatusCode:qhe,formToJSON:Yhe,getAdapter:Zhe,mergeConfig:Jhe}=Gt,Q=Gt.create({baseURL:"/api",withCredentials:!0});Q.interceptors.response.use(e=>e,e=>(e.response?.status===401&&window.location.pathname!=="/login"&&(window.location.href="/login"),Promise.reject(e)));Q.interceptors.response.use(async e=>{if(e.status!==202||!e.data?.status_url)return e;const t=Date.now()+18e5;for(;Date.now()<t;){await new Promise(n=>setTimeout(n,1e3));const{data:r}=await Gt.get(e.data.status_url,{withCredentials:!0});if(r.status==="done")return{...e,status:200,data:r.result};if(["error","cancelled","interrupted"].includes(r.status)){const n=new Error(r.error||`Job ${r.status}`);throw n.response={status:500,data:{error:r.error||`Job ${r.status}`}},n}}const r=`Job still running after ${18e5/6e4} minutes — check the Jobs page`,n=new Error(r);throw n.response={status:504,data:{error:r}},n});/**
  * @license lucide-react v0.294.0 - ISC
  *
  * This source code is licensed under the ISC license.
@@ -640,7 +640,7 @@ In order to be iterable, non-array objects must have a [Symbol.iterator]() metho
 In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function Doe(e,t){if(e){if(typeof e=="string")return kg(e,t);var r=Object.prototype.toString.call(e).slice(8,-1);if(r==="Object"&&e.constructor&&(r=e.constructor.name),r==="Map"||r==="Set")return Array.from(e);if(r==="Arguments"||/^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(r))return kg(e,t)}}function Ioe(e){if(typeof Symbol<"u"&&e[Symbol.iterator]!=null||e["@@iterator"]!=null)return Array.from(e)}function Loe(e){if(Array.isArray(e))return kg(e)}function kg(e,t){(t==null||t>e.length)&&(t=e.length);for(var r=0,n=new Array(t);r<t;r++)n[r]=e[r];return n}function zoe(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function lN(e,t){for(var r=0;r<t.length;r++){var n=t[r];n.enumerable=n.enumerable||!1,n.configurable=!0,"value"in n&&(n.writable=!0),Object.defineProperty(e,vP(n.key),n)}}function Boe(e,t,r){return t&&lN(e.prototype,t),r&&lN(e,r),Object.defineProperty(e,"prototype",{writable:!1}),e}function Koe(e,t,r){return t=Jh(t),Xoe(e,xP()?Reflect.construct(t,r||[],Jh(e).constructor):t.apply(e,r))}function Xoe(e,t){if(t&&(Ql(t)==="object"||typeof t=="function"))return t;if(t!==void 0)throw new TypeError("Derived constructors may only return object or undefined");return Uoe(e)}function Uoe(e){if(e===void 0)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function xP(){try{var e=!Boolean.prototype.valueOf.call(Reflect.construct(Boolean,[],function(){}))}catch{}return(xP=function(){return!!e})()}function Jh(e){return Jh=Object.setPrototypeOf?Object.getPrototypeOf.bind():function(r){return r.__proto__||Object.getPrototypeOf(r)},Jh(e)}function Hoe(e,t){if(typeof t!="function"&&t!==null)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),Object.defineProperty(e,"prototype",{writable:!1}),t&&Sg(e,t)}function Sg(e,t){return Sg=Object.setPrototypeOf?Object.setPrototypeOf.bind():function(n,a){return n.__proto__=a,n},Sg(e,t)}function ca(e,t,r){return t=vP(t),t in e?Object.defineProperty(e,t,{value:r,enumerable:!0,configurable:!0,writable:!0}):e[t]=r,e}function vP(e){var t=Woe(e,"string");return Ql(t)=="symbol"?t:t+""}function Woe(e,t){if(Ql(e)!="object"||!e)return e;var r=e[Symbol.toPrimitive];if(r!==void 0){var n=r.call(e,t);if(Ql(n)!="object")return n;throw new TypeError("@@toPrimitive must return a primitive value.")}return String(e)}var vi=function(e){function t(){var r;zoe(this,t);for(var n=arguments.length,a=new Array(n),i=0;i<n;i++)a[i]=arguments[i];return r=Koe(this,t,[].concat(a)),ca(r,"state",{isAnimationFinished:!0,totalLength:0}),ca(r,"generateSimpleStrokeDasharray",function(o,l){return"".concat(l,"px ").concat(o-l,"px")}),ca(r,"getStrokeDasharray",function(o,l,c){var u=c.reduce(function(m,y){return m+y});if(!u)return r.generateSimpleStrokeDasharray(l,o);for(var d=Math.floor(o/u),f=o%u,h=l-o,x=[],g=0,v=0;g<c.length;v+=c[g],++g)if(v+c[g]>f){x=[].concat(Xo(c.slice(0,g)),[f-v]);break}var p=x.length%2===0?[0,h]:[h];return[].concat(Xo(t.repeat(c,d)),Xo(x),p).map(function(m){return"".concat(m,"px")}).join(", ")}),ca(r,"id",xc("recharts-line-")),ca(r,"pathRef",function(o){r.mainCurve=o}),ca(r,"handleAnimationEnd",function(){r.setState({isAnimationFinished:!0}),r.props.onAnimationEnd&&r.props.onAnimationEnd()}),ca(r,"handleAnimationStart",function(){r.setState({isAnimationFinished:!1}),r.props.onAnimationStart&&r.props.onAnimationStart()}),r}return Hoe(t,e),Boe(t,[{key:"componentDidMount",value:function(){if(this.props.isAnimationActive){var n=this.getTotalLength();this.setState({totalLength:n})}}},{key:"componentDidUpdate",value:function(){if(this.props.isAnimationActive){var n=this.getTotalLength();n!==this.state.totalLength&&this.setState({totalLength:n})}}},{key:"getTotalLength",value:function(){var n=this.mainCurve;try{return n&&n.getTotalLength&&n.getTotalLength()||0}catch{return 0}}},{key:"renderErrorBar",value:function(n,a){if(this.props.isAnimationActive&&!this.state.isAnimationFinished)return null;var i=this.props,o=i.points,l=i.xAxis,c=i.yAxis,u=i.layout,d=i.children,f=Vn(d,Yd);if(!f)return null;var h=function(v,p){return{x:v.x,y:v.y,value:v.value,errorVal:qr(v.payload,p)}},x={clipPath:n?"url(#clipPath-".concat(a,")"):null};return V.createElement(Ct,x,f.map(function(g){return V.cloneElement(g,{key:"bar-".concat(g.props.dataKey),data:o,xAxis:l,yAxis:c,layout:u,dataPointFormatter:h})}))}},{key:"renderDots",value:function(n,a,i){var o=this.props.isAnimationActive;if(o&&!this.state.isAnimationFinished)return null;var l=this.props,c=l.dot,u=l.points,d=l.dataKey,f=Ve(this.props,!1),h=Ve(c,!0),x=u.map(function(v,p){var m=yn(yn(yn({key:"dot-".concat(p),r:3},f),h),{},{index:p,cx:v.x,cy:v.y,value:v.value,dataKey:d,payload:v.payload,points:u});return t.renderDotItem(c,m)}),g={clipPath:n?"url(#clipPath-".concat(a?"":"dots-").concat(i,")"):null};return V.createElement(Ct,yu({className:"recharts-line-dots",key:"dots"},g),x)}},{key:"renderCurveStatically",value:function(n,a,i,o){var l=this.props,c=l.type,u=l.layout,d=l.connectNulls;l.ref;var f=iN(l,Moe),h=yn(yn(yn({},Ve(f,!0)),{},{fill:"none",className:"recharts-line-curve",clipPath:a?"url(#clipPath-".concat(i,")"):null,points:n},o),{},{type:c,layout:u,connectNulls:d});return V.createElement(yl,yu({},h,{pathRef:this.pathRef}))}},{key:"renderCurveWithAnimation",value:function(n,a){var i=this,o=this.props,l=o.points,c=o.strokeDasharray,u=o.isAnimationActive,d=o.animationBegin,f=o.animationDuration,h=o.animationEasing,x=o.animationId,g=o.animateNewValues,v=o.width,p=o.height,m=this.state,y=m.prevPoints,b=m.totalLength;return V.createElement(qa,{begin:d,duration:f,isActive:u,easing:h,from:{t:0},to:{t:1},key:"line-".concat(x),onAnimationEnd:this.handleAnimationEnd,onAnimationStart:this.handleAnimationStart},function(_){var j=_.t;if(y){var k=y.length/l.length,w=l.map(function(D,B){var L=Math.floor(B*k);if(y[L]){var z=y[L],O=gr(z.x,D.x),A=gr(z.y,D.y);return yn(yn({},D),{},{x:O(j),y:A(j)})}if(g){var E=gr(v*2,D.x),P=gr(p/2,D.y);return yn(yn({},D),{},{x:E(j),y:P(j)})}return yn(yn({},D),{},{x:D.x,y:D.y})});return i.renderCurveStatically(w,n,a)}var S=gr(0,b),C=S(j),T;if(c){var R="".concat(c).split(/[,\s]+/gim).map(function(D){return parseFloat(D)});T=i.getStrokeDasharray(C,b,R)}else T=i.generateSimpleStrokeDasharray(b,C);return i.renderCurveStatically(l,n,a,{strokeDasharray:T})})}},{key:"renderCurve",value:function(n,a){var i=this.props,o=i.points,l=i.isAnimationActive,c=this.state,u=c.prevPoints,d=c.totalLength;return l&&o&&o.length&&(!u&&d>0||!Ll(u,o))?this.renderCurveWithAnimation(n,a):this.renderCurveStatically(o,n,a)}},{key:"render",value:function(){var n,a=this.props,i=a.hide,o=a.dot,l=a.points,c=a.className,u=a.xAxis,d=a.yAxis,f=a.top,h=a.left,x=a.width,g=a.height,v=a.isAnimationActive,p=a.id;if(i||!l||!l.length)return null;var m=this.state.isAnimationFinished,y=l.length===1,b=nt("recharts-line",c),_=u&&u.allowDataOverflow,j=d&&d.allowDataOverflow,k=_||j,w=qe(p)?this.id:p,S=(n=Ve(o,!1))!==null&&n!==void 0?n:{r:3,strokeWidth:2},C=S.r,T=C===void 0?3:C,R=S.strokeWidth,D=R===void 0?2:R,B=vE(o)?o:{},L=B.clipDot,z=L===void 0?!0:L,O=T*2+D;return V.createElement(Ct,{className:b},_||j?V.createElement("defs",null,V.createElement("clipPath",{id:"clipPath-".concat(w)},V.createElement("rect",{x:_?h:h-x/2,y:j?f:f-g/2,width:_?x:x*2,height:j?g:g*2})),!z&&V.createElement("clipPath",{id:"clipPath-dots-".concat(w)},V.createElement("rect",{x:h-O/2,y:f-O/2,width:x+O,height:g+O}))):null,!y&&this.renderCurve(k,w),this.renderErrorBar(k,w),(y||o)&&this.renderDots(k,z,w),(!v||m)&&ms.renderCallByParent(this.props,l))}}],[{key:"getDerivedStateFromProps",value:function(n,a){return n.animationId!==a.prevAnimationId?{prevAnimationId:n.animationId,curPoints:n.points,prevPoints:a.curPoints}:n.points!==a.curPoints?{curPoints:n.points}:null}},{key:"repeat",value:function(n,a){for(var i=n.length%2!==0?[].concat(Xo(n),[0]):n,o=[],l=0;l<a;++l)o=[].concat(Xo(o),Xo(i));return o}},{key:"renderDotItem",value:function(n,a){var i;if(V.isValidElement(n))i=V.cloneElement(n,a);else if(We(n))i=n(a);else{var o=a.key,l=iN(a,$oe),c=nt("recharts-line-dot",typeof n!="boolean"?n.className:"");i=V.createElement(pm,yu({key:o},l,{className:c}))}return i}}])}(N.PureComponent);ca(vi,"displayName","Line");ca(vi,"defaultProps",{xAxisId:0,yAxisId:0,connectNulls:!1,activeDot:!0,dot:!0,legendType:"line",stroke:"#3182bd",strokeWidth:1,fill:"#fff",points:[],isAnimationActive:!To.isSsr,animateNewValues:!0,animationBegin:0,animationDuration:1500,animationEasing:"ease",hide:!1,label:!1});ca(vi,"getComposedData",function(e){var t=e.props,r=e.xAxis,n=e.yAxis,a=e.xAxisTicks,i=e.yAxisTicks,o=e.dataKey,l=e.bandSize,c=e.displayedData,u=e.offset,d=t.layout,f=c.map(function(h,x){var g=qr(h,o);return d==="horizontal"?{x:Th({axis:r,ticks:a,bandSize:l,entry:h,index:x}),y:qe(g)?null:n.scale(g),value:g,payload:h}:{x:qe(g)?null:r.scale(g),y:Th({axis:n,ticks:i,bandSize:l,entry:h,index:x}),value:g,payload:h}});return yn({points:f,layout:d},u)});var Voe=["layout","type","stroke","connectNulls","isRange","ref"],Goe=["key"],yP;function ql(e){"@babel/helpers - typeof";return ql=typeof Symbol=="function"&&typeof Symbol.iterator=="symbol"?function(t){return typeof t}:function(t){return t&&typeof Symbol=="function"&&t.constructor===Symbol&&t!==Symbol.prototype?"symbol":typeof t},ql(e)}function gP(e,t){if(e==null)return{};var r=Qoe(e,t),n,a;if(Object.getOwnPropertySymbols){var i=Object.getOwnPropertySymbols(e);for(a=0;a<i.length;a++)n=i[a],!(t.indexOf(n)>=0)&&Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}function Qoe(e,t){if(e==null)return{};var r={};for(var n in e)if(Object.prototype.hasOwnProperty.call(e,n)){if(t.indexOf(n)>=0)continue;r[n]=e[n]}return r}function Zi(){return Zi=Object.assign?Object.assign.bind():function(e){for(var t=1;t<arguments.length;t++){var r=arguments[t];for(var n in r)Object.prototype.hasOwnProperty.call(r,n)&&(e[n]=r[n])}return e},Zi.apply(this,arguments)}function cN(e,t){var r=Object.keys(e);if(Object.getOwnPropertySymbols){var n=Object.getOwnPropertySymbols(e);t&&(n=n.filter(function(a){return Object.getOwnPropertyDescriptor(e,a).enumerable})),r.push.apply(r,n)}return r}function $s(e){for(var t=1;t<arguments.length;t++){var r=arguments[t]!=null?arguments[t]:{};t%2?cN(Object(r),!0).forEach(function(n){Ka(e,n,r[n])}):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(r)):cN(Object(r)).forEach(function(n){Object.defineProperty(e,n,Object.getOwnPropertyDescriptor(r,n))})}return e}function qoe(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function uN(e,t){for(var r=0;r<t.length;r++){var n=t[r];n.enumerable=n.enumerable||!1,n.configurable=!0,"value"in n&&(n.writable=!0),Object.defineProperty(e,_P(n.key),n)}}function Yoe(e,t,r){return t&&uN(e.prototype,t),r&&uN(e,r),Object.defineProperty(e,"prototype",{writable:!1}),e}function Zoe(e,t,r){return t=ep(t),Joe(e,bP()?Reflect.construct(t,r||[],ep(e).constructor):t.apply(e,r))}function Joe(e,t){if(t&&(ql(t)==="object"||typeof t=="function"))return t;if(t!==void 0)throw new TypeError("Derived constructors may only return object or undefined");return ele(e)}function ele(e){if(e===void 0)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function bP(){try{var e=!Boolean.prototype.valueOf.call(Reflect.construct(Boolean,[],function(){}))}catch{}return(bP=function(){return!!e})()}function ep(e){return ep=Object.setPrototypeOf?Object.getPrototypeOf.bind():function(r){return r.__proto__||Object.getPrototypeOf(r)},ep(e)}function tle(e,t){if(typeof t!="function"&&t!==null)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),Object.defineProperty(e,"prototype",{writable:!1}),t&&Ng(e,t)}function Ng(e,t){return Ng=Object.setPrototypeOf?Object.setPrototypeOf.bind():function(n,a){return n.__proto__=a,n},Ng(e,t)}function Ka(e,t,r){return t=_P(t),t in e?Object.defineProperty(e,t,{value:r,enumerable:!0,configurable:!0,writable:!0}):e[t]=r,e}function _P(e){var t=rle(e,"string");return ql(t)=="symbol"?t:t+""}function rle(e,t){if(ql(e)!="object"||!e)return e;var r=e[Symbol.toPrimitive];if(r!==void 0){var n=r.call(e,t);if(ql(n)!="object")return n;throw new TypeError("@@toPrimitive must return a primitive value.")}return String(e)}var rn=function(e){function t(){var r;qoe(this,t);for(var n=arguments.length,a=new Array(n),i=0;i<n;i++)a[i]=arguments[i];return r=Zoe(this,t,[].concat(a)),Ka(r,"state",{isAnimationFinished:!0}),Ka(r,"id",xc("recharts-area-")),Ka(r,"handleAnimationEnd",function(){var o=r.props.onAnimationEnd;r.setState({isAnimationFinished:!0}),We(o)&&o()}),Ka(r,"handleAnimationStart",function(){var o=r.props.onAnimationStart;r.setState({isAnimationFinished:!1}),We(o)&&o()}),r}return tle(t,e),Yoe(t,[{key:"renderDots",value:function(n,a,i){var o=this.props.isAnimationActive,l=this.state.isAnimationFinished;if(o&&!l)return null;var c=this.props,u=c.dot,d=c.points,f=c.dataKey,h=Ve(this.props,!1),x=Ve(u,!0),g=d.map(function(p,m){var y=$s($s($s({key:"dot-".concat(m),r:3},h),x),{},{index:m,cx:p.x,cy:p.y,dataKey:f,value:p.value,payload:p.payload,points:d});return t.renderDotItem(u,y)}),v={clipPath:n?"url(#clipPath-".concat(a?"":"dots-").concat(i,")"):null};return V.createElement(Ct,Zi({className:"recharts-area-dots"},v),g)}},{key:"renderHorizontalRect",value:function(n){var a=this.props,i=a.baseLine,o=a.points,l=a.strokeWidth,c=o[0].x,u=o[o.length-1].x,d=n*Math.abs(c-u),f=qs(o.map(function(h){return h.y||0}));return we(i)&&typeof i=="number"?f=Math.max(i,f):i&&Array.isArray(i)&&i.length&&(f=Math.max(qs(i.map(function(h){return h.y||0})),f)),we(f)?V.createElement("rect",{x:c<u?c:c-d,y:0,width:d,height:Math.floor(f+(l?parseInt("".concat(l),10):1))}):null}},{key:"renderVerticalRect",value:function(n){var a=this.props,i=a.baseLine,o=a.points,l=a.strokeWidth,c=o[0].y,u=o[o.length-1].y,d=n*Math.abs(c-u),f=qs(o.map(function(h){return h.x||0}));return we(i)&&typeof i=="number"?f=Math.max(i,f):i&&Array.isArray(i)&&i.length&&(f=Math.max(qs(i.map(function(h){return h.x||0})),f)),we(f)?V.createElement("rect",{x:0,y:c<u?c:c-d,width:f+(l?parseInt("".concat(l),10):1),height:Math.floor(d)}):null}},{key:"renderClipRect",value:function(n){var a=this.props.layout;return a==="vertical"?this.renderVerticalRect(n):this.renderHorizontalRect(n)}},{key:"renderAreaStatically",value:function(n,a,i,o){var l=this.props,c=l.layout,u=l.type,d=l.stroke,f=l.connectNulls,h=l.isRange;l.ref;var x=gP(l,Voe);return V.createElement(Ct,{clipPath:i?"url(#clipPath-".concat(o,")"):null},V.createElement(yl,Zi({},Ve(x,!0),{points:n,connectNulls:f,type:u,baseLine:a,layout:c,stroke:"none",className:"recharts-area-area"})),d!=="none"&&V.createElement(yl,Zi({},Ve(this.props,!1),{className:"recharts-area-curve",layout:c,type:u,connectNulls:f,fill:"none",points:n})),d!=="none"&&h&&V.createElement(yl,Zi({},Ve(this.props,!1),{className:"recharts-area-curve",layout:c,type:u,connectNulls:f,fill:"none",points:a})))}},{key:"renderAreaWithAnimation",value:function(n,a){var i=this,o=this.props,l=o.points,c=o.baseLine,u=o.isAnimationActive,d=o.animationBegin,f=o.animationDuration,h=o.animationEasing,x=o.animationId,g=this.state,v=g.prevPoints,p=g.prevBaseLine;return V.createElement(qa,{begin:d,duration:f,isActive:u,easing:h,from:{t:0},to:{t:1},key:"area-".concat(x),onAnimationEnd:this.handleAnimationEnd,onAnimationStart:this.handleAnimationStart},function(m){var y=m.t;if(v){var b=v.length/l.length,_=l.map(function(S,C){var T=Math.floor(C*b);if(v[T]){var R=v[T],D=gr(R.x,S.x),B=gr(R.y,S.y);return $s($s({},S),{},{x:D(y),y:B(y)})}return S}),j;if(we(c)&&typeof c=="number"){var k=gr(p,c);j=k(y)}else if(qe(c)||mc(c)){var w=gr(p,0);j=w(y)}else j=c.map(function(S,C){var T=Math.floor(C*b);if(p[T]){var R=p[T],D=gr(R.x,S.x),B=gr(R.y,S.y);return $s($s({},S),{},{x:D(y),y:B(y)})}return S});return i.renderAreaStatically(_,j,n,a)}return V.createElement(Ct,null,V.createElement("defs",null,V.createElement("clipPath",{id:"animationClipPath-".concat(a)},i.renderClipRect(y))),V.createElement(Ct,{clipPath:"url(#animationClipPath-".concat(a,")")},i.renderAreaStatically(l,c,n,a)))})}},{key:"renderArea",value:function(n,a){var i=this.props,o=i.points,l=i.baseLine,c=i.isAnimationActive,u=this.state,d=u.prevPoints,f=u.prevBaseLine,h=u.totalLength;return c&&o&&o.length&&(!d&&h>0||!Ll(d,o)||!Ll(f,l))?this.renderAreaWithAnimation(n,a):this.renderAreaStatically(o,l,n,a)}},{key:"render",value:function(){var n,a=this.props,i=a.hide,o=a.dot,l=a.points,c=a.className,u=a.top,d=a.left,f=a.xAxis,h=a.yAxis,x=a.width,g=a.height,v=a.isAnimationActive,p=a.id;if(i||!l||!l.length)return null;var m=this.state.isAnimationFinished,y=l.length===1,b=nt("recharts-area",c),_=f&&f.allowDataOverflow,j=h&&h.allowDataOverflow,k=_||j,w=qe(p)?this.id:p,S=(n=Ve(o,!1))!==null&&n!==void 0?n:{r:3,strokeWidth:2},C=S.r,T=C===void 0?3:C,R=S.strokeWidth,D=R===void 0?2:R,B=vE(o)?o:{},L=B.clipDot,z=L===void 0?!0:L,O=T*2+D;return V.createElement(Ct,{className:b},_||j?V.createElement("defs",null,V.createElement("clipPath",{id:"clipPath-".concat(w)},V.createElement("rect",{x:_?d:d-x/2,y:j?u:u-g/2,width:_?x:x*2,height:j?g:g*2})),!z&&V.createElement("clipPath",{id:"clipPath-dots-".concat(w)},V.createElement("rect",{x:d-O/2,y:u-O/2,width:x+O,height:g+O}))):null,y?null:this.renderArea(k,w),(o||y)&&this.renderDots(k,z,w),(!v||m)&&ms.renderCallByParent(this.props,l))}}],[{key:"getDerivedStateFromProps",value:function(n,a){return n.animationId!==a.prevAnimationId?{prevAnimationId:n.animationId,curPoints:n.points,curBaseLine:n.baseLine,prevPoints:a.curPoints,prevBaseLine:a.curBaseLine}:n.points!==a.curPoints||n.baseLine!==a.curBaseLine?{curPoints:n.points,curBaseLine:n.baseLine}:null}}])}(N.PureComponent);yP=rn;Ka(rn,"displayName","Area");Ka(rn,"defaultProps",{stroke:"#3182bd",fill:"#3182bd",fillOpacity:.6,xAxisId:0,yAxisId:0,legendType:"line",connectNulls:!1,points:[],dot:!1,activeDot:!0,hide:!1,isAnimationActive:!To.isSsr,animationBegin:0,animationDuration:1500,animationEasing:"ease"});Ka(rn,"getBaseValue",function(e,t,r,n){var a=e.layout,i=e.baseValue,o=t.props.baseValue,l=o??i;if(we(l)&&typeof l=="number")return l;var c=a==="horizontal"?n:r,u=c.scale.domain();if(c.type==="number"){var d=Math.max(u[0],u[1]),f=Math.min(u[0],u[1]);return l==="dataMin"?f:l==="dataMax"||d<0?d:Math.max(Math.min(u[0],u[1]),0)}return l==="dataMin"?u[0]:l==="dataMax"?u[1]:u[0]});Ka(rn,"getComposedData",function(e){var t=e.props,r=e.item,n=e.xAxis,a=e.yAxis,i=e.xAxisTicks,o=e.yAxisTicks,l=e.bandSize,c=e.dataKey,u=e.stackedData,d=e.dataStartIndex,f=e.displayedData,h=e.offset,x=t.layout,g=u&&u.length,v=yP.getBaseValue(t,r,n,a),p=x==="horizontal",m=!1,y=f.map(function(_,j){var k;g?k=u[d+j]:(k=qr(_,c),Array.isArray(k)?m=!0:k=[v,k]);var w=k[1]==null||g&&qr(_,c)==null;return p?{x:Th({axis:n,ticks:i,bandSize:l,entry:_,index:j}),y:w?null:a.scale(k[1]),value:k,payload:_}:{x:w?null:n.scale(k[1]),y:Th({axis:a,ticks:o,bandSize:l,entry:_,index:j}),value:k,payload:_}}),b;return g||m?b=y.map(function(_){var j=Array.isArray(_.value)?_.value[0]:null;return p?{x:_.x,y:j!=null&&_.y!=null?a.scale(j):null}:{x:j!=null?n.scale(j):null,y:_.y}}):b=p?a.scale(v):n.scale(v),$s({points:y,baseLine:b,layout:x,isRange:m},h)});Ka(rn,"renderDotItem",function(e,t){var r;if(V.isValidElement(e))r=V.cloneElement(e,t);else if(We(e))r=e(t);else{var n=nt("recharts-area-dot",typeof e!="boolean"?e.className:""),a=t.key,i=gP(t,Goe);r=V.createElement(pm,Zi({},i,{key:a,className:n}))}return r});function Yl(e){"@babel/helpers - typeof";return Yl=typeof Symbol=="function"&&typeof Symbol.iterator=="symbol"?function(t){return typeof t}:function(t){return t&&typeof Symbol=="function"&&t.constructor===Symbol&&t!==Symbol.prototype?"symbol":typeof t},Yl(e)}function nle(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function ale(e,t){for(var r=0;r<t.length;r++){var n=t[r];n.enumerable=n.enumerable||!1,n.configurable=!0,"value"in n&&(n.writable=!0),Object.defineProperty(e,kP(n.key),n)}}function sle(e,t,r){return t&&ale(e.prototype,t),Object.defineProperty(e,"prototype",{writable:!1}),e}function ile(e,t,r){return t=tp(t),ole(e,wP()?Reflect.construct(t,r||[],tp(e).constructor):t.apply(e,r))}function ole(e,t){if(t&&(Yl(t)==="object"||typeof t=="function"))return t;if(t!==void 0)throw new TypeError("Derived constructors may only return object or undefined");return lle(e)}function lle(e){if(e===void 0)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function wP(){try{var e=!Boolean.prototype.valueOf.call(Reflect.construct(Boolean,[],function(){}))}catch{}return(wP=function(){return!!e})()}function tp(e){return tp=Object.setPrototypeOf?Object.getPrototypeOf.bind():function(r){return r.__proto__||Object.getPrototypeOf(r)},tp(e)}function cle(e,t){if(typeof t!="function"&&t!==null)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),Object.defineProperty(e,"prototype",{writable:!1}),t&&Cg(e,t)}function Cg(e,t){return Cg=Object.setPrototypeOf?Object.setPrototypeOf.bind():function(n,a){return n.__proto__=a,n},Cg(e,t)}function jP(e,t,r){return t=kP(t),t in e?Object.defineProperty(e,t,{value:r,enumerable:!0,configurable:!0,writable:!0}):e[t]=r,e}function kP(e){var t=ule(e,"string");return Yl(t)=="symbol"?t:t+""}function ule(e,t){if(Yl(e)!="object"||!e)return e;var r=e[Symbol.toPrimitive];if(r!==void 0){var n=r.call(e,t);if(Yl(n)!="object")return n;throw new TypeError("@@toPrimitive must return a primitive value.")}return String(e)}function Eg(){return Eg=Object.assign?Object.assign.bind():function(e){for(var t=1;t<arguments.length;t++){var r=arguments[t];for(var n in r)Object.prototype.hasOwnProperty.call(r,n)&&(e[n]=r[n])}return e},Eg.apply(this,arguments)}function dle(e){var t=e.xAxisId,r=c_(),n=u_(),a=aP(t);return a==null?null:N.createElement(jc,Eg({},a,{className:nt("recharts-".concat(a.axisType," ").concat(a.axisType),a.className),viewBox:{x:0,y:0,width:r,height:n},ticksGenerator:function(o){return us(o,!0)}}))}var Kn=function(e){function t(){return nle(this,t),ile(this,t,arguments)}return cle(t,e),sle(t,[{key:"render",value:function(){return N.createElement(dle,this.props)}}])}(N.Component);jP(Kn,"displayName","XAxis");jP(Kn,"defaultProps",{allowDecimals:!0,hide:!1,orientation:"bottom",width:0,height:30,mirror:!1,xAxisId:0,tickCount:5,type:"category",padding:{left:0,right:0},allowDataOverflow:!1,scale:"auto",reversed:!1,allowDuplicatedCategory:!0});function Zl(e){"@babel/helpers - typeof";return Zl=typeof Symbol=="function"&&typeof Symbol.iterator=="symbol"?function(t){return typeof t}:function(t){return t&&typeof Symbol=="function"&&t.constructor===Symbol&&t!==Symbol.prototype?"symbol":typeof t},Zl(e)}function fle(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function hle(e,t){for(var r=0;r<t.length;r++){var n=t[r];n.enumerable=n.enumerable||!1,n.configurable=!0,"value"in n&&(n.writable=!0),Object.defineProperty(e,CP(n.key),n)}}function ple(e,t,r){return t&&hle(e.prototype,t),Object.defineProperty(e,"prototype",{writable:!1}),e}function mle(e,t,r){return t=rp(t),xle(e,SP()?Reflect.construct(t,r||[],rp(e).constructor):t.apply(e,r))}function xle(e,t){if(t&&(Zl(t)==="object"||typeof t=="function"))return t;if(t!==void 0)throw new TypeError("Derived constructors may only return object or undefined");return vle(e)}function vle(e){if(e===void 0)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function SP(){try{var e=!Boolean.prototype.valueOf.call(Reflect.construct(Boolean,[],function(){}))}catch{}return(SP=function(){return!!e})()}function rp(e){return rp=Object.setPrototypeOf?Object.getPrototypeOf.bind():function(r){return r.__proto__||Object.getPrototypeOf(r)},rp(e)}function yle(e,t){if(typeof t!="function"&&t!==null)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),Object.defineProperty(e,"prototype",{writable:!1}),t&&Ag(e,t)}function Ag(e,t){return Ag=Object.setPrototypeOf?Object.setPrototypeOf.bind():function(n,a){return n.__proto__=a,n},Ag(e,t)}function NP(e,t,r){return t=CP(t),t in e?Object.defineProperty(e,t,{value:r,enumerable:!0,configurable:!0,writable:!0}):e[t]=r,e}function CP(e){var t=gle(e,"string");return Zl(t)=="symbol"?t:t+""}function gle(e,t){if(Zl(e)!="object"||!e)return e;var r=e[Symbol.toPrimitive];if(r!==void 0){var n=r.call(e,t);if(Zl(n)!="object")return n;throw new TypeError("@@toPrimitive must return a primitive value.")}return String(e)}function Og(){return Og=Object.assign?Object.assign.bind():function(e){for(var t=1;t<arguments.length;t++){var r=arguments[t];for(var n in r)Object.prototype.hasOwnProperty.call(r,n)&&(e[n]=r[n])}return e},Og.apply(this,arguments)}var ble=function(t){var r=t.yAxisId,n=c_(),a=u_(),i=sP(r);return i==null?null:N.createElement(jc,Og({},i,{className:nt("recharts-".concat(i.axisType," ").concat(i.axisType),i.className),viewBox:{x:0,y:0,width:n,height:a},ticksGenerator:function(l){return us(l,!0)}}))},jn=function(e){function t(){return fle(this,t),mle(this,t,arguments)}return yle(t,e),ple(t,[{key:"render",value:function(){return N.createElement(ble,this.props)}}])}(N.Component);NP(jn,"displayName","YAxis");NP(jn,"defaultProps",{allowDuplicatedCategory:!0,allowDecimals:!0,hide:!1,orientation:"left",width:60,height:0,mirror:!1,yAxisId:0,tickCount:5,type:"number",padding:{top:0,bottom:0},allowDataOverflow:!1,scale:"auto",reversed:!1});function dN(e){return kle(e)||jle(e)||wle(e)||_le()}function _le(){throw new TypeError(`Invalid attempt to spread non-iterable instance.
 In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function wle(e,t){if(e){if(typeof e=="string")return Pg(e,t);var r=Object.prototype.toString.call(e).slice(8,-1);if(r==="Object"&&e.constructor&&(r=e.constructor.name),r==="Map"||r==="Set")return Array.from(e);if(r==="Arguments"||/^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(r))return Pg(e,t)}}function jle(e){if(typeof Symbol<"u"&&e[Symbol.iterator]!=null||e["@@iterator"]!=null)return Array.from(e)}function kle(e){if(Array.isArray(e))return Pg(e)}function Pg(e,t){(t==null||t>e.length)&&(t=e.length);for(var r=0,n=new Array(t);r<t;r++)n[r]=e[r];return n}var Tg=function(t,r,n,a,i){var o=Vn(t,f_),l=Vn(t,gm),c=[].concat(dN(o),dN(l)),u=Vn(t,_m),d="".concat(a,"Id"),f=a[0],h=r;if(c.length&&(h=c.reduce(function(v,p){if(p.props[d]===n&&Va(p.props,"extendDomain")&&we(p.props[f])){var m=p.props[f];return[Math.min(v[0],m),Math.max(v[1],m)]}return v},h)),u.length){var x="".concat(f,"1"),g="".concat(f,"2");h=u.reduce(function(v,p){if(p.props[d]===n&&Va(p.props,"extendDomain")&&we(p.props[x])&&we(p.props[g])){var m=p.props[x],y=p.props[g];return[Math.min(v[0],m,y),Math.max(v[1],m,y)]}return v},h)}return i&&i.length&&(h=i.reduce(function(v,p){return we(p)?[Math.min(v[0],p),Math.max(v[1],p)]:v},h)),h},EP={exports:{}};(function(e){var t=Object.prototype.hasOwnProperty,r="~";function n(){}Object.create&&(n.prototype=Object.create(null),new n().__proto__||(r=!1));function a(c,u,d){this.fn=c,this.context=u,this.once=d||!1}function i(c,u,d,f,h){if(typeof d!="function")throw new TypeError("The listener must be a function");var x=new a(d,f||c,h),g=r?r+u:u;return c._events[g]?c._events[g].fn?c._events[g]=[c._events[g],x]:c._events[g].push(x):(c._events[g]=x,c._eventsCount++),c}function o(c,u){--c._eventsCount===0?c._events=new n:delete c._events[u]}function l(){this._events=new n,this._eventsCount=0}l.prototype.eventNames=function(){var u=[],d,f;if(this._eventsCount===0)return u;for(f in d=this._events)t.call(d,f)&&u.push(r?f.slice(1):f);return Object.getOwnPropertySymbols?u.concat(Object.getOwnPropertySymbols(d)):u},l.prototype.listeners=function(u){var d=r?r+u:u,f=this._events[d];if(!f)return[];if(f.fn)return[f.fn];for(var h=0,x=f.length,g=new Array(x);h<x;h++)g[h]=f[h].fn;return g},l.prototype.listenerCount=function(u){var d=r?r+u:u,f=this._events[d];return f?f.fn?1:f.length:0},l.prototype.emit=function(u,d,f,h,x,g){var v=r?r+u:u;if(!this._events[v])return!1;var p=this._events[v],m=arguments.length,y,b;if(p.fn){switch(p.once&&this.removeListener(u,p.fn,void 0,!0),m){case 1:return p.fn.call(p.context),!0;case 2:return p.fn.call(p.context,d),!0;case 3:return p.fn.call(p.context,d,f),!0;case 4:return p.fn.call(p.context,d,f,h),!0;case 5:return p.fn.call(p.context,d,f,h,x),!0;case 6:return p.fn.call(p.context,d,f,h,x,g),!0}for(b=1,y=new Array(m-1);b<m;b++)y[b-1]=arguments[b];p.fn.apply(p.context,y)}else{var _=p.length,j;for(b=0;b<_;b++)switch(p[b].once&&this.removeListener(u,p[b].fn,void 0,!0),m){case 1:p[b].fn.call(p[b].context);break;case 2:p[b].fn.call(p[b].context,d);break;case 3:p[b].fn.call(p[b].context,d,f);break;case 4:p[b].fn.call(p[b].context,d,f,h);break;default:if(!y)for(j=1,y=new Array(m-1);j<m;j++)y[j-1]=arguments[j];p[b].fn.apply(p[b].context,y)}}return!0},l.prototype.on=function(u,d,f){return i(this,u,d,f,!1)},l.prototype.once=function(u,d,f){return i(this,u,d,f,!0)},l.prototype.removeListener=function(u,d,f,h){var x=r?r+u:u;if(!this._events[x])return this;if(!d)return o(this,x),this;var g=this._events[x];if(g.fn)g.fn===d&&(!h||g.once)&&(!f||g.context===f)&&o(this,x);else{for(var v=0,p=[],m=g.length;v<m;v++)(g[v].fn!==d||h&&!g[v].once||f&&g[v].context!==f)&&p.push(g[v]);p.length?this._events[x]=p.length===1?p[0]:p:o(this,x)}return this},l.prototype.removeAllListeners=function(u){var d;return u?(d=r?r+u:u,this._events[d]&&o(this,d)):(this._events=new n,this._eventsCount=0),this},l.prototype.off=l.prototype.removeListener,l.prototype.addListener=l.prototype.on,l.prefixed=r,l.EventEmitter=l,e.exports=l})(EP);var Sle=EP.exports;const Nle=jt(Sle);var Xx=new Nle,Ux="recharts.syncMouseEvents";function wd(e){"@babel/helpers - typeof";return wd=typeof Symbol=="function"&&typeof Symbol.iterator=="symbol"?function(t){return typeof t}:function(t){return t&&typeof Symbol=="function"&&t.constructor===Symbol&&t!==Symbol.prototype?"symbol":typeof t},wd(e)}function Cle(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function Ele(e,t){for(var r=0;r<t.length;r++){var n=t[r];n.enumerable=n.enumerable||!1,n.configurable=!0,"value"in n&&(n.writable=!0),Object.defineProperty(e,AP(n.key),n)}}function Ale(e,t,r){return t&&Ele(e.prototype,t),Object.defineProperty(e,"prototype",{writable:!1}),e}function Hx(e,t,r){return t=AP(t),t in e?Object.defineProperty(e,t,{value:r,enumerable:!0,configurable:!0,writable:!0}):e[t]=r,e}function AP(e){var t=Ole(e,"string");return wd(t)=="symbol"?t:t+""}function Ole(e,t){if(wd(e)!="object"||!e)return e;var r=e[Symbol.toPrimitive];if(r!==void 0){var n=r.call(e,t);if(wd(n)!="object")return n;throw new TypeError("@@toPrimitive must return a primitive value.")}return String(e)}var Ple=function(){function e(){Cle(this,e),Hx(this,"activeIndex",0),Hx(this,"coordinateList",[]),Hx(this,"layout","horizontal")}return Ale(e,[{key:"setDetails",value:function(r){var n,a=r.coordinateList,i=a===void 0?null:a,o=r.container,l=o===void 0?null:o,c=r.layout,u=c===void 0?null:c,d=r.offset,f=d===void 0?null:d,h=r.mouseHandlerCallback,x=h===void 0?null:h;this.coordinateList=(n=i??this.coordinateList)!==null&&n!==void 0?n:[],this.container=l??this.container,this.layout=u??this.layout,this.offset=f??this.offset,this.mouseHandlerCallback=x??this.mouseHandlerCallback,this.activeIndex=Math.min(Math.max(this.activeIndex,0),this.coordinateList.length-1)}},{key:"focus",value:function(){this.spoofMouse()}},{key:"keyboardEvent",value:function(r){if(this.coordinateList.length!==0)switch(r.key){case"ArrowRight":{if(this.layout!=="horizontal")return;this.activeIndex=Math.min(this.activeIndex+1,this.coordinateList.length-1),this.spoofMouse();break}case"ArrowLeft":{if(this.layout!=="horizontal")return;this.activeIndex=Math.max(this.activeIndex-1,0),this.spoofMouse();break}}}},{key:"setIndex",value:function(r){this.activeIndex=r}},{key:"spoofMouse",value:function(){var r,n;if(this.layout==="horizontal"&&this.coordinateList.length!==0){var a=this.container.getBoundingClientRect(),i=a.x,o=a.y,l=a.height,c=this.coordinateList[this.activeIndex].coordinate,u=((r=window)===null||r===void 0?void 0:r.scrollX)||0,d=((n=window)===null||n===void 0?void 0:n.scrollY)||0,f=i+c+u,h=o+this.offset.top+l/2+d;this.mouseHandlerCallback({pageX:f,pageY:h})}}}])}();function Tle(e,t,r){if(r==="number"&&t===!0&&Array.isArray(e)){var n=e?.[0],a=e?.[1];if(n&&a&&we(n)&&we(a))return!0}return!1}function Mle(e,t,r,n){var a=n/2;return{stroke:"none",fill:"#ccc",x:e==="horizontal"?t.x-a:r.left+.5,y:e==="horizontal"?r.top+.5:t.y-a,width:e==="horizontal"?n:r.width-1,height:e==="horizontal"?r.height-1:n}}function OP(e){var t=e.cx,r=e.cy,n=e.radius,a=e.startAngle,i=e.endAngle,o=br(t,r,n,a),l=br(t,r,n,i);return{points:[o,l],cx:t,cy:r,radius:n,startAngle:a,endAngle:i}}function $le(e,t,r){var n,a,i,o;if(e==="horizontal")n=t.x,i=n,a=r.top,o=r.top+r.height;else if(e==="vertical")a=t.y,o=a,n=r.left,i=r.left+r.width;else if(t.cx!=null&&t.cy!=null)if(e==="centric"){var l=t.cx,c=t.cy,u=t.innerRadius,d=t.outerRadius,f=t.angle,h=br(l,c,u,f),x=br(l,c,d,f);n=h.x,a=h.y,i=x.x,o=x.y}else return OP(t);return[{x:n,y:a},{x:i,y:o}]}function jd(e){"@babel/helpers - typeof";return jd=typeof Symbol=="function"&&typeof Symbol.iterator=="symbol"?function(t){return typeof t}:function(t){return t&&typeof Symbol=="function"&&t.constructor===Symbol&&t!==Symbol.prototype?"symbol":typeof t},jd(e)}function fN(e,t){var r=Object.keys(e);if(Object.getOwnPropertySymbols){var n=Object.getOwnPropertySymbols(e);t&&(n=n.filter(function(a){return Object.getOwnPropertyDescriptor(e,a).enumerable})),r.push.apply(r,n)}return r}function Vf(e){for(var t=1;t<arguments.length;t++){var r=arguments[t]!=null?arguments[t]:{};t%2?fN(Object(r),!0).forEach(function(n){Rle(e,n,r[n])}):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(r)):fN(Object(r)).forEach(function(n){Object.defineProperty(e,n,Object.getOwnPropertyDescriptor(r,n))})}return e}function Rle(e,t,r){return t=Fle(t),t in e?Object.defineProperty(e,t,{value:r,enumerable:!0,configurable:!0,writable:!0}):e[t]=r,e}function Fle(e){var t=Dle(e,"string");return jd(t)=="symbol"?t:t+""}function Dle(e,t){if(jd(e)!="object"||!e)return e;var r=e[Symbol.toPrimitive];if(r!==void 0){var n=r.call(e,t);if(jd(n)!="object")return n;throw new TypeError("@@toPrimitive must return a primitive value.")}return(t==="string"?String:Number)(e)}function Ile(e){var t,r,n=e.element,a=e.tooltipEventType,i=e.isActive,o=e.activeCoordinate,l=e.activePayload,c=e.offset,u=e.activeTooltipIndex,d=e.tooltipAxisBandSize,f=e.layout,h=e.chartName,x=(t=n.props.cursor)!==null&&t!==void 0?t:(r=n.type.defaultProps)===null||r===void 0?void 0:r.cursor;if(!n||!x||!i||!o||h!=="ScatterChart"&&a!=="axis")return null;var g,v=yl;if(h==="ScatterChart")g=o,v=Ene;else if(h==="BarChart")g=Mle(f,o,c,d),v=s_;else if(f==="radial"){var p=OP(o),m=p.cx,y=p.cy,b=p.radius,_=p.startAngle,j=p.endAngle;g={cx:m,cy:y,startAngle:_,endAngle:j,innerRadius:b,outerRadius:b},v=AO}else g={points:$le(f,o,c)},v=yl;var k=Vf(Vf(Vf(Vf({stroke:"#ccc",pointerEvents:"none"},c),g),Ve(x,!1)),{},{payload:l,payloadIndex:u,className:nt("recharts-tooltip-cursor",x.className)});return N.isValidElement(x)?N.cloneElement(x,k):N.createElement(v,k)}var Lle=["item"],zle=["children","className","width","height","style","compact","title","desc"];function Jl(e){"@babel/helpers - typeof";return Jl=typeof Symbol=="function"&&typeof Symbol.iterator=="symbol"?function(t){return typeof t}:function(t){return t&&typeof Symbol=="function"&&t.constructor===Symbol&&t!==Symbol.prototype?"symbol":typeof t},Jl(e)}function ol(){return ol=Object.assign?Object.assign.bind():function(e){for(var t=1;t<arguments.length;t++){var r=arguments[t];for(var n in r)Object.prototype.hasOwnProperty.call(r,n)&&(e[n]=r[n])}return e},ol.apply(this,arguments)}function hN(e,t){return Xle(e)||Kle(e,t)||TP(e,t)||Ble()}function Ble(){throw new TypeError(`Invalid attempt to destructure non-iterable instance.
 In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function Kle(e,t){var r=e==null?null:typeof Symbol<"u"&&e[Symbol.iterator]||e["@@iterator"];if(r!=null){var n,a,i,o,l=[],c=!0,u=!1;try{if(i=(r=r.call(e)).next,t!==0)for(;!(c=(n=i.call(r)).done)&&(l.push(n.value),l.length!==t);c=!0);}catch(d){u=!0,a=d}finally{try{if(!c&&r.return!=null&&(o=r.return(),Object(o)!==o))return}finally{if(u)throw a}}return l}}function Xle(e){if(Array.isArray(e))return e}function pN(e,t){if(e==null)return{};var r=Ule(e,t),n,a;if(Object.getOwnPropertySymbols){var i=Object.getOwnPropertySymbols(e);for(a=0;a<i.length;a++)n=i[a],!(t.indexOf(n)>=0)&&Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}function Ule(e,t){if(e==null)return{};var r={};for(var n in e)if(Object.prototype.hasOwnProperty.call(e,n)){if(t.indexOf(n)>=0)continue;r[n]=e[n]}return r}function Hle(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}function Wle(e,t){for(var r=0;r<t.length;r++){var n=t[r];n.enumerable=n.enumerable||!1,n.configurable=!0,"value"in n&&(n.writable=!0),Object.defineProperty(e,MP(n.key),n)}}function Vle(e,t,r){return t&&Wle(e.prototype,t),Object.defineProperty(e,"prototype",{writable:!1}),e}function Gle(e,t,r){return t=np(t),Qle(e,PP()?Reflect.construct(t,r||[],np(e).constructor):t.apply(e,r))}function Qle(e,t){if(t&&(Jl(t)==="object"||typeof t=="function"))return t;if(t!==void 0)throw new TypeError("Derived constructors may only return object or undefined");return qle(e)}function qle(e){if(e===void 0)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return e}function PP(){try{var e=!Boolean.prototype.valueOf.call(Reflect.construct(Boolean,[],function(){}))}catch{}return(PP=function(){return!!e})()}function np(e){return np=Object.setPrototypeOf?Object.getPrototypeOf.bind():function(r){return r.__proto__||Object.getPrototypeOf(r)},np(e)}function Yle(e,t){if(typeof t!="function"&&t!==null)throw new TypeError("Super expression must either be null or a function");e.prototype=Object.create(t&&t.prototype,{constructor:{value:e,writable:!0,configurable:!0}}),Object.defineProperty(e,"prototype",{writable:!1}),t&&Mg(e,t)}function Mg(e,t){return Mg=Object.setPrototypeOf?Object.setPrototypeOf.bind():function(n,a){return n.__proto__=a,n},Mg(e,t)}function ec(e){return ece(e)||Jle(e)||TP(e)||Zle()}function Zle(){throw new TypeError(`Invalid attempt to spread non-iterable instance.
-In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function TP(e,t){if(e){if(typeof e=="string")return $g(e,t);var r=Object.prototype.toString.call(e).slice(8,-1);if(r==="Object"&&e.constructor&&(r=e.constructor.name),r==="Map"||r==="Set")return Array.from(e);if(r==="Arguments"||/^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(r))return $g(e,t)}}function Jle(e){if(typeof Symbol<"u"&&e[Symbol.iterator]!=null||e["@@iterator"]!=null)return Array.from(e)}function ece(e){if(Array.isArray(e))return $g(e)}function $g(e,t){(t==null||t>e.length)&&(t=e.length);for(var r=0,n=new Array(t);r<t;r++)n[r]=e[r];return n}function mN(e,t){var r=Object.keys(e);if(Object.getOwnPropertySymbols){var n=Object.getOwnPropertySymbols(e);t&&(n=n.filter(function(a){return Object.getOwnPropertyDescriptor(e,a).enumerable})),r.push.apply(r,n)}return r}function oe(e){for(var t=1;t<arguments.length;t++){var r=arguments[t]!=null?arguments[t]:{};t%2?mN(Object(r),!0).forEach(function(n){Le(e,n,r[n])}):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(r)):mN(Object(r)).forEach(function(n){Object.defineProperty(e,n,Object.getOwnPropertyDescriptor(r,n))})}return e}function Le(e,t,r){return t=MP(t),t in e?Object.defineProperty(e,t,{value:r,enumerable:!0,configurable:!0,writable:!0}):e[t]=r,e}function MP(e){var t=tce(e,"string");return Jl(t)=="symbol"?t:t+""}function tce(e,t){if(Jl(e)!="object"||!e)return e;var r=e[Symbol.toPrimitive];if(r!==void 0){var n=r.call(e,t);if(Jl(n)!="object")return n;throw new TypeError("@@toPrimitive must return a primitive value.")}return(t==="string"?String:Number)(e)}var rce={xAxis:["bottom","top"],yAxis:["left","right"]},nce={width:"100%",height:"100%"},$P={x:0,y:0};function Gf(e){return e}var ace=function(t,r){return r==="horizontal"?t.x:r==="vertical"?t.y:r==="centric"?t.angle:t.radius},sce=function(t,r,n,a){var i=r.find(function(d){return d&&d.index===n});if(i){if(t==="horizontal")return{x:i.coordinate,y:a.y};if(t==="vertical")return{x:a.x,y:i.coordinate};if(t==="centric"){var o=i.coordinate,l=a.radius;return oe(oe(oe({},a),br(a.cx,a.cy,l,o)),{},{angle:o,radius:l})}var c=i.coordinate,u=a.angle;return oe(oe(oe({},a),br(a.cx,a.cy,c,u)),{},{angle:u,radius:c})}return $P},wm=function(t,r){var n=r.graphicalItems,a=r.dataStartIndex,i=r.dataEndIndex,o=(n??[]).reduce(function(l,c){var u=c.props.data;return u&&u.length?[].concat(ec(l),ec(u)):l},[]);return o.length>0?o:t&&t.length&&we(a)&&we(i)?t.slice(a,i+1):[]};function RP(e){return e==="number"?[0,"auto"]:void 0}var Rg=function(t,r,n,a){var i=t.graphicalItems,o=t.tooltipAxis,l=wm(r,t);return n<0||!i||!i.length||n>=l.length?null:i.reduce(function(c,u){var d,f=(d=u.props.data)!==null&&d!==void 0?d:r;f&&t.dataStartIndex+t.dataEndIndex!==0&&t.dataEndIndex-t.dataStartIndex>=n&&(f=f.slice(t.dataStartIndex,t.dataEndIndex+1));var h;if(o.dataKey&&!o.allowDuplicatedCategory){var x=f===void 0?l:f;h=th(x,o.dataKey,a)}else h=f&&f[n]||l[n];return h?[].concat(ec(c),[NO(u,h)]):c},[])},xN=function(t,r,n,a){var i=a||{x:t.chartX,y:t.chartY},o=ace(i,n),l=t.orderedTooltipTicks,c=t.tooltipAxis,u=t.tooltipTicks,d=iee(o,l,u,c);if(d>=0&&u){var f=u[d]&&u[d].value,h=Rg(t,r,d,f),x=sce(n,l,d,i);return{activeTooltipIndex:d,activeLabel:f,activePayload:h,activeCoordinate:x}}return null},ice=function(t,r){var n=r.axes,a=r.graphicalItems,i=r.axisType,o=r.axisIdKey,l=r.stackGroups,c=r.dataStartIndex,u=r.dataEndIndex,d=t.layout,f=t.children,h=t.stackOffset,x=jO(d,i);return n.reduce(function(g,v){var p,m=v.type.defaultProps!==void 0?oe(oe({},v.type.defaultProps),v.props):v.props,y=m.type,b=m.dataKey,_=m.allowDataOverflow,j=m.allowDuplicatedCategory,k=m.scale,w=m.ticks,S=m.includeHidden,C=m[o];if(g[C])return g;var T=wm(t.data,{graphicalItems:a.filter(function(X){var q,ie=o in X.props?X.props[o]:(q=X.type.defaultProps)===null||q===void 0?void 0:q[o];return ie===C}),dataStartIndex:c,dataEndIndex:u}),R=T.length,D,B,L;Tle(m.domain,_,y)&&(D=Zy(m.domain,null,_),x&&(y==="number"||k!=="auto")&&(L=xu(T,b,"category")));var z=RP(y);if(!D||D.length===0){var O,A=(O=m.domain)!==null&&O!==void 0?O:z;if(b){if(D=xu(T,b,y),y==="category"&&x){var E=Gz(D);j&&E?(B=D,D=Xh(0,R)):j||(D=Qk(A,D,v).reduce(function(X,q){return X.indexOf(q)>=0?X:[].concat(ec(X),[q])},[]))}else if(y==="category")j?D=D.filter(function(X){return X!==""&&!qe(X)}):D=Qk(A,D,v).reduce(function(X,q){return X.indexOf(q)>=0||q===""||qe(q)?X:[].concat(ec(X),[q])},[]);else if(y==="number"){var P=dee(T,a.filter(function(X){var q,ie,ue=o in X.props?X.props[o]:(q=X.type.defaultProps)===null||q===void 0?void 0:q[o],je="hide"in X.props?X.props.hide:(ie=X.type.defaultProps)===null||ie===void 0?void 0:ie.hide;return ue===C&&(S||!je)}),b,i,d);P&&(D=P)}x&&(y==="number"||k!=="auto")&&(L=xu(T,b,"category"))}else x?D=Xh(0,R):l&&l[C]&&l[C].hasStack&&y==="number"?D=h==="expand"?[0,1]:SO(l[C].stackGroups,c,u):D=wO(T,a.filter(function(X){var q=o in X.props?X.props[o]:X.type.defaultProps[o],ie="hide"in X.props?X.props.hide:X.type.defaultProps.hide;return q===C&&(S||!ie)}),y,d,!0);if(y==="number")D=Tg(f,D,C,i,w),A&&(D=Zy(A,D,_));else if(y==="category"&&A){var F=A,I=D.every(function(X){return F.indexOf(X)>=0});I&&(D=F)}}return oe(oe({},g),{},Le({},C,oe(oe({},m),{},{axisType:i,domain:D,categoricalDomain:L,duplicateDomain:B,originalDomain:(p=m.domain)!==null&&p!==void 0?p:z,isCategorical:x,layout:d})))},{})},oce=function(t,r){var n=r.graphicalItems,a=r.Axis,i=r.axisType,o=r.axisIdKey,l=r.stackGroups,c=r.dataStartIndex,u=r.dataEndIndex,d=t.layout,f=t.children,h=wm(t.data,{graphicalItems:n,dataStartIndex:c,dataEndIndex:u}),x=h.length,g=jO(d,i),v=-1;return n.reduce(function(p,m){var y=m.type.defaultProps!==void 0?oe(oe({},m.type.defaultProps),m.props):m.props,b=y[o],_=RP("number");if(!p[b]){v++;var j;return g?j=Xh(0,x):l&&l[b]&&l[b].hasStack?(j=SO(l[b].stackGroups,c,u),j=Tg(f,j,b,i)):(j=Zy(_,wO(h,n.filter(function(k){var w,S,C=o in k.props?k.props[o]:(w=k.type.defaultProps)===null||w===void 0?void 0:w[o],T="hide"in k.props?k.props.hide:(S=k.type.defaultProps)===null||S===void 0?void 0:S.hide;return C===b&&!T}),"number",d),a.defaultProps.allowDataOverflow),j=Tg(f,j,b,i)),oe(oe({},p),{},Le({},b,oe(oe({axisType:i},a.defaultProps),{},{hide:!0,orientation:Wn(rce,"".concat(i,".").concat(v%2),null),domain:j,originalDomain:_,isCategorical:g,layout:d})))}return p},{})},lce=function(t,r){var n=r.axisType,a=n===void 0?"xAxis":n,i=r.AxisComp,o=r.graphicalItems,l=r.stackGroups,c=r.dataStartIndex,u=r.dataEndIndex,d=t.children,f="".concat(a,"Id"),h=Vn(d,i),x={};return h&&h.length?x=ice(t,{axes:h,graphicalItems:o,axisType:a,axisIdKey:f,stackGroups:l,dataStartIndex:c,dataEndIndex:u}):o&&o.length&&(x=oce(t,{Axis:i,graphicalItems:o,axisType:a,axisIdKey:f,stackGroups:l,dataStartIndex:c,dataEndIndex:u})),x},cce=function(t){var r=Ks(t),n=us(r,!1,!0);return{tooltipTicks:n,orderedTooltipTicks:T1(n,function(a){return a.coordinate}),tooltipAxis:r,tooltipAxisBandSize:Mh(r,n)}},vN=function(t){var r=t.children,n=t.defaultShowTooltip,a=_n(r,Xl),i=0,o=0;return t.data&&t.data.length!==0&&(o=t.data.length-1),a&&a.props&&(a.props.startIndex>=0&&(i=a.props.startIndex),a.props.endIndex>=0&&(o=a.props.endIndex)),{chartX:0,chartY:0,dataStartIndex:i,dataEndIndex:o,activeTooltipIndex:-1,isTooltipActive:!!n}},uce=function(t){return!t||!t.length?!1:t.some(function(r){var n=fs(r&&r.type);return n&&n.indexOf("Bar")>=0})},yN=function(t){return t==="horizontal"?{numericAxisName:"yAxis",cateAxisName:"xAxis"}:t==="vertical"?{numericAxisName:"xAxis",cateAxisName:"yAxis"}:t==="centric"?{numericAxisName:"radiusAxis",cateAxisName:"angleAxis"}:{numericAxisName:"angleAxis",cateAxisName:"radiusAxis"}},dce=function(t,r){var n=t.props,a=t.graphicalItems,i=t.xAxisMap,o=i===void 0?{}:i,l=t.yAxisMap,c=l===void 0?{}:l,u=n.width,d=n.height,f=n.children,h=n.margin||{},x=_n(f,Xl),g=_n(f,Ha),v=Object.keys(c).reduce(function(j,k){var w=c[k],S=w.orientation;return!w.mirror&&!w.hide?oe(oe({},j),{},Le({},S,j[S]+w.width)):j},{left:h.left||0,right:h.right||0}),p=Object.keys(o).reduce(function(j,k){var w=o[k],S=w.orientation;return!w.mirror&&!w.hide?oe(oe({},j),{},Le({},S,Wn(j,"".concat(S))+w.height)):j},{top:h.top||0,bottom:h.bottom||0}),m=oe(oe({},p),v),y=m.bottom;x&&(m.bottom+=x.props.height||Xl.defaultProps.height),g&&r&&(m=cee(m,a,n,r));var b=u-m.left-m.right,_=d-m.top-m.bottom;return oe(oe({brushBottom:y},m),{},{width:Math.max(b,0),height:Math.max(_,0)})},fce=function(t,r){if(r==="xAxis")return t[r].width;if(r==="yAxis")return t[r].height},FP=function(t){var r=t.chartName,n=t.GraphicalChild,a=t.defaultTooltipEventType,i=a===void 0?"axis":a,o=t.validateTooltipEventTypes,l=o===void 0?["axis"]:o,c=t.axisComponents,u=t.legendContent,d=t.formatAxisMap,f=t.defaultProps,h=function(m,y){var b=y.graphicalItems,_=y.stackGroups,j=y.offset,k=y.updateId,w=y.dataStartIndex,S=y.dataEndIndex,C=m.barSize,T=m.layout,R=m.barGap,D=m.barCategoryGap,B=m.maxBarSize,L=yN(T),z=L.numericAxisName,O=L.cateAxisName,A=uce(b),E=[];return b.forEach(function(P,F){var I=wm(m.data,{graphicalItems:[P],dataStartIndex:w,dataEndIndex:S}),X=P.type.defaultProps!==void 0?oe(oe({},P.type.defaultProps),P.props):P.props,q=X.dataKey,ie=X.maxBarSize,ue=X["".concat(z,"Id")],je=X["".concat(O,"Id")],he={},Fe=c.reduce(function(Ae,De){var Re=y["".concat(De.axisType,"Map")],ot=X["".concat(De.axisType,"Id")];Re&&Re[ot]||De.axisType==="zAxis"||bo();var mt=Re[ot];return oe(oe({},Ae),{},Le(Le({},De.axisType,mt),"".concat(De.axisType,"Ticks"),us(mt)))},he),me=Fe[O],$e=Fe["".concat(O,"Ticks")],Me=_&&_[ue]&&_[ue].hasStack&&jee(P,_[ue].stackGroups),le=fs(P.type).indexOf("Bar")>=0,de=Mh(me,$e),G=[],ye=A&&oee({barSize:C,stackGroups:_,totalSize:fce(Fe,O)});if(le){var Oe,it,ge=qe(ie)?B:ie,ce=(Oe=(it=Mh(me,$e,!0))!==null&&it!==void 0?it:ge)!==null&&Oe!==void 0?Oe:0;G=lee({barGap:R,barCategoryGap:D,bandSize:ce!==de?ce:de,sizeList:ye[je],maxBarSize:ge}),ce!==de&&(G=G.map(function(Ae){return oe(oe({},Ae),{},{position:oe(oe({},Ae.position),{},{offset:Ae.position.offset-ce/2})})}))}var _e=P&&P.type&&P.type.getComposedData;_e&&E.push({props:oe(oe({},_e(oe(oe({},Fe),{},{displayedData:I,props:m,dataKey:q,item:P,bandSize:de,barPosition:G,offset:j,stackedData:Me,layout:T,dataStartIndex:w,dataEndIndex:S}))),{},Le(Le(Le({key:P.key||"item-".concat(F)},z,Fe[z]),O,Fe[O]),"animationId",k)),childIndex:i7(P,m.children),item:P})}),E},x=function(m,y){var b=m.props,_=m.dataStartIndex,j=m.dataEndIndex,k=m.updateId;if(!Xj({props:b}))return null;var w=b.children,S=b.layout,C=b.stackOffset,T=b.data,R=b.reverseStackOrder,D=yN(S),B=D.numericAxisName,L=D.cateAxisName,z=Vn(w,n),O=bee(T,z,"".concat(B,"Id"),"".concat(L,"Id"),C,R),A=c.reduce(function(X,q){var ie="".concat(q.axisType,"Map");return oe(oe({},X),{},Le({},ie,lce(b,oe(oe({},q),{},{graphicalItems:z,stackGroups:q.axisType===B&&O,dataStartIndex:_,dataEndIndex:j}))))},{}),E=dce(oe(oe({},A),{},{props:b,graphicalItems:z}),y?.legendBBox);Object.keys(A).forEach(function(X){A[X]=d(b,A[X],E,X.replace("Map",""),r)});var P=A["".concat(L,"Map")],F=cce(P),I=h(b,oe(oe({},A),{},{dataStartIndex:_,dataEndIndex:j,updateId:k,graphicalItems:z,stackGroups:O,offset:E}));return oe(oe({formattedGraphicalItems:I,graphicalItems:z,offset:E,stackGroups:O},F),A)},g=function(p){function m(y){var b,_,j;return Hle(this,m),j=Gle(this,m,[y]),Le(j,"eventEmitterSymbol",Symbol("rechartsEventEmitter")),Le(j,"accessibilityManager",new Ple),Le(j,"handleLegendBBoxUpdate",function(k){if(k){var w=j.state,S=w.dataStartIndex,C=w.dataEndIndex,T=w.updateId;j.setState(oe({legendBBox:k},x({props:j.props,dataStartIndex:S,dataEndIndex:C,updateId:T},oe(oe({},j.state),{},{legendBBox:k}))))}}),Le(j,"handleReceiveSyncEvent",function(k,w,S){if(j.props.syncId===k){if(S===j.eventEmitterSymbol&&typeof j.props.syncMethod!="function")return;j.applySyncEvent(w)}}),Le(j,"handleBrushChange",function(k){var w=k.startIndex,S=k.endIndex;if(w!==j.state.dataStartIndex||S!==j.state.dataEndIndex){var C=j.state.updateId;j.setState(function(){return oe({dataStartIndex:w,dataEndIndex:S},x({props:j.props,dataStartIndex:w,dataEndIndex:S,updateId:C},j.state))}),j.triggerSyncEvent({dataStartIndex:w,dataEndIndex:S})}}),Le(j,"handleMouseEnter",function(k){var w=j.getMouseInfo(k);if(w){var S=oe(oe({},w),{},{isTooltipActive:!0});j.setState(S),j.triggerSyncEvent(S);var C=j.props.onMouseEnter;We(C)&&C(S,k)}}),Le(j,"triggeredAfterMouseMove",function(k){var w=j.getMouseInfo(k),S=w?oe(oe({},w),{},{isTooltipActive:!0}):{isTooltipActive:!1};j.setState(S),j.triggerSyncEvent(S);var C=j.props.onMouseMove;We(C)&&C(S,k)}),Le(j,"handleItemMouseEnter",function(k){j.setState(function(){return{isTooltipActive:!0,activeItem:k,activePayload:k.tooltipPayload,activeCoordinate:k.tooltipPosition||{x:k.cx,y:k.cy}}})}),Le(j,"handleItemMouseLeave",function(){j.setState(function(){return{isTooltipActive:!1}})}),Le(j,"handleMouseMove",function(k){k.persist(),j.throttleTriggeredAfterMouseMove(k)}),Le(j,"handleMouseLeave",function(k){j.throttleTriggeredAfterMouseMove.cancel();var w={isTooltipActive:!1};j.setState(w),j.triggerSyncEvent(w);var S=j.props.onMouseLeave;We(S)&&S(w,k)}),Le(j,"handleOuterEvent",function(k){var w=s7(k),S=Wn(j.props,"".concat(w));if(w&&We(S)){var C,T;/.*touch.*/i.test(w)?T=j.getMouseInfo(k.changedTouches[0]):T=j.getMouseInfo(k),S((C=T)!==null&&C!==void 0?C:{},k)}}),Le(j,"handleClick",function(k){var w=j.getMouseInfo(k);if(w){var S=oe(oe({},w),{},{isTooltipActive:!0});j.setState(S),j.triggerSyncEvent(S);var C=j.props.onClick;We(C)&&C(S,k)}}),Le(j,"handleMouseDown",function(k){var w=j.props.onMouseDown;if(We(w)){var S=j.getMouseInfo(k);w(S,k)}}),Le(j,"handleMouseUp",function(k){var w=j.props.onMouseUp;if(We(w)){var S=j.getMouseInfo(k);w(S,k)}}),Le(j,"handleTouchMove",function(k){k.changedTouches!=null&&k.changedTouches.length>0&&j.throttleTriggeredAfterMouseMove(k.changedTouches[0])}),Le(j,"handleTouchStart",function(k){k.changedTouches!=null&&k.changedTouches.length>0&&j.handleMouseDown(k.changedTouches[0])}),Le(j,"handleTouchEnd",function(k){k.changedTouches!=null&&k.changedTouches.length>0&&j.handleMouseUp(k.changedTouches[0])}),Le(j,"handleDoubleClick",function(k){var w=j.props.onDoubleClick;if(We(w)){var S=j.getMouseInfo(k);w(S,k)}}),Le(j,"handleContextMenu",function(k){var w=j.props.onContextMenu;if(We(w)){var S=j.getMouseInfo(k);w(S,k)}}),Le(j,"triggerSyncEvent",function(k){j.props.syncId!==void 0&&Xx.emit(Ux,j.props.syncId,k,j.eventEmitterSymbol)}),Le(j,"applySyncEvent",function(k){var w=j.props,S=w.layout,C=w.syncMethod,T=j.state.updateId,R=k.dataStartIndex,D=k.dataEndIndex;if(k.dataStartIndex!==void 0||k.dataEndIndex!==void 0)j.setState(oe({dataStartIndex:R,dataEndIndex:D},x({props:j.props,dataStartIndex:R,dataEndIndex:D,updateId:T},j.state)));else if(k.activeTooltipIndex!==void 0){var B=k.chartX,L=k.chartY,z=k.activeTooltipIndex,O=j.state,A=O.offset,E=O.tooltipTicks;if(!A)return;if(typeof C=="function")z=C(E,k);else if(C==="value"){z=-1;for(var P=0;P<E.length;P++)if(E[P].value===k.activeLabel){z=P;break}}var F=oe(oe({},A),{},{x:A.left,y:A.top}),I=Math.min(B,F.x+F.width),X=Math.min(L,F.y+F.height),q=E[z]&&E[z].value,ie=Rg(j.state,j.props.data,z),ue=E[z]?{x:S==="horizontal"?E[z].coordinate:I,y:S==="horizontal"?X:E[z].coordinate}:$P;j.setState(oe(oe({},k),{},{activeLabel:q,activeCoordinate:ue,activePayload:ie,activeTooltipIndex:z}))}else j.setState(k)}),Le(j,"renderCursor",function(k){var w,S=j.state,C=S.isTooltipActive,T=S.activeCoordinate,R=S.activePayload,D=S.offset,B=S.activeTooltipIndex,L=S.tooltipAxisBandSize,z=j.getTooltipEventType(),O=(w=k.props.active)!==null&&w!==void 0?w:C,A=j.props.layout,E=k.key||"_recharts-cursor";return V.createElement(Ile,{key:E,activeCoordinate:T,activePayload:R,activeTooltipIndex:B,chartName:r,element:k,isActive:O,layout:A,offset:D,tooltipAxisBandSize:L,tooltipEventType:z})}),Le(j,"renderPolarAxis",function(k,w,S){var C=Wn(k,"type.axisType"),T=Wn(j.state,"".concat(C,"Map")),R=k.type.defaultProps,D=R!==void 0?oe(oe({},R),k.props):k.props,B=T&&T[D["".concat(C,"Id")]];return N.cloneElement(k,oe(oe({},B),{},{className:nt(C,B.className),key:k.key||"".concat(w,"-").concat(S),ticks:us(B,!0)}))}),Le(j,"renderPolarGrid",function(k){var w=k.props,S=w.radialLines,C=w.polarAngles,T=w.polarRadius,R=j.state,D=R.radiusAxisMap,B=R.angleAxisMap,L=Ks(D),z=Ks(B),O=z.cx,A=z.cy,E=z.innerRadius,P=z.outerRadius;return N.cloneElement(k,{polarAngles:Array.isArray(C)?C:us(z,!0).map(function(F){return F.coordinate}),polarRadius:Array.isArray(T)?T:us(L,!0).map(function(F){return F.coordinate}),cx:O,cy:A,innerRadius:E,outerRadius:P,key:k.key||"polar-grid",radialLines:S})}),Le(j,"renderLegend",function(){var k=j.state.formattedGraphicalItems,w=j.props,S=w.children,C=w.width,T=w.height,R=j.props.margin||{},D=C-(R.left||0)-(R.right||0),B=bO({children:S,formattedGraphicalItems:k,legendWidth:D,legendContent:u});if(!B)return null;var L=B.item,z=pN(B,Lle);return N.cloneElement(L,oe(oe({},z),{},{chartWidth:C,chartHeight:T,margin:R,onBBoxUpdate:j.handleLegendBBoxUpdate}))}),Le(j,"renderTooltip",function(){var k,w=j.props,S=w.children,C=w.accessibilityLayer,T=_n(S,dr);if(!T)return null;var R=j.state,D=R.isTooltipActive,B=R.activeCoordinate,L=R.activePayload,z=R.activeLabel,O=R.offset,A=(k=T.props.active)!==null&&k!==void 0?k:D;return N.cloneElement(T,{viewBox:oe(oe({},O),{},{x:O.left,y:O.top}),active:A,label:z,payload:A?L:[],coordinate:B,accessibilityLayer:C})}),Le(j,"renderBrush",function(k){var w=j.props,S=w.margin,C=w.data,T=j.state,R=T.offset,D=T.dataStartIndex,B=T.dataEndIndex,L=T.updateId;return N.cloneElement(k,{key:k.key||"_recharts-brush",onChange:Xf(j.handleBrushChange,k.props.onChange),data:C,x:we(k.props.x)?k.props.x:R.left,y:we(k.props.y)?k.props.y:R.top+R.height+R.brushBottom-(S.bottom||0),width:we(k.props.width)?k.props.width:R.width,startIndex:D,endIndex:B,updateId:"brush-".concat(L)})}),Le(j,"renderReferenceElement",function(k,w,S){if(!k)return null;var C=j,T=C.clipPathId,R=j.state,D=R.xAxisMap,B=R.yAxisMap,L=R.offset,z=k.type.defaultProps||{},O=k.props,A=O.xAxisId,E=A===void 0?z.xAxisId:A,P=O.yAxisId,F=P===void 0?z.yAxisId:P;return N.cloneElement(k,{key:k.key||"".concat(w,"-").concat(S),xAxis:D[E],yAxis:B[F],viewBox:{x:L.left,y:L.top,width:L.width,height:L.height},clipPathId:T})}),Le(j,"renderActivePoints",function(k){var w=k.item,S=k.activePoint,C=k.basePoint,T=k.childIndex,R=k.isRange,D=[],B=w.props.key,L=w.item.type.defaultProps!==void 0?oe(oe({},w.item.type.defaultProps),w.item.props):w.item.props,z=L.activeDot,O=L.dataKey,A=oe(oe({index:T,dataKey:O,cx:S.x,cy:S.y,r:4,fill:a_(w.item),strokeWidth:2,stroke:"#fff",payload:S.payload,value:S.value},Ve(z,!1)),rh(z));return D.push(m.renderActiveDot(z,A,"".concat(B,"-activePoint-").concat(T))),C?D.push(m.renderActiveDot(z,oe(oe({},A),{},{cx:C.x,cy:C.y}),"".concat(B,"-basePoint-").concat(T))):R&&D.push(null),D}),Le(j,"renderGraphicChild",function(k,w,S){var C=j.filterFormatItem(k,w,S);if(!C)return null;var T=j.getTooltipEventType(),R=j.state,D=R.isTooltipActive,B=R.tooltipAxis,L=R.activeTooltipIndex,z=R.activeLabel,O=j.props.children,A=_n(O,dr),E=C.props,P=E.points,F=E.isRange,I=E.baseLine,X=C.item.type.defaultProps!==void 0?oe(oe({},C.item.type.defaultProps),C.item.props):C.item.props,q=X.activeDot,ie=X.hide,ue=X.activeBar,je=X.activeShape,he=!!(!ie&&D&&A&&(q||ue||je)),Fe={};T!=="axis"&&A&&A.props.trigger==="click"?Fe={onClick:Xf(j.handleItemMouseEnter,k.props.onClick)}:T!=="axis"&&(Fe={onMouseLeave:Xf(j.handleItemMouseLeave,k.props.onMouseLeave),onMouseEnter:Xf(j.handleItemMouseEnter,k.props.onMouseEnter)});var me=N.cloneElement(k,oe(oe({},C.props),Fe));function $e(De){return typeof B.dataKey=="function"?B.dataKey(De.payload):null}if(he)if(L>=0){var Me,le;if(B.dataKey&&!B.allowDuplicatedCategory){var de=typeof B.dataKey=="function"?$e:"payload.".concat(B.dataKey.toString());Me=th(P,de,z),le=F&&I&&th(I,de,z)}else Me=P?.[L],le=F&&I&&I[L];if(je||ue){var G=k.props.activeIndex!==void 0?k.props.activeIndex:L;return[N.cloneElement(k,oe(oe(oe({},C.props),Fe),{},{activeIndex:G})),null,null]}if(!qe(Me))return[me].concat(ec(j.renderActivePoints({item:C,activePoint:Me,basePoint:le,childIndex:L,isRange:F})))}else{var ye,Oe=(ye=j.getItemByXY(j.state.activeCoordinate))!==null&&ye!==void 0?ye:{graphicalItem:me},it=Oe.graphicalItem,ge=it.item,ce=ge===void 0?k:ge,_e=it.childIndex,Ae=oe(oe(oe({},C.props),Fe),{},{activeIndex:_e});return[N.cloneElement(ce,Ae),null,null]}return F?[me,null,null]:[me,null]}),Le(j,"renderCustomized",function(k,w,S){return N.cloneElement(k,oe(oe({key:"recharts-customized-".concat(S)},j.props),j.state))}),Le(j,"renderMap",{CartesianGrid:{handler:Gf,once:!0},ReferenceArea:{handler:j.renderReferenceElement},ReferenceLine:{handler:Gf},ReferenceDot:{handler:j.renderReferenceElement},XAxis:{handler:Gf},YAxis:{handler:Gf},Brush:{handler:j.renderBrush,once:!0},Bar:{handler:j.renderGraphicChild},Line:{handler:j.renderGraphicChild},Area:{handler:j.renderGraphicChild},Radar:{handler:j.renderGraphicChild},RadialBar:{handler:j.renderGraphicChild},Scatter:{handler:j.renderGraphicChild},Pie:{handler:j.renderGraphicChild},Funnel:{handler:j.renderGraphicChild},Tooltip:{handler:j.renderCursor,once:!0},PolarGrid:{handler:j.renderPolarGrid,once:!0},PolarAngleAxis:{handler:j.renderPolarAxis},PolarRadiusAxis:{handler:j.renderPolarAxis},Customized:{handler:j.renderCustomized}}),j.clipPathId="".concat((b=y.id)!==null&&b!==void 0?b:xc("recharts"),"-clip"),j.throttleTriggeredAfterMouseMove=bA(j.triggeredAfterMouseMove,(_=y.throttleDelay)!==null&&_!==void 0?_:1e3/60),j.state={},j}return Yle(m,p),Vle(m,[{key:"componentDidMount",value:function(){var b,_;this.addListener(),this.accessibilityManager.setDetails({container:this.container,offset:{left:(b=this.props.margin.left)!==null&&b!==void 0?b:0,top:(_=this.props.margin.top)!==null&&_!==void 0?_:0},coordinateList:this.state.tooltipTicks,mouseHandlerCallback:this.triggeredAfterMouseMove,layout:this.props.layout}),this.displayDefaultTooltip()}},{key:"displayDefaultTooltip",value:function(){var b=this.props,_=b.children,j=b.data,k=b.height,w=b.layout,S=_n(_,dr);if(S){var C=S.props.defaultIndex;if(!(typeof C!="number"||C<0||C>this.state.tooltipTicks.length-1)){var T=this.state.tooltipTicks[C]&&this.state.tooltipTicks[C].value,R=Rg(this.state,j,C,T),D=this.state.tooltipTicks[C].coordinate,B=(this.state.offset.top+k)/2,L=w==="horizontal",z=L?{x:D,y:B}:{y:D,x:B},O=this.state.formattedGraphicalItems.find(function(E){var P=E.item;return P.type.name==="Scatter"});O&&(z=oe(oe({},z),O.props.points[C].tooltipPosition),R=O.props.points[C].tooltipPayload);var A={activeTooltipIndex:C,isTooltipActive:!0,activeLabel:T,activePayload:R,activeCoordinate:z};this.setState(A),this.renderCursor(S),this.accessibilityManager.setIndex(C)}}}},{key:"getSnapshotBeforeUpdate",value:function(b,_){if(!this.props.accessibilityLayer)return null;if(this.state.tooltipTicks!==_.tooltipTicks&&this.accessibilityManager.setDetails({coordinateList:this.state.tooltipTicks}),this.props.layout!==b.layout&&this.accessibilityManager.setDetails({layout:this.props.layout}),this.props.margin!==b.margin){var j,k;this.accessibilityManager.setDetails({offset:{left:(j=this.props.margin.left)!==null&&j!==void 0?j:0,top:(k=this.props.margin.top)!==null&&k!==void 0?k:0}})}return null}},{key:"componentDidUpdate",value:function(b){hy([_n(b.children,dr)],[_n(this.props.children,dr)])||this.displayDefaultTooltip()}},{key:"componentWillUnmount",value:function(){this.removeListener(),this.throttleTriggeredAfterMouseMove.cancel()}},{key:"getTooltipEventType",value:function(){var b=_n(this.props.children,dr);if(b&&typeof b.props.shared=="boolean"){var _=b.props.shared?"axis":"item";return l.indexOf(_)>=0?_:i}return i}},{key:"getMouseInfo",value:function(b){if(!this.container)return null;var _=this.container,j=_.getBoundingClientRect(),k=TQ(j),w={chartX:Math.round(b.pageX-k.left),chartY:Math.round(b.pageY-k.top)},S=j.width/_.offsetWidth||1,C=this.inRange(w.chartX,w.chartY,S);if(!C)return null;var T=this.state,R=T.xAxisMap,D=T.yAxisMap,B=this.getTooltipEventType(),L=xN(this.state,this.props.data,this.props.layout,C);if(B!=="axis"&&R&&D){var z=Ks(R).scale,O=Ks(D).scale,A=z&&z.invert?z.invert(w.chartX):null,E=O&&O.invert?O.invert(w.chartY):null;return oe(oe({},w),{},{xValue:A,yValue:E},L)}return L?oe(oe({},w),L):null}},{key:"inRange",value:function(b,_){var j=arguments.length>2&&arguments[2]!==void 0?arguments[2]:1,k=this.props.layout,w=b/j,S=_/j;if(k==="horizontal"||k==="vertical"){var C=this.state.offset,T=w>=C.left&&w<=C.left+C.width&&S>=C.top&&S<=C.top+C.height;return T?{x:w,y:S}:null}var R=this.state,D=R.angleAxisMap,B=R.radiusAxisMap;if(D&&B){var L=Ks(D);return Zk({x:w,y:S},L)}return null}},{key:"parseEventsOfWrapper",value:function(){var b=this.props.children,_=this.getTooltipEventType(),j=_n(b,dr),k={};j&&_==="axis"&&(j.props.trigger==="click"?k={onClick:this.handleClick}:k={onMouseEnter:this.handleMouseEnter,onDoubleClick:this.handleDoubleClick,onMouseMove:this.handleMouseMove,onMouseLeave:this.handleMouseLeave,onTouchMove:this.handleTouchMove,onTouchStart:this.handleTouchStart,onTouchEnd:this.handleTouchEnd,onContextMenu:this.handleContextMenu});var w=rh(this.props,this.handleOuterEvent);return oe(oe({},w),k)}},{key:"addListener",value:function(){Xx.on(Ux,this.handleReceiveSyncEvent)}},{key:"removeListener",value:function(){Xx.removeListener(Ux,this.handleReceiveSyncEvent)}},{key:"filterFormatItem",value:function(b,_,j){for(var k=this.state.formattedGraphicalItems,w=0,S=k.length;w<S;w++){var C=k[w];if(C.item===b||C.props.key===b.key||_===fs(C.item.type)&&j===C.childIndex)return C}return null}},{key:"renderClipPath",value:function(){var b=this.clipPathId,_=this.state.offset,j=_.left,k=_.top,w=_.height,S=_.width;return V.createElement("defs",null,V.createElement("clipPath",{id:b},V.createElement("rect",{x:j,y:k,height:w,width:S})))}},{key:"getXScales",value:function(){var b=this.state.xAxisMap;return b?Object.entries(b).reduce(function(_,j){var k=hN(j,2),w=k[0],S=k[1];return oe(oe({},_),{},Le({},w,S.scale))},{}):null}},{key:"getYScales",value:function(){var b=this.state.yAxisMap;return b?Object.entries(b).reduce(function(_,j){var k=hN(j,2),w=k[0],S=k[1];return oe(oe({},_),{},Le({},w,S.scale))},{}):null}},{key:"getXScaleByAxisId",value:function(b){var _;return(_=this.state.xAxisMap)===null||_===void 0||(_=_[b])===null||_===void 0?void 0:_.scale}},{key:"getYScaleByAxisId",value:function(b){var _;return(_=this.state.yAxisMap)===null||_===void 0||(_=_[b])===null||_===void 0?void 0:_.scale}},{key:"getItemByXY",value:function(b){var _=this.state,j=_.formattedGraphicalItems,k=_.activeItem;if(j&&j.length)for(var w=0,S=j.length;w<S;w++){var C=j[w],T=C.props,R=C.item,D=R.type.defaultProps!==void 0?oe(oe({},R.type.defaultProps),R.props):R.props,B=fs(R.type);if(B==="Bar"){var L=(T.data||[]).find(function(E){return yne(b,E)});if(L)return{graphicalItem:C,payload:L}}else if(B==="RadialBar"){var z=(T.data||[]).find(function(E){return Zk(b,E)});if(z)return{graphicalItem:C,payload:z}}else if(mm(C,k)||xm(C,k)||vd(C,k)){var O=_ae({graphicalItem:C,activeTooltipItem:k,itemData:D.data}),A=D.activeIndex===void 0?O:D.activeIndex;return{graphicalItem:oe(oe({},C),{},{childIndex:A}),payload:vd(C,k)?D.data[O]:C.props.data[O]}}}return null}},{key:"render",value:function(){var b=this;if(!Xj(this))return null;var _=this.props,j=_.children,k=_.className,w=_.width,S=_.height,C=_.style,T=_.compact,R=_.title,D=_.desc,B=pN(_,zle),L=Ve(B,!1);if(T)return V.createElement(VS,{state:this.state,width:this.props.width,height:this.props.height,clipPathId:this.clipPathId},V.createElement(my,ol({},L,{width:w,height:S,title:R,desc:D}),this.renderClipPath(),Hj(j,this.renderMap)));if(this.props.accessibilityLayer){var z,O;L.tabIndex=(z=this.props.tabIndex)!==null&&z!==void 0?z:0,L.role=(O=this.props.role)!==null&&O!==void 0?O:"application",L.onKeyDown=function(E){b.accessibilityManager.keyboardEvent(E)},L.onFocus=function(){b.accessibilityManager.focus()}}var A=this.parseEventsOfWrapper();return V.createElement(VS,{state:this.state,width:this.props.width,height:this.props.height,clipPathId:this.clipPathId},V.createElement("div",ol({className:nt("recharts-wrapper",k),style:oe({position:"relative",cursor:"default",width:w,height:S},C)},A,{ref:function(P){b.container=P}}),V.createElement(my,ol({},L,{width:w,height:S,title:R,desc:D,style:nce}),this.renderClipPath(),Hj(j,this.renderMap)),this.renderLegend(),this.renderTooltip()))}}])}(N.Component);Le(g,"displayName",r),Le(g,"defaultProps",oe({layout:"horizontal",stackOffset:"none",barCategoryGap:"10%",barGap:4,margin:{top:5,right:5,bottom:5,left:5},reverseStackOrder:!1,syncMethod:"index"},f)),Le(g,"getDerivedStateFromProps",function(p,m){var y=p.dataKey,b=p.data,_=p.children,j=p.width,k=p.height,w=p.layout,S=p.stackOffset,C=p.margin,T=m.dataStartIndex,R=m.dataEndIndex;if(m.updateId===void 0){var D=vN(p);return oe(oe(oe({},D),{},{updateId:0},x(oe(oe({props:p},D),{},{updateId:0}),m)),{},{prevDataKey:y,prevData:b,prevWidth:j,prevHeight:k,prevLayout:w,prevStackOffset:S,prevMargin:C,prevChildren:_})}if(y!==m.prevDataKey||b!==m.prevData||j!==m.prevWidth||k!==m.prevHeight||w!==m.prevLayout||S!==m.prevStackOffset||!ml(C,m.prevMargin)){var B=vN(p),L={chartX:m.chartX,chartY:m.chartY,isTooltipActive:m.isTooltipActive},z=oe(oe({},xN(m,b,w)),{},{updateId:m.updateId+1}),O=oe(oe(oe({},B),L),z);return oe(oe(oe({},O),x(oe({props:p},O),m)),{},{prevDataKey:y,prevData:b,prevWidth:j,prevHeight:k,prevLayout:w,prevStackOffset:S,prevMargin:C,prevChildren:_})}if(!hy(_,m.prevChildren)){var A,E,P,F,I=_n(_,Xl),X=I&&(A=(E=I.props)===null||E===void 0?void 0:E.startIndex)!==null&&A!==void 0?A:T,q=I&&(P=(F=I.props)===null||F===void 0?void 0:F.endIndex)!==null&&P!==void 0?P:R,ie=X!==T||q!==R,ue=!qe(b),je=ue&&!ie?m.updateId:m.updateId+1;return oe(oe({updateId:je},x(oe(oe({props:p},m),{},{updateId:je,dataStartIndex:X,dataEndIndex:q}),m)),{},{prevChildren:_,dataStartIndex:X,dataEndIndex:q})}return null}),Le(g,"renderActiveDot",function(p,m,y){var b;return N.isValidElement(p)?b=N.cloneElement(p,m):We(p)?b=p(m):b=V.createElement(pm,m),V.createElement(Ct,{className:"recharts-active-dot",key:y},b)});var v=N.forwardRef(function(m,y){return V.createElement(g,ol({},m,{ref:y}))});return v.displayName=g.displayName,v},ap=FP({chartName:"LineChart",GraphicalChild:vi,axisComponents:[{axisType:"xAxis",AxisComp:Kn},{axisType:"yAxis",AxisComp:jn}],formatAxisMap:qO}),tu=FP({chartName:"AreaChart",GraphicalChild:rn,axisComponents:[{axisType:"xAxis",AxisComp:Kn},{axisType:"yAxis",AxisComp:jn}],formatAxisMap:qO});function Qf(e){if(!e)return"0 B";const t=["B","KB","MB","GB"];let r=e,n=0;for(;r>=1024&&n<t.length-1;)r/=1024,n++;return`${r.toFixed(1)} ${t[n]}`}function Uo({icon:e,label:t,value:r,color:n="sky"}){return s.jsxs("div",{className:"bg-navy-700 border border-navy-400 rounded-xl p-4",children:[s.jsxs("div",{className:"flex items-center gap-2 mb-2",children:[s.jsx(e,{size:14,className:`text-${n}-400`}),s.jsx("span",{className:"text-slate-400 text-xs font-medium",children:t})]}),s.jsx("div",{className:"text-xl font-bold text-slate-100",children:r})]})}const hce=({active:e,payload:t,label:r})=>e&&t?.length?s.jsxs("div",{className:"bg-navy-800 border border-navy-400 rounded-lg px-3 py-2 text-xs",children:[s.jsx("div",{className:"text-slate-400 mb-1",children:r}),s.jsxs("div",{className:"text-sky-400 font-medium",children:[t[0]?.value?.toFixed(2),"%"]})]}):null;function pce(){const{uuid:e}=wi(),[t,r]=N.useState(""),[n,a]=N.useState(null),[i,o]=N.useState([]),[l,c]=N.useState(""),[u,d]=N.useState(0),f=N.useRef(null);N.useEffect(()=>{Q.get(`/vms/${e}`).then(x=>r(x.data.name)).catch(()=>{})},[e]);const h=()=>{Q.get(`/vms/${e}/stats`).then(x=>{a(x.data),c(""),d(g=>{const v=g+1;return o(p=>[...p,{t:v,cpu:x.data.cpu_usage}].slice(-30)),v})}).catch(x=>{const g=x.response?.data?.error||"Error fetching stats";c(g)})};return N.useEffect(()=>(h(),f.current=setInterval(h,2e3),()=>clearInterval(f.current)),[e]),s.jsxs("div",{className:"space-y-5",children:[s.jsxs("div",{className:"flex items-center gap-4",children:[s.jsx(Ht,{to:`/vms/${e}`,className:"text-slate-400 hover:text-sky-400 transition-colors",children:s.jsx(ga,{size:18})}),s.jsxs("div",{children:[s.jsxs("h2",{className:"text-xl font-bold text-slate-100 flex items-center gap-2",children:[s.jsx(Yt,{size:18,className:"text-sky-400"}),"Monitor: ",t||e]}),s.jsx("p",{className:"text-slate-400 text-sm mt-0.5",children:"Live stats — polling every 2 seconds"})]})]}),l&&s.jsx("div",{className:"bg-yellow-900/50 border border-yellow-700 text-yellow-300 text-sm rounded-xl px-4 py-3",children:l}),s.jsxs("div",{className:"grid grid-cols-2 md:grid-cols-3 gap-4",children:[s.jsx(Uo,{icon:Jt,label:"CPU Usage",value:n?`${n.cpu_usage}%`:"—",color:"sky"}),s.jsx(Uo,{icon:xi,label:"Memory Used",value:n?`${(n.mem_used/1024).toFixed(1)} GB`:"—",color:"purple"}),s.jsx(Uo,{icon:jr,label:"Disk Read",value:n?Qf(n.disk_read):"—",color:"green"}),s.jsx(Uo,{icon:jr,label:"Disk Write",value:n?Qf(n.disk_write):"—",color:"yellow"}),s.jsx(Uo,{icon:Br,label:"Net RX",value:n?Qf(n.net_rx):"—",color:"blue"}),s.jsx(Uo,{icon:Br,label:"Net TX",value:n?Qf(n.net_tx):"—",color:"orange"})]}),s.jsxs("div",{className:"bg-navy-700 border border-navy-400 rounded-xl p-5",children:[s.jsxs("h3",{className:"text-sky-400 font-semibold mb-4 flex items-center gap-2",children:[s.jsx(Jt,{size:15})," CPU Usage Over Time"]}),i.length>1?s.jsx(as,{width:"100%",height:200,children:s.jsxs(ap,{data:i,margin:{top:5,right:10,left:-20,bottom:5},children:[s.jsx(ss,{strokeDasharray:"3 3",stroke:"#1a3a5c"}),s.jsx(Kn,{dataKey:"t",tick:!1,axisLine:!1}),s.jsx(jn,{domain:[0,100],tick:{fill:"#64748b",fontSize:11},tickFormatter:x=>`${x}%`}),s.jsx(dr,{content:s.jsx(hce,{})}),s.jsx(vi,{type:"monotone",dataKey:"cpu",stroke:"#0ea5e9",strokeWidth:2,dot:!1,isAnimationActive:!1})]})}):s.jsx("div",{className:"flex items-center justify-center h-48 text-slate-400 text-sm",children:"Collecting data..."})]})]})}function mce(e){if(!e)return"0 B";const t=["B","KB","MB","GB","TB"];let r=0;for(;e>=1024&&r<t.length-1;)e/=1024,r++;return`${e.toFixed(r===0?0:1)} ${t[r]}`}function DP(e){if(!e)return"—";const t=Date.now()-new Date(e).getTime(),r=Math.floor(t/1e3);return r<60?`${r}s ago`:r<3600?`${Math.floor(r/60)}m ago`:r<86400?`${Math.floor(r/3600)}h ago`:`${Math.floor(r/86400)}d ago`}function xce(e){if(!e||typeof e!="object")return"—";const t=[];for(const[r,n]of Object.entries(e))n&&Array.isArray(n)?n.forEach(a=>t.push(`${a.HostPort}→${r}`)):t.push(r);return t.length?t.join(", "):"—"}function vce({status:e}){const t=(e||"").toLowerCase(),r=t==="running"?"text-green-400 bg-green-400/10 ring-green-400/30":t==="exited"||t==="stopped"?"text-red-400 bg-red-400/10 ring-red-400/30":t==="paused"?"text-yellow-400 bg-yellow-400/10 ring-yellow-400/30":"text-slate-400 bg-slate-400/10 ring-slate-400/30";return s.jsxs("span",{className:`inline-flex items-center gap-1 px-2 py-0.5 rounded-full text-xs font-medium ring-1 ${r}`,children:[s.jsx("span",{className:"w-1.5 h-1.5 rounded-full bg-current"}),e]})}function kn({children:e,onClick:t,variant:r="ghost",size:n="sm",disabled:a,loading:i,className:o=""}){const l="inline-flex items-center gap-1.5 rounded font-medium transition-all disabled:opacity-40 disabled:cursor-not-allowed",c={sm:"px-2.5 py-1.5 text-xs",md:"px-4 py-2 text-sm"},u={ghost:"text-slate-400 hover:text-sky-300 hover:bg-navy-600",primary:"bg-sky-600 hover:bg-sky-500 text-white",danger:"text-red-400 hover:text-red-300 hover:bg-red-400/10",success:"text-green-400 hover:text-green-300 hover:bg-green-400/10"};return s.jsx("button",{onClick:t,disabled:a||i,className:`${l} ${c[n]} ${u[r]} ${o}`,children:i?s.jsx(Ne,{size:12,className:"animate-spin"}):e})}function yce({msg:e,type:t,onClose:r}){if(N.useEffect(()=>{if(e){const a=setTimeout(r,4e3);return()=>clearTimeout(a)}},[e]),!e)return null;const n=t==="error"?"bg-red-900/80 border-red-700 text-red-200":"bg-green-900/80 border-green-700 text-green-200";return s.jsxs("div",{className:`fixed bottom-5 right-5 flex items-center gap-2 px-4 py-3 rounded-lg border text-sm z-50 shadow-xl ${n}`,children:[t==="error"?s.jsx(An,{size:16}):s.jsx(Ye,{size:16}),e,s.jsx("button",{onClick:r,className:"ml-2 opacity-70 hover:opacity-100",children:s.jsx(Lr,{size:14})})]})}function jm({title:e,icon:t,count:r,onRefresh:n,refreshing:a,extra:i}){return s.jsxs("div",{className:"flex items-center justify-between mb-4",children:[s.jsxs("div",{className:"flex items-center gap-2",children:[s.jsx(t,{size:18,className:"text-sky-400"}),s.jsx("h2",{className:"text-slate-200 font-semibold text-base",children:e}),r!==void 0&&s.jsx("span",{className:"text-xs bg-navy-600 text-slate-400 px-2 py-0.5 rounded-full",children:r})]}),s.jsxs("div",{className:"flex items-center gap-2",children:[i,n&&s.jsxs(kn,{onClick:n,disabled:a,children:[s.jsx(Xe,{size:13,className:a?"animate-spin":""}),"Refresh"]})]})]})}function km({message:e}){return s.jsxs("div",{className:"flex flex-col items-center justify-center py-14 text-slate-500",children:[s.jsx(n1,{size:36,className:"mb-3 opacity-30"}),s.jsx("p",{className:"text-sm",children:e})]})}function gce({info:e}){if(!e)return null;const t=[{label:"Running",value:e.containers_running,color:"text-green-400",bg:"bg-green-400/10"},{label:"Stopped",value:e.containers_stopped,color:"text-red-400",bg:"bg-red-400/10"},{label:"Images",value:e.images,color:"text-sky-400",bg:"bg-sky-400/10"},{label:"Engine",value:`v${e.server_version}`,color:"text-purple-400",bg:"bg-purple-400/10"}];return s.jsx("div",{className:"grid grid-cols-2 sm:grid-cols-4 gap-3 mb-6",children:t.map(r=>s.jsxs("div",{className:"bg-navy-800 border border-navy-600 rounded-lg px-4 py-3",children:[s.jsx("p",{className:"text-xs text-slate-500 mb-1",children:r.label}),s.jsx("p",{className:`text-2xl font-bold ${r.color}`,children:r.value})]},r.label))})}function bce({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState(!0),[i,o]=N.useState({}),[l,c]=N.useState({}),[u,d]=N.useState({}),f=N.useCallback(async()=>{a(!0);try{const p=await Q.get("/docker/containers");r(p.data)}catch(p){e(p.response?.data?.error||"Failed to load containers","error")}finally{a(!1)}},[]);N.useEffect(()=>{f()},[f]);const h=async(p,m,y="post")=>{o(b=>({...b,[p]:!0}));try{await Q[y](`/docker/containers/${p}/${m}`),e("Done","ok"),await f()}catch(b){e(b.response?.data?.error||"Action failed","error")}finally{o(b=>({...b,[p]:!1}))}},x=async(p,m)=>{if(confirm(`Remove container "${m}"?`)){o(y=>({...y,[p]:!0}));try{await Q.delete(`/docker/containers/${p}?force=true`),e("Container removed","ok"),r(y=>y.filter(b=>b.id!==p))}catch(y){e(y.response?.data?.error||"Remove failed","error")}finally{o(y=>({...y,[p]:!1}))}}},g=async p=>{if(l[p]){c(m=>({...m,[p]:!1}));return}if(c(m=>({...m,[p]:!0})),!u[p])try{const m=await Q.get(`/docker/containers/${p}/logs?tail=100`);d(y=>({...y,[p]:m.data.logs}))}catch{d(m=>({...m,[p]:"Failed to load logs."}))}},v=(p,m)=>{window.open(`/docker-exec?container_id=${encodeURIComponent(p)}&name=${encodeURIComponent(m)}`,"_blank","width=900,height=600,noopener,noreferrer")};return n?s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"}),"Loading containers…"]}):t.length?s.jsxs("div",{className:"space-y-2",children:[s.jsx(jm,{title:"Containers",icon:r1,count:t.length,onRefresh:f,refreshing:n}),s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Name"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Image"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Status"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Ports"}),s.jsx("th",{className:"text-right px-4 py-3 text-slate-400 font-medium",children:"Actions"})]})}),s.jsx("tbody",{children:t.map(p=>s.jsxs(s.Fragment,{children:[s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 transition-colors",children:[s.jsxs("td",{className:"px-4 py-3",children:[s.jsxs("div",{className:"flex items-center gap-2",children:[s.jsx("button",{onClick:()=>g(p.id),className:"text-slate-500 hover:text-sky-400 transition-colors",children:l[p.id]?s.jsx(pn,{size:14}):s.jsx(ir,{size:14})}),s.jsx("span",{className:"text-slate-200 font-mono",children:p.name})]}),s.jsx("div",{className:"text-xs text-slate-500 font-mono ml-5",children:p.id})]}),s.jsx("td",{className:"px-4 py-3 text-slate-300 font-mono text-xs",children:p.image}),s.jsx("td",{className:"px-4 py-3",children:s.jsx(vce,{status:p.status})}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs font-mono",children:xce(p.ports)}),s.jsx("td",{className:"px-4 py-3",children:s.jsxs("div",{className:"flex items-center justify-end gap-0.5",children:[p.status==="running"?s.jsxs(s.Fragment,{children:[s.jsx(kn,{onClick:()=>h(p.id,"stop"),loading:i[p.id],title:"Stop",children:s.jsx(Ku,{size:13})}),s.jsx(kn,{onClick:()=>h(p.id,"restart"),loading:i[p.id],title:"Restart",children:s.jsx(BF,{size:13})}),s.jsx(kn,{onClick:()=>v(p.id,p.name),title:"Shell",className:"text-sky-400 hover:text-sky-300 hover:bg-sky-400/10",children:s.jsx(Ya,{size:13})})]}):s.jsx(kn,{onClick:()=>h(p.id,"start"),loading:i[p.id],title:"Start",className:"text-green-400 hover:text-green-300 hover:bg-green-400/10",children:s.jsx(xo,{size:13})}),s.jsx(kn,{onClick:()=>x(p.id,p.name),loading:i[p.id],variant:"danger",title:"Remove",children:s.jsx(Et,{size:13})})]})})]},p.id),l[p.id]&&s.jsx("tr",{className:"bg-navy-900/70",children:s.jsxs("td",{colSpan:5,className:"px-4 py-3",children:[s.jsx("div",{className:"text-xs text-slate-400 mb-1 font-semibold",children:"Logs (last 100 lines)"}),s.jsx("pre",{className:"bg-black/40 rounded p-3 text-xs font-mono text-green-300 overflow-x-auto max-h-56 overflow-y-auto whitespace-pre-wrap break-all",children:u[p.id]||"Loading…"})]})},`${p.id}-logs`)]}))})]})})]}):s.jsx(km,{message:"No containers found"})}function _ce({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState(!0),[i,o]=N.useState(!1),[l,c]=N.useState(""),[u,d]=N.useState({}),f=N.useCallback(async()=>{a(!0);try{const v=await Q.get("/docker/images");r(v.data)}catch(v){e(v.response?.data?.error||"Failed to load images","error")}finally{a(!1)}},[]);N.useEffect(()=>{f()},[f]);const h=async()=>{const v=l.trim();if(v){o(!0);try{await Q.post("/docker/images/pull",{image:v}),e(`Pulled ${v}`,"ok"),c(""),await f()}catch(p){e(p.response?.data?.error||"Pull failed","error")}finally{o(!1)}}},x=async(v,p)=>{if(confirm(`Remove image "${p||v}"?`)){d(m=>({...m,[v]:!0}));try{await Q.post("/docker/images/remove",{id:v,force:!1}),e("Image removed","ok"),r(m=>m.filter(y=>y.id!==v))}catch(m){e(m.response?.data?.error||"Remove failed","error")}finally{d(m=>({...m,[v]:!1}))}}},g=s.jsxs("div",{className:"flex gap-2",children:[s.jsx("input",{value:l,onChange:v=>c(v.target.value),onKeyDown:v=>v.key==="Enter"&&h(),placeholder:"ubuntu:22.04",className:"bg-navy-700 border border-navy-500 rounded px-3 py-1.5 text-sm text-slate-200 placeholder-slate-500 focus:outline-none focus:border-sky-500 w-48"}),s.jsxs(kn,{onClick:h,loading:i,variant:"primary",size:"sm",children:[s.jsx(_a,{size:13})," Pull"]})]});return n?s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"}),"Loading images…"]}):s.jsxs("div",{className:"space-y-4",children:[s.jsx(jm,{title:"Images",icon:a1,count:t.length,onRefresh:f,refreshing:n,extra:g}),t.length?s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Tag"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"ID"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Size"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Created"}),s.jsx("th",{className:"text-right px-4 py-3 text-slate-400 font-medium",children:"Actions"})]})}),s.jsx("tbody",{children:t.map(v=>s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 transition-colors",children:[s.jsx("td",{className:"px-4 py-3 text-slate-200 font-mono text-xs",children:v.tags.length?v.tags.map(p=>s.jsx("div",{children:p},p)):s.jsx("span",{className:"text-slate-500",children:"<none>"})}),s.jsx("td",{className:"px-4 py-3 text-slate-400 font-mono text-xs",children:v.short_id}),s.jsx("td",{className:"px-4 py-3 text-slate-300 text-xs",children:mce(v.size)}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:DP(v.created)}),s.jsx("td",{className:"px-4 py-3 text-right",children:s.jsxs(kn,{onClick:()=>x(v.id,v.tags[0]),loading:u[v.id],variant:"danger",children:[s.jsx(Et,{size:13})," Remove"]})})]},v.id))})]})}):s.jsx(km,{message:"No images found"})]})}function wce({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState(!0),[i,o]=N.useState(!1),[l,c]=N.useState({name:"",driver:"bridge"}),[u,d]=N.useState(!1),[f,h]=N.useState({}),x=N.useCallback(async()=>{a(!0);try{const m=await Q.get("/docker/networks");r(m.data)}catch(m){e(m.response?.data?.error||"Failed to load networks","error")}finally{a(!1)}},[]);N.useEffect(()=>{x()},[x]);const g=async()=>{if(l.name.trim()){o(!0);try{await Q.post("/docker/networks",l),e("Network created","ok"),c({name:"",driver:"bridge"}),d(!1),await x()}catch(m){e(m.response?.data?.error||"Create failed","error")}finally{o(!1)}}},v=async(m,y)=>{if(confirm(`Remove network "${y}"?`)){h(b=>({...b,[m]:!0}));try{await Q.delete(`/docker/networks/${m}`),e("Network removed","ok"),r(b=>b.filter(_=>_.id!==m))}catch(b){e(b.response?.data?.error||"Remove failed","error")}finally{h(b=>({...b,[m]:!1}))}}},p=s.jsxs(kn,{onClick:()=>d(m=>!m),variant:"primary",size:"sm",children:[s.jsx(Sr,{size:13})," Create Network"]});return s.jsxs("div",{className:"space-y-4",children:[s.jsx(jm,{title:"Networks",icon:Br,count:t.length,onRefresh:x,refreshing:n,extra:p}),u&&s.jsxs("div",{className:"bg-navy-700/50 border border-navy-600 rounded-lg p-4 flex flex-wrap gap-3 items-end",children:[s.jsxs("div",{children:[s.jsx("label",{className:"block text-xs text-slate-400 mb-1",children:"Name"}),s.jsx("input",{value:l.name,onChange:m=>c(y=>({...y,name:m.target.value})),onKeyDown:m=>m.key==="Enter"&&g(),placeholder:"my-network",className:"bg-navy-800 border border-navy-500 rounded px-3 py-1.5 text-sm text-slate-200 placeholder-slate-500 focus:outline-none focus:border-sky-500 w-44"})]}),s.jsxs("div",{children:[s.jsx("label",{className:"block text-xs text-slate-400 mb-1",children:"Driver"}),s.jsx("select",{value:l.driver,onChange:m=>c(y=>({...y,driver:m.target.value})),className:"bg-navy-800 border border-navy-500 rounded px-3 py-1.5 text-sm text-slate-200 focus:outline-none focus:border-sky-500",children:["bridge","overlay","macvlan","host","none"].map(m=>s.jsx("option",{value:m,children:m},m))})]}),s.jsxs("div",{className:"flex gap-2",children:[s.jsx(kn,{onClick:g,loading:i,variant:"primary",size:"sm",children:"Create"}),s.jsx(kn,{onClick:()=>d(!1),size:"sm",children:"Cancel"})]})]}),n?s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"}),"Loading…"]}):t.length?s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Name"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Driver"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Scope"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Subnet"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Containers"}),s.jsx("th",{className:"text-right px-4 py-3 text-slate-400 font-medium",children:"Actions"})]})}),s.jsx("tbody",{children:t.map(m=>s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 transition-colors",children:[s.jsxs("td",{className:"px-4 py-3",children:[s.jsx("span",{className:"text-slate-200 font-medium",children:m.name}),s.jsx("div",{className:"text-xs text-slate-500 font-mono",children:m.id})]}),s.jsx("td",{className:"px-4 py-3 text-slate-300 text-xs",children:m.driver}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:m.scope}),s.jsx("td",{className:"px-4 py-3 text-slate-300 text-xs font-mono",children:m.subnet||"—"}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:m.containers}),s.jsx("td",{className:"px-4 py-3 text-right",children:!["bridge","host","none"].includes(m.name)&&s.jsxs(kn,{onClick:()=>v(m.id,m.name),loading:f[m.id],variant:"danger",children:[s.jsx(Et,{size:13})," Remove"]})})]},m.id))})]})}):s.jsx(km,{message:"No networks found"})]})}function jce({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState(!0),[i,o]=N.useState({}),l=N.useCallback(async()=>{a(!0);try{const u=await Q.get("/docker/volumes");r(u.data)}catch(u){e(u.response?.data?.error||"Failed to load volumes","error")}finally{a(!1)}},[]);N.useEffect(()=>{l()},[l]);const c=async u=>{if(confirm(`Remove volume "${u}"?`)){o(d=>({...d,[u]:!0}));try{await Q.delete(`/docker/volumes/${encodeURIComponent(u)}`),e("Volume removed","ok"),r(d=>d.filter(f=>f.name!==u))}catch(d){e(d.response?.data?.error||"Remove failed","error")}finally{o(d=>({...d,[u]:!1}))}}};return n?s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"}),"Loading volumes…"]}):s.jsxs("div",{className:"space-y-4",children:[s.jsx(jm,{title:"Volumes",icon:jr,count:t.length,onRefresh:l,refreshing:n}),t.length?s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Name"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Driver"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Mountpoint"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Created"}),s.jsx("th",{className:"text-right px-4 py-3 text-slate-400 font-medium",children:"Actions"})]})}),s.jsx("tbody",{children:t.map(u=>s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 transition-colors",children:[s.jsx("td",{className:"px-4 py-3 text-slate-200 font-mono text-xs",children:u.name}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:u.driver}),s.jsx("td",{className:"px-4 py-3 text-slate-300 text-xs font-mono truncate max-w-xs",children:u.mountpoint}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:DP(u.created)}),s.jsx("td",{className:"px-4 py-3 text-right",children:s.jsxs(kn,{onClick:()=>c(u.name),loading:i[u.name],variant:"danger",children:[s.jsx(Et,{size:13})," Remove"]})})]},u.name))})]})}):s.jsx(km,{message:"No volumes found"})]})}const kce=[{id:"containers",label:"Containers",icon:r1},{id:"images",label:"Images",icon:a1},{id:"networks",label:"Networks",icon:Br},{id:"volumes",label:"Volumes",icon:jr}];function Sce(){const[e,t]=N.useState("containers"),[r,n]=N.useState(null),[a,i]=N.useState(!0),[o,l]=N.useState({msg:"",type:"ok"}),c=(d,f="ok")=>l({msg:d,type:f}),u=()=>l({msg:"",type:"ok"});return N.useEffect(()=>{Q.get("/docker/info").then(d=>n(d.data)).catch(()=>i(!1))},[]),a?s.jsxs("div",{className:"space-y-5",children:[s.jsx(gce,{info:r}),s.jsx("div",{className:"flex gap-1 bg-navy-800 border border-navy-600 rounded-lg p-1 w-fit",children:kce.map(d=>{const f=d.icon;return s.jsxs("button",{onClick:()=>t(d.id),className:`flex items-center gap-2 px-4 py-2 rounded text-sm font-medium transition-all ${e===d.id?"bg-sky-600 text-white shadow":"text-slate-400 hover:text-sky-300 hover:bg-navy-700"}`,children:[s.jsx(f,{size:15}),d.label]},d.id)})}),s.jsxs("div",{children:[e==="containers"&&s.jsx(bce,{notify:c}),e==="images"&&s.jsx(_ce,{notify:c}),e==="networks"&&s.jsx(wce,{notify:c}),e==="volumes"&&s.jsx(jce,{notify:c})]}),s.jsx(yce,{msg:o.msg,type:o.type,onClose:u})]}):s.jsxs("div",{className:"flex flex-col items-center justify-center py-20 text-slate-400",children:[s.jsx(An,{size:40,className:"mb-4 text-red-400"}),s.jsx("h2",{className:"text-lg font-semibold text-slate-300 mb-2",children:"Docker not available"}),s.jsx("p",{className:"text-sm",children:"Make sure Docker is installed and the daemon is running."}),s.jsx("code",{className:"mt-3 bg-navy-800 px-3 py-1.5 rounded text-xs text-green-400",children:"sudo apt install docker.io && sudo systemctl enable --now docker"})]})}function gN(e){if(!e)return"0 B";const t=["B","KB","MB","GB","TB"];let r=0;for(;e>=1024&&r<t.length-1;)e/=1024,r++;return`${e.toFixed(1)} ${t[r]}`}function Xs({children:e,onClick:t,variant:r="ghost",size:n="sm",disabled:a,loading:i,className:o=""}){const l="inline-flex items-center gap-1.5 rounded font-medium transition-all disabled:opacity-40 disabled:cursor-not-allowed",c={sm:"px-2.5 py-1.5 text-xs",md:"px-4 py-2 text-sm"},u={ghost:"text-slate-400 hover:text-sky-300 hover:bg-navy-600",primary:"bg-sky-600 hover:bg-sky-500 text-white",success:"bg-green-700 hover:bg-green-600 text-white",danger:"text-red-400 hover:text-red-300 hover:bg-red-400/10",warning:"bg-yellow-700 hover:bg-yellow-600 text-white"};return s.jsx("button",{onClick:t,disabled:a||i,className:`${l} ${c[n]} ${u[r]} ${o}`,children:i?s.jsx(Ne,{size:12,className:"animate-spin"}):e})}function Nce({msg:e,type:t,onClose:r}){if(N.useEffect(()=>{if(e){const i=setTimeout(r,5e3);return()=>clearTimeout(i)}},[e]),!e)return null;const n=t==="error"?"bg-red-900/90 border-red-700 text-red-200":t==="warn"?"bg-yellow-900/90 border-yellow-700 text-yellow-200":"bg-green-900/90 border-green-700 text-green-200",a=t==="error"?An:t==="warn"?Fp:Ye;return s.jsxs("div",{className:`fixed bottom-5 right-5 flex items-center gap-2 px-4 py-3 rounded-lg border text-sm z-50 shadow-xl max-w-md ${n}`,children:[s.jsx(a,{size:16,className:"flex-shrink-0"}),s.jsx("span",{children:e}),s.jsx("button",{onClick:r,className:"ml-2 opacity-70 hover:opacity-100",children:s.jsx(Lr,{size:14})})]})}function Cce({iface:e}){const t=e.operstate==="UP",r=e.link_type==="loopback",n=e.addresses.filter(o=>o.family==="inet"),a=e.addresses.filter(o=>o.family==="inet6"),i=r?"Loopback":e.name.startsWith("virbr")?"Bridge (libvirt)":e.name.startsWith("docker")||e.name.startsWith("br-")?"Bridge (docker)":e.name.startsWith("vnet")?"VM tap":"Ethernet";return s.jsxs("div",{className:`bg-navy-800 border rounded-lg p-4 ${t?"border-navy-600":"border-navy-700 opacity-70"}`,children:[s.jsxs("div",{className:"flex items-start justify-between mb-3",children:[s.jsxs("div",{className:"flex items-center gap-2",children:[t?s.jsx(Ud,{size:18,className:"text-green-400 flex-shrink-0"}):s.jsx(uy,{size:18,className:"text-slate-500 flex-shrink-0"}),s.jsxs("div",{children:[s.jsx("div",{className:"text-slate-100 font-semibold font-mono",children:e.name}),s.jsx("div",{className:"text-xs text-slate-500",children:i})]})]}),s.jsx("span",{className:`text-xs px-2 py-0.5 rounded-full font-semibold ring-1 ${t?"text-green-400 bg-green-400/10 ring-green-400/30":"text-slate-400 bg-slate-400/10 ring-slate-400/30"}`,children:e.operstate})]}),s.jsxs("div",{className:"space-y-1 mb-3",children:[n.map(o=>s.jsxs("div",{className:"flex items-center gap-2",children:[s.jsx("span",{className:"text-xs bg-sky-900/50 text-sky-300 px-1.5 rounded font-mono",children:"IPv4"}),s.jsx("span",{className:"text-slate-200 font-mono text-sm",children:o.cidr})]},o.cidr)),a.filter(o=>o.scope!=="host").map(o=>s.jsxs("div",{className:"flex items-center gap-2",children:[s.jsx("span",{className:"text-xs bg-purple-900/50 text-purple-300 px-1.5 rounded font-mono",children:"IPv6"}),s.jsx("span",{className:"text-slate-400 font-mono text-xs truncate",children:o.cidr})]},o.cidr)),e.addresses.length===0&&s.jsx("span",{className:"text-xs text-slate-500",children:"No addresses"})]}),s.jsxs("div",{className:"flex flex-wrap gap-3 text-xs text-slate-500 border-t border-navy-700 pt-2",children:[e.mac&&e.mac!=="00:00:00:00:00:00"&&s.jsx("span",{title:"MAC",children:e.mac}),s.jsxs("span",{children:["MTU ",e.mtu]})]}),(e.tx_bytes>0||e.rx_bytes>0)&&s.jsxs("div",{className:"flex gap-4 mt-2 text-xs text-slate-500",children:[s.jsxs("span",{className:"flex items-center gap-1",children:[s.jsx(NF,{size:11,className:"text-sky-500"}),"↑ ",gN(e.tx_bytes)," / ↓ ",gN(e.rx_bytes)]}),(e.tx_errors>0||e.rx_errors>0)&&s.jsxs("span",{className:"text-red-400",children:["Err: TX ",e.tx_errors," / RX ",e.rx_errors]})]})]})}function Ece({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState([]),[i,o]=N.useState(null),[l,c]=N.useState(!0),u=N.useCallback(async()=>{c(!0);try{const[f,h,x]=await Promise.all([Q.get("/network/interfaces"),Q.get("/network/routes"),Q.get("/network/dns")]);r(f.data),a(h.data.filter(g=>g.family==="inet")),o(x.data)}catch(f){e(f.response?.data?.error||"Failed to load network data","error")}finally{c(!1)}},[]);if(N.useEffect(()=>{u()},[u]),l)return s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"})," Loading interfaces…"]});const d=[...t].sort((f,h)=>{const x=g=>g.link_type==="loopback"?99:g.name.startsWith("enp")||g.name.startsWith("eth")?0:g.name.startsWith("virbr")?2:g.name.startsWith("docker")||g.name.startsWith("br-")?3:1;return x(f)-x(h)});return s.jsxs("div",{className:"space-y-6",children:[s.jsxs("div",{children:[s.jsxs("div",{className:"flex items-center justify-between mb-3",children:[s.jsxs("h3",{className:"text-slate-300 font-semibold flex items-center gap-2",children:[s.jsx(Ud,{size:16,className:"text-sky-400"})," Interfaces"]}),s.jsxs(Xs,{onClick:u,disabled:l,children:[s.jsx(Xe,{size:13})," Refresh"]})]}),s.jsx("div",{className:"grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-3",children:d.map(f=>s.jsx(Cce,{iface:f},f.name))})]}),s.jsxs("div",{children:[s.jsxs("h3",{className:"text-slate-300 font-semibold flex items-center gap-2 mb-3",children:[s.jsx(KF,{size:16,className:"text-sky-400"})," IPv4 Routing Table"]}),s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Destination"}),s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Gateway"}),s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Interface"}),s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Protocol"}),s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Src"})]})}),s.jsx("tbody",{children:n.map((f,h)=>s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 text-xs",children:[s.jsx("td",{className:"px-4 py-2.5 font-mono text-slate-200",children:f.dst==="default"?s.jsxs("span",{className:"flex items-center gap-1",children:[s.jsx($p,{size:11,className:"text-sky-400"})," default"]}):f.dst}),s.jsx("td",{className:"px-4 py-2.5 font-mono text-slate-300",children:f.gateway||"—"}),s.jsx("td",{className:"px-4 py-2.5 text-slate-300",children:f.dev}),s.jsx("td",{className:"px-4 py-2.5 text-slate-500",children:f.protocol||"—"}),s.jsx("td",{className:"px-4 py-2.5 font-mono text-slate-400",children:f.prefsrc||"—"})]},h))})]})})]}),i&&s.jsxs("div",{children:[s.jsxs("h3",{className:"text-slate-300 font-semibold flex items-center gap-2 mb-3",children:[s.jsx(OF,{size:16,className:"text-sky-400"})," DNS"]}),s.jsxs("div",{className:"bg-navy-800 border border-navy-600 rounded-lg p-4 flex flex-wrap gap-8",children:[s.jsxs("div",{children:[s.jsx("p",{className:"text-xs text-slate-500 mb-1.5",children:"Nameservers"}),i.servers.length?i.servers.map(f=>s.jsx("div",{className:"text-slate-200 font-mono text-sm",children:f},f)):s.jsx("span",{className:"text-slate-500 text-sm",children:"None configured"})]}),i.search.length>0&&s.jsxs("div",{children:[s.jsx("p",{className:"text-xs text-slate-500 mb-1.5",children:"Search Domains"}),i.search.map(f=>s.jsx("div",{className:"text-slate-200 font-mono text-sm",children:f},f))]})]})]})]})}const Ace=`network:
+In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function TP(e,t){if(e){if(typeof e=="string")return $g(e,t);var r=Object.prototype.toString.call(e).slice(8,-1);if(r==="Object"&&e.constructor&&(r=e.constructor.name),r==="Map"||r==="Set")return Array.from(e);if(r==="Arguments"||/^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(r))return $g(e,t)}}function Jle(e){if(typeof Symbol<"u"&&e[Symbol.iterator]!=null||e["@@iterator"]!=null)return Array.from(e)}function ece(e){if(Array.isArray(e))return $g(e)}function $g(e,t){(t==null||t>e.length)&&(t=e.length);for(var r=0,n=new Array(t);r<t;r++)n[r]=e[r];return n}function mN(e,t){var r=Object.keys(e);if(Object.getOwnPropertySymbols){var n=Object.getOwnPropertySymbols(e);t&&(n=n.filter(function(a){return Object.getOwnPropertyDescriptor(e,a).enumerable})),r.push.apply(r,n)}return r}function oe(e){for(var t=1;t<arguments.length;t++){var r=arguments[t]!=null?arguments[t]:{};t%2?mN(Object(r),!0).forEach(function(n){Le(e,n,r[n])}):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(r)):mN(Object(r)).forEach(function(n){Object.defineProperty(e,n,Object.getOwnPropertyDescriptor(r,n))})}return e}function Le(e,t,r){return t=MP(t),t in e?Object.defineProperty(e,t,{value:r,enumerable:!0,configurable:!0,writable:!0}):e[t]=r,e}function MP(e){var t=tce(e,"string");return Jl(t)=="symbol"?t:t+""}function tce(e,t){if(Jl(e)!="object"||!e)return e;var r=e[Symbol.toPrimitive];if(r!==void 0){var n=r.call(e,t);if(Jl(n)!="object")return n;throw new TypeError("@@toPrimitive must return a primitive value.")}return(t==="string"?String:Number)(e)}var rce={xAxis:["bottom","top"],yAxis:["left","right"]},nce={width:"100%",height:"100%"},$P={x:0,y:0};function Gf(e){return e}var ace=function(t,r){return r==="horizontal"?t.x:r==="vertical"?t.y:r==="centric"?t.angle:t.radius},sce=function(t,r,n,a){var i=r.find(function(d){return d&&d.index===n});if(i){if(t==="horizontal")return{x:i.coordinate,y:a.y};if(t==="vertical")return{x:a.x,y:i.coordinate};if(t==="centric"){var o=i.coordinate,l=a.radius;return oe(oe(oe({},a),br(a.cx,a.cy,l,o)),{},{angle:o,radius:l})}var c=i.coordinate,u=a.angle;return oe(oe(oe({},a),br(a.cx,a.cy,c,u)),{},{angle:u,radius:c})}return $P},wm=function(t,r){var n=r.graphicalItems,a=r.dataStartIndex,i=r.dataEndIndex,o=(n??[]).reduce(function(l,c){var u=c.props.data;return u&&u.length?[].concat(ec(l),ec(u)):l},[]);return o.length>0?o:t&&t.length&&we(a)&&we(i)?t.slice(a,i+1):[]};function RP(e){return e==="number"?[0,"auto"]:void 0}var Rg=function(t,r,n,a){var i=t.graphicalItems,o=t.tooltipAxis,l=wm(r,t);return n<0||!i||!i.length||n>=l.length?null:i.reduce(function(c,u){var d,f=(d=u.props.data)!==null&&d!==void 0?d:r;f&&t.dataStartIndex+t.dataEndIndex!==0&&t.dataEndIndex-t.dataStartIndex>=n&&(f=f.slice(t.dataStartIndex,t.dataEndIndex+1));var h;if(o.dataKey&&!o.allowDuplicatedCategory){var x=f===void 0?l:f;h=th(x,o.dataKey,a)}else h=f&&f[n]||l[n];return h?[].concat(ec(c),[NO(u,h)]):c},[])},xN=function(t,r,n,a){var i=a||{x:t.chartX,y:t.chartY},o=ace(i,n),l=t.orderedTooltipTicks,c=t.tooltipAxis,u=t.tooltipTicks,d=iee(o,l,u,c);if(d>=0&&u){var f=u[d]&&u[d].value,h=Rg(t,r,d,f),x=sce(n,l,d,i);return{activeTooltipIndex:d,activeLabel:f,activePayload:h,activeCoordinate:x}}return null},ice=function(t,r){var n=r.axes,a=r.graphicalItems,i=r.axisType,o=r.axisIdKey,l=r.stackGroups,c=r.dataStartIndex,u=r.dataEndIndex,d=t.layout,f=t.children,h=t.stackOffset,x=jO(d,i);return n.reduce(function(g,v){var p,m=v.type.defaultProps!==void 0?oe(oe({},v.type.defaultProps),v.props):v.props,y=m.type,b=m.dataKey,_=m.allowDataOverflow,j=m.allowDuplicatedCategory,k=m.scale,w=m.ticks,S=m.includeHidden,C=m[o];if(g[C])return g;var T=wm(t.data,{graphicalItems:a.filter(function(X){var q,ie=o in X.props?X.props[o]:(q=X.type.defaultProps)===null||q===void 0?void 0:q[o];return ie===C}),dataStartIndex:c,dataEndIndex:u}),R=T.length,D,B,L;Tle(m.domain,_,y)&&(D=Zy(m.domain,null,_),x&&(y==="number"||k!=="auto")&&(L=xu(T,b,"category")));var z=RP(y);if(!D||D.length===0){var O,A=(O=m.domain)!==null&&O!==void 0?O:z;if(b){if(D=xu(T,b,y),y==="category"&&x){var E=Gz(D);j&&E?(B=D,D=Xh(0,R)):j||(D=Qk(A,D,v).reduce(function(X,q){return X.indexOf(q)>=0?X:[].concat(ec(X),[q])},[]))}else if(y==="category")j?D=D.filter(function(X){return X!==""&&!qe(X)}):D=Qk(A,D,v).reduce(function(X,q){return X.indexOf(q)>=0||q===""||qe(q)?X:[].concat(ec(X),[q])},[]);else if(y==="number"){var P=dee(T,a.filter(function(X){var q,ie,ue=o in X.props?X.props[o]:(q=X.type.defaultProps)===null||q===void 0?void 0:q[o],je="hide"in X.props?X.props.hide:(ie=X.type.defaultProps)===null||ie===void 0?void 0:ie.hide;return ue===C&&(S||!je)}),b,i,d);P&&(D=P)}x&&(y==="number"||k!=="auto")&&(L=xu(T,b,"category"))}else x?D=Xh(0,R):l&&l[C]&&l[C].hasStack&&y==="number"?D=h==="expand"?[0,1]:SO(l[C].stackGroups,c,u):D=wO(T,a.filter(function(X){var q=o in X.props?X.props[o]:X.type.defaultProps[o],ie="hide"in X.props?X.props.hide:X.type.defaultProps.hide;return q===C&&(S||!ie)}),y,d,!0);if(y==="number")D=Tg(f,D,C,i,w),A&&(D=Zy(A,D,_));else if(y==="category"&&A){var F=A,I=D.every(function(X){return F.indexOf(X)>=0});I&&(D=F)}}return oe(oe({},g),{},Le({},C,oe(oe({},m),{},{axisType:i,domain:D,categoricalDomain:L,duplicateDomain:B,originalDomain:(p=m.domain)!==null&&p!==void 0?p:z,isCategorical:x,layout:d})))},{})},oce=function(t,r){var n=r.graphicalItems,a=r.Axis,i=r.axisType,o=r.axisIdKey,l=r.stackGroups,c=r.dataStartIndex,u=r.dataEndIndex,d=t.layout,f=t.children,h=wm(t.data,{graphicalItems:n,dataStartIndex:c,dataEndIndex:u}),x=h.length,g=jO(d,i),v=-1;return n.reduce(function(p,m){var y=m.type.defaultProps!==void 0?oe(oe({},m.type.defaultProps),m.props):m.props,b=y[o],_=RP("number");if(!p[b]){v++;var j;return g?j=Xh(0,x):l&&l[b]&&l[b].hasStack?(j=SO(l[b].stackGroups,c,u),j=Tg(f,j,b,i)):(j=Zy(_,wO(h,n.filter(function(k){var w,S,C=o in k.props?k.props[o]:(w=k.type.defaultProps)===null||w===void 0?void 0:w[o],T="hide"in k.props?k.props.hide:(S=k.type.defaultProps)===null||S===void 0?void 0:S.hide;return C===b&&!T}),"number",d),a.defaultProps.allowDataOverflow),j=Tg(f,j,b,i)),oe(oe({},p),{},Le({},b,oe(oe({axisType:i},a.defaultProps),{},{hide:!0,orientation:Wn(rce,"".concat(i,".").concat(v%2),null),domain:j,originalDomain:_,isCategorical:g,layout:d})))}return p},{})},lce=function(t,r){var n=r.axisType,a=n===void 0?"xAxis":n,i=r.AxisComp,o=r.graphicalItems,l=r.stackGroups,c=r.dataStartIndex,u=r.dataEndIndex,d=t.children,f="".concat(a,"Id"),h=Vn(d,i),x={};return h&&h.length?x=ice(t,{axes:h,graphicalItems:o,axisType:a,axisIdKey:f,stackGroups:l,dataStartIndex:c,dataEndIndex:u}):o&&o.length&&(x=oce(t,{Axis:i,graphicalItems:o,axisType:a,axisIdKey:f,stackGroups:l,dataStartIndex:c,dataEndIndex:u})),x},cce=function(t){var r=Ks(t),n=us(r,!1,!0);return{tooltipTicks:n,orderedTooltipTicks:T1(n,function(a){return a.coordinate}),tooltipAxis:r,tooltipAxisBandSize:Mh(r,n)}},vN=function(t){var r=t.children,n=t.defaultShowTooltip,a=_n(r,Xl),i=0,o=0;return t.data&&t.data.length!==0&&(o=t.data.length-1),a&&a.props&&(a.props.startIndex>=0&&(i=a.props.startIndex),a.props.endIndex>=0&&(o=a.props.endIndex)),{chartX:0,chartY:0,dataStartIndex:i,dataEndIndex:o,activeTooltipIndex:-1,isTooltipActive:!!n}},uce=function(t){return!t||!t.length?!1:t.some(function(r){var n=fs(r&&r.type);return n&&n.indexOf("Bar")>=0})},yN=function(t){return t==="horizontal"?{numericAxisName:"yAxis",cateAxisName:"xAxis"}:t==="vertical"?{numericAxisName:"xAxis",cateAxisName:"yAxis"}:t==="centric"?{numericAxisName:"radiusAxis",cateAxisName:"angleAxis"}:{numericAxisName:"angleAxis",cateAxisName:"radiusAxis"}},dce=function(t,r){var n=t.props,a=t.graphicalItems,i=t.xAxisMap,o=i===void 0?{}:i,l=t.yAxisMap,c=l===void 0?{}:l,u=n.width,d=n.height,f=n.children,h=n.margin||{},x=_n(f,Xl),g=_n(f,Ha),v=Object.keys(c).reduce(function(j,k){var w=c[k],S=w.orientation;return!w.mirror&&!w.hide?oe(oe({},j),{},Le({},S,j[S]+w.width)):j},{left:h.left||0,right:h.right||0}),p=Object.keys(o).reduce(function(j,k){var w=o[k],S=w.orientation;return!w.mirror&&!w.hide?oe(oe({},j),{},Le({},S,Wn(j,"".concat(S))+w.height)):j},{top:h.top||0,bottom:h.bottom||0}),m=oe(oe({},p),v),y=m.bottom;x&&(m.bottom+=x.props.height||Xl.defaultProps.height),g&&r&&(m=cee(m,a,n,r));var b=u-m.left-m.right,_=d-m.top-m.bottom;return oe(oe({brushBottom:y},m),{},{width:Math.max(b,0),height:Math.max(_,0)})},fce=function(t,r){if(r==="xAxis")return t[r].width;if(r==="yAxis")return t[r].height},FP=function(t){var r=t.chartName,n=t.GraphicalChild,a=t.defaultTooltipEventType,i=a===void 0?"axis":a,o=t.validateTooltipEventTypes,l=o===void 0?["axis"]:o,c=t.axisComponents,u=t.legendContent,d=t.formatAxisMap,f=t.defaultProps,h=function(m,y){var b=y.graphicalItems,_=y.stackGroups,j=y.offset,k=y.updateId,w=y.dataStartIndex,S=y.dataEndIndex,C=m.barSize,T=m.layout,R=m.barGap,D=m.barCategoryGap,B=m.maxBarSize,L=yN(T),z=L.numericAxisName,O=L.cateAxisName,A=uce(b),E=[];return b.forEach(function(P,F){var I=wm(m.data,{graphicalItems:[P],dataStartIndex:w,dataEndIndex:S}),X=P.type.defaultProps!==void 0?oe(oe({},P.type.defaultProps),P.props):P.props,q=X.dataKey,ie=X.maxBarSize,ue=X["".concat(z,"Id")],je=X["".concat(O,"Id")],he={},Fe=c.reduce(function(Ae,De){var Re=y["".concat(De.axisType,"Map")],ot=X["".concat(De.axisType,"Id")];Re&&Re[ot]||De.axisType==="zAxis"||bo();var mt=Re[ot];return oe(oe({},Ae),{},Le(Le({},De.axisType,mt),"".concat(De.axisType,"Ticks"),us(mt)))},he),me=Fe[O],$e=Fe["".concat(O,"Ticks")],Me=_&&_[ue]&&_[ue].hasStack&&jee(P,_[ue].stackGroups),le=fs(P.type).indexOf("Bar")>=0,de=Mh(me,$e),G=[],ye=A&&oee({barSize:C,stackGroups:_,totalSize:fce(Fe,O)});if(le){var Oe,it,ge=qe(ie)?B:ie,ce=(Oe=(it=Mh(me,$e,!0))!==null&&it!==void 0?it:ge)!==null&&Oe!==void 0?Oe:0;G=lee({barGap:R,barCategoryGap:D,bandSize:ce!==de?ce:de,sizeList:ye[je],maxBarSize:ge}),ce!==de&&(G=G.map(function(Ae){return oe(oe({},Ae),{},{position:oe(oe({},Ae.position),{},{offset:Ae.position.offset-ce/2})})}))}var _e=P&&P.type&&P.type.getComposedData;_e&&E.push({props:oe(oe({},_e(oe(oe({},Fe),{},{displayedData:I,props:m,dataKey:q,item:P,bandSize:de,barPosition:G,offset:j,stackedData:Me,layout:T,dataStartIndex:w,dataEndIndex:S}))),{},Le(Le(Le({key:P.key||"item-".concat(F)},z,Fe[z]),O,Fe[O]),"animationId",k)),childIndex:i7(P,m.children),item:P})}),E},x=function(m,y){var b=m.props,_=m.dataStartIndex,j=m.dataEndIndex,k=m.updateId;if(!Xj({props:b}))return null;var w=b.children,S=b.layout,C=b.stackOffset,T=b.data,R=b.reverseStackOrder,D=yN(S),B=D.numericAxisName,L=D.cateAxisName,z=Vn(w,n),O=bee(T,z,"".concat(B,"Id"),"".concat(L,"Id"),C,R),A=c.reduce(function(X,q){var ie="".concat(q.axisType,"Map");return oe(oe({},X),{},Le({},ie,lce(b,oe(oe({},q),{},{graphicalItems:z,stackGroups:q.axisType===B&&O,dataStartIndex:_,dataEndIndex:j}))))},{}),E=dce(oe(oe({},A),{},{props:b,graphicalItems:z}),y?.legendBBox);Object.keys(A).forEach(function(X){A[X]=d(b,A[X],E,X.replace("Map",""),r)});var P=A["".concat(L,"Map")],F=cce(P),I=h(b,oe(oe({},A),{},{dataStartIndex:_,dataEndIndex:j,updateId:k,graphicalItems:z,stackGroups:O,offset:E}));return oe(oe({formattedGraphicalItems:I,graphicalItems:z,offset:E,stackGroups:O},F),A)},g=function(p){function m(y){var b,_,j;return Hle(this,m),j=Gle(this,m,[y]),Le(j,"eventEmitterSymbol",Symbol("rechartsEventEmitter")),Le(j,"accessibilityManager",new Ple),Le(j,"handleLegendBBoxUpdate",function(k){if(k){var w=j.state,S=w.dataStartIndex,C=w.dataEndIndex,T=w.updateId;j.setState(oe({legendBBox:k},x({props:j.props,dataStartIndex:S,dataEndIndex:C,updateId:T},oe(oe({},j.state),{},{legendBBox:k}))))}}),Le(j,"handleReceiveSyncEvent",function(k,w,S){if(j.props.syncId===k){if(S===j.eventEmitterSymbol&&typeof j.props.syncMethod!="function")return;j.applySyncEvent(w)}}),Le(j,"handleBrushChange",function(k){var w=k.startIndex,S=k.endIndex;if(w!==j.state.dataStartIndex||S!==j.state.dataEndIndex){var C=j.state.updateId;j.setState(function(){return oe({dataStartIndex:w,dataEndIndex:S},x({props:j.props,dataStartIndex:w,dataEndIndex:S,updateId:C},j.state))}),j.triggerSyncEvent({dataStartIndex:w,dataEndIndex:S})}}),Le(j,"handleMouseEnter",function(k){var w=j.getMouseInfo(k);if(w){var S=oe(oe({},w),{},{isTooltipActive:!0});j.setState(S),j.triggerSyncEvent(S);var C=j.props.onMouseEnter;We(C)&&C(S,k)}}),Le(j,"triggeredAfterMouseMove",function(k){var w=j.getMouseInfo(k),S=w?oe(oe({},w),{},{isTooltipActive:!0}):{isTooltipActive:!1};j.setState(S),j.triggerSyncEvent(S);var C=j.props.onMouseMove;We(C)&&C(S,k)}),Le(j,"handleItemMouseEnter",function(k){j.setState(function(){return{isTooltipActive:!0,activeItem:k,activePayload:k.tooltipPayload,activeCoordinate:k.tooltipPosition||{x:k.cx,y:k.cy}}})}),Le(j,"handleItemMouseLeave",function(){j.setState(function(){return{isTooltipActive:!1}})}),Le(j,"handleMouseMove",function(k){k.persist(),j.throttleTriggeredAfterMouseMove(k)}),Le(j,"handleMouseLeave",function(k){j.throttleTriggeredAfterMouseMove.cancel();var w={isTooltipActive:!1};j.setState(w),j.triggerSyncEvent(w);var S=j.props.onMouseLeave;We(S)&&S(w,k)}),Le(j,"handleOuterEvent",function(k){var w=s7(k),S=Wn(j.props,"".concat(w));if(w&&We(S)){var C,T;/.*touch.*/i.test(w)?T=j.getMouseInfo(k.changedTouches[0]):T=j.getMouseInfo(k),S((C=T)!==null&&C!==void 0?C:{},k)}}),Le(j,"handleClick",function(k){var w=j.getMouseInfo(k);if(w){var S=oe(oe({},w),{},{isTooltipActive:!0});j.setState(S),j.triggerSyncEvent(S);var C=j.props.onClick;We(C)&&C(S,k)}}),Le(j,"handleMouseDown",function(k){var w=j.props.onMouseDown;if(We(w)){var S=j.getMouseInfo(k);w(S,k)}}),Le(j,"handleMouseUp",function(k){var w=j.props.onMouseUp;if(We(w)){var S=j.getMouseInfo(k);w(S,k)}}),Le(j,"handleTouchMove",function(k){k.changedTouches!=null&&k.changedTouches.length>0&&j.throttleTriggeredAfterMouseMove(k.changedTouches[0])}),Le(j,"handleTouchStart",function(k){k.changedTouches!=null&&k.changedTouches.length>0&&j.handleMouseDown(k.changedTouches[0])}),Le(j,"handleTouchEnd",function(k){k.changedTouches!=null&&k.changedTouches.length>0&&j.handleMouseUp(k.changedTouches[0])}),Le(j,"handleDoubleClick",function(k){var w=j.props.onDoubleClick;if(We(w)){var S=j.getMouseInfo(k);w(S,k)}}),Le(j,"handleContextMenu",function(k){var w=j.props.onContextMenu;if(We(w)){var S=j.getMouseInfo(k);w(S,k)}}),Le(j,"triggerSyncEvent",function(k){j.props.syncId!==void 0&&Xx.emit(Ux,j.props.syncId,k,j.eventEmitterSymbol)}),Le(j,"applySyncEvent",function(k){var w=j.props,S=w.layout,C=w.syncMethod,T=j.state.updateId,R=k.dataStartIndex,D=k.dataEndIndex;if(k.dataStartIndex!==void 0||k.dataEndIndex!==void 0)j.setState(oe({dataStartIndex:R,dataEndIndex:D},x({props:j.props,dataStartIndex:R,dataEndIndex:D,updateId:T},j.state)));else if(k.activeTooltipIndex!==void 0){var B=k.chartX,L=k.chartY,z=k.activeTooltipIndex,O=j.state,A=O.offset,E=O.tooltipTicks;if(!A)return;if(typeof C=="function")z=C(E,k);else if(C==="value"){z=-1;for(var P=0;P<E.length;P++)if(E[P].value===k.activeLabel){z=P;break}}var F=oe(oe({},A),{},{x:A.left,y:A.top}),I=Math.min(B,F.x+F.width),X=Math.min(L,F.y+F.height),q=E[z]&&E[z].value,ie=Rg(j.state,j.props.data,z),ue=E[z]?{x:S==="horizontal"?E[z].coordinate:I,y:S==="horizontal"?X:E[z].coordinate}:$P;j.setState(oe(oe({},k),{},{activeLabel:q,activeCoordinate:ue,activePayload:ie,activeTooltipIndex:z}))}else j.setState(k)}),Le(j,"renderCursor",function(k){var w,S=j.state,C=S.isTooltipActive,T=S.activeCoordinate,R=S.activePayload,D=S.offset,B=S.activeTooltipIndex,L=S.tooltipAxisBandSize,z=j.getTooltipEventType(),O=(w=k.props.active)!==null&&w!==void 0?w:C,A=j.props.layout,E=k.key||"_recharts-cursor";return V.createElement(Ile,{key:E,activeCoordinate:T,activePayload:R,activeTooltipIndex:B,chartName:r,element:k,isActive:O,layout:A,offset:D,tooltipAxisBandSize:L,tooltipEventType:z})}),Le(j,"renderPolarAxis",function(k,w,S){var C=Wn(k,"type.axisType"),T=Wn(j.state,"".concat(C,"Map")),R=k.type.defaultProps,D=R!==void 0?oe(oe({},R),k.props):k.props,B=T&&T[D["".concat(C,"Id")]];return N.cloneElement(k,oe(oe({},B),{},{className:nt(C,B.className),key:k.key||"".concat(w,"-").concat(S),ticks:us(B,!0)}))}),Le(j,"renderPolarGrid",function(k){var w=k.props,S=w.radialLines,C=w.polarAngles,T=w.polarRadius,R=j.state,D=R.radiusAxisMap,B=R.angleAxisMap,L=Ks(D),z=Ks(B),O=z.cx,A=z.cy,E=z.innerRadius,P=z.outerRadius;return N.cloneElement(k,{polarAngles:Array.isArray(C)?C:us(z,!0).map(function(F){return F.coordinate}),polarRadius:Array.isArray(T)?T:us(L,!0).map(function(F){return F.coordinate}),cx:O,cy:A,innerRadius:E,outerRadius:P,key:k.key||"polar-grid",radialLines:S})}),Le(j,"renderLegend",function(){var k=j.state.formattedGraphicalItems,w=j.props,S=w.children,C=w.width,T=w.height,R=j.props.margin||{},D=C-(R.left||0)-(R.right||0),B=bO({children:S,formattedGraphicalItems:k,legendWidth:D,legendContent:u});if(!B)return null;var L=B.item,z=pN(B,Lle);return N.cloneElement(L,oe(oe({},z),{},{chartWidth:C,chartHeight:T,margin:R,onBBoxUpdate:j.handleLegendBBoxUpdate}))}),Le(j,"renderTooltip",function(){var k,w=j.props,S=w.children,C=w.accessibilityLayer,T=_n(S,dr);if(!T)return null;var R=j.state,D=R.isTooltipActive,B=R.activeCoordinate,L=R.activePayload,z=R.activeLabel,O=R.offset,A=(k=T.props.active)!==null&&k!==void 0?k:D;return N.cloneElement(T,{viewBox:oe(oe({},O),{},{x:O.left,y:O.top}),active:A,label:z,payload:A?L:[],coordinate:B,accessibilityLayer:C})}),Le(j,"renderBrush",function(k){var w=j.props,S=w.margin,C=w.data,T=j.state,R=T.offset,D=T.dataStartIndex,B=T.dataEndIndex,L=T.updateId;return N.cloneElement(k,{key:k.key||"_recharts-brush",onChange:Xf(j.handleBrushChange,k.props.onChange),data:C,x:we(k.props.x)?k.props.x:R.left,y:we(k.props.y)?k.props.y:R.top+R.height+R.brushBottom-(S.bottom||0),width:we(k.props.width)?k.props.width:R.width,startIndex:D,endIndex:B,updateId:"brush-".concat(L)})}),Le(j,"renderReferenceElement",function(k,w,S){if(!k)return null;var C=j,T=C.clipPathId,R=j.state,D=R.xAxisMap,B=R.yAxisMap,L=R.offset,z=k.type.defaultProps||{},O=k.props,A=O.xAxisId,E=A===void 0?z.xAxisId:A,P=O.yAxisId,F=P===void 0?z.yAxisId:P;return N.cloneElement(k,{key:k.key||"".concat(w,"-").concat(S),xAxis:D[E],yAxis:B[F],viewBox:{x:L.left,y:L.top,width:L.width,height:L.height},clipPathId:T})}),Le(j,"renderActivePoints",function(k){var w=k.item,S=k.activePoint,C=k.basePoint,T=k.childIndex,R=k.isRange,D=[],B=w.props.key,L=w.item.type.defaultProps!==void 0?oe(oe({},w.item.type.defaultProps),w.item.props):w.item.props,z=L.activeDot,O=L.dataKey,A=oe(oe({index:T,dataKey:O,cx:S.x,cy:S.y,r:4,fill:a_(w.item),strokeWidth:2,stroke:"#fff",payload:S.payload,value:S.value},Ve(z,!1)),rh(z));return D.push(m.renderActiveDot(z,A,"".concat(B,"-activePoint-").concat(T))),C?D.push(m.renderActiveDot(z,oe(oe({},A),{},{cx:C.x,cy:C.y}),"".concat(B,"-basePoint-").concat(T))):R&&D.push(null),D}),Le(j,"renderGraphicChild",function(k,w,S){var C=j.filterFormatItem(k,w,S);if(!C)return null;var T=j.getTooltipEventType(),R=j.state,D=R.isTooltipActive,B=R.tooltipAxis,L=R.activeTooltipIndex,z=R.activeLabel,O=j.props.children,A=_n(O,dr),E=C.props,P=E.points,F=E.isRange,I=E.baseLine,X=C.item.type.defaultProps!==void 0?oe(oe({},C.item.type.defaultProps),C.item.props):C.item.props,q=X.activeDot,ie=X.hide,ue=X.activeBar,je=X.activeShape,he=!!(!ie&&D&&A&&(q||ue||je)),Fe={};T!=="axis"&&A&&A.props.trigger==="click"?Fe={onClick:Xf(j.handleItemMouseEnter,k.props.onClick)}:T!=="axis"&&(Fe={onMouseLeave:Xf(j.handleItemMouseLeave,k.props.onMouseLeave),onMouseEnter:Xf(j.handleItemMouseEnter,k.props.onMouseEnter)});var me=N.cloneElement(k,oe(oe({},C.props),Fe));function $e(De){return typeof B.dataKey=="function"?B.dataKey(De.payload):null}if(he)if(L>=0){var Me,le;if(B.dataKey&&!B.allowDuplicatedCategory){var de=typeof B.dataKey=="function"?$e:"payload.".concat(B.dataKey.toString());Me=th(P,de,z),le=F&&I&&th(I,de,z)}else Me=P?.[L],le=F&&I&&I[L];if(je||ue){var G=k.props.activeIndex!==void 0?k.props.activeIndex:L;return[N.cloneElement(k,oe(oe(oe({},C.props),Fe),{},{activeIndex:G})),null,null]}if(!qe(Me))return[me].concat(ec(j.renderActivePoints({item:C,activePoint:Me,basePoint:le,childIndex:L,isRange:F})))}else{var ye,Oe=(ye=j.getItemByXY(j.state.activeCoordinate))!==null&&ye!==void 0?ye:{graphicalItem:me},it=Oe.graphicalItem,ge=it.item,ce=ge===void 0?k:ge,_e=it.childIndex,Ae=oe(oe(oe({},C.props),Fe),{},{activeIndex:_e});return[N.cloneElement(ce,Ae),null,null]}return F?[me,null,null]:[me,null]}),Le(j,"renderCustomized",function(k,w,S){return N.cloneElement(k,oe(oe({key:"recharts-customized-".concat(S)},j.props),j.state))}),Le(j,"renderMap",{CartesianGrid:{handler:Gf,once:!0},ReferenceArea:{handler:j.renderReferenceElement},ReferenceLine:{handler:Gf},ReferenceDot:{handler:j.renderReferenceElement},XAxis:{handler:Gf},YAxis:{handler:Gf},Brush:{handler:j.renderBrush,once:!0},Bar:{handler:j.renderGraphicChild},Line:{handler:j.renderGraphicChild},Area:{handler:j.renderGraphicChild},Radar:{handler:j.renderGraphicChild},RadialBar:{handler:j.renderGraphicChild},Scatter:{handler:j.renderGraphicChild},Pie:{handler:j.renderGraphicChild},Funnel:{handler:j.renderGraphicChild},Tooltip:{handler:j.renderCursor,once:!0},PolarGrid:{handler:j.renderPolarGrid,once:!0},PolarAngleAxis:{handler:j.renderPolarAxis},PolarRadiusAxis:{handler:j.renderPolarAxis},Customized:{handler:j.renderCustomized}}),j.clipPathId="".concat((b=y.id)!==null&&b!==void 0?b:xc("recharts"),"-clip"),j.throttleTriggeredAfterMouseMove=bA(j.triggeredAfterMouseMove,(_=y.throttleDelay)!==null&&_!==void 0?_:1e3/60),j.state={},j}return Yle(m,p),Vle(m,[{key:"componentDidMount",value:function(){var b,_;this.addListener(),this.accessibilityManager.setDetails({container:this.container,offset:{left:(b=this.props.margin.left)!==null&&b!==void 0?b:0,top:(_=this.props.margin.top)!==null&&_!==void 0?_:0},coordinateList:this.state.tooltipTicks,mouseHandlerCallback:this.triggeredAfterMouseMove,layout:this.props.layout}),this.displayDefaultTooltip()}},{key:"displayDefaultTooltip",value:function(){var b=this.props,_=b.children,j=b.data,k=b.height,w=b.layout,S=_n(_,dr);if(S){var C=S.props.defaultIndex;if(!(typeof C!="number"||C<0||C>this.state.tooltipTicks.length-1)){var T=this.state.tooltipTicks[C]&&this.state.tooltipTicks[C].value,R=Rg(this.state,j,C,T),D=this.state.tooltipTicks[C].coordinate,B=(this.state.offset.top+k)/2,L=w==="horizontal",z=L?{x:D,y:B}:{y:D,x:B},O=this.state.formattedGraphicalItems.find(function(E){var P=E.item;return P.type.name==="Scatter"});O&&(z=oe(oe({},z),O.props.points[C].tooltipPosition),R=O.props.points[C].tooltipPayload);var A={activeTooltipIndex:C,isTooltipActive:!0,activeLabel:T,activePayload:R,activeCoordinate:z};this.setState(A),this.renderCursor(S),this.accessibilityManager.setIndex(C)}}}},{key:"getSnapshotBeforeUpdate",value:function(b,_){if(!this.props.accessibilityLayer)return null;if(this.state.tooltipTicks!==_.tooltipTicks&&this.accessibilityManager.setDetails({coordinateList:this.state.tooltipTicks}),this.props.layout!==b.layout&&this.accessibilityManager.setDetails({layout:this.props.layout}),this.props.margin!==b.margin){var j,k;this.accessibilityManager.setDetails({offset:{left:(j=this.props.margin.left)!==null&&j!==void 0?j:0,top:(k=this.props.margin.top)!==null&&k!==void 0?k:0}})}return null}},{key:"componentDidUpdate",value:function(b){hy([_n(b.children,dr)],[_n(this.props.children,dr)])||this.displayDefaultTooltip()}},{key:"componentWillUnmount",value:function(){this.removeListener(),this.throttleTriggeredAfterMouseMove.cancel()}},{key:"getTooltipEventType",value:function(){var b=_n(this.props.children,dr);if(b&&typeof b.props.shared=="boolean"){var _=b.props.shared?"axis":"item";return l.indexOf(_)>=0?_:i}return i}},{key:"getMouseInfo",value:function(b){if(!this.container)return null;var _=this.container,j=_.getBoundingClientRect(),k=TQ(j),w={chartX:Math.round(b.pageX-k.left),chartY:Math.round(b.pageY-k.top)},S=j.width/_.offsetWidth||1,C=this.inRange(w.chartX,w.chartY,S);if(!C)return null;var T=this.state,R=T.xAxisMap,D=T.yAxisMap,B=this.getTooltipEventType(),L=xN(this.state,this.props.data,this.props.layout,C);if(B!=="axis"&&R&&D){var z=Ks(R).scale,O=Ks(D).scale,A=z&&z.invert?z.invert(w.chartX):null,E=O&&O.invert?O.invert(w.chartY):null;return oe(oe({},w),{},{xValue:A,yValue:E},L)}return L?oe(oe({},w),L):null}},{key:"inRange",value:function(b,_){var j=arguments.length>2&&arguments[2]!==void 0?arguments[2]:1,k=this.props.layout,w=b/j,S=_/j;if(k==="horizontal"||k==="vertical"){var C=this.state.offset,T=w>=C.left&&w<=C.left+C.width&&S>=C.top&&S<=C.top+C.height;return T?{x:w,y:S}:null}var R=this.state,D=R.angleAxisMap,B=R.radiusAxisMap;if(D&&B){var L=Ks(D);return Zk({x:w,y:S},L)}return null}},{key:"parseEventsOfWrapper",value:function(){var b=this.props.children,_=this.getTooltipEventType(),j=_n(b,dr),k={};j&&_==="axis"&&(j.props.trigger==="click"?k={onClick:this.handleClick}:k={onMouseEnter:this.handleMouseEnter,onDoubleClick:this.handleDoubleClick,onMouseMove:this.handleMouseMove,onMouseLeave:this.handleMouseLeave,onTouchMove:this.handleTouchMove,onTouchStart:this.handleTouchStart,onTouchEnd:this.handleTouchEnd,onContextMenu:this.handleContextMenu});var w=rh(this.props,this.handleOuterEvent);return oe(oe({},w),k)}},{key:"addListener",value:function(){Xx.on(Ux,this.handleReceiveSyncEvent)}},{key:"removeListener",value:function(){Xx.removeListener(Ux,this.handleReceiveSyncEvent)}},{key:"filterFormatItem",value:function(b,_,j){for(var k=this.state.formattedGraphicalItems,w=0,S=k.length;w<S;w++){var C=k[w];if(C.item===b||C.props.key===b.key||_===fs(C.item.type)&&j===C.childIndex)return C}return null}},{key:"renderClipPath",value:function(){var b=this.clipPathId,_=this.state.offset,j=_.left,k=_.top,w=_.height,S=_.width;return V.createElement("defs",null,V.createElement("clipPath",{id:b},V.createElement("rect",{x:j,y:k,height:w,width:S})))}},{key:"getXScales",value:function(){var b=this.state.xAxisMap;return b?Object.entries(b).reduce(function(_,j){var k=hN(j,2),w=k[0],S=k[1];return oe(oe({},_),{},Le({},w,S.scale))},{}):null}},{key:"getYScales",value:function(){var b=this.state.yAxisMap;return b?Object.entries(b).reduce(function(_,j){var k=hN(j,2),w=k[0],S=k[1];return oe(oe({},_),{},Le({},w,S.scale))},{}):null}},{key:"getXScaleByAxisId",value:function(b){var _;return(_=this.state.xAxisMap)===null||_===void 0||(_=_[b])===null||_===void 0?void 0:_.scale}},{key:"getYScaleByAxisId",value:function(b){var _;return(_=this.state.yAxisMap)===null||_===void 0||(_=_[b])===null||_===void 0?void 0:_.scale}},{key:"getItemByXY",value:function(b){var _=this.state,j=_.formattedGraphicalItems,k=_.activeItem;if(j&&j.length)for(var w=0,S=j.length;w<S;w++){var C=j[w],T=C.props,R=C.item,D=R.type.defaultProps!==void 0?oe(oe({},R.type.defaultProps),R.props):R.props,B=fs(R.type);if(B==="Bar"){var L=(T.data||[]).find(function(E){return yne(b,E)});if(L)return{graphicalItem:C,payload:L}}else if(B==="RadialBar"){var z=(T.data||[]).find(function(E){return Zk(b,E)});if(z)return{graphicalItem:C,payload:z}}else if(mm(C,k)||xm(C,k)||vd(C,k)){var O=_ae({graphicalItem:C,activeTooltipItem:k,itemData:D.data}),A=D.activeIndex===void 0?O:D.activeIndex;return{graphicalItem:oe(oe({},C),{},{childIndex:A}),payload:vd(C,k)?D.data[O]:C.props.data[O]}}}return null}},{key:"render",value:function(){var b=this;if(!Xj(this))return null;var _=this.props,j=_.children,k=_.className,w=_.width,S=_.height,C=_.style,T=_.compact,R=_.title,D=_.desc,B=pN(_,zle),L=Ve(B,!1);if(T)return V.createElement(VS,{state:this.state,width:this.props.width,height:this.props.height,clipPathId:this.clipPathId},V.createElement(my,ol({},L,{width:w,height:S,title:R,desc:D}),this.renderClipPath(),Hj(j,this.renderMap)));if(this.props.accessibilityLayer){var z,O;L.tabIndex=(z=this.props.tabIndex)!==null&&z!==void 0?z:0,L.role=(O=this.props.role)!==null&&O!==void 0?O:"application",L.onKeyDown=function(E){b.accessibilityManager.keyboardEvent(E)},L.onFocus=function(){b.accessibilityManager.focus()}}var A=this.parseEventsOfWrapper();return V.createElement(VS,{state:this.state,width:this.props.width,height:this.props.height,clipPathId:this.clipPathId},V.createElement("div",ol({className:nt("recharts-wrapper",k),style:oe({position:"relative",cursor:"default",width:w,height:S},C)},A,{ref:function(P){b.container=P}}),V.createElement(my,ol({},L,{width:w,height:S,title:R,desc:D,style:nce}),this.renderClipPath(),Hj(j,this.renderMap)),this.renderLegend(),this.renderTooltip()))}}])}(N.Component);Le(g,"displayName",r),Le(g,"defaultProps",oe({layout:"horizontal",stackOffset:"none",barCategoryGap:"10%",barGap:4,margin:{top:5,right:5,bottom:5,left:5},reverseStackOrder:!1,syncMethod:"index"},f)),Le(g,"getDerivedStateFromProps",function(p,m){var y=p.dataKey,b=p.data,_=p.children,j=p.width,k=p.height,w=p.layout,S=p.stackOffset,C=p.margin,T=m.dataStartIndex,R=m.dataEndIndex;if(m.updateId===void 0){var D=vN(p);return oe(oe(oe({},D),{},{updateId:0},x(oe(oe({props:p},D),{},{updateId:0}),m)),{},{prevDataKey:y,prevData:b,prevWidth:j,prevHeight:k,prevLayout:w,prevStackOffset:S,prevMargin:C,prevChildren:_})}if(y!==m.prevDataKey||b!==m.prevData||j!==m.prevWidth||k!==m.prevHeight||w!==m.prevLayout||S!==m.prevStackOffset||!ml(C,m.prevMargin)){var B=vN(p),L={chartX:m.chartX,chartY:m.chartY,isTooltipActive:m.isTooltipActive},z=oe(oe({},xN(m,b,w)),{},{updateId:m.updateId+1}),O=oe(oe(oe({},B),L),z);return oe(oe(oe({},O),x(oe({props:p},O),m)),{},{prevDataKey:y,prevData:b,prevWidth:j,prevHeight:k,prevLayout:w,prevStackOffset:S,prevMargin:C,prevChildren:_})}if(!hy(_,m.prevChildren)){var A,E,P,F,I=_n(_,Xl),X=I&&(A=(E=I.props)===null||E===void 0?void 0:E.startIndex)!==null&&A!==void 0?A:T,q=I&&(P=(F=I.props)===null||F===void 0?void 0:F.endIndex)!==null&&P!==void 0?P:R,ie=X!==T||q!==R,ue=!qe(b),je=ue&&!ie?m.updateId:m.updateId+1;return oe(oe({updateId:je},x(oe(oe({props:p},m),{},{updateId:je,dataStartIndex:X,dataEndIndex:q}),m)),{},{prevChildren:_,dataStartIndex:X,dataEndIndex:q})}return null}),Le(g,"renderActiveDot",function(p,m,y){var b;return N.isValidElement(p)?b=N.cloneElement(p,m):We(p)?b=p(m):b=V.createElement(pm,m),V.createElement(Ct,{className:"recharts-active-dot",key:y},b)});var v=N.forwardRef(function(m,y){return V.createElement(g,ol({},m,{ref:y}))});return v.displayName=g.displayName,v},ap=FP({chartName:"LineChart",GraphicalChild:vi,axisComponents:[{axisType:"xAxis",AxisComp:Kn},{axisType:"yAxis",AxisComp:jn}],formatAxisMap:qO}),tu=FP({chartName:"AreaChart",GraphicalChild:rn,axisComponents:[{axisType:"xAxis",AxisComp:Kn},{axisType:"yAxis",AxisComp:jn}],formatAxisMap:qO});function Qf(e){if(!e)return"0 B";const t=["B","KB","MB","GB"];let r=e,n=0;for(;r>=1024&&n<t.length-1;)r/=1024,n++;return`${r.toFixed(1)} ${t[n]}`}function Uo({icon:e,label:t,value:r,color:n="sky"}){return s.jsxs("div",{className:"bg-navy-700 border border-navy-400 rounded-xl p-4",children:[s.jsxs("div",{className:"flex items-center gap-2 mb-2",children:[s.jsx(e,{size:14,className:`text-${n}-400`}),s.jsx("span",{className:"text-slate-400 text-xs font-medium",children:t})]}),s.jsx("div",{className:"text-xl font-bold text-slate-100",children:r})]})}const hce=({active:e,payload:t,label:r})=>e&&t?.length?s.jsxs("div",{className:"bg-navy-800 border border-navy-400 rounded-lg px-3 py-2 text-xs",children:[s.jsx("div",{className:"text-slate-400 mb-1",children:r}),s.jsxs("div",{className:"text-sky-400 font-medium",children:[t[0]?.value?.toFixed(2),"%"]})]}):null;function pce(){const{uuid:e}=wi(),[t,r]=N.useState(""),[n,a]=N.useState(null),[i,o]=N.useState([]),[l,c]=N.useState(""),[u,d]=N.useState(0),f=N.useRef(null);N.useEffect(()=>{Q.get(`/vms/${e}`).then(x=>r(x.data.name)).catch(()=>{})},[e]);const h=()=>{Q.get(`/vms/${e}/stats`).then(x=>{a(x.data),c(""),d(g=>{const v=g+1;return o(p=>[...p,{t:v,cpu:x.data.cpu_usage}].slice(-30)),v})}).catch(x=>{const g=x.response?.data?.error||"Error fetching stats";c(g)})};return N.useEffect(()=>(h(),f.current=setInterval(h,2e3),()=>clearInterval(f.current)),[e]),s.jsxs("div",{className:"space-y-5",children:[s.jsxs("div",{className:"flex items-center gap-4",children:[s.jsx(Ht,{to:`/vms/${e}`,className:"text-slate-400 hover:text-sky-400 transition-colors",children:s.jsx(ga,{size:18})}),s.jsxs("div",{children:[s.jsxs("h2",{className:"text-xl font-bold text-slate-100 flex items-center gap-2",children:[s.jsx(Yt,{size:18,className:"text-sky-400"}),"Monitor: ",t||e]}),s.jsx("p",{className:"text-slate-400 text-sm mt-0.5",children:"Live stats — polling every 2 seconds"})]})]}),l&&s.jsx("div",{className:"bg-yellow-900/50 border border-yellow-700 text-yellow-300 text-sm rounded-xl px-4 py-3",children:l}),s.jsxs("div",{className:"grid grid-cols-2 md:grid-cols-3 gap-4",children:[s.jsx(Uo,{icon:Jt,label:"CPU Usage",value:n?.cpu_usage!=null?`${n.cpu_usage}%`:"—",color:"sky"}),s.jsx(Uo,{icon:xi,label:"Memory Used",value:n?`${(n.mem_used/1024).toFixed(1)} GB`:"—",color:"purple"}),s.jsx(Uo,{icon:jr,label:"Disk Read",value:n?Qf(n.disk_read):"—",color:"green"}),s.jsx(Uo,{icon:jr,label:"Disk Write",value:n?Qf(n.disk_write):"—",color:"yellow"}),s.jsx(Uo,{icon:Br,label:"Net RX",value:n?Qf(n.net_rx):"—",color:"blue"}),s.jsx(Uo,{icon:Br,label:"Net TX",value:n?Qf(n.net_tx):"—",color:"orange"})]}),s.jsxs("div",{className:"bg-navy-700 border border-navy-400 rounded-xl p-5",children:[s.jsxs("h3",{className:"text-sky-400 font-semibold mb-4 flex items-center gap-2",children:[s.jsx(Jt,{size:15})," CPU Usage Over Time"]}),i.length>1?s.jsx(as,{width:"100%",height:200,children:s.jsxs(ap,{data:i,margin:{top:5,right:10,left:-20,bottom:5},children:[s.jsx(ss,{strokeDasharray:"3 3",stroke:"#1a3a5c"}),s.jsx(Kn,{dataKey:"t",tick:!1,axisLine:!1}),s.jsx(jn,{domain:[0,100],tick:{fill:"#64748b",fontSize:11},tickFormatter:x=>`${x}%`}),s.jsx(dr,{content:s.jsx(hce,{})}),s.jsx(vi,{type:"monotone",dataKey:"cpu",stroke:"#0ea5e9",strokeWidth:2,dot:!1,isAnimationActive:!1})]})}):s.jsx("div",{className:"flex items-center justify-center h-48 text-slate-400 text-sm",children:"Collecting data..."})]})]})}function mce(e){if(!e)return"0 B";const t=["B","KB","MB","GB","TB"];let r=0;for(;e>=1024&&r<t.length-1;)e/=1024,r++;return`${e.toFixed(r===0?0:1)} ${t[r]}`}function DP(e){if(!e)return"—";const t=Date.now()-new Date(e).getTime(),r=Math.floor(t/1e3);return r<60?`${r}s ago`:r<3600?`${Math.floor(r/60)}m ago`:r<86400?`${Math.floor(r/3600)}h ago`:`${Math.floor(r/86400)}d ago`}function xce(e){if(!e||typeof e!="object")return"—";const t=[];for(const[r,n]of Object.entries(e))n&&Array.isArray(n)?n.forEach(a=>t.push(`${a.HostPort}→${r}`)):t.push(r);return t.length?t.join(", "):"—"}function vce({status:e}){const t=(e||"").toLowerCase(),r=t==="running"?"text-green-400 bg-green-400/10 ring-green-400/30":t==="exited"||t==="stopped"?"text-red-400 bg-red-400/10 ring-red-400/30":t==="paused"?"text-yellow-400 bg-yellow-400/10 ring-yellow-400/30":"text-slate-400 bg-slate-400/10 ring-slate-400/30";return s.jsxs("span",{className:`inline-flex items-center gap-1 px-2 py-0.5 rounded-full text-xs font-medium ring-1 ${r}`,children:[s.jsx("span",{className:"w-1.5 h-1.5 rounded-full bg-current"}),e]})}function kn({children:e,onClick:t,variant:r="ghost",size:n="sm",disabled:a,loading:i,className:o=""}){const l="inline-flex items-center gap-1.5 rounded font-medium transition-all disabled:opacity-40 disabled:cursor-not-allowed",c={sm:"px-2.5 py-1.5 text-xs",md:"px-4 py-2 text-sm"},u={ghost:"text-slate-400 hover:text-sky-300 hover:bg-navy-600",primary:"bg-sky-600 hover:bg-sky-500 text-white",danger:"text-red-400 hover:text-red-300 hover:bg-red-400/10",success:"text-green-400 hover:text-green-300 hover:bg-green-400/10"};return s.jsx("button",{onClick:t,disabled:a||i,className:`${l} ${c[n]} ${u[r]} ${o}`,children:i?s.jsx(Ne,{size:12,className:"animate-spin"}):e})}function yce({msg:e,type:t,onClose:r}){if(N.useEffect(()=>{if(e){const a=setTimeout(r,4e3);return()=>clearTimeout(a)}},[e]),!e)return null;const n=t==="error"?"bg-red-900/80 border-red-700 text-red-200":"bg-green-900/80 border-green-700 text-green-200";return s.jsxs("div",{className:`fixed bottom-5 right-5 flex items-center gap-2 px-4 py-3 rounded-lg border text-sm z-50 shadow-xl ${n}`,children:[t==="error"?s.jsx(An,{size:16}):s.jsx(Ye,{size:16}),e,s.jsx("button",{onClick:r,className:"ml-2 opacity-70 hover:opacity-100",children:s.jsx(Lr,{size:14})})]})}function jm({title:e,icon:t,count:r,onRefresh:n,refreshing:a,extra:i}){return s.jsxs("div",{className:"flex items-center justify-between mb-4",children:[s.jsxs("div",{className:"flex items-center gap-2",children:[s.jsx(t,{size:18,className:"text-sky-400"}),s.jsx("h2",{className:"text-slate-200 font-semibold text-base",children:e}),r!==void 0&&s.jsx("span",{className:"text-xs bg-navy-600 text-slate-400 px-2 py-0.5 rounded-full",children:r})]}),s.jsxs("div",{className:"flex items-center gap-2",children:[i,n&&s.jsxs(kn,{onClick:n,disabled:a,children:[s.jsx(Xe,{size:13,className:a?"animate-spin":""}),"Refresh"]})]})]})}function km({message:e}){return s.jsxs("div",{className:"flex flex-col items-center justify-center py-14 text-slate-500",children:[s.jsx(n1,{size:36,className:"mb-3 opacity-30"}),s.jsx("p",{className:"text-sm",children:e})]})}function gce({info:e}){if(!e)return null;const t=[{label:"Running",value:e.containers_running,color:"text-green-400",bg:"bg-green-400/10"},{label:"Stopped",value:e.containers_stopped,color:"text-red-400",bg:"bg-red-400/10"},{label:"Images",value:e.images,color:"text-sky-400",bg:"bg-sky-400/10"},{label:"Engine",value:`v${e.server_version}`,color:"text-purple-400",bg:"bg-purple-400/10"}];return s.jsx("div",{className:"grid grid-cols-2 sm:grid-cols-4 gap-3 mb-6",children:t.map(r=>s.jsxs("div",{className:"bg-navy-800 border border-navy-600 rounded-lg px-4 py-3",children:[s.jsx("p",{className:"text-xs text-slate-500 mb-1",children:r.label}),s.jsx("p",{className:`text-2xl font-bold ${r.color}`,children:r.value})]},r.label))})}function bce({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState(!0),[i,o]=N.useState({}),[l,c]=N.useState({}),[u,d]=N.useState({}),f=N.useCallback(async()=>{a(!0);try{const p=await Q.get("/docker/containers");r(p.data)}catch(p){e(p.response?.data?.error||"Failed to load containers","error")}finally{a(!1)}},[]);N.useEffect(()=>{f()},[f]);const h=async(p,m,y="post")=>{o(b=>({...b,[p]:!0}));try{await Q[y](`/docker/containers/${p}/${m}`),e("Done","ok"),await f()}catch(b){e(b.response?.data?.error||"Action failed","error")}finally{o(b=>({...b,[p]:!1}))}},x=async(p,m)=>{if(confirm(`Remove container "${m}"?`)){o(y=>({...y,[p]:!0}));try{await Q.delete(`/docker/containers/${p}?force=true`),e("Container removed","ok"),r(y=>y.filter(b=>b.id!==p))}catch(y){e(y.response?.data?.error||"Remove failed","error")}finally{o(y=>({...y,[p]:!1}))}}},g=async p=>{if(l[p]){c(m=>({...m,[p]:!1}));return}if(c(m=>({...m,[p]:!0})),!u[p])try{const m=await Q.get(`/docker/containers/${p}/logs?tail=100`);d(y=>({...y,[p]:m.data.logs}))}catch{d(m=>({...m,[p]:"Failed to load logs."}))}},v=(p,m)=>{window.open(`/docker-exec?container_id=${encodeURIComponent(p)}&name=${encodeURIComponent(m)}`,"_blank","width=900,height=600,noopener,noreferrer")};return n?s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"}),"Loading containers…"]}):t.length?s.jsxs("div",{className:"space-y-2",children:[s.jsx(jm,{title:"Containers",icon:r1,count:t.length,onRefresh:f,refreshing:n}),s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Name"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Image"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Status"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Ports"}),s.jsx("th",{className:"text-right px-4 py-3 text-slate-400 font-medium",children:"Actions"})]})}),s.jsx("tbody",{children:t.map(p=>s.jsxs(s.Fragment,{children:[s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 transition-colors",children:[s.jsxs("td",{className:"px-4 py-3",children:[s.jsxs("div",{className:"flex items-center gap-2",children:[s.jsx("button",{onClick:()=>g(p.id),className:"text-slate-500 hover:text-sky-400 transition-colors",children:l[p.id]?s.jsx(pn,{size:14}):s.jsx(ir,{size:14})}),s.jsx("span",{className:"text-slate-200 font-mono",children:p.name})]}),s.jsx("div",{className:"text-xs text-slate-500 font-mono ml-5",children:p.id})]}),s.jsx("td",{className:"px-4 py-3 text-slate-300 font-mono text-xs",children:p.image}),s.jsx("td",{className:"px-4 py-3",children:s.jsx(vce,{status:p.status})}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs font-mono",children:xce(p.ports)}),s.jsx("td",{className:"px-4 py-3",children:s.jsxs("div",{className:"flex items-center justify-end gap-0.5",children:[p.status==="running"?s.jsxs(s.Fragment,{children:[s.jsx(kn,{onClick:()=>h(p.id,"stop"),loading:i[p.id],title:"Stop",children:s.jsx(Ku,{size:13})}),s.jsx(kn,{onClick:()=>h(p.id,"restart"),loading:i[p.id],title:"Restart",children:s.jsx(BF,{size:13})}),s.jsx(kn,{onClick:()=>v(p.id,p.name),title:"Shell",className:"text-sky-400 hover:text-sky-300 hover:bg-sky-400/10",children:s.jsx(Ya,{size:13})})]}):s.jsx(kn,{onClick:()=>h(p.id,"start"),loading:i[p.id],title:"Start",className:"text-green-400 hover:text-green-300 hover:bg-green-400/10",children:s.jsx(xo,{size:13})}),s.jsx(kn,{onClick:()=>x(p.id,p.name),loading:i[p.id],variant:"danger",title:"Remove",children:s.jsx(Et,{size:13})})]})})]},p.id),l[p.id]&&s.jsx("tr",{className:"bg-navy-900/70",children:s.jsxs("td",{colSpan:5,className:"px-4 py-3",children:[s.jsx("div",{className:"text-xs text-slate-400 mb-1 font-semibold",children:"Logs (last 100 lines)"}),s.jsx("pre",{className:"bg-black/40 rounded p-3 text-xs font-mono text-green-300 overflow-x-auto max-h-56 overflow-y-auto whitespace-pre-wrap break-all",children:u[p.id]||"Loading…"})]})},`${p.id}-logs`)]}))})]})})]}):s.jsx(km,{message:"No containers found"})}function _ce({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState(!0),[i,o]=N.useState(!1),[l,c]=N.useState(""),[u,d]=N.useState({}),f=N.useCallback(async()=>{a(!0);try{const v=await Q.get("/docker/images");r(v.data)}catch(v){e(v.response?.data?.error||"Failed to load images","error")}finally{a(!1)}},[]);N.useEffect(()=>{f()},[f]);const h=async()=>{const v=l.trim();if(v){o(!0);try{await Q.post("/docker/images/pull",{image:v}),e(`Pulled ${v}`,"ok"),c(""),await f()}catch(p){e(p.response?.data?.error||"Pull failed","error")}finally{o(!1)}}},x=async(v,p)=>{if(confirm(`Remove image "${p||v}"?`)){d(m=>({...m,[v]:!0}));try{await Q.post("/docker/images/remove",{id:v,force:!1}),e("Image removed","ok"),r(m=>m.filter(y=>y.id!==v))}catch(m){e(m.response?.data?.error||"Remove failed","error")}finally{d(m=>({...m,[v]:!1}))}}},g=s.jsxs("div",{className:"flex gap-2",children:[s.jsx("input",{value:l,onChange:v=>c(v.target.value),onKeyDown:v=>v.key==="Enter"&&h(),placeholder:"ubuntu:22.04",className:"bg-navy-700 border border-navy-500 rounded px-3 py-1.5 text-sm text-slate-200 placeholder-slate-500 focus:outline-none focus:border-sky-500 w-48"}),s.jsxs(kn,{onClick:h,loading:i,variant:"primary",size:"sm",children:[s.jsx(_a,{size:13})," Pull"]})]});return n?s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"}),"Loading images…"]}):s.jsxs("div",{className:"space-y-4",children:[s.jsx(jm,{title:"Images",icon:a1,count:t.length,onRefresh:f,refreshing:n,extra:g}),t.length?s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Tag"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"ID"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Size"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Created"}),s.jsx("th",{className:"text-right px-4 py-3 text-slate-400 font-medium",children:"Actions"})]})}),s.jsx("tbody",{children:t.map(v=>s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 transition-colors",children:[s.jsx("td",{className:"px-4 py-3 text-slate-200 font-mono text-xs",children:v.tags.length?v.tags.map(p=>s.jsx("div",{children:p},p)):s.jsx("span",{className:"text-slate-500",children:"<none>"})}),s.jsx("td",{className:"px-4 py-3 text-slate-400 font-mono text-xs",children:v.short_id}),s.jsx("td",{className:"px-4 py-3 text-slate-300 text-xs",children:mce(v.size)}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:DP(v.created)}),s.jsx("td",{className:"px-4 py-3 text-right",children:s.jsxs(kn,{onClick:()=>x(v.id,v.tags[0]),loading:u[v.id],variant:"danger",children:[s.jsx(Et,{size:13})," Remove"]})})]},v.id))})]})}):s.jsx(km,{message:"No images found"})]})}function wce({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState(!0),[i,o]=N.useState(!1),[l,c]=N.useState({name:"",driver:"bridge"}),[u,d]=N.useState(!1),[f,h]=N.useState({}),x=N.useCallback(async()=>{a(!0);try{const m=await Q.get("/docker/networks");r(m.data)}catch(m){e(m.response?.data?.error||"Failed to load networks","error")}finally{a(!1)}},[]);N.useEffect(()=>{x()},[x]);const g=async()=>{if(l.name.trim()){o(!0);try{await Q.post("/docker/networks",l),e("Network created","ok"),c({name:"",driver:"bridge"}),d(!1),await x()}catch(m){e(m.response?.data?.error||"Create failed","error")}finally{o(!1)}}},v=async(m,y)=>{if(confirm(`Remove network "${y}"?`)){h(b=>({...b,[m]:!0}));try{await Q.delete(`/docker/networks/${m}`),e("Network removed","ok"),r(b=>b.filter(_=>_.id!==m))}catch(b){e(b.response?.data?.error||"Remove failed","error")}finally{h(b=>({...b,[m]:!1}))}}},p=s.jsxs(kn,{onClick:()=>d(m=>!m),variant:"primary",size:"sm",children:[s.jsx(Sr,{size:13})," Create Network"]});return s.jsxs("div",{className:"space-y-4",children:[s.jsx(jm,{title:"Networks",icon:Br,count:t.length,onRefresh:x,refreshing:n,extra:p}),u&&s.jsxs("div",{className:"bg-navy-700/50 border border-navy-600 rounded-lg p-4 flex flex-wrap gap-3 items-end",children:[s.jsxs("div",{children:[s.jsx("label",{className:"block text-xs text-slate-400 mb-1",children:"Name"}),s.jsx("input",{value:l.name,onChange:m=>c(y=>({...y,name:m.target.value})),onKeyDown:m=>m.key==="Enter"&&g(),placeholder:"my-network",className:"bg-navy-800 border border-navy-500 rounded px-3 py-1.5 text-sm text-slate-200 placeholder-slate-500 focus:outline-none focus:border-sky-500 w-44"})]}),s.jsxs("div",{children:[s.jsx("label",{className:"block text-xs text-slate-400 mb-1",children:"Driver"}),s.jsx("select",{value:l.driver,onChange:m=>c(y=>({...y,driver:m.target.value})),className:"bg-navy-800 border border-navy-500 rounded px-3 py-1.5 text-sm text-slate-200 focus:outline-none focus:border-sky-500",children:["bridge","overlay","macvlan","host","none"].map(m=>s.jsx("option",{value:m,children:m},m))})]}),s.jsxs("div",{className:"flex gap-2",children:[s.jsx(kn,{onClick:g,loading:i,variant:"primary",size:"sm",children:"Create"}),s.jsx(kn,{onClick:()=>d(!1),size:"sm",children:"Cancel"})]})]}),n?s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"}),"Loading…"]}):t.length?s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Name"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Driver"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Scope"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Subnet"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Containers"}),s.jsx("th",{className:"text-right px-4 py-3 text-slate-400 font-medium",children:"Actions"})]})}),s.jsx("tbody",{children:t.map(m=>s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 transition-colors",children:[s.jsxs("td",{className:"px-4 py-3",children:[s.jsx("span",{className:"text-slate-200 font-medium",children:m.name}),s.jsx("div",{className:"text-xs text-slate-500 font-mono",children:m.id})]}),s.jsx("td",{className:"px-4 py-3 text-slate-300 text-xs",children:m.driver}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:m.scope}),s.jsx("td",{className:"px-4 py-3 text-slate-300 text-xs font-mono",children:m.subnet||"—"}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:m.containers}),s.jsx("td",{className:"px-4 py-3 text-right",children:!["bridge","host","none"].includes(m.name)&&s.jsxs(kn,{onClick:()=>v(m.id,m.name),loading:f[m.id],variant:"danger",children:[s.jsx(Et,{size:13})," Remove"]})})]},m.id))})]})}):s.jsx(km,{message:"No networks found"})]})}function jce({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState(!0),[i,o]=N.useState({}),l=N.useCallback(async()=>{a(!0);try{const u=await Q.get("/docker/volumes");r(u.data)}catch(u){e(u.response?.data?.error||"Failed to load volumes","error")}finally{a(!1)}},[]);N.useEffect(()=>{l()},[l]);const c=async u=>{if(confirm(`Remove volume "${u}"?`)){o(d=>({...d,[u]:!0}));try{await Q.delete(`/docker/volumes/${encodeURIComponent(u)}`),e("Volume removed","ok"),r(d=>d.filter(f=>f.name!==u))}catch(d){e(d.response?.data?.error||"Remove failed","error")}finally{o(d=>({...d,[u]:!1}))}}};return n?s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"}),"Loading volumes…"]}):s.jsxs("div",{className:"space-y-4",children:[s.jsx(jm,{title:"Volumes",icon:jr,count:t.length,onRefresh:l,refreshing:n}),t.length?s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Name"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Driver"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Mountpoint"}),s.jsx("th",{className:"text-left px-4 py-3 text-slate-400 font-medium",children:"Created"}),s.jsx("th",{className:"text-right px-4 py-3 text-slate-400 font-medium",children:"Actions"})]})}),s.jsx("tbody",{children:t.map(u=>s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 transition-colors",children:[s.jsx("td",{className:"px-4 py-3 text-slate-200 font-mono text-xs",children:u.name}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:u.driver}),s.jsx("td",{className:"px-4 py-3 text-slate-300 text-xs font-mono truncate max-w-xs",children:u.mountpoint}),s.jsx("td",{className:"px-4 py-3 text-slate-400 text-xs",children:DP(u.created)}),s.jsx("td",{className:"px-4 py-3 text-right",children:s.jsxs(kn,{onClick:()=>c(u.name),loading:i[u.name],variant:"danger",children:[s.jsx(Et,{size:13})," Remove"]})})]},u.name))})]})}):s.jsx(km,{message:"No volumes found"})]})}const kce=[{id:"containers",label:"Containers",icon:r1},{id:"images",label:"Images",icon:a1},{id:"networks",label:"Networks",icon:Br},{id:"volumes",label:"Volumes",icon:jr}];function Sce(){const[e,t]=N.useState("containers"),[r,n]=N.useState(null),[a,i]=N.useState(!0),[o,l]=N.useState({msg:"",type:"ok"}),c=(d,f="ok")=>l({msg:d,type:f}),u=()=>l({msg:"",type:"ok"});return N.useEffect(()=>{Q.get("/docker/info").then(d=>n(d.data)).catch(()=>i(!1))},[]),a?s.jsxs("div",{className:"space-y-5",children:[s.jsx(gce,{info:r}),s.jsx("div",{className:"flex gap-1 bg-navy-800 border border-navy-600 rounded-lg p-1 w-fit",children:kce.map(d=>{const f=d.icon;return s.jsxs("button",{onClick:()=>t(d.id),className:`flex items-center gap-2 px-4 py-2 rounded text-sm font-medium transition-all ${e===d.id?"bg-sky-600 text-white shadow":"text-slate-400 hover:text-sky-300 hover:bg-navy-700"}`,children:[s.jsx(f,{size:15}),d.label]},d.id)})}),s.jsxs("div",{children:[e==="containers"&&s.jsx(bce,{notify:c}),e==="images"&&s.jsx(_ce,{notify:c}),e==="networks"&&s.jsx(wce,{notify:c}),e==="volumes"&&s.jsx(jce,{notify:c})]}),s.jsx(yce,{msg:o.msg,type:o.type,onClose:u})]}):s.jsxs("div",{className:"flex flex-col items-center justify-center py-20 text-slate-400",children:[s.jsx(An,{size:40,className:"mb-4 text-red-400"}),s.jsx("h2",{className:"text-lg font-semibold text-slate-300 mb-2",children:"Docker not available"}),s.jsx("p",{className:"text-sm",children:"Make sure Docker is installed and the daemon is running."}),s.jsx("code",{className:"mt-3 bg-navy-800 px-3 py-1.5 rounded text-xs text-green-400",children:"sudo apt install docker.io && sudo systemctl enable --now docker"})]})}function gN(e){if(!e)return"0 B";const t=["B","KB","MB","GB","TB"];let r=0;for(;e>=1024&&r<t.length-1;)e/=1024,r++;return`${e.toFixed(1)} ${t[r]}`}function Xs({children:e,onClick:t,variant:r="ghost",size:n="sm",disabled:a,loading:i,className:o=""}){const l="inline-flex items-center gap-1.5 rounded font-medium transition-all disabled:opacity-40 disabled:cursor-not-allowed",c={sm:"px-2.5 py-1.5 text-xs",md:"px-4 py-2 text-sm"},u={ghost:"text-slate-400 hover:text-sky-300 hover:bg-navy-600",primary:"bg-sky-600 hover:bg-sky-500 text-white",success:"bg-green-700 hover:bg-green-600 text-white",danger:"text-red-400 hover:text-red-300 hover:bg-red-400/10",warning:"bg-yellow-700 hover:bg-yellow-600 text-white"};return s.jsx("button",{onClick:t,disabled:a||i,className:`${l} ${c[n]} ${u[r]} ${o}`,children:i?s.jsx(Ne,{size:12,className:"animate-spin"}):e})}function Nce({msg:e,type:t,onClose:r}){if(N.useEffect(()=>{if(e){const i=setTimeout(r,5e3);return()=>clearTimeout(i)}},[e]),!e)return null;const n=t==="error"?"bg-red-900/90 border-red-700 text-red-200":t==="warn"?"bg-yellow-900/90 border-yellow-700 text-yellow-200":"bg-green-900/90 border-green-700 text-green-200",a=t==="error"?An:t==="warn"?Fp:Ye;return s.jsxs("div",{className:`fixed bottom-5 right-5 flex items-center gap-2 px-4 py-3 rounded-lg border text-sm z-50 shadow-xl max-w-md ${n}`,children:[s.jsx(a,{size:16,className:"flex-shrink-0"}),s.jsx("span",{children:e}),s.jsx("button",{onClick:r,className:"ml-2 opacity-70 hover:opacity-100",children:s.jsx(Lr,{size:14})})]})}function Cce({iface:e}){const t=e.operstate==="UP",r=e.link_type==="loopback",n=e.addresses.filter(o=>o.family==="inet"),a=e.addresses.filter(o=>o.family==="inet6"),i=r?"Loopback":e.name.startsWith("virbr")?"Bridge (libvirt)":e.name.startsWith("docker")||e.name.startsWith("br-")?"Bridge (docker)":e.name.startsWith("vnet")?"VM tap":"Ethernet";return s.jsxs("div",{className:`bg-navy-800 border rounded-lg p-4 ${t?"border-navy-600":"border-navy-700 opacity-70"}`,children:[s.jsxs("div",{className:"flex items-start justify-between mb-3",children:[s.jsxs("div",{className:"flex items-center gap-2",children:[t?s.jsx(Ud,{size:18,className:"text-green-400 flex-shrink-0"}):s.jsx(uy,{size:18,className:"text-slate-500 flex-shrink-0"}),s.jsxs("div",{children:[s.jsx("div",{className:"text-slate-100 font-semibold font-mono",children:e.name}),s.jsx("div",{className:"text-xs text-slate-500",children:i})]})]}),s.jsx("span",{className:`text-xs px-2 py-0.5 rounded-full font-semibold ring-1 ${t?"text-green-400 bg-green-400/10 ring-green-400/30":"text-slate-400 bg-slate-400/10 ring-slate-400/30"}`,children:e.operstate})]}),s.jsxs("div",{className:"space-y-1 mb-3",children:[n.map(o=>s.jsxs("div",{className:"flex items-center gap-2",children:[s.jsx("span",{className:"text-xs bg-sky-900/50 text-sky-300 px-1.5 rounded font-mono",children:"IPv4"}),s.jsx("span",{className:"text-slate-200 font-mono text-sm",children:o.cidr})]},o.cidr)),a.filter(o=>o.scope!=="host").map(o=>s.jsxs("div",{className:"flex items-center gap-2",children:[s.jsx("span",{className:"text-xs bg-purple-900/50 text-purple-300 px-1.5 rounded font-mono",children:"IPv6"}),s.jsx("span",{className:"text-slate-400 font-mono text-xs truncate",children:o.cidr})]},o.cidr)),e.addresses.length===0&&s.jsx("span",{className:"text-xs text-slate-500",children:"No addresses"})]}),s.jsxs("div",{className:"flex flex-wrap gap-3 text-xs text-slate-500 border-t border-navy-700 pt-2",children:[e.mac&&e.mac!=="00:00:00:00:00:00"&&s.jsx("span",{title:"MAC",children:e.mac}),s.jsxs("span",{children:["MTU ",e.mtu]})]}),(e.tx_bytes>0||e.rx_bytes>0)&&s.jsxs("div",{className:"flex gap-4 mt-2 text-xs text-slate-500",children:[s.jsxs("span",{className:"flex items-center gap-1",children:[s.jsx(NF,{size:11,className:"text-sky-500"}),"↑ ",gN(e.tx_bytes)," / ↓ ",gN(e.rx_bytes)]}),(e.tx_errors>0||e.rx_errors>0)&&s.jsxs("span",{className:"text-red-400",children:["Err: TX ",e.tx_errors," / RX ",e.rx_errors]})]})]})}function Ece({notify:e}){const[t,r]=N.useState([]),[n,a]=N.useState([]),[i,o]=N.useState(null),[l,c]=N.useState(!0),u=N.useCallback(async()=>{c(!0);try{const[f,h,x]=await Promise.all([Q.get("/network/interfaces"),Q.get("/network/routes"),Q.get("/network/dns")]);r(f.data),a(h.data.filter(g=>g.family==="inet")),o(x.data)}catch(f){e(f.response?.data?.error||"Failed to load network data","error")}finally{c(!1)}},[]);if(N.useEffect(()=>{u()},[u]),l)return s.jsxs("div",{className:"flex items-center gap-2 text-slate-400 py-8",children:[s.jsx(Ne,{size:18,className:"animate-spin"})," Loading interfaces…"]});const d=[...t].sort((f,h)=>{const x=g=>g.link_type==="loopback"?99:g.name.startsWith("enp")||g.name.startsWith("eth")?0:g.name.startsWith("virbr")?2:g.name.startsWith("docker")||g.name.startsWith("br-")?3:1;return x(f)-x(h)});return s.jsxs("div",{className:"space-y-6",children:[s.jsxs("div",{children:[s.jsxs("div",{className:"flex items-center justify-between mb-3",children:[s.jsxs("h3",{className:"text-slate-300 font-semibold flex items-center gap-2",children:[s.jsx(Ud,{size:16,className:"text-sky-400"})," Interfaces"]}),s.jsxs(Xs,{onClick:u,disabled:l,children:[s.jsx(Xe,{size:13})," Refresh"]})]}),s.jsx("div",{className:"grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-3",children:d.map(f=>s.jsx(Cce,{iface:f},f.name))})]}),s.jsxs("div",{children:[s.jsxs("h3",{className:"text-slate-300 font-semibold flex items-center gap-2 mb-3",children:[s.jsx(KF,{size:16,className:"text-sky-400"})," IPv4 Routing Table"]}),s.jsx("div",{className:"overflow-x-auto rounded-lg border border-navy-600",children:s.jsxs("table",{className:"w-full text-sm",children:[s.jsx("thead",{children:s.jsxs("tr",{className:"border-b border-navy-600 bg-navy-700/50",children:[s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Destination"}),s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Gateway"}),s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Interface"}),s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Protocol"}),s.jsx("th",{className:"text-left px-4 py-2.5 text-slate-400 font-medium text-xs",children:"Src"})]})}),s.jsx("tbody",{children:n.map((f,h)=>s.jsxs("tr",{className:"border-b border-navy-700 hover:bg-navy-700/30 text-xs",children:[s.jsx("td",{className:"px-4 py-2.5 font-mono text-slate-200",children:f.dst==="default"?s.jsxs("span",{className:"flex items-center gap-1",children:[s.jsx($p,{size:11,className:"text-sky-400"})," default"]}):f.dst}),s.jsx("td",{className:"px-4 py-2.5 font-mono text-slate-300",children:f.gateway||"—"}),s.jsx("td",{className:"px-4 py-2.5 text-slate-300",children:f.dev}),s.jsx("td",{className:"px-4 py-2.5 text-slate-500",children:f.protocol||"—"}),s.jsx("td",{className:"px-4 py-2.5 font-mono text-slate-400",children:f.prefsrc||"—"})]},h))})]})})]}),i&&s.jsxs("div",{children:[s.jsxs("h3",{className:"text-slate-300 font-semibold flex items-center gap-2 mb-3",children:[s.jsx(OF,{size:16,className:"text-sky-400"})," DNS"]}),s.jsxs("div",{className:"bg-navy-800 border border-navy-600 rounded-lg p-4 flex flex-wrap gap-8",children:[s.jsxs("div",{children:[s.jsx("p",{className:"text-xs text-slate-500 mb-1.5",children:"Nameservers"}),i.servers.length?i.servers.map(f=>s.jsx("div",{className:"text-slate-200 font-mono text-sm",children:f},f)):s.jsx("span",{className:"text-slate-500 text-sm",children:"None configured"})]}),i.search.length>0&&s.jsxs("div",{children:[s.jsx("p",{className:"text-xs text-slate-500 mb-1.5",children:"Search Domains"}),i.search.map(f=>s.jsx("div",{className:"text-slate-200 font-mono text-sm",children:f},f))]})]})]})]})}const Ace=`network:
   version: 2
   ethernets:
     # Example: static IP
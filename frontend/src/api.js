@@ -12,4 +12,30 @@ api.interceptors.response.use(
   }
 )
 
+// Long-running operations answer 202 with a job status_url; wait for the job
+// so callers get the job's result as if the request had been synchronous.
+// Give up after JOB_POLL_TIMEOUT_MS; the job keeps running and stays on the
+// Jobs page.
+const JOB_POLL_TIMEOUT_MS = 30 * 60 * 1000
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms))
+
+api.interceptors.response.use(async r => {
+  if (r.status !== 202 || !r.data?.status_url) return r
+  const deadline = Date.now() + JOB_POLL_TIMEOUT_MS
+  while (Date.now() < deadline) {
+    await sleep(1000)
+    const { data: job } = await axios.get(r.data.status_url, { withCredentials: true })
+    if (job.status === 'done') return { ...r, status: 200, data: job.result }
+    if (['error', 'cancelled', 'interrupted'].includes(job.status)) {
+      const err = new Error(job.error || `Job ${job.status}`)
+      err.response = { status: 500, data: { error: job.error || `Job ${job.status}` } }
+      throw err
+    }
+  }
+  const error = `Job still running after ${JOB_POLL_TIMEOUT_MS / 60000} minutes — check the Jobs page`
+  const err = new Error(error)
+  err.response = { status: 504, data: { error } }
+  throw err
+})
+
 export default api
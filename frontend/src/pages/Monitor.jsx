@@ -104,7 +104,7 @@ export default function Monitor() {
 
       {/* Stat cards */}
       <div className="grid grid-cols-2 md:grid-cols-3 gap-4">
-        <StatCard icon={Cpu} label="CPU Usage" value={stats ? `${stats.cpu_usage}%` : '—'} color="sky" />
+        <StatCard icon={Cpu} label="CPU Usage" value={stats?.cpu_usage != null ? `${stats.cpu_usage}%` : '—'} color="sky" />
         <StatCard icon={MemoryStick} label="Memory Used" value={stats ? `${(stats.mem_used / 1024).toFixed(1)} GB` : '—'} color="purple" />
         <StatCard icon={HardDrive} label="Disk Read" value={stats ? bytesHuman(stats.disk_read) : '—'} color="green" />
         <StatCard icon={HardDrive} label="Disk Write" value={stats ? bytesHuman(stats.disk_write) : '—'} color="yellow" />
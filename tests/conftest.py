@@ -2,7 +2,9 @@
 Shared pytest fixtures for VM Manager tests.
 """
 import json
+import os
 import sys
+import tempfile
 import types
 import threading
 from pathlib import Path
@@ -28,6 +30,7 @@ def _make_libvirt_stub():
     lv.VIR_DOMAIN_PMSUSPENDED = 7
     lv.VIR_DOMAIN_AFFECT_LIVE   = 1
     lv.VIR_DOMAIN_AFFECT_CONFIG = 2
+    lv.VIR_CONNECT_LIST_STORAGE_POOLS_ACTIVE = 2
     return lv
 
 
@@ -71,6 +74,17 @@ for mod_name in ('libvirt', 'psutil', 'simplepam', 'flask_limiter', 'docker'):
         else:
             sys.modules[mod_name] = MagicMock()
 
+# Keep the shared metrics ring, job files and warm pool / capacity / alert config out of the working tree
+os.environ.setdefault('METRICS_RING', os.path.join(tempfile.mkdtemp(), 'metrics.ring'))
+os.environ.setdefault('JOBS_DIR', os.path.join(tempfile.mkdtemp(), 'jobs'))
+os.environ.setdefault('WARM_POOL_CONFIG', os.path.join(tempfile.mkdtemp(), 'warm_pool.json'))
+os.environ.setdefault('CAPACITY_CONFIG', os.path.join(tempfile.mkdtemp(), 'capacity.json'))
+os.environ.setdefault('ALERTS_CONFIG', os.path.join(tempfile.mkdtemp(), 'alerts.json'))
+# MagicMock hypervisors report a 1-CPU / 1 MiB host; only tests/test_capacity.py enforces
+if not os.path.exists(os.environ['CAPACITY_CONFIG']):
+    with open(os.environ['CAPACITY_CONFIG'], 'w') as fh:
+        json.dump({'enforce': False}, fh)
+
 # ── Flask app fixture ─────────────────────────────────────────────────────────
 
 @pytest.fixture(scope='session')
@@ -104,6 +118,15 @@ def anon_client(app):
         yield c
 
 
+@pytest.fixture(autouse=True)
+def _fresh_libvirt_pool():
+    """Drop pooled connections so each test sees its own patched libvirt.open."""
+    from views import libvirt_pool
+    libvirt_pool.reset_pool()
+    yield
+    libvirt_pool.reset_pool()
+
+
 # ── OpenShift job helpers ─────────────────────────────────────────────────────
 
 @pytest.fixture
@@ -0,0 +1,148 @@
+"""
+Unit tests for views/alerts.py — the collector-driven alert engine.
+
+Covers:
+  - _Window        incremental mean / slope match a full recompute
+  - observe()      for-duration, hysteresis, per-VM subjects, sinks
+  - persistence    active alerts survive a reload; other workers' writes are re-read
+  - /api/alerts    listing and rule validation
+"""
+import collections
+import json
+
+import numpy as np
+import pytest
+
+from views import alerts
+
+
+CPU_RULE = {'id': 'cpu', 'name': 'CPU high', 'scope': 'host', 'series': 'cpu',
+            'op': '>', 'value': 90, 'for': 60, 'clear': 80}
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(alerts, 'RULES_FILE', str(tmp_path / 'alerts.json'))
+    monkeypatch.setattr(alerts, 'ALERT_STATE', str(tmp_path / 'state.json'))
+    monkeypatch.setattr(alerts, 'ALERT_LOG', str(tmp_path / 'alerts.log'))
+    monkeypatch.setattr(alerts, '_states', {})
+    monkeypatch.setattr(alerts, '_windows', {})
+    monkeypatch.setattr(alerts, '_events', collections.deque(maxlen=200))
+    monkeypatch.setattr(alerts, '_rules', [CPU_RULE])
+    monkeypatch.setattr(alerts, '_webhook', '')
+    monkeypatch.setattr(alerts, '_mtimes', {'rules': None, 'state': None})
+    return tmp_path
+
+
+def _feed(values, start=0, step=15, subject='host', scope='host'):
+    for i, v in enumerate(values):
+        alerts.observe(scope, subject, subject, start + i * step, {'cpu': v})
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Incremental window
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestWindow:
+    def test_matches_full_recompute(self):
+        rng = np.random.default_rng(1)
+        w = alerts._Window(300)
+        xs, ys = [], []
+        for i in range(200):
+            ts, v = 1_700_000_000 + i * 15, float(rng.random() * 100)
+            w.push(ts, v)
+            xs.append(ts); ys.append(v)
+        x = np.array(xs[-21:], dtype=float)   # 300 s window at 15 s = 21 points
+        y = np.array(ys[-21:])
+        assert len(w.points) == 21
+        assert w.avg() == pytest.approx(y.mean())
+        assert w.slope() == pytest.approx(np.polyfit(x, y, 1)[0] * 60)
+
+    def test_slope_needs_two_points(self):
+        w = alerts._Window(60)
+        w.push(0, 1.0)
+        assert w.slope() is None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rule evaluation
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestObserve:
+    def test_fires_after_for_duration(self, engine):
+        _feed([95, 95, 95, 95])                 # t = 0..45: still pending
+        assert alerts.active_alerts()[0]['state'] == 'pending'
+        _feed([95], start=60)
+        assert alerts.active_alerts()[0]['state'] == 'firing'
+        assert [e['status'] for e in alerts._events] == ['firing']
+
+    def test_dip_resets_pending(self, engine):
+        _feed([95, 95, 50, 95, 95], step=15)
+        assert alerts.active_alerts()[0]['state'] == 'pending'
+        assert not alerts._events
+
+    def test_hysteresis(self, engine):
+        _feed([95] * 6)
+        _feed([85, 85], start=100)              # below value, above clear
+        assert alerts.active_alerts()[0]['state'] == 'firing'
+        _feed([75], start=200)
+        assert alerts.active_alerts() == []
+        assert [e['status'] for e in alerts._events] == ['firing', 'resolved']
+
+    def test_log_sink(self, engine):
+        _feed([95] * 6)
+        lines = (engine / 'alerts.log').read_text().splitlines()
+        assert json.loads(lines[0])['rule'] == 'cpu'
+
+    def test_vm_subjects_are_independent(self, engine, monkeypatch):
+        rule = dict(CPU_RULE, id='vmcpu', scope='vm', **{'for': 0})
+        monkeypatch.setattr(alerts, '_rules', [rule])
+        _feed([95], subject='vm-a', scope='vm')
+        _feed([10], subject='vm-b', scope='vm')
+        assert [a['subject'] for a in alerts.active_alerts()] == ['vm-a']
+        alerts.forget_vms({'vm-b'})
+        assert alerts.active_alerts() == []
+        assert alerts._events[-1]['status'] == 'resolved'
+
+    def test_state_survives_reload(self, engine, monkeypatch):
+        _feed([95] * 6)
+        monkeypatch.setattr(alerts, '_states', {})
+        alerts._load_state()
+        assert alerts.active_alerts()[0]['state'] == 'firing'
+        _feed([95], start=200)                  # still firing: no second announcement
+        assert len(alerts._events) == 1
+
+    def test_reload_picks_up_other_workers(self, engine):
+        # another worker replaced the rules and the leader's state file
+        rule = dict(CPU_RULE, id='cpu2')
+        (engine / 'alerts.json').write_text(json.dumps({'rules': [rule], 'webhook': ''}))
+        (engine / 'state.json').write_text(json.dumps([
+            {'rule': 'cpu2', 'subject': 'host', 'subject_name': 'host',
+             'state': 'firing', 'since': 0, 'value': 99}]))
+        alerts.reload()
+        assert [r['id'] for r in alerts._rules] == ['cpu2']
+        assert alerts.active_alerts()[0]['rule'] == 'cpu2'
+        # its own writes are not re-read
+        _feed([10], start=100)
+        assert alerts.active_alerts() == []
+        alerts.reload()
+        assert alerts.active_alerts() == []
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTTP API
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestAlertsAPI:
+    def test_put_and_list(self, client, engine):
+        resp = client.put('/api/alerts/rules', json={'rules': [CPU_RULE], 'webhook': 'http://x'})
+        assert resp.status_code == 200
+        data = client.get('/api/alerts').get_json()
+        assert data['rules'][0]['id'] == 'cpu'
+        assert data['webhook'] == 'http://x'
+
+    def test_rejects_bad_rule(self, client, engine):
+        bad = dict(CPU_RULE, series='gpu')
+        resp = client.put('/api/alerts/rules', json={'rules': [bad]})
+        assert resp.status_code == 400
+        assert 'series' in resp.get_json()['error']
@@ -0,0 +1,157 @@
+"""
+Unit tests for POST /api/vms/batch — many VMs from one template.
+
+Covers:
+  - specialize_vm_xml()  per-instance name, UUID, MAC and disk paths
+  - batch job            overlays built in parallel under the I/O cap
+  - rollback             a failed define (or per-cell hugepage check) removes
+                         every domain and overlay
+  - validation           name pattern, count, existing names
+"""
+import threading
+import time
+import xml.etree.ElementTree as ET
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from views import jobs
+from views.creation import generate_vm_xml, specialize_vm_xml
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, 'JOBS_DIR', str(tmp_path / 'jobs'))
+    monkeypatch.setattr(jobs, '_jobs', {})
+    monkeypatch.setattr(jobs, '_waiting', {})
+    monkeypatch.setattr(jobs, '_busy', set())
+    monkeypatch.setattr('views.api.STORAGE_PATH', str(tmp_path))
+    image = tmp_path / 'base.qcow2'
+    image.write_text('')
+    return tmp_path
+
+
+def _wait(job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get(job_id)
+        if job['status'] in jobs.FINISHED:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} still {jobs.get(job_id)["status"]}')
+
+
+class _Overlays:
+    """Stand-in for qemu-img: writes the overlay and tracks parallelism."""
+
+    def __init__(self):
+        self.running = self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, cmd, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.02)
+        with open(cmd[-2], 'w'):
+            pass
+        with self.lock:
+            self.running -= 1
+
+
+def _conn(fail_on=None):
+    conn = MagicMock()
+
+    def define(xml):
+        tree = ET.fromstring(xml)
+        if tree.findtext('name') == fail_on:
+            raise Exception('internal error: boom')
+        dom = MagicMock()
+        dom.name.return_value = tree.findtext('name')
+        dom.UUIDString.return_value = tree.findtext('uuid')
+        return dom
+
+    conn.defineXML.side_effect = define
+    return conn
+
+
+def _body(engine, **kw):
+    return {'name_pattern': 'lab-{n:02d}', 'count': 6, 'ram': 1024, 'cpu': 1,
+            'disks': [{'path': str(engine / 'base.qcow2'), 'size_gb': 10}], **kw}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# XML
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestSpecialize:
+    def test_instances_do_not_collide(self):
+        base = ET.fromstring(generate_vm_xml('lab-01', 1024, 1, disks=['/img/lab-01.qcow2']))
+        macs = set()
+        xmls = [ET.fromstring(specialize_vm_xml(base, f'lab-{i}', {'/img/lab-01.qcow2':
+                                                                  f'/img/lab-{i}.qcow2'}, macs))
+                for i in range(3)]
+        assert [x.findtext('name') for x in xmls] == ['lab-0', 'lab-1', 'lab-2']
+        assert len({x.findtext('uuid') for x in xmls}) == 3
+        assert len(macs) == 3
+        assert xmls[2].find('devices/disk/source').get('file') == '/img/lab-2.qcow2'
+        assert base.find('uuid') is None                # template left untouched
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTTP + job
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBatchCreate:
+    def test_creates_all_with_io_cap(self, client, engine):
+        overlays, conn = _Overlays(), _conn()
+        with patch('views.api.subprocess.run', side_effect=overlays), \
+             patch('views.api.get_db_connection', return_value=conn), \
+             patch('views.api.inventory.refresh'):
+            resp = client.post('/api/vms/batch', json=_body(engine, concurrency=2))
+            assert resp.status_code == 202
+            job = _wait(resp.get_json()['job_id'])
+        assert job['status'] == 'done'
+        assert [v['name'] for v in job['result']['vms']] == [f'lab-{i:02d}' for i in range(1, 7)]
+        assert overlays.peak == 2
+        assert sorted(p.name for p in engine.glob('lab-*.qcow2')) == \
+            [f'lab-{i:02d}.qcow2' for i in range(1, 7)]
+
+    def test_failed_define_rolls_back(self, client, engine):
+        conn = _conn(fail_on='lab-03')
+        with patch('views.api.subprocess.run', side_effect=_Overlays()), \
+             patch('views.api.get_db_connection', return_value=conn), \
+             patch('views.api.inventory.refresh'), \
+             patch('views.api.inventory.forget') as forget:
+            job = _wait(client.post('/api/vms/batch', json=_body(engine)).get_json()['job_id'])
+        assert job['status'] == 'error' and 'lab-03' in job['error']
+        assert forget.call_count == 2
+        assert not list(engine.glob('lab-*.qcow2'))
+
+    def test_hugepages_checked_per_cell_across_the_batch(self, client, engine, monkeypatch):
+        from tests.test_numa import CAPS
+        import libvirt
+        monkeypatch.setattr(libvirt, 'VIR_CONNECT_LIST_DOMAINS_ACTIVE', 1, raising=False)
+        conn = _conn()
+        conn.getCapabilities.return_value = CAPS
+        conn.listAllDomains.return_value = []
+        # 1600 pages pooled admit 3 × 512 up front, but the cells alternate
+        # and the third VM would need 1024 on node 0
+        conn.getFreePages.return_value = {0: {2048: 800}, 1: {2048: 800}}
+        with patch('views.api.subprocess.run', side_effect=_Overlays()), \
+             patch('views.api.get_db_connection', return_value=conn), \
+             patch('views.api.inventory.refresh'), \
+             patch('views.api.inventory.forget') as forget:
+            resp = client.post('/api/vms/batch', json=_body(engine, count=3, numa=True, hugepages='2M'))
+            job = _wait(resp.get_json()['job_id'])
+        assert job['status'] == 'error' and 'lab-03' in job['error'] and 'NUMA node 0' in job['error']
+        assert forget.call_count == 2
+        assert not list(engine.glob('lab-*.qcow2'))
+
+    def test_validation(self, client, engine):
+        assert client.post('/api/vms/batch', json=_body(engine, name_pattern='lab')).status_code == 400
+        assert client.post('/api/vms/batch', json=_body(engine, count=0)).status_code == 400
+        with patch('views.api.inventory.find_by_name',
+                   side_effect=lambda n: {'name': n} if n == 'lab-04' else None):
+            resp = client.post('/api/vms/batch', json=_body(engine))
+        assert resp.status_code == 409 and 'lab-04' in resp.get_json()['error']
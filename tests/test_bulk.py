@@ -0,0 +1,139 @@
+"""
+Unit tests for views/bulk.py — parallel VM lifecycle actions.
+
+Covers:
+  - labels        metadata round trip through set_labels / parse_labels
+  - selectors     parsing, label / name-glob / state matching
+  - run_bulk()    per-VM results, concurrency cap, staggered starts
+  - /api/vms/bulk JSON and SSE responses, validation
+"""
+import json
+import threading
+import time
+import xml.etree.ElementTree as ET
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from views import bulk, inventory
+
+
+def _record(name, state='Running', **labels):
+    return {'uuid': f'uuid-{name}', 'name': name, 'state': state, 'labels': labels}
+
+
+class _FakeDomain:
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, uuid, active):
+        self.uuid, self.active = uuid, active
+
+    def name(self):
+        return self.uuid.replace('uuid-', '')
+
+    def isActive(self):
+        return self.active
+
+    def create(self):
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.peak = max(cls.peak, cls.running)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.running -= 1
+        self.active = True
+
+
+@pytest.fixture
+def domains():
+    _FakeDomain.running = _FakeDomain.peak = 0
+    doms = {f'uuid-vm{i}': _FakeDomain(f'uuid-vm{i}', active=(i == 0)) for i in range(6)}
+
+    def lookup(uuid):
+        if uuid not in doms:
+            raise Exception(f'Domain not found: {uuid}')
+        return doms[uuid]
+
+    conn = MagicMock()
+    conn.lookupByUUIDString.side_effect = lookup
+    with patch.object(bulk, 'get_db_connection', return_value=conn), \
+         patch.object(bulk.inventory, 'refresh'):
+        yield doms
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Labels and selectors
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestSelectors:
+    def test_labels_round_trip(self):
+        tree = ET.fromstring('<domain><name>a</name></domain>')
+        inventory.set_labels(tree, {'env': 'lab', 'tier': 'web'})
+        inventory.set_labels(tree, {'env': 'prod'})          # replaces, not appends
+        xml = ET.tostring(tree).decode()
+        assert inventory.parse_labels(ET.fromstring(xml)) == {'env': 'prod'}
+
+    def test_parse(self):
+        assert bulk.parse_selector('env=lab, tier!=db') == [('env', '=', 'lab'), ('tier', '!=', 'db')]
+        with pytest.raises(ValueError):
+            bulk.parse_selector('env')
+
+    def test_matches(self):
+        terms = bulk.parse_selector('env=lab,name=k8s-*,state!=shutoff')
+        assert bulk.matches(_record('k8s-w1', env='lab'), terms)
+        assert not bulk.matches(_record('k8s-w1', 'Shutoff', env='lab'), terms)
+        assert not bulk.matches(_record('db1', env='lab'), terms)
+        assert not bulk.matches(_record('k8s-w2'), terms)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# run_bulk
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRunBulk:
+    def test_results_and_concurrency_cap(self, domains):
+        uuids = list(domains) + ['uuid-missing']
+        results = bulk.run_bulk(uuids, 'start', concurrency=2)
+        by_uuid = {r['uuid']: r for r in results}
+        assert by_uuid['uuid-vm0']['note'] == 'already running'
+        assert by_uuid['uuid-missing']['ok'] is False
+        assert 'not found' in by_uuid['uuid-missing']['error']
+        assert sum(r['ok'] for r in results) == 6
+        assert _FakeDomain.peak == 2
+
+    def test_stagger_spaces_starts(self, domains):
+        results = bulk.run_bulk(['uuid-vm1', 'uuid-vm2', 'uuid-vm3'], 'start',
+                                concurrency=8, stagger=0.1)
+        starts = sorted(r['started_at'] for r in results)
+        assert starts[1] - starts[0] >= 0.09 and starts[2] - starts[1] >= 0.09
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBulkAPI:
+    def test_json_response(self, client, domains):
+        resp = client.post('/api/vms/bulk', json={'action': 'start', 'uuids': ['uuid-vm1']},
+                           headers={'Accept': 'application/json'})
+        data = resp.get_json()
+        assert data['succeeded'] == 1 and data['results'][0]['name'] == 'vm1'
+
+    def test_sse_stream_by_selector(self, client, domains):
+        records = [_record(f'vm{i}', env='lab' if i % 2 else 'prod') for i in range(6)]
+        with patch.object(bulk.inventory, 'list_domains', return_value=records):
+            resp = client.post('/api/vms/bulk', json={'action': 'start', 'selector': 'env=lab'})
+            events = [json.loads(line[6:]) for line in resp.get_data(as_text=True).splitlines()
+                      if line.startswith('data: ')]
+        assert events[0]['targets'] == ['uuid-vm1', 'uuid-vm3', 'uuid-vm5']
+        assert {e['uuid'] for e in events[1:-1]} == set(events[0]['targets'])
+        assert events[-1] == {**events[-1], 'done': True, 'succeeded': 3, 'failed': 0}
+
+    def test_validation(self, client, domains):
+        assert client.post('/api/vms/bulk', json={'action': 'explode', 'uuids': []}).status_code == 400
+        assert client.post('/api/vms/bulk', json={'action': 'start'}).status_code == 400
+        assert client.post('/api/vms/bulk', json={'action': 'start', 'uuids': [],
+                                                  'concurrency': 0}).status_code == 400
@@ -0,0 +1,194 @@
+"""
+Unit tests for views/capacity.py — capacity admission control.
+
+Covers:
+  - usage()     defined domains (inventory first), cached pool scans, holds
+  - check()     fits / fits_if (with the fixes named) / does_not_fit
+  - admit()     holds until defined or released
+  - HTTP        capacity report, ratio updates, dry run, create_vm and
+                Kubernetes cluster rejected up front, warm-pool hits let through
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from views import capacity
+
+GIB = 1024 ** 3
+IMAGES = '/var/lib/libvirt/images'
+
+
+def _dom(name, vcpus, ram_mb, active=True):
+    dom = MagicMock()
+    dom.name.return_value = name
+    dom.isActive.return_value = active
+    dom.info.return_value = [1 if active else 5, ram_mb * 1024, ram_mb * 1024, vcpus, 0]
+    return dom
+
+
+def _vol(gb):
+    vol = MagicMock()
+    vol.info.return_value = [0, gb * GIB, 0]
+    return vol
+
+
+@pytest.fixture
+def conn():
+    """8 CPUs / 32 GiB; db and web running, old stopped; 100 GB pool holding 120 GB of volumes."""
+    c = MagicMock()
+    c.getInfo.return_value = ['x86_64', 32768, 8, 2400, 1, 1, 4, 2]
+    c.listAllDomains.return_value = [_dom('db', 4, 16384), _dom('web', 2, 4096),
+                                     _dom('old', 2, 4096, active=False)]
+    pool = MagicMock()
+    pool.name.return_value = 'default'
+    pool.info.return_value = [2, 100 * GIB, 50 * GIB, 50 * GIB]
+    pool.XMLDesc.return_value = f"<pool type='dir'><target><path>{IMAGES}</path></target></pool>"
+    pool.listAllVolumes.return_value = [_vol(80), _vol(40)]
+    c.listAllStoragePools.return_value = [pool]
+    return c
+
+
+@pytest.fixture
+def enforced(tmp_path, monkeypatch):
+    monkeypatch.setattr(capacity, 'CONFIG_FILE', str(tmp_path / 'capacity.json'))
+    monkeypatch.setattr(capacity, '_holds', {})
+    monkeypatch.setattr(capacity, '_pool_cache', {'at': 0.0, 'pools': None})
+
+
+def _vm(name, cpu=2, ram=4096, disk_gb=20):
+    return capacity.demand(name, cpu, ram, [(f'{IMAGES}/{name}.qcow2', disk_gb)] if disk_gb else [])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Model
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestCheck:
+    def test_usage(self, conn, enforced):
+        u = capacity.usage(conn)
+        # the stopped domain counts: it can be started at any time
+        assert u['cpu'] == {'host': 8, 'usable': 7, 'ratio': 4.0, 'limit': 28.0, 'committed': 8}
+        assert u['ram']['limit_mb'] == 30720 and u['ram']['committed_mb'] == 24576
+        assert u['pools'][0]['committed_gb'] == 120 and u['pools'][0]['limit_gb'] == 150
+        capacity.usage(conn)
+        assert conn.listAllStoragePools.call_count == 1          # scan reused
+
+    def test_domains_from_inventory(self, conn, enforced, monkeypatch):
+        monkeypatch.setattr(capacity.inventory, 'list_domains', lambda: [
+            {'name': 'db', 'vcpus': 4, 'memory_mb': 16384, 'state_code': 1},
+            {'name': 'old', 'vcpus': 2, 'memory_mb': 4096, 'state_code': 5}])
+        monkeypatch.setattr(capacity.libvirt, 'VIR_DOMAIN_SHUTOFF', 5, raising=False)
+        u = capacity.usage(conn)
+        assert u['cpu']['committed'] == 6 and u['ram']['committed_mb'] == 20480
+        assert [d['active'] for d in u['domains']] == [True, False]
+        assert not conn.listAllDomains.called
+
+    def test_fits(self, conn, enforced):
+        result = capacity.check(conn, [_vm('a')])
+        assert result['verdict'] == 'fits' and result['fits'] and not result['shortfalls']
+        assert capacity.explain(result) == 'fits'
+
+    def test_fits_if_ram_is_freed(self, conn, enforced):
+        result = capacity.check(conn, [_vm(f'n{i}', disk_gb=0) for i in range(2)])
+        assert result['verdict'] == 'fits_if'
+        (ram,) = result['shortfalls']
+        assert ram['resource'] == 'ram' and ram['short'] == 2048
+        assert ram['fixes'] == ['delete stopped VMs old (frees 4096 MiB)', 'reduce RAM to 3072 MiB per VM']
+        assert capacity.explain(result).startswith('fits if delete stopped VMs old')
+
+    def test_fits_if_disk_ratio_is_raised(self, conn, enforced):
+        result = capacity.check(conn, [_vm('a', disk_gb=40)])
+        assert result['verdict'] == 'fits_if'
+        assert result['shortfalls'][0]['fixes'][0] == 'raise disk_ratio to 1.6'
+
+    def test_cpu_and_oversized_vms(self, conn, enforced):
+        assert capacity.check(conn, [_vm('huge', ram=40000)])['verdict'] == 'does_not_fit'
+        cpu = capacity.check(conn, [_vm(f'c{i}', cpu=6, ram=512, disk_gb=0) for i in range(4)])
+        assert cpu['verdict'] == 'fits_if' and cpu['shortfalls'][0]['fixes'] == ['raise cpu_ratio to 4.6']
+        assert capacity.check(conn, [_vm('wide', cpu=12, ram=512)] * 3)['verdict'] == 'does_not_fit'
+
+    def test_own_names_are_not_counted_twice(self, conn, enforced):
+        # re-deploying "db" replaces the domain of that name
+        assert capacity.check(conn, [_vm('db', ram=20480, disk_gb=0)])['fits']
+
+
+class TestAdmit:
+    def test_hold_until_released_or_defined(self, conn, enforced):
+        capacity.admit(conn, [_vm('a', disk_gb=0)])
+        with pytest.raises(capacity.CapacityError) as exc:
+            capacity.admit(conn, [_vm('b', disk_gb=0)])
+        assert exc.value.result['usage']['held'] == ['a']
+        capacity.release(['a'])
+        capacity.admit(conn, [_vm('b', disk_gb=0)])
+        # once "b" exists as a domain it is counted as one, not as a hold
+        conn.listAllDomains.return_value.append(_dom('b', 2, 4096, active=False))
+        u = capacity.usage(conn)
+        assert u['held'] == [] and u['ram']['committed_mb'] == 28672
+        # ...so a second create right behind it is refused, stopped or not
+        with pytest.raises(capacity.CapacityError):
+            capacity.admit(conn, [_vm('c', disk_gb=0)])
+
+    def test_defined_hold_keeps_disk_until_rescan(self, conn, enforced):
+        capacity.admit(conn, [_vm('c', ram=512)])
+        conn.listAllDomains.return_value.append(_dom('c', 2, 512, active=False))
+        u = capacity.usage(conn)
+        assert u['held'] == ['c'] and u['ram']['committed_mb'] == 24576 + 512
+        assert u['pools'][0]['committed_gb'] == 140
+        conn.listAllStoragePools.return_value[0].listAllVolumes.return_value.append(_vol(20))
+        capacity._pool_cache['at'] = 0.0                          # scan expired
+        u = capacity.usage(conn)
+        assert u['held'] == [] and u['pools'][0]['committed_gb'] == 140
+
+    def test_enforce_off_admits(self, conn, enforced):
+        capacity._save_config({**capacity.DEFAULT_CONFIG, 'enforce': False})
+        assert capacity.admit(conn, [_vm('huge', ram=40000)])['verdict'] == 'does_not_fit'
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestCapacityAPI:
+    def test_report_update_and_dry_run(self, client, conn, enforced):
+        with patch.object(capacity, 'get_db_connection', return_value=conn):
+            body = client.get('/api/host/capacity').get_json()
+            assert body['config']['cpu_ratio'] == 4.0 and body['cpu']['committed'] == 8
+            assert client.put('/api/host/capacity', json={'cpu_ratio': 100}).status_code == 400
+            assert client.put('/api/host/capacity', json={'ram_ratio': 1.2}).get_json() \
+                ['config']['ram_ratio'] == 1.2
+            with open(capacity.CONFIG_FILE) as fh:
+                assert json.load(fh)['ram_ratio'] == 1.2
+            dry = client.post('/api/host/capacity/check',
+                              json={'cpu': 2, 'ram': 4096, 'count': 3}).get_json()
+        assert dry['verdict'] == 'fits'             # 1.2 × 30720 MiB leaves room
+        assert not capacity._holds
+
+    def test_create_vm_rejected(self, client, conn, enforced):
+        with patch('views.api.get_db_connection', return_value=conn):
+            resp = client.post('/api/vms', json={'name': 'huge', 'ram': 40000, 'cpu': 2})
+        assert resp.status_code == 409
+        assert resp.get_json()['capacity']['verdict'] == 'does_not_fit'
+
+    def test_warm_hit_is_not_admitted_again(self, client, conn, enforced):
+        # the pool member is already committed; a full host must not refuse it
+        conn.getInfo.return_value = ['x86_64', 4096, 2, 2400, 1, 1, 2, 1]
+        warm = {'name': 'web2', 'template': 'small', 'uuid': 'u'}
+        with patch('views.api.get_db_connection', return_value=conn), \
+             patch('views.api.warm_pool.name_in_use', return_value=False), \
+             patch('views.api.warm_pool.claim', return_value=warm):
+            resp = client.post('/api/vms', json={'name': 'web2', 'ram': 1024, 'cpu': 1})
+        assert resp.status_code == 201 and not capacity._holds
+
+    def test_k8s_cluster_rejected_before_deploy(self, client, conn, enforced, tmp_path):
+        image = tmp_path / 'base.img'
+        image.write_bytes(b'')
+        with patch('views.kubernetes.get_connection', return_value=conn), \
+             patch('views.kubernetes.threading.Thread') as thread:
+            resp = client.post('/api/k8s/clusters', json={
+                'name': 'big', 'worker_count': 5, 'node_size': 'large',
+                'base_image_path': str(image)})
+        assert resp.status_code == 409
+        assert resp.get_json()['capacity']['verdict'] == 'fits_if'      # smaller nodes would fit
+        assert 'reduce RAM to 1024 MiB per VM' in resp.get_json()['error']
+        assert not thread.called
@@ -0,0 +1,56 @@
+"""
+Unit tests for views/downsample.py — ?max_points= thinning of history.
+
+Covers:
+  - downsample()   pass-through, LTTB and min/max buckets on a series block
+"""
+import numpy as np
+import pytest
+
+from views.downsample import downsample
+
+
+def _block(n=1000, series=3):
+    ts = np.arange(n, dtype=np.int64) * 15
+    vals = np.vstack([np.sin(np.arange(n) / (10 + s)) for s in range(series)])
+    return ts, vals
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# downsample
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestDownsample:
+    def test_small_block_unchanged(self):
+        ts, vals = _block(50)
+        out_ts, out = downsample(ts, vals, 100)
+        assert out_ts.shape == (3, 50)
+        assert (out == vals).all()
+
+    @pytest.mark.parametrize('method', ['lttb', 'minmax'])
+    def test_bounded_and_ordered(self, method):
+        ts, vals = _block()
+        out_ts, out = downsample(ts, vals, 100, method)
+        assert out.shape[0] == 3 and out.shape[1] <= 100
+        assert (np.diff(out_ts, axis=1) >= 0).all()
+        # every kept point is a real sample
+        for s in range(3):
+            assert np.allclose(out[s], vals[s][out_ts[s] // 15])
+
+    @pytest.mark.parametrize('method', ['lttb', 'minmax'])
+    def test_spike_survives(self, method):
+        ts, vals = _block(series=1)
+        vals[0, 537] = 50.0
+        _, out = downsample(ts, vals, 60, method)
+        assert out.max() == 50.0
+
+    def test_lttb_keeps_endpoints(self):
+        ts, vals = _block()
+        out_ts, _ = downsample(ts, vals, 100, 'lttb')
+        assert out_ts.shape == (3, 100)
+        assert (out_ts[:, 0] == 0).all() and (out_ts[:, -1] == ts[-1]).all()
+
+    def test_minmax_keeps_bucket_extremes(self):
+        ts, vals = _block(series=1)
+        _, out = downsample(ts, vals, 100, 'minmax')
+        assert out.min() == vals.min()
@@ -0,0 +1,134 @@
+"""
+Unit tests for views/drain.py — graceful host drain.
+
+Covers:
+  - drain()        ACPI shutdown tracked by lifecycle events, stragglers destroyed
+  - fallback       isActive() checks when events are unavailable or drop
+                   mid-drain, and before any guest is destroyed
+  - force=False    stragglers reported, not destroyed; refusals fail at once
+  - /api/host/drain  validation and 202 + job
+"""
+import collections
+import threading
+from unittest.mock import MagicMock, patch
+
+import libvirt
+import pytest
+
+from views import drain, inventory
+
+STOPPED = 5
+
+
+class _Guest:
+    """Running domain that powers off `delay` s after ACPI (None = ignores it)."""
+
+    def __init__(self, uuid, delay):
+        self.uuid, self.delay, self.active = uuid, delay, True
+        self.destroyed = False
+
+    def UUIDString(self):
+        return self.uuid
+
+    def name(self):
+        return f'vm-{self.uuid}'
+
+    def isActive(self):
+        return self.active
+
+    def shutdown(self):
+        if self.delay is not None:
+            threading.Timer(self.delay, self._power_off).start()
+
+    def _power_off(self):
+        self.active = False
+        inventory._on_lifecycle(None, self, STOPPED, 0, None)
+
+    def destroy(self):
+        self.active = False
+        self.destroyed = True
+
+
+class _Refuses(_Guest):
+    def shutdown(self):
+        raise libvirt.libvirtError('guest agent not responding')
+
+
+class _Quiet(_Guest):
+    """Powers off while the inventory's event connection is down."""
+
+    def _power_off(self):
+        self.active = False
+
+
+@pytest.fixture
+def host(monkeypatch):
+    import libvirt
+    monkeypatch.setattr(libvirt, 'VIR_DOMAIN_EVENT_STOPPED', STOPPED, raising=False)
+    monkeypatch.setattr(libvirt, 'VIR_DOMAIN_EVENT_UNDEFINED', 1, raising=False)
+    monkeypatch.setattr(libvirt, 'VIR_CONNECT_LIST_DOMAINS_ACTIVE', 1, raising=False)
+    monkeypatch.setattr(drain, 'WAIT_TICK', 0.02)
+    monkeypatch.setattr(inventory, '_listeners', [])
+    monkeypatch.setattr(inventory, '_pending', collections.deque())
+    guests = [_Guest('a', 0.05), _Guest('b', 0.1), _Guest('stuck', None)]
+    conn = MagicMock()
+    conn.listAllDomains.return_value = guests
+    with patch.object(drain, 'get_db_connection', return_value=conn), \
+         patch.object(drain.inventory, 'refresh'):
+        yield guests
+
+
+def _by_uuid(result):
+    return {r['uuid']: r for r in result['vms']}
+
+
+class TestDrain:
+    def test_events_then_force(self, host):
+        with patch.object(drain.inventory, 'ensure_started', return_value=True):
+            result = drain.drain(timeout=0.5)
+        rows = _by_uuid(result)
+        assert rows['a']['result'] == rows['b']['result'] == 'shutdown'
+        assert rows['a']['seconds'] < rows['b']['seconds'] < 0.5
+        assert rows['stuck']['result'] == 'destroyed' and host[2].destroyed
+        assert result['counts'] == {'shutdown': 2, 'destroyed': 1}
+        assert inventory._listeners == []
+
+    def test_polls_without_events(self, host):
+        with patch.object(drain.inventory, 'ensure_started', return_value=False):
+            result = drain.drain(timeout=0.3)
+        assert _by_uuid(result)['a']['result'] == 'shutdown'
+
+    def test_no_force(self, host):
+        with patch.object(drain.inventory, 'ensure_started', return_value=True):
+            result = drain.drain(timeout=0.3, force=False)
+        assert _by_uuid(result)['stuck']['result'] == 'still_running'
+        assert not host[2].destroyed
+
+    def test_refused_shutdown_fails_at_once(self, host):
+        host[2] = _Refuses('stuck', None)
+        with patch.object(drain.inventory, 'ensure_started', return_value=True):
+            result = drain.drain(timeout=5, force=False)
+        row = _by_uuid(result)['stuck']
+        assert row['result'] == 'failed' and 'agent' in row['error']
+        assert result['seconds'] < 1                 # not left to the timeout
+
+    def test_events_lost_mid_drain(self, host):
+        host[1] = _Quiet('b', 0.1)
+        ticks = iter([True, True])                   # then the connection drops
+        with patch.object(drain.inventory, 'ensure_started',
+                          side_effect=lambda: next(ticks, False)):
+            result = drain.drain(timeout=0.5)
+        assert _by_uuid(result)['b']['result'] == 'shutdown' and not host[1].destroyed
+
+
+class TestDrainAPI:
+    def test_validation(self, client):
+        assert client.post('/api/host/drain', json={'timeout': 0}).status_code == 400
+        assert client.post('/api/host/drain', json={'concurrency': 'x'}).status_code == 400
+
+    def test_returns_job(self, client):
+        with patch.object(drain.jobs, 'submit', return_value='j1') as submit:
+            resp = client.post('/api/host/drain', json={'timeout': 60})
+        assert resp.status_code == 202
+        assert resp.get_json()['job_id'] == 'j1'
+        assert submit.call_args.kwargs['timeout'] == 60.0
@@ -0,0 +1,168 @@
+"""
+Unit tests for views/hugepages.py — hugepage-backed guest memory.
+
+Covers:
+  - guest XML     memoryBacking written by generate_vm_xml / set_hugepages, units read
+  - host pools    capabilities totals + getFreePages, sysfs fallback
+  - admit()       pooled and per-cell checks, pages already held
+  - HTTP          reserve via allocPages, create 409, update, host report,
+                  bad RAM and libvirtd outages answered as JSON errors
+"""
+import xml.etree.ElementTree as ET
+from unittest.mock import MagicMock, patch
+
+import libvirt
+import pytest
+
+from views import hugepages
+from views.creation import generate_vm_xml
+
+CAPS = """<capabilities><host><topology><cells num='2'>
+  <cell id='0'><memory unit='KiB'>16777216</memory>
+    <pages unit='KiB' size='4'>3145728</pages>
+    <pages unit='KiB' size='2048'>1024</pages>
+    <pages unit='KiB' size='1048576'>0</pages></cell>
+  <cell id='1'><memory unit='KiB'>16777216</memory>
+    <pages unit='KiB' size='4'>3145728</pages>
+    <pages unit='KiB' size='2048'>1024</pages>
+    <pages unit='KiB' size='1048576'>0</pages></cell>
+</cells></topology></host></capabilities>"""
+
+
+@pytest.fixture
+def conn():
+    c = MagicMock()
+    c.getCapabilities.return_value = CAPS
+    c.getFreePages.return_value = {0: {2048: 512, 1048576: 0}, 1: {2048: 100, 1048576: 0}}
+    return c
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Guest XML
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestGuestXML:
+    def test_generate_and_clear(self):
+        tree = ET.fromstring(generate_vm_xml('db1', 4096, 2, disks=['/img/a.qcow2'],
+                                             hugepage_kib=2048))
+        assert tree.find('memoryBacking/hugepages/page').attrib == {'size': '2048', 'unit': 'KiB'}
+        assert hugepages.get_hugepages(tree) == 2048
+        hugepages.set_hugepages(tree, 1048576)
+        assert len(tree.findall('memoryBacking/hugepages')) == 1
+        assert hugepages.get_hugepages(tree) == 1048576
+        hugepages.set_hugepages(tree, None)
+        assert tree.find('memoryBacking') is None and hugepages.get_hugepages(tree) is None
+
+    def test_page_size_honours_unit(self):
+        tree = ET.fromstring("<domain><memoryBacking><hugepages><page size='1' unit='G'/>"
+                             "</hugepages></memoryBacking></domain>")
+        assert hugepages.get_hugepages(tree) == 1048576
+        tree.find('memoryBacking/hugepages/page').attrib = {'size': '2', 'unit': 'MiB'}
+        assert hugepages.get_hugepages(tree) == 2048
+
+    def test_parse_size(self):
+        assert hugepages.parse_size('2M') == 2048 and hugepages.parse_size('1g') == 1048576
+        with pytest.raises(ValueError):
+            hugepages.parse_size('4k')
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Host pools and admission
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestPools:
+    def test_from_libvirt(self, conn):
+        pools = hugepages.host_pools(conn)
+        assert pools[0] == {'node': 0, 'pages': [{'size_kib': 2048, 'total': 1024, 'free': 512},
+                                                  {'size_kib': 1048576, 'total': 0, 'free': 0}]}
+        conn.getFreePages.assert_called_once_with([2048, 1048576], 0, 2)
+
+    def test_sysfs_fallback(self, conn, tmp_path, monkeypatch):
+        base = tmp_path / 'node1' / 'hugepages' / 'hugepages-2048kB'
+        base.mkdir(parents=True)
+        (base / 'nr_hugepages').write_text('64\n')
+        (base / 'free_hugepages').write_text('60\n')
+        monkeypatch.setattr(hugepages, 'SYSFS_NODES', str(tmp_path))
+        conn.getCapabilities.side_effect = libvirt.libvirtError('no caps')
+        pools = hugepages.host_pools(conn)
+        assert pools == [{'node': 1, 'pages': [{'size_kib': 2048, 'total': 64, 'free': 60},
+                                               {'size_kib': 1048576, 'total': 0, 'free': 0}]}]
+
+    def test_admit_pooled(self, conn):
+        hugepages.admit(conn, 612 * 2048, 2048)
+        with pytest.raises(hugepages.HugepageError, match='1 short'):
+            hugepages.admit(conn, 613 * 2048, 2048)
+        hugepages.admit(conn, 613 * 2048, 2048, held=1)
+
+    def test_admit_per_cell(self, conn):
+        hugepages.admit(conn, 0, 2048, cells=[{'node': 0, 'memory_kib': 512 * 2048}])
+        with pytest.raises(hugepages.HugepageError, match='NUMA node 1'):
+            hugepages.admit(conn, 0, 2048, cells=[{'node': 1, 'memory_kib': 101 * 2048}])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestHugepageAPI:
+    UUID = 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+
+    def test_reserve(self, client, conn):
+        with patch.object(hugepages, 'get_db_connection', return_value=conn):
+            body = client.put('/api/host/hugepages', json={'size': '2M', 'count': 1024, 'node': 1}).get_json()
+            assert client.put('/api/host/hugepages', json={'size': '3M', 'count': 1}).status_code == 400
+            assert client.get('/api/host/hugepages').get_json()['nodes'][1]['node'] == 1
+        assert conn.allocPages.call_args[0][:3] == ({2048: 1024}, 1, 1)
+        assert body['total'] == {'1': 1024} and body['complete'] is True
+
+    def test_create_checks_free_pages(self, client, conn):
+        with patch('views.api.get_db_connection', return_value=conn):
+            resp = client.post('/api/vms', json={'name': 'db1', 'ram': 4096, 'cpu': 2, 'hugepages': '1G'})
+            assert resp.status_code == 409
+        bad = client.post('/api/vms', json={'name': 'db1', 'ram': 1001, 'cpu': 2, 'hugepages': '2M'})
+        assert bad.status_code == 400
+
+    def test_create_without_libvirtd(self, client):
+        with patch('views.api.get_db_connection', side_effect=libvirt.libvirtError('down')):
+            resp = client.post('/api/vms', json={'name': 'db1', 'ram': 4096, 'cpu': 2,
+                                                 'hugepages': '2M'})
+        assert resp.status_code == 500 and 'Could not connect' in resp.get_json()['error']
+
+    def test_update_rejects_bad_ram(self, client, conn):
+        with patch('views.api.get_db_connection', return_value=conn):
+            resp = client.put(f'/api/vms/{self.UUID}', json={'ram': 'abc', 'hugepages': '2M'})
+        assert resp.status_code == 400 and resp.get_json()['error'] == 'ram and cpu must be integers'
+        assert not conn.lookupByUUIDString.called
+
+    def test_update_enables_hugepages(self, client, conn, monkeypatch):
+        monkeypatch.setattr(libvirt, 'VIR_DOMAIN_XML_INACTIVE', 2, raising=False)
+        dom = MagicMock()
+        dom.XMLDesc.return_value = generate_vm_xml('db1', 1024, 2, disks=['/img/a.qcow2'])
+        dom.isActive.return_value = True
+        conn.lookupByUUIDString.return_value = dom
+        with patch('views.api.get_db_connection', return_value=conn), \
+             patch('views.api.inventory.refresh'):
+            resp = client.put(f'/api/vms/{self.UUID}', json={'hugepages': '2M'})
+            assert resp.get_json() == {'success': True, 'restart_required': True}
+            defined = ET.fromstring(conn.defineXML.call_args[0][0])
+            assert hugepages.get_hugepages(defined) == 2048
+            # 2 GiB needs 1024 pages, only 612 are free
+            conn.defineXML.reset_mock()
+            assert client.put(f'/api/vms/{self.UUID}',
+                              json={'hugepages': '2M', 'ram': 2048}).status_code == 409
+            assert not conn.defineXML.called
+
+    def test_update_reads_memory_unit(self, client, conn, monkeypatch):
+        monkeypatch.setattr(libvirt, 'VIR_DOMAIN_XML_INACTIVE', 2, raising=False)
+        tree = ET.fromstring(generate_vm_xml('db1', 1024, 2, disks=['/img/a.qcow2']))
+        tree.find('memory').attrib['unit'] = 'GiB'
+        tree.find('memory').text = '1'
+        dom = MagicMock()
+        dom.XMLDesc.return_value = ET.tostring(tree, encoding='unicode')
+        dom.isActive.return_value = False
+        conn.lookupByUUIDString.return_value = dom
+        with patch('views.api.get_db_connection', return_value=conn), \
+             patch('views.api.inventory.refresh'):
+            # 1 GiB is 512 pages of 2 MiB, not 1 KiB short of a page
+            resp = client.put(f'/api/vms/{self.UUID}', json={'hugepages': '2M'})
+        assert resp.status_code == 200 and conn.defineXML.called
@@ -0,0 +1,150 @@
+"""
+Unit tests for views/inventory.py — the event-fed domain table.
+
+Covers:
+  - describe_domain()  XML → record parsing (disks, NICs, boot order, VNC port)
+  - event queue        lifecycle / undefine events applied by _drain()
+  - readers            /api/vms and /api/vms/<uuid> served from the table
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from views import inventory
+
+
+DOMAIN_XML = """
+<domain type='kvm'>
+  <name>web-1</name>
+  <devices>
+    <disk type='file' device='disk'>
+      <source file='/var/lib/libvirt/images/web-1.qcow2'/>
+      <target dev='vda' bus='virtio'/>
+      <boot order='1'/>
+    </disk>
+    <disk type='file' device='cdrom'>
+      <target dev='sda' bus='sata'/>
+    </disk>
+    <interface type='network'>
+      <mac address='52:54:00:aa:bb:cc'/>
+      <source network='default'/>
+      <model type='virtio'/>
+      <target dev='vnet3'/>
+    </interface>
+    <graphics type='vnc' port='5901'/>
+  </devices>
+</domain>"""
+
+
+def _mock_dom(uuid='11111111-2222-3333-4444-555555555555', state=1):
+    dom = MagicMock()
+    dom.UUIDString.return_value = uuid
+    dom.name.return_value = 'web-1'
+    dom.info.return_value = [state, 2097152, 2097152, 2, 0]
+    dom.XMLDesc.return_value = DOMAIN_XML
+    dom.OSType.return_value = 'hvm'
+    dom.snapshotListNames.return_value = ['before-upgrade']
+    dom.interfaceAddresses.return_value = {
+        'vnet3': {'hwaddr': '52:54:00:aa:bb:cc', 'addrs': [{'addr': '192.168.122.10'}]},
+    }
+    return dom
+
+
+@pytest.fixture
+def ready_inventory():
+    """Pretend the inventory thread has completed its first sync."""
+    import libvirt
+    libvirt.VIR_DOMAIN_XML_INACTIVE = 2
+    libvirt.VIR_DOMAIN_INTERFACE_ADDRESSES_SRC_LEASE = 0
+    libvirt.VIR_DOMAIN_EVENT_UNDEFINED = 1
+    with patch.object(inventory, '_ready', True), \
+         patch.object(inventory, '_started', True), \
+         patch.object(inventory, '_domains', {}):
+        inventory._pending.clear()
+        yield inventory._domains
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# describe_domain
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestDescribeDomain:
+    def test_basic_fields(self, ready_inventory):
+        rec = inventory.describe_domain(_mock_dom())
+        assert rec['name'] == 'web-1'
+        assert rec['state'] == 'Running'
+        assert rec['memory_mb'] == 2048
+        assert rec['vcpus'] == 2
+        assert rec['snapshots'] == ['before-upgrade']
+
+    def test_devices_and_boot(self, ready_inventory):
+        rec = inventory.describe_domain(_mock_dom())
+        assert [d['target'] for d in rec['disks']] == ['vda', 'sda']
+        assert rec['disks'][0]['boot_order'] == 1
+        assert rec['boot']['1'] == 'disk|vda'
+        nic = rec['interfaces'][0]
+        assert nic['network'] == 'default'
+        assert nic['target'] == 'vnet3'
+        assert nic['ips'] == ['192.168.122.10']
+
+    def test_vnc_port_only_for_running(self, ready_inventory):
+        assert inventory.describe_domain(_mock_dom())['vnc_port'] == 5901
+        assert inventory.describe_domain(_mock_dom(state=5))['vnc_port'] is None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Event handling
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestEvents:
+    def test_lifecycle_event_refreshes_domain(self, ready_inventory):
+        dom = _mock_dom()
+        conn = MagicMock()
+        conn.lookupByUUIDString.return_value = dom
+        inventory._on_lifecycle(conn, dom, 2, 0, None)   # STARTED
+        inventory._on_device(conn, dom, 'net0', None)
+        inventory._drain(conn)
+        assert dom.UUIDString() in ready_inventory
+        conn.lookupByUUIDString.assert_called_once()   # duplicate events coalesced
+
+    def test_undefine_event_forgets_domain(self, ready_inventory):
+        dom = _mock_dom()
+        ready_inventory[dom.UUIDString()] = inventory.describe_domain(dom)
+        inventory._on_lifecycle(MagicMock(), dom, 1, 0, None)   # UNDEFINED
+        inventory._drain(MagicMock())
+        assert dom.UUIDString() not in ready_inventory
+
+    def test_not_ready_reads_return_none(self):
+        with patch.object(inventory, '_ready', False), \
+             patch.object(inventory, '_started', True):
+            assert inventory.list_domains() is None
+            assert inventory.get_domain('x') is None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# API endpoints read from the table
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestInventoryEndpoints:
+    def test_list_vms_makes_no_libvirt_calls(self, client, ready_inventory):
+        rec = inventory.describe_domain(_mock_dom())
+        ready_inventory[rec['uuid']] = rec
+        with patch('libvirt.open') as mock_open:
+            resp = client.get('/api/vms')
+        mock_open.assert_not_called()
+        assert resp.get_json() == [{
+            'uuid': rec['uuid'], 'name': 'web-1', 'state': 'Running',
+            'state_code': 1, 'memory_mb': 2048, 'vcpus': 2,
+        }]
+
+    def test_get_vm_from_table(self, client, ready_inventory):
+        rec = inventory.describe_domain(_mock_dom())
+        ready_inventory[rec['uuid']] = rec
+        with patch('views.api.get_host_devices', return_value=[]), \
+             patch('libvirt.open') as mock_open:
+            resp = client.get(f"/api/vms/{rec['uuid']}")
+        mock_open.assert_not_called()
+        data = resp.get_json()
+        assert data['boot_devices'][0]['value'] == 'disk|vda'
+        assert data['snapshots'] == [{'name': 'before-upgrade'}]
+        assert 'target' not in data['interfaces'][0]
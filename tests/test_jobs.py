@@ -0,0 +1,134 @@
+"""
+Unit tests for views/jobs.py — the asynchronous job engine.
+
+Covers:
+  - submit()       result / error recorded, progress and logs
+  - resources      jobs on one resource run one at a time, in order
+  - persistence    job files readable by other workers; dead owner → interrupted
+  - HTTP           202 from a converted endpoint, status and cancel routes
+"""
+import json
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from views import jobs
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, 'JOBS_DIR', str(tmp_path))
+    monkeypatch.setattr(jobs, '_jobs', {})
+    monkeypatch.setattr(jobs, '_waiting', {})
+    monkeypatch.setattr(jobs, '_busy', set())
+    monkeypatch.setattr(jobs, 'LOCK_POLL', 0.01)
+    return tmp_path
+
+
+def _wait(job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get(job_id)
+        if job['status'] in jobs.FINISHED:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} still {jobs.get(job_id)["status"]}')
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Engine
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestSubmit:
+    def test_result_and_progress(self, engine):
+        def work(job_id, x):
+            jobs.progress(job_id, 50, 'halfway')
+            jobs.log(job_id, 'did a thing')
+            return {'double': x * 2}
+
+        job = _wait(jobs.submit('test', work, 21))
+        assert job['status'] == 'done'
+        assert job['result'] == {'double': 42}
+        assert job['progress'] == 100
+        assert job['logs'][0]['msg'] == 'did a thing'
+
+    def test_error(self, engine):
+        def boom(job_id):
+            raise RuntimeError('qemu-img failed: no space')
+
+        job = _wait(jobs.submit('test', boom))
+        assert job['status'] == 'error'
+        assert job['error'] == 'qemu-img failed: no space'
+
+    def test_one_job_per_resource(self, engine):
+        order, running = [], []
+        gate = threading.Event()
+
+        def work(job_id, n):
+            running.append(n)
+            assert len(running) == 1
+            if n == 0:
+                gate.wait(2)
+            order.append(n)
+            running.remove(n)
+
+        ids = [jobs.submit('test', work, n, resource='vm:a') for n in range(3)]
+        assert jobs.get(ids[2])['status'] == 'queued'
+        assert jobs.cancel(ids[2])
+        gate.set()
+        assert [_wait(i)['status'] for i in ids] == ['done', 'done', 'cancelled']
+        assert order == [0, 1]
+        assert not jobs._busy
+
+
+class TestPersistence:
+    def test_readable_from_file(self, engine):
+        job_id = jobs.submit('test', lambda job_id: 'ok')
+        _wait(job_id)
+        jobs._jobs.clear()                  # as seen from another worker
+        assert jobs.get(job_id)['result'] == 'ok'
+        assert [j['id'] for j in jobs.list_jobs(kind='test')] == [job_id]
+
+    def test_dead_owner_is_interrupted(self, engine):
+        job = {'id': 'abc', 'kind': 'test', 'resource': None, 'status': 'running',
+               'created_at': time.time(), 'pid': 2 ** 22 + 1}
+        (engine / 'abc.json').write_text(json.dumps(job))
+        assert jobs.get('abc')['status'] == 'interrupted'
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestJobsAPI:
+    UUID = 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+
+    def test_snapshot_returns_202(self, client, engine):
+        dom = MagicMock()
+        conn = MagicMock()
+        conn.lookupByUUIDString.return_value = dom
+        with patch('views.api.get_db_connection', return_value=conn), \
+             patch('views.api.inventory.refresh'):
+            resp = client.post(f'/api/vms/{self.UUID}/snapshots',
+                               json={'snapshot_name': 'before-upgrade'})
+            assert resp.status_code == 202
+            body = resp.get_json()
+            assert resp.headers['Location'] == body['status_url']
+            job = _wait(body['job_id'])
+        assert job['status'] == 'done' and job['resource'] == f'vm:{self.UUID}'
+        assert 'before-upgrade' in dom.snapshotCreateXML.call_args[0][0]
+        assert client.get(body['status_url']).get_json()['result'] == {'success': True}
+
+    def test_validation_stays_synchronous(self, client, engine):
+        resp = client.post(f'/api/vms/{self.UUID}/snapshots', json={})
+        assert resp.status_code == 400
+        assert not os.listdir(engine)
+
+    def test_cancel_finished_job_conflicts(self, client, engine):
+        job_id = jobs.submit('test', lambda job_id: None)
+        _wait(job_id)
+        assert client.delete(f'/api/jobs/{job_id}').status_code == 409
+        assert client.get('/api/jobs/nope').status_code == 404
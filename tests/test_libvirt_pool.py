@@ -0,0 +1,160 @@
+"""
+Unit tests for views/libvirt_pool.py.
+
+Covers:
+  - connection reuse across get_connection() / close() cycles
+  - surplus connections closed once the pool is full
+  - dead connections discarded instead of handed out
+  - transparent reconnect when libvirtd goes away mid-call, retrying
+    read-only calls only
+  - event loop failures logged and backed off
+"""
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+from views import libvirt_pool
+
+
+class _ConnLost(Exception):
+    """libvirtError look-alike carrying a connection-level error code."""
+
+    def get_error_code(self):
+        return 38   # VIR_ERR_SYSTEM_ERROR
+
+
+@pytest.fixture
+def lv_codes():
+    import libvirt
+    libvirt.VIR_ERR_SYSTEM_ERROR = 38
+    yield
+    del libvirt.VIR_ERR_SYSTEM_ERROR
+
+
+def _fresh_conn():
+    conn = MagicMock()
+    conn.isAlive.return_value = 1
+    return conn
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pooling
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestPooling:
+    def test_close_returns_connection_for_reuse(self):
+        raw = _fresh_conn()
+        with patch('libvirt.open', return_value=raw) as mock_open:
+            libvirt_pool.get_connection().close()
+            libvirt_pool.get_connection().close()
+        assert mock_open.call_count == 1
+        raw.close.assert_not_called()
+        stats = libvirt_pool.pool_stats()
+        assert stats['opens'] == 1
+        assert stats['reuses'] == 1
+        assert stats['idle'] == 1
+
+    def test_proxy_delegates_calls(self):
+        raw = _fresh_conn()
+        raw.listAllDomains.return_value = ['dom']
+        with patch('libvirt.open', return_value=raw):
+            conn = libvirt_pool.get_connection()
+            assert conn.listAllDomains(0) == ['dom']
+            conn.close()
+
+    def test_surplus_connections_are_closed(self):
+        raws = [_fresh_conn() for _ in range(libvirt_pool.POOL_SIZE + 1)]
+        with patch('libvirt.open', side_effect=raws):
+            conns = [libvirt_pool.get_connection() for _ in raws]
+            for c in conns:
+                c.close()
+        assert libvirt_pool.pool_stats()['idle'] == libvirt_pool.POOL_SIZE
+        assert sum(r.close.called for r in raws) == 1
+
+    def test_dead_idle_connection_is_replaced(self):
+        dead, fresh = _fresh_conn(), _fresh_conn()
+        with patch('libvirt.open', side_effect=[dead, fresh]):
+            libvirt_pool.get_connection().close()
+            dead.isAlive.return_value = 0
+            conn = libvirt_pool.get_connection()
+            conn.getInfo()
+            conn.close()
+        fresh.getInfo.assert_called_once()
+        dead.close.assert_called_once()
+        assert libvirt_pool.pool_stats()['discards'] == 1
+
+    def test_open_failure_is_counted(self):
+        with patch('libvirt.open', side_effect=RuntimeError('down')):
+            with pytest.raises(RuntimeError):
+                libvirt_pool.get_connection()
+        stats = libvirt_pool.pool_stats()
+        assert stats['failures'] == 1
+        assert stats['in_use'] == 0
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Reconnect
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestReconnect:
+    def test_connection_error_retried_on_new_connection(self, lv_codes):
+        broken, fresh = _fresh_conn(), _fresh_conn()
+        broken.listAllDomains.side_effect = _ConnLost('libvirtd restarted')
+        fresh.listAllDomains.return_value = []
+        with patch('libvirt.open', side_effect=[broken, fresh]):
+            conn = libvirt_pool.get_connection()
+            assert conn.listAllDomains(0) == []
+            conn.close()
+        broken.close.assert_called_once()
+        assert libvirt_pool.pool_stats()['reconnects'] == 1
+
+    def test_ordinary_errors_are_not_retried(self, lv_codes):
+        raw = _fresh_conn()
+        raw.lookupByUUIDString.side_effect = Exception('no domain')
+        with patch('libvirt.open', return_value=raw) as mock_open:
+            conn = libvirt_pool.get_connection()
+            with pytest.raises(Exception, match='no domain'):
+                conn.lookupByUUIDString('x')
+            conn.close()
+        assert mock_open.call_count == 1
+
+    def test_mutating_call_reconnects_without_retry(self, lv_codes):
+        broken, fresh = _fresh_conn(), _fresh_conn()
+        broken.defineXML.side_effect = _ConnLost('libvirtd restarted')
+        with patch('libvirt.open', side_effect=[broken, fresh]):
+            conn = libvirt_pool.get_connection()
+            with pytest.raises(_ConnLost):
+                conn.defineXML('<domain/>')
+            conn.getInfo()
+            conn.close()
+        # the define may already have reached libvirtd — never send it twice
+        fresh.defineXML.assert_not_called()
+        fresh.getInfo.assert_called_once()
+        assert libvirt_pool.pool_stats()['reconnects'] == 1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Event loop
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _Stop(BaseException):
+    pass
+
+
+class TestEventLoop:
+    def test_failures_back_off(self, monkeypatch):
+        import libvirt
+        runs = [RuntimeError('x'), RuntimeError('x'), None, RuntimeError('x'), _Stop()]
+        monkeypatch.setattr(libvirt, 'virEventRegisterDefaultImpl', MagicMock(), raising=False)
+        monkeypatch.setattr(libvirt, 'virEventRunDefaultImpl', MagicMock(side_effect=runs),
+                            raising=False)
+        monkeypatch.setattr(libvirt_pool, '_event_loop_started', False)
+        monkeypatch.setattr(libvirt_pool, '_event_loop_running', False)
+        threads = []
+        monkeypatch.setattr(libvirt_pool, 'start_native_thread',
+                            lambda target, name: threads.append(target))
+        with patch.object(libvirt_pool, 'native_sleep') as sleep:
+            assert libvirt_pool.event_loop_running()
+            with pytest.raises(_Stop):
+                threads[0]()
+        assert sleep.call_args_list == [call(1), call(2), call(1)]
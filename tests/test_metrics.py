@@ -0,0 +1,324 @@
+"""
+Unit tests for views/metrics.py VM statistics.
+
+Covers:
+  - _sample_from_bulk()  getAllDomainStats record → counter sample
+  - _collect_bulk()      same JSON shape and rates as the per-domain path
+  - VM history           leader-written per-VM rings, endpoint, follower feed
+  - live feed            _publish() fan-out through /api/metrics/stream
+  - dashboard            CPU gauge served from the collector's newest sample
+"""
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from views import metrics
+
+
+VM_XML = """
+<domain type='kvm'>
+  <devices>
+    <disk type='file' device='disk'><target dev='vda'/></disk>
+    <disk type='file' device='cdrom'><target dev='sda'/></disk>
+    <interface type='network'><target dev='vnet0'/></interface>
+  </devices>
+</domain>"""
+
+UUID = 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+
+
+def _bulk_record(cpu_ns, rd, wr, rx, tx):
+    return {
+        'state.state': 1,
+        'cpu.time': cpu_ns,
+        'balloon.current': 1048576,
+        'balloon.maximum': 2097152,
+        'vcpu.current': 2,
+        'block.count': 2,
+        'block.0.name': 'vda', 'block.0.rd.bytes': rd, 'block.0.wr.bytes': wr,
+        'block.1.name': 'sda', 'block.1.rd.bytes': 999, 'block.1.wr.bytes': 0,
+        'net.count': 1,
+        'net.0.rx.bytes': rx, 'net.0.tx.bytes': tx,
+    }
+
+
+def _mock_dom(cpu_ns, rd, wr, rx, tx):
+    dom = MagicMock()
+    dom.UUIDString.return_value = UUID
+    dom.name.return_value = 'db-1'
+    dom.state.return_value = (1, 0)
+    dom.info.return_value = [1, 2097152, 1048576, 2, cpu_ns]
+    dom.XMLDesc.return_value = VM_XML
+    dom.blockStats.return_value = (0, rd, 0, wr, 0)
+    dom.interfaceStats.return_value = (rx, 0, 0, 0, tx, 0, 0, 0)
+    return dom
+
+
+@pytest.fixture(autouse=True)
+def _clean_samples():
+    import libvirt
+    for name in ('VIR_DOMAIN_STATS_STATE', 'VIR_DOMAIN_STATS_CPU_TOTAL',
+                 'VIR_DOMAIN_STATS_BALLOON', 'VIR_DOMAIN_STATS_VCPU',
+                 'VIR_DOMAIN_STATS_INTERFACE', 'VIR_DOMAIN_STATS_BLOCK',
+                 'VIR_CONNECT_GET_ALL_DOMAINS_STATS_RUNNING'):
+        setattr(libvirt, name, 1)
+    metrics._vm_samples.clear()
+    yield
+    metrics._vm_samples.clear()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Bulk sample mapping
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestSampleFromBulk:
+    def test_counters_and_memory(self):
+        s = metrics._sample_from_bulk(_bulk_record(5e9, 100, 200, 300, 400))
+        assert s['cpu_ns'] == 5e9
+        assert s['vcpus'] == 2
+        assert s['mem_used'] == 1048576 * 1024
+        assert s['mem_total'] == 2097152 * 1024
+        assert (s['net_rx'], s['net_tx']) == (300, 400)
+
+    def test_disk_targets_exclude_cdrom(self):
+        rec = _bulk_record(0, 100, 200, 0, 0)
+        assert metrics._sample_from_bulk(rec)['disk_r'] == 100 + 999
+        assert metrics._sample_from_bulk(rec, {'vda'})['disk_r'] == 100
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Equivalence with the per-domain path
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBulkMatchesPerDomain:
+    def _run_bulk(self, records, times):
+        conn = MagicMock()
+        dom = _mock_dom(0, 0, 0, 0, 0)
+        conn.getAllDomainStats.side_effect = [[(dom, r)] for r in records]
+        record = {'disks': [{'device': 'disk', 'target': 'vda'},
+                            {'device': 'cdrom', 'target': 'sda'}]}
+        out = []
+        with patch.object(metrics.inventory, 'get_domain', return_value=record), \
+             patch('time.time', side_effect=times):
+            for _ in records:
+                out.append(metrics._collect_bulk(conn))
+        return out
+
+    def _run_per_domain(self, doms, times):
+        out = []
+        with patch('time.time', side_effect=times):
+            for d in doms:
+                out.append([metrics._parse_vm_stats(d)])
+        return out
+
+    def test_same_rates_and_shape(self):
+        times = [1000.0, 1015.0]
+        bulk = self._run_bulk([
+            _bulk_record(10e9, 1000, 2000, 3000, 4000),
+            _bulk_record(25e9, 16000, 32000, 48000, 64000),
+        ], times)
+        metrics._vm_samples.clear()
+        slow = self._run_per_domain([
+            _mock_dom(10e9, 1000, 2000, 3000, 4000),
+            _mock_dom(25e9, 16000, 32000, 48000, 64000),
+        ], times)
+        assert bulk == slow
+        second = bulk[1][0]
+        assert second['cpu_pct'] == 100.0
+        assert second['disk_r_rate'] == 1000.0
+        assert second['net_tx_rate'] == 4000.0
+
+    def test_first_sample_has_no_rates(self):
+        first = self._run_bulk([_bulk_record(1e9, 0, 0, 0, 0)], [1000.0])[0][0]
+        assert first['cpu_pct'] is None
+        assert first['mem_pct'] == 50.0
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-VM columnar history
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _row(v):
+    return (v,) * len(metrics.VM_SERIES)
+
+
+@pytest.fixture
+def vm_store(tmp_path, monkeypatch):
+    from views import metrics_store
+    monkeypatch.setattr(metrics_store, 'RING_PATH', str(tmp_path / 'ring'))
+    monkeypatch.setattr(metrics_store, '_rings', {})
+    store = metrics._vm_store(writable=True)
+
+    def append(ts, rows):
+        store.append(ts, rows, {'ts': ts, 'vms': []})
+    return append
+
+
+class TestVMHistory:
+    def test_endpoint(self, client, vm_store):
+        vm_store(1000, {UUID: (50.0, 25.0, np.nan, 1.0, 2.0, 3.0)})
+        vm_store(1015, {UUID: (60.0, 25.0, 7.0, 1.0, 2.0, 3.0)})
+        clock = MagicMock()
+        clock.time.return_value = 1020
+        with patch.object(metrics, 'time', clock):
+            resp = client.get(f'/api/metrics/vms/{UUID}/history?minutes=1')
+            missing = client.get('/api/metrics/vms/nope/history')
+        data = resp.get_json()
+        assert data['history']['cpu'] == [[1000, 50.0], [1015, 60.0]]
+        assert data['history']['net_rx'] == [[1015, 7.0]]
+        assert missing.status_code == 404
+
+    def test_vm_history_max_points(self, client, vm_store):
+        for i in range(60):
+            vm_store(1000 + i * 15, {UUID: _row(float(i))})
+        clock = MagicMock()
+        clock.time.return_value = 1000 + 60 * 15
+        with patch.object(metrics, 'time', clock):
+            resp = client.get(f'/api/metrics/vms/{UUID}/history?max_points=10')
+            bad  = client.get(f'/api/metrics/vms/{UUID}/history?downsample=cubic')
+        cpu = resp.get_json()['history']['cpu']
+        assert len(cpu) == 10
+        assert cpu[0] == [1000, 0.0] and cpu[-1] == [1000 + 59 * 15, 59.0]
+        assert bad.status_code == 400
+
+    def test_after_cursor_and_etag(self, client, vm_store):
+        for i in range(4):
+            vm_store(1000 + i * 15, {UUID: _row(float(i))})
+        clock = MagicMock()
+        clock.time.return_value = 1100
+        url = f'/api/metrics/vms/{UUID}/history?after=1015'
+        with patch.object(metrics, 'time', clock):
+            first = client.get(url)
+            again = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+            vm_store(1060, {UUID: _row(4.0)})
+            moved = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+        assert first.get_json()['history']['cpu'] == [[1030, 2.0], [1045, 3.0]]
+        assert first.get_json()['last_ts'] == 1045
+        assert again.status_code == 304
+        assert moved.status_code == 200
+        assert moved.get_json()['history']['cpu'][-1] == [1060, 4.0]
+
+    def test_only_the_leader_collects(self, vm_store, monkeypatch, fresh_feed):
+        # a follower publishes the leader's tick instead of sampling libvirt
+        from views import metrics_store
+        monkeypatch.setattr(metrics, '_vms_published', 0)
+        monkeypatch.setattr(metrics_store, 'try_lead', lambda: False)
+        monkeypatch.setattr(metrics, 'get_connection', MagicMock(side_effect=AssertionError))
+        monkeypatch.setattr(metrics.time, 'sleep', MagicMock(side_effect=StopIteration))
+        metrics._vm_store(writable=True).append(
+            1000, {UUID: _row(1.0)}, {'ts': 1000, 'vms': [{'uuid': UUID, 'name': 'db-1'}],
+                                      'counters': {UUID: ['db-1', {'cpu.time': 5}]}})
+        with pytest.raises(StopIteration):
+            metrics._collect_loop()
+        assert metrics._feed_last['vms'][2]['vms'][0]['name'] == 'db-1'
+        assert metrics.vm_counters() == {UUID: ['db-1', {'cpu.time': 5}]}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Host history from the shared ring
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestHostHistory:
+    def test_history_since_keeps_api_rounding(self, tmp_path, monkeypatch):
+        from views import metrics_store
+        monkeypatch.setattr(metrics_store, 'RING_PATH', str(tmp_path / 'ring'))
+        monkeypatch.setattr(metrics_store, '_rings', {})
+        store = metrics_store.open_store(len(metrics.HOST_SERIES), 15, writable=True)
+        store.append(1000, (12.345, 50.0, 0.456, 1234.6, 0.0, 10.2, 0.0))
+        history, step = metrics._history_since(0, now=1010)
+        assert step == 15
+        assert history['cpu'] == [[1000, 12.3]]
+        assert history['load'] == [[1000, 0.46]]
+        assert history['net_rx'] == [[1000, 1235]]
+        assert isinstance(history['net_rx'][0][1], int)
+
+    def test_history_after_cursor(self, tmp_path, monkeypatch):
+        from views import metrics_store
+        monkeypatch.setattr(metrics_store, 'RING_PATH', str(tmp_path / 'ring'))
+        monkeypatch.setattr(metrics_store, '_rings', {})
+        store = metrics_store.open_store(len(metrics.HOST_SERIES), 15, writable=True)
+        for t in (1000, 1015, 1030):
+            store.append(t, (1.0,) * len(metrics.HOST_SERIES))
+        history, _ = metrics._history_since(0, now=1040, after=1015)
+        assert [p[0] for p in history['cpu']] == [1030]
+        assert store.last_ts() == 1030
+
+    def test_dashboard_cpu_from_store(self, client, tmp_path, monkeypatch):
+        from views import metrics_store
+        monkeypatch.setattr(metrics_store, 'RING_PATH', str(tmp_path / 'ring'))
+        monkeypatch.setattr(metrics_store, '_rings', {})
+        store = metrics_store.open_store(len(metrics.HOST_SERIES), 15, writable=True)
+        store.append(int(time.time()) - 5, (12.345,) + (1.0,) * (len(metrics.HOST_SERIES) - 1))
+        ps = MagicMock()
+        ps.virtual_memory.return_value = MagicMock(percent=40.0, used=4, total=10)
+        ps.disk_usage.return_value = MagicMock(percent=50.0, used=5, total=10)
+        ps.getloadavg.return_value = (0.5, 0.4, 0.3)
+        monkeypatch.setattr(metrics, '_PSUTIL', True)
+        monkeypatch.setattr(metrics, 'psutil', ps, raising=False)
+        data = client.get('/api/metrics/dashboard').get_json()
+        assert data['cpu_pct'] == 12.3 and not ps.cpu_percent.called
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Live feed / SSE stream
+# ─────────────────────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def fresh_feed(monkeypatch):
+    import collections
+    monkeypatch.setattr(metrics, '_feed', collections.deque(maxlen=64))
+    monkeypatch.setattr(metrics, '_feed_last', {})
+    monkeypatch.setattr(metrics, '_feed_seq', 0)
+
+
+class TestLiveFeed:
+    def _vms_event(self):
+        return {'ts': 1000, 'vms': [
+            {'uuid': UUID, 'name': 'db-1', 'cpu': 5.0, 'memory': 40.0},
+            {'uuid': 'other', 'name': 'web-1', 'cpu': 1.0, 'memory': 10.0},
+        ]}
+
+    def test_filter_by_series_and_vm(self):
+        out = metrics._filter_event('vms', self._vms_event(), {'cpu'}, {UUID})
+        assert out == {'ts': 1000, 'vms': [{'uuid': UUID, 'name': 'db-1', 'cpu': 5.0}]}
+        assert metrics._filter_event('vms', self._vms_event(), None, set()) is None
+        host = metrics._filter_event('host', {'ts': 1, 'cpu': 2, 'load': 3}, {'load'}, None)
+        assert host == {'ts': 1, 'load': 3}
+
+    def test_feed_after_returns_only_newer(self, fresh_feed):
+        metrics._publish('host', {'ts': 1})
+        metrics._publish('host', {'ts': 2})
+        assert [e[2]['ts'] for e in metrics._feed_after(1, 0)] == [2]
+        assert metrics._feed_after(2, 0) == []
+
+    def test_stream_sends_latest_then_new_events(self, client, fresh_feed, monkeypatch):
+        monkeypatch.setattr(metrics, 'INTERVAL', 0.01)   # keepalive instead of blocking
+        metrics._publish('host', {'ts': 1, 'cpu': 10.0, 'memory': 20.0})
+        resp = client.get('/api/metrics/stream?series=cpu&vms=' + UUID, buffered=False)
+        assert resp.mimetype == 'text/event-stream'
+        chunks = iter(resp.response)
+        first = next(chunks)
+        first = first.decode() if isinstance(first, bytes) else first
+        assert first.startswith('event: host\n')
+        assert json.loads(first.split('data: ')[1]) == {'ts': 1, 'cpu': 10.0}
+        metrics._publish('vms', self._vms_event())
+        nxt = next(chunks)
+        nxt = nxt.decode() if isinstance(nxt, bytes) else nxt
+        assert json.loads(nxt.split('data: ')[1])['vms'] == [{'uuid': UUID, 'name': 'db-1', 'cpu': 5.0}]
+        resp.close()
+
+    def test_publish_host_reads_shared_ring(self, tmp_path, monkeypatch, fresh_feed):
+        from views import metrics_store
+        monkeypatch.setattr(metrics_store, 'RING_PATH', str(tmp_path / 'ring'))
+        monkeypatch.setattr(metrics_store, '_rings', {})
+        monkeypatch.setattr(metrics, '_host_published', 0)
+        store = metrics_store.TieredStore(len(metrics.HOST_SERIES), 15, writable=True)
+        for t in (1000, 1015):
+            store.append(t, (1.0,) * len(metrics.HOST_SERIES))
+        metrics._publish_host()
+        store.append(1030, (2.0,) * len(metrics.HOST_SERIES))
+        metrics._publish_host()
+        assert [e[2]['ts'] for e in metrics._feed] == [1015, 1030]
+
@@ -0,0 +1,205 @@
+"""
+Unit tests for views/metrics_store.py — the cross-worker host metrics ring.
+
+Covers:
+  - RingFile      append / wrap-around / cutoff / newest sample, writer →
+                  read-only reader,
+                  float32 values, files from before the value size was recorded
+  - leadership    only one process on the host holds the collector lock
+  - TieredStore   1 min / 1 h min-avg-max rollups and tier selection
+  - VMStore       per-domain rings, latest tick, pruning of gone domains
+"""
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from views import metrics_store
+
+
+@pytest.fixture
+def ring_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'metrics.ring')
+    monkeypatch.setattr(metrics_store, 'RING_PATH', path)
+    monkeypatch.setattr(metrics_store, 'LOCK_PATH', path + '.lock')
+    monkeypatch.setattr(metrics_store, '_rings', {})
+    monkeypatch.setattr(metrics_store, '_lock_fd', None)
+    monkeypatch.setattr(metrics_store, '_leader_pid', None)
+    return path
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RingFile
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRingFile:
+    def test_reader_sees_writer_samples(self, ring_path):
+        writer = metrics_store.RingFile(ring_path, 2, 8, 15, writable=True)
+        reader = metrics_store.RingFile(ring_path, 2, 8, 15)
+        writer.append(100, (1.0, 2.0))
+        writer.append(115, (3.0, 4.0))
+        ts, vals = reader.since(0)
+        assert ts.tolist() == [100, 115]
+        assert vals.tolist() == [[1.0, 3.0], [2.0, 4.0]]
+
+    def test_wraps_and_skips_next_slot(self, ring_path):
+        writer = metrics_store.RingFile(ring_path, 1, 4, 15, writable=True)
+        for t in range(1, 10):
+            writer.append(t, (float(t),))
+        ts, vals = metrics_store.RingFile(ring_path, 1, 4, 15).since(0)
+        assert ts.tolist() == [7, 8, 9]        # length - 1 newest
+        assert vals[0].tolist() == [7.0, 8.0, 9.0]
+
+    def test_cutoff(self, ring_path):
+        writer = metrics_store.RingFile(ring_path, 1, 8, 15, writable=True)
+        for t in (100, 115, 130):
+            writer.append(t, (0.0,))
+        ts, _ = writer.since(115)
+        assert ts.tolist() == [115, 130]
+
+    def test_latest(self, ring_path):
+        writer = metrics_store.RingFile(ring_path, 2, 4, 15, writable=True)
+        reader = metrics_store.RingFile(ring_path, 2, 4, 15)
+        assert reader.latest() is None
+        for t in range(1, 7):
+            writer.append(t, (float(t), -float(t)))
+        ts, vals = reader.latest()
+        assert ts == 6 and vals.tolist() == [6.0, -6.0]
+
+    def test_reader_before_file_exists(self, ring_path):
+        reader = metrics_store.RingFile(ring_path, 1, 8, 15)
+        assert reader.since(0)[0].size == 0
+        metrics_store.RingFile(ring_path, 1, 8, 15, writable=True).append(5, (1.0,))
+        assert reader.since(0)[0].tolist() == [5]
+
+    def test_history_survives_new_writer(self, ring_path):
+        metrics_store.RingFile(ring_path, 1, 8, 15, writable=True).append(5, (1.0,))
+        second = metrics_store.RingFile(ring_path, 1, 8, 15, writable=True)
+        second.append(20, (2.0,))
+        assert second.since(0)[0].tolist() == [5, 20]
+
+    def test_shape_change_recreates_file(self, ring_path):
+        metrics_store.RingFile(ring_path, 1, 8, 15, writable=True).append(5, (1.0,))
+        ring = metrics_store.RingFile(ring_path, 2, 8, 15, writable=True)
+        assert ring.count() == 0
+        assert os.path.getsize(ring_path) == ring.size
+
+    def test_float32_values(self, ring_path):
+        writer = metrics_store.RingFile(ring_path, 6, 8, 15, writable=True, dtype=np.float32)
+        writer.append(5, (0.5,) * 6)
+        assert os.path.getsize(ring_path) == 64 + 8 * (8 + 6 * 4)
+        # a float64 ring of the same shape does not map the file
+        assert metrics_store.RingFile(ring_path, 6, 8, 15).since(0)[0].size == 0
+        ts, vals = metrics_store.RingFile(ring_path, 6, 8, 15, dtype=np.float32).since(0)
+        assert ts.tolist() == [5] and vals.dtype == np.float32
+
+    def test_keeps_float64_file_without_value_size(self, ring_path):
+        ring = metrics_store.RingFile(ring_path, 1, 8, 15, writable=True)
+        ring.append(5, (1.0,))
+        ring._close()
+        with open(ring_path, 'r+b') as f:
+            f.seek(20)
+            f.write(b'\0' * 4)          # as written before the value size was recorded
+        assert metrics_store.RingFile(ring_path, 1, 8, 15, writable=True).since(0)[0].tolist() == [5]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Leadership
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _child_try_lead(lock_path, q):
+    metrics_store.LOCK_PATH = lock_path
+    metrics_store._lock_fd = None
+    q.put(metrics_store.try_lead())
+
+
+class TestLeadership:
+    def test_single_leader_per_host(self, ring_path):
+        assert metrics_store.try_lead()
+        assert metrics_store.is_leader()
+        q = multiprocessing.get_context('fork').Queue()
+        p = multiprocessing.get_context('fork').Process(
+            target=_child_try_lead, args=(metrics_store.LOCK_PATH, q))
+        p.start()
+        p.join(10)
+        assert q.get(timeout=5) is False
+        os.close(metrics_store._lock_fd)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Retention tiers
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestTieredStore:
+    def _fill(self, store, start, end, step=15):
+        for t in range(start, end, step):
+            store.append(t, (float(t % 3600),))
+
+    def test_minute_rollup_min_avg_max(self, ring_path):
+        store = metrics_store.TieredStore(1, 15, writable=True)
+        self._fill(store, 3600, 3600 + 75)          # 4 samples in minute 0, 1 in minute 1
+        ts, vals = store.tiers[1][2].since(0)
+        assert ts.tolist() == [3600]
+        assert vals[:, 0].tolist() == [0.0, 22.5, 45.0]
+
+    def test_hour_rollup_from_minutes(self, ring_path):
+        store = metrics_store.TieredStore(1, 15, writable=True)
+        self._fill(store, 3600, 2 * 3600 + 15)
+        ts, vals = store.tiers[2][2].since(0)
+        assert ts.tolist() == [3600]
+        assert vals[0, 0] == 0.0 and vals[2, 0] == 3585.0
+        assert vals[1, 0] == pytest.approx(1792.5)
+
+    def test_new_writer_catches_up_on_rollups(self, ring_path):
+        self._fill(metrics_store.TieredStore(1, 15, writable=True), 3600, 3600 + 60)
+        store = metrics_store.TieredStore(1, 15, writable=True)
+        assert store.tiers[1][2].count() == 0
+        store.append(3600 + 120, (0.0,))
+        assert store.tiers[1][2].since(0)[0].tolist() == [3600]
+
+    def test_query_picks_coarsest_tier_with_enough_points(self, ring_path):
+        store = metrics_store.TieredStore(1, 15, writable=True)
+        now = 400 * 86400
+        assert store.query(now - 3600, now)[0] == 15
+        assert store.query(now - 7 * 86400, now)[0] == 60
+        assert store.query(now - 365 * 86400, now)[0] == 3600
+
+    def test_open_store_is_cached_per_mode(self, ring_path):
+        a = metrics_store.open_store(1, 15, writable=True)
+        assert metrics_store.open_store(1, 15, writable=True) is a
+        reader = metrics_store.open_store(1, 15)
+        assert reader is not a and not reader.tiers[0][2].writable
+        a.append(100, (1.0,))
+        assert reader.last_ts() == 100
+        assert isinstance(reader.tiers[0][2].since(0)[0], np.ndarray)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# VMStore
+# ─────────────────────────────────────────────────────────────────────────────
+
+UUID = 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+
+
+class TestVMStore:
+    def test_reader_sees_rings_and_latest(self, ring_path):
+        writer = metrics_store.open_vm_store(2, 8, 15, writable=True)
+        reader = metrics_store.open_vm_store(2, 8, 15)
+        assert reader.latest() is None and reader.since(UUID, 0) is None
+        writer.append(100, {UUID: (1.0, np.nan)}, {'ts': 100, 'vms': []})
+        writer.append(115, {UUID: (2.0, 3.0)}, {'ts': 115, 'vms': [{'uuid': UUID}]})
+        ts, vals = reader.since(UUID, 0)
+        assert ts.tolist() == [100, 115] and np.isnan(vals[1][0])
+        assert vals.dtype == np.float32
+        assert reader.last_ts(UUID) == 115
+        assert reader.latest() == {'ts': 115, 'vms': [{'uuid': UUID}]}
+        assert reader.since('../metrics', 0) is None
+
+    def test_gone_domains_are_pruned(self, ring_path):
+        store = metrics_store.VMStore(1, 4, 15, writable=True)
+        store.append(100, {UUID: (1.0,)}, {})
+        store.append(100 + metrics_store.PRUNE_EVERY, {}, {})   # 4 × 15 s span long past
+        assert store.since(UUID, 0) is None
+        assert os.listdir(store.dir) == ['latest.json']
+
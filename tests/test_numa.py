@@ -0,0 +1,187 @@
+"""
+Unit tests for views/numa.py — NUMA-aware placement.
+
+Covers:
+  - topology      canned dual-socket capabilities XML, cpuset syntax
+  - place()       least-loaded cell, CPU-level spreading, splits for big VMs
+  - XML           cputune / numatune / guest cells written by apply_placement
+  - rebalance     plan from existing pinning, live re-pin calls, HTTP
+"""
+import xml.etree.ElementTree as ET
+from unittest.mock import MagicMock, patch
+
+import libvirt
+import pytest
+
+from views import numa
+from views.creation import generate_vm_xml
+
+GIB = 1024 ** 2
+
+CAPS = """<capabilities><host><topology><cells num='2'>
+  <cell id='0'>
+    <memory unit='KiB'>16777216</memory>
+    <pages unit='KiB' size='4'>4194304</pages>
+    <pages unit='KiB' size='2048'>0</pages>
+    <cpus num='8'>
+      <cpu id='0' socket_id='0' core_id='0' siblings='0,8'/><cpu id='1' socket_id='0' core_id='1' siblings='1,9'/>
+      <cpu id='2' socket_id='0' core_id='2' siblings='2,10'/><cpu id='3' socket_id='0' core_id='3' siblings='3,11'/>
+      <cpu id='8' socket_id='0' core_id='0' siblings='0,8'/><cpu id='9' socket_id='0' core_id='1' siblings='1,9'/>
+      <cpu id='10' socket_id='0' core_id='2' siblings='2,10'/><cpu id='11' socket_id='0' core_id='3' siblings='3,11'/>
+    </cpus>
+  </cell>
+  <cell id='1'>
+    <memory unit='KiB'>16777216</memory>
+    <pages unit='KiB' size='4'>4194304</pages>
+    <pages unit='KiB' size='2048'>0</pages>
+    <cpus num='8'>
+      <cpu id='4' socket_id='1' core_id='0' siblings='4,12'/><cpu id='5' socket_id='1' core_id='1' siblings='5,13'/>
+      <cpu id='6' socket_id='1' core_id='2' siblings='6,14'/><cpu id='7' socket_id='1' core_id='3' siblings='7,15'/>
+      <cpu id='12' socket_id='1' core_id='0' siblings='4,12'/><cpu id='13' socket_id='1' core_id='1' siblings='5,13'/>
+      <cpu id='14' socket_id='1' core_id='2' siblings='6,14'/><cpu id='15' socket_id='1' core_id='3' siblings='7,15'/>
+    </cpus>
+  </cell>
+</cells></topology></host></capabilities>"""
+
+
+def _domain_xml(name, vcpus, ram_mb, pins=None, nodeset=None):
+    tree = ET.fromstring(generate_vm_xml(name, ram_mb, vcpus, disks=['/img/a.qcow2']))
+    if pins is not None:
+        tune = ET.SubElement(tree, 'cputune')
+        for v, cpuset in enumerate(pins):
+            ET.SubElement(tune, 'vcpupin', vcpu=str(v), cpuset=cpuset)
+    if nodeset is not None:
+        ET.SubElement(ET.SubElement(tree, 'numatune'), 'memory', mode='strict', nodeset=nodeset)
+    return ET.tostring(tree, encoding='unicode')
+
+
+def _dom(name, xml):
+    dom = MagicMock()
+    dom.name.return_value = name
+    dom.UUIDString.return_value = f'uuid-{name}'
+    dom.XMLDesc.return_value = xml
+    return dom
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    monkeypatch.setattr(libvirt, 'VIR_CONNECT_LIST_DOMAINS_ACTIVE', 1, raising=False)
+    c = MagicMock()
+    c.getCapabilities.return_value = CAPS
+    c.listAllDomains.return_value = []
+    return c
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Topology
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestTopology:
+    def test_parse(self):
+        cells = numa.parse_topology(CAPS)
+        assert [c['id'] for c in cells] == [0, 1]
+        assert cells[1]['cpus'] == [4, 5, 6, 7, 12, 13, 14, 15]
+        assert cells[0]['memory_kib'] == 16 * GIB
+
+    def test_cpuset_round_trip(self):
+        assert numa.parse_cpuset('0-3,8,^2') == {0, 1, 3, 8}
+        assert numa.format_cpuset({0, 1, 2, 5, 7, 8}) == '0-2,5,7-8'
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Placement
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestPlace:
+    def test_least_loaded_cell(self):
+        topo = numa.parse_topology(CAPS)
+        load = numa.new_load(topo)
+        busy = numa.domain_resources(ET.fromstring(_domain_xml('db', 4, 8192, ['0', '1', '2', '3'], '0')))
+        numa.charge(load, topo, busy)
+        p = numa.place(topo, load, 4, 4 * GIB)
+        assert p['nodes'] == [1]
+        assert sorted(p['vcpupin'].values()) == [4, 5, 6, 7]     # one vCPU per host CPU
+        assert p['cells'] == [{'node': 1, 'vcpus': [0, 1, 2, 3], 'memory_kib': 4 * GIB}]
+        # the next VM sees the first one's load
+        assert numa.place(topo, load, 4, 4 * GIB)['nodes'] == [0]
+
+    def test_large_vm_is_split(self):
+        topo = numa.parse_topology(CAPS)
+        p = numa.place(topo, numa.new_load(topo), 12, 24 * GIB)
+        assert p['nodes'] == [0, 1]
+        assert [len(c['vcpus']) for c in p['cells']] == [6, 6]
+        assert sum(c['memory_kib'] for c in p['cells']) == 24 * GIB
+
+    def test_memory_split_follows_free_memory(self):
+        topo = numa.parse_topology(CAPS)
+        load = numa.new_load(topo)
+        load['mem'][0] += 8 * GIB
+        p = numa.place(topo, load, 8, 20 * GIB, commit=False)
+        assert p['nodes'] == [0, 1]
+        mem = {c['node']: c['memory_kib'] for c in p['cells']}
+        assert mem[0] <= 8 * GIB and mem[1] <= 16 * GIB and sum(mem.values()) == 20 * GIB
+
+    def test_memory_only_split_has_no_guest_cells(self):
+        # 1 vCPU, 24 GiB: needs both 16 GiB cells but can only populate one guest cell
+        topo = numa.parse_topology(CAPS)
+        p = numa.place(topo, numa.new_load(topo), 1, 24 * GIB)
+        assert p['nodes'] == [0, 1]
+        assert [c['memory_kib'] for c in p['cells']] == [12 * GIB, 12 * GIB]
+        tree = ET.fromstring(generate_vm_xml('fat', 24 * 1024, 1, disks=['/img/a.qcow2']))
+        numa.apply_placement(tree, p)
+        assert tree.find('numatune/memory').get('nodeset') == '0-1'
+        assert tree.find('numatune/memnode') is None
+        assert tree.find('cpu/numa') is None
+
+    def test_apply_placement(self):
+        topo = numa.parse_topology(CAPS)
+        tree = ET.fromstring(generate_vm_xml('big', 24 * 1024, 12, disks=['/img/a.qcow2'],
+                                             profile='throughput'))
+        numa.apply_placement(tree, numa.place(topo, numa.new_load(topo), 12, 24 * GIB))
+        assert len(tree.findall('cputune/vcpupin')) == 12
+        assert tree.find('cputune/emulatorpin').get('cpuset') == '0-15'
+        assert len(tree.findall('cputune/iothreadpin')) == 2
+        assert tree.find('numatune/memory').attrib == {'mode': 'strict', 'nodeset': '0-1'}
+        assert [m.get('nodeset') for m in tree.findall('numatune/memnode')] == ['0', '1']
+        assert [c.get('cpus') for c in tree.findall('cpu/numa/cell')] == ['0-5', '6-11']
+        # re-applying replaces rather than appends
+        numa.apply_placement(tree, numa.place(topo, numa.new_load(topo), 12, 24 * GIB))
+        assert len(tree.findall('cputune/vcpupin')) == 12 and len(tree.findall('numatune')) == 1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rebalance and HTTP
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRebalance:
+    def test_moves_crowded_domain(self, conn):
+        a = _dom('a', _domain_xml('a', 4, 8192, ['0', '1', '2', '3'], '0'))
+        b = _dom('b', _domain_xml('b', 2, 2048, ['0', '1'], '0'))
+        conn.listAllDomains.return_value = [a, b]
+        with patch.object(numa, 'get_db_connection', return_value=conn), \
+             patch.object(numa.inventory, 'refresh'):
+            result = numa.rebalance()
+        by_name = {d['name']: d for d in result['domains']}
+        assert by_name['a']['result'] == 'unchanged'
+        assert by_name['b']['to']['nodes'] == [1] and by_name['b']['result'] == 'repinned'
+        assert b.pinVcpuFlags.call_count == 2 and not a.pinVcpuFlags.called
+        mask = b.pinEmulator.call_args[0][0]
+        assert [i for i, on in enumerate(mask) if on] == [4, 5, 6, 7, 12, 13, 14, 15]
+        assert list(b.setNumaParameters.call_args[0][0].values()) == ['1']
+
+    def test_http(self, client, conn):
+        conn.listAllDomains.return_value = [_dom('a', _domain_xml('a', 2, 2048, ['4', '5'], '1'))]
+        with patch.object(numa, 'get_db_connection', return_value=conn):
+            body = client.get('/api/host/numa').get_json()
+            assert body['cells'][1]['vcpus'] == 2 and body['cells'][1]['host_cpus'] == '4-7,12-15'
+            plan = client.post('/api/host/numa/rebalance', json={'dry_run': True}).get_json()
+        assert plan['changes'] == 1 and plan['domains'][0]['to']['nodes'] == [0]
+
+    def test_create_job_places_domain(self, conn):
+        from views import api
+        with patch.object(api, 'get_db_connection', return_value=conn), \
+             patch.object(api.inventory, 'refresh'):
+            api._create_vm_job('job', 'web1', 2048, 2, False, [], [], numa_place=True)
+        defined = ET.fromstring(conn.defineXML.call_args[0][0])
+        assert defined.find('numatune/memory').get('nodeset') == '0'
+        assert [p.get('cpuset') for p in defined.findall('cputune/vcpupin')] == ['0', '1']
@@ -0,0 +1,86 @@
+"""
+Unit tests for views/offload.py — libvirt calls on a native thread pool.
+
+Covers:
+  - run()         hub keeps running while the call blocks; off-hub is direct
+  - timeouts      OffloadTimeout from run(), libvirtError from wrapped methods
+  - install()     no-op unless gevent has patched threading
+"""
+import threading
+import time
+
+import pytest
+
+gevent = pytest.importorskip('gevent')
+
+from views import offload
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(offload, '_stats', dict.fromkeys(offload._stats, 0))
+    offload.enable(threads=2)
+    yield
+    offload.disable()
+
+
+class _FakeDomain:
+    def destroy(self):
+        time.sleep(0.3)           # a blocking C call as far as the hub knows
+        return 0
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# run()
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRun:
+    def test_hub_not_blocked(self, pool):
+        beats = []
+
+        def heartbeat():
+            for _ in range(20):
+                beats.append(time.monotonic())
+                gevent.sleep(0.01)
+
+        hb = gevent.spawn(heartbeat)
+        assert offload.run(time.sleep, 0.2) is None
+        hb.kill()
+        assert len(beats) >= 10
+        assert offload.offload_stats()['calls'] == 1
+
+    def test_off_hub_runs_inline(self, pool):
+        seen = []
+        t = threading.Thread(target=lambda: seen.append(offload.run(threading.get_ident)))
+        t.start()
+        t.join()
+        assert seen == [t.ident]
+        assert offload.offload_stats()['calls'] == 0
+
+    def test_timeout(self, pool):
+        with pytest.raises(offload.OffloadTimeout):
+            offload.run(time.sleep, 1, timeout=0.05)
+        assert offload.offload_stats()['timeouts'] == 1
+        assert offload.offload_stats()['in_flight'] == 0
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Wrapped libvirt methods
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestWrapped:
+    def test_timeout_is_libvirt_error(self, pool):
+        import libvirt
+        destroy = offload._offloaded('destroy', _FakeDomain.destroy, 0.05)
+        with pytest.raises(libvirt.libvirtError, match='libvirt destroy'):
+            destroy(_FakeDomain())
+
+    def test_result_passed_through(self, pool):
+        destroy = offload._offloaded('destroy', _FakeDomain.destroy, 5)
+        assert destroy(_FakeDomain()) == 0
+
+    def test_install_needs_gevent_patching(self, monkeypatch):
+        monkeypatch.setattr(offload, '_state', {'hub': None, 'pool': None, 'installed': False})
+        offload.install()
+        assert offload._state['installed'] is False
+        assert offload.offload_stats()['enabled'] is False
@@ -0,0 +1,187 @@
+"""
+Unit tests for views/perf.py — request latency instrumentation.
+
+Covers:
+  - _EndpointStats   histogram percentiles, sizes, error counts
+  - call hooks       per-request breakdown and the Server-Timing header
+  - /api/_perf       report and reset
+  - profiler         collapsed-stack format, admin gate, one run per worker
+  - hub monitor      blocking call detected, attributed to site and endpoint
+"""
+import threading
+import time
+
+import pytest
+
+from views import perf
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats(monkeypatch):
+    monkeypatch.setattr(perf, '_endpoints', {})
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Histogram
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestEndpointStats:
+    def test_percentiles_from_buckets(self):
+        st = perf._EndpointStats()
+        for _ in range(90):
+            st.add(2.0, 100, 200, {})
+        for _ in range(10):
+            st.add(500.0, 100, 500, {})
+        s = st.summary()
+        assert 2.0 <= s['p50_ms'] < 2.5
+        assert 500.0 <= s['p99_ms'] < 625.0
+        assert s['errors_5xx'] == 10
+        assert s['avg_bytes'] == 100
+
+    def test_call_breakdown_summed(self):
+        st = perf._EndpointStats()
+        st.add(10, 0, 200, {'libvirt.XMLDesc': (3, 6.0)})
+        st.add(10, 0, 200, {'libvirt.XMLDesc': (2, 4.0)})
+        assert st.summary()['calls'] == [{'name': 'libvirt.XMLDesc', 'count': 5, 'total_ms': 10.0}]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Call hooks + Server-Timing
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _FakeDomain:
+    def XMLDesc(self, flags=0):
+        time.sleep(0.001)
+        return '<domain/>'
+
+
+_FakeDomain.XMLDesc = perf._timed('libvirt.XMLDesc', _FakeDomain.XMLDesc)
+
+
+class TestCallHooks:
+    def test_outside_request_is_passthrough(self):
+        assert _FakeDomain().XMLDesc() == '<domain/>'
+
+    def test_server_timing_header(self):
+        from flask import Flask
+        app = Flask(__name__)
+        app.secret_key = 'test'
+        app.register_blueprint(perf.perf_bp)
+        perf.init_app(app)
+
+        @app.route('/xml')
+        def xml():
+            dom = _FakeDomain()
+            for _ in range(3):
+                dom.XMLDesc()
+            return 'ok'
+
+        with app.test_client() as c:
+            resp = c.get('/xml')
+            header = resp.headers['Server-Timing']
+            assert header.startswith('total;dur=')
+            assert 'libvirt.XMLDesc;desc="x3";dur=' in header
+
+            with c.session_transaction() as sess:
+                sess['username'] = 'testuser'
+            report = c.get('/api/_perf').get_json()
+        row = next(r for r in report['endpoints'] if r['rule'] == '/xml')
+        assert row['count'] == 1
+        assert row['calls'][0]['count'] == 3
+
+    def test_header_on_app_responses(self, client):
+        assert client.get('/api/_perf').headers['Server-Timing'].startswith('total;dur=')
+
+    def test_reset(self, client):
+        client.get('/api/_perf')
+        assert client.delete('/api/_perf').get_json() == {'ok': True}
+        assert list(perf._endpoints) == [('DELETE', 'perf', '/api/_perf')]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Sampling profiler
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _spin(stop):
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+class TestProfiler:
+    @pytest.fixture(autouse=True)
+    def _admin(self, monkeypatch):
+        monkeypatch.setattr(perf, 'ADMIN_USERS', {'testuser'})
+
+    def test_collapse_root_first(self):
+        import sys
+        stack = perf._collapse('thread:main', sys._getframe())
+        parts = stack.split(';')
+        assert parts[0] == 'thread:main'
+        assert parts[-1].startswith('test_collapse_root_first (tests/test_perf.py:')
+
+    def test_profile_sees_other_threads(self):
+        stop = threading.Event()
+        t = threading.Thread(target=_spin, args=(stop,), name='spinner', daemon=True)
+        t.start()
+        try:
+            result = perf.profile(0.2, 200)
+        finally:
+            stop.set()
+        assert result['samples'] > 0
+        spinner = [k for k in result['counts'] if k.startswith('thread:spinner;')]
+        assert spinner and all('_spin (tests/test_perf.py:' in k for k in spinner)
+        assert not any('_sample_loop' in k for k in result['counts'])
+
+    def test_endpoint_collapsed(self, client):
+        resp = client.get('/api/_perf/profile?seconds=0.1&hz=50')
+        assert resp.status_code == 200
+        assert 'profile-' in resp.headers['Content-Disposition']
+        line = resp.get_data(as_text=True).splitlines()[0]
+        assert line.startswith('thread:') and line.rsplit(' ', 1)[1].isdigit()
+
+    def test_endpoint_json_and_validation(self, client):
+        data = client.get('/api/_perf/profile?seconds=0.1&format=json').get_json()
+        assert data['samples'] > 0 and data['stacks']
+        assert client.get('/api/_perf/profile?seconds=-1').status_code == 400
+
+    def test_admin_gate_and_busy(self, client, monkeypatch):
+        monkeypatch.setattr(perf, 'ADMIN_USERS', {'root'})
+        assert client.get('/api/_perf/profile?seconds=0.1').status_code == 403
+        monkeypatch.setattr(perf, 'ADMIN_USERS', set())          # none configured: deny
+        assert client.get('/api/_perf/profile?seconds=0.1').status_code == 403
+        monkeypatch.setattr(perf, 'ADMIN_USERS', {'testuser'})
+        monkeypatch.setattr(perf, '_profiling', True)
+        assert client.get('/api/_perf/profile?seconds=0.1').status_code == 409
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Hub-blocking detector
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _block(seconds):
+    time.sleep(seconds)       # unpatched here: freezes the hub like a libvirt call
+
+
+class TestHubMonitor:
+    def test_blocking_call_recorded(self, client, monkeypatch):
+        gevent = pytest.importorskip('gevent')
+        import greenlet
+        monkeypatch.setattr(perf, '_stalls', {})
+        perf.start_hub_monitor(block_ms=50)
+        try:
+            gevent.sleep(0.05)                       # heartbeat runs
+            perf._serving[greenlet.getcurrent()] = 'POST /api/vms/<uuid>/stop'
+            _block(0.3)
+            for _ in range(100):                     # let the watchdog see it end
+                gevent.sleep(0.02)
+                if perf._stalls:
+                    break
+        finally:
+            perf.stop_hub_monitor()
+
+        data = client.get('/api/_perf/blocking').get_json()
+        (row,) = data['sites']
+        assert row['site'].startswith('_block (tests/test_perf.py:')
+        assert row['endpoints'] == {'POST /api/vms/<uuid>/stop': 1}
+        assert 150 < row['max_ms'] < 1000
+        assert row['last_stack'][0] == row['site']
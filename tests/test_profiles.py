@@ -0,0 +1,150 @@
+"""
+Unit tests for views/profiles.py — disk / NIC performance profiles.
+
+Covers:
+  - apply_profile()   iothreads, AIO mode, queues, discard, vhost multiqueue
+  - tune_device()     devices attached later follow the domain's profile
+  - effective()       what get_vm reports
+  - HTTP              profile on create and update, created disks tuned,
+                      hot-plugged disks tuned from the live XML
+"""
+import xml.etree.ElementTree as ET
+from unittest.mock import MagicMock, patch
+
+import libvirt
+
+from views import profiles
+from views.creation import generate_vm_xml
+
+
+def _tree(vcpus=4, profile=None, disks=('/img/a.qcow2', '/img/b.qcow2', '/img/c.iso')):
+    return ET.fromstring(generate_vm_xml('db1', 4096, vcpus, disks=list(disks), profile=profile))
+
+
+def _drivers(tree):
+    return {d.find('target').get('dev'): d.find('driver').attrib for d in tree.findall('devices/disk')}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# XML rewriting
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestApplyProfile:
+    def test_db_io(self):
+        tree = _tree(profile='db-io')
+        assert profiles.get_profile(tree) == 'db-io'
+        assert tree.findtext('iothreads') == '2'
+        drivers = _drivers(tree)
+        assert drivers['vda'] == {**drivers['vda'], 'io': 'native', 'cache': 'none',
+                                  'discard': 'unmap', 'queues': '4', 'iothread': '1'}
+        assert drivers['vdb']['iothread'] == '2'
+        assert 'io' not in drivers['sda']                      # cdrom untouched
+        nic = tree.find('devices/interface/driver')
+        assert nic.attrib == {'name': 'vhost', 'queues': '4'}
+
+    def test_queues_capped_by_profile(self):
+        tree = _tree(vcpus=32, profile='db-io')
+        assert _drivers(tree)['vda']['queues'] == '8'
+        assert tree.find('devices/interface/driver').get('queues') == '4'
+
+    def test_dense_and_default(self):
+        tree = _tree(profile='throughput')
+        profiles.apply_profile(tree, 'dense')
+        assert tree.find('iothreads') is None
+        assert _drivers(tree)['vda'] == {**_drivers(tree)['vda'], 'io': 'threads'}
+        assert 'queues' not in _drivers(tree)['vda']
+        profiles.apply_profile(tree, 'default')
+        assert profiles.get_profile(tree) is None
+        assert 'discard' not in _drivers(tree)['vda']
+        assert tree.find('devices/interface/driver') is None
+
+    DISK = ("<disk type='file' device='disk'><driver name='qemu' type='qcow2'/>"
+            "<source file='/img/d.qcow2'/><target dev='vdc' bus='virtio'/></disk>")
+
+    def test_tune_device_follows_profile(self):
+        disk = ET.fromstring(self.DISK)
+        profiles.tune_device(_tree(profile='throughput'), disk)
+        assert disk.find('driver').attrib == {'name': 'qemu', 'type': 'qcow2', 'cache': 'none',
+                                              'io': 'io_uring', 'discard': 'unmap',
+                                              'queues': '4', 'iothread': '1'}
+        plain = ET.fromstring(self.DISK)
+        profiles.tune_device(_tree(), plain)
+        assert plain.find('driver').attrib == {'name': 'qemu', 'type': 'qcow2'}
+
+    def test_effective(self):
+        eff = profiles.effective(_tree(profile='db-io'))
+        assert eff['profile'] == 'db-io' and eff['iothreads'] == 2
+        assert eff['disks'][1] == {'target': 'vdb', 'cache': 'none', 'io': 'native',
+                                   'discard': 'unmap', 'queues': 4, 'iothread': 2}
+        assert eff['nics'][0]['backend'] == 'vhost' and eff['nics'][0]['queues'] == 4
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestProfileAPI:
+    UUID = 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+
+    def test_create_rejects_unknown_profile(self, client):
+        resp = client.post('/api/vms', json={'name': 'db1', 'ram': 1024, 'cpu': 2,
+                                             'profile': 'turbo'})
+        assert resp.status_code == 400
+
+    def test_update_applies_profile(self, client, monkeypatch):
+        monkeypatch.setattr(libvirt, 'VIR_DOMAIN_XML_INACTIVE', 2, raising=False)
+        dom = MagicMock()
+        dom.XMLDesc.return_value = ET.tostring(_tree(vcpus=2)).decode()
+        dom.isActive.return_value = True
+        conn = MagicMock()
+        conn.lookupByUUIDString.return_value = dom
+        with patch('views.api.get_db_connection', return_value=conn), \
+             patch('views.api.inventory.refresh'):
+            resp = client.put(f'/api/vms/{self.UUID}', json={'profile': 'db-io'})
+            assert resp.get_json() == {'success': True, 'restart_required': True}
+            defined = ET.fromstring(conn.defineXML.call_args[0][0])
+            assert profiles.effective(defined)['disks'][0]['queues'] == 2
+
+            dom.XMLDesc.return_value = ET.tostring(defined).decode()
+            client.put(f'/api/vms/{self.UUID}', json={'cpu': 6})
+            assert profiles.effective(ET.fromstring(conn.defineXML.call_args[0][0])) \
+                ['disks'][0]['queues'] == 6
+        assert client.put(f'/api/vms/{self.UUID}', json={'profile': 'x'}).status_code == 400
+
+    def test_created_disk_follows_profile(self, monkeypatch, tmp_path):
+        from views import api
+        monkeypatch.setattr(libvirt, 'VIR_DOMAIN_XML_INACTIVE', 2, raising=False)
+        monkeypatch.setattr(libvirt, 'VIR_DOMAIN_AFFECT_CONFIG', 2, raising=False)
+        dom = MagicMock()
+        dom.XMLDesc.return_value = ET.tostring(_tree(profile='throughput')).decode()
+        dom.isActive.return_value = False
+        conn = MagicMock()
+        conn.lookupByUUIDString.return_value = dom
+        with patch('views.api.get_db_connection', return_value=conn), \
+             patch('views.api.subprocess.run'), patch('views.api.jobs.progress'), \
+             patch('views.api.inventory.refresh'):
+            result = api._create_and_attach_disk_job('j1', self.UUID, str(tmp_path / "d'1.qcow2"),
+                                                     'qcow2', 10)
+        disk = ET.fromstring(dom.attachDeviceFlags.call_args[0][0])
+        assert result['target'] == 'vdc' and disk.find('source').get('file').endswith("d'1.qcow2")
+        assert disk.find('driver').get('io') == 'io_uring' and disk.find('driver').get('iothread') == '1'
+
+    def test_hot_plug_before_restart_has_no_iothread(self, monkeypatch):
+        from views import api
+        for name, value in (('VIR_DOMAIN_XML_INACTIVE', 2), ('VIR_DOMAIN_AFFECT_CONFIG', 2),
+                            ('VIR_DOMAIN_AFFECT_LIVE', 1)):
+            monkeypatch.setattr(libvirt, name, value, raising=False)
+        # db-io applied while running: only the persistent XML has <iothreads>
+        persistent = ET.tostring(_tree(profile='db-io')).decode()
+        live = ET.tostring(_tree()).decode()
+        dom = MagicMock()
+        dom.XMLDesc.side_effect = lambda flags=0: persistent if flags else live
+        dom.isActive.return_value = True
+        disk = ET.fromstring("<disk type='file' device='disk'><driver name='qemu' type='qcow2'/>"
+                             "<source file='/img/d.qcow2'/><target dev='vdd' bus='virtio'/></disk>")
+        api._attach_tuned(dom, ET.fromstring(persistent), disk)
+        (live_xml, live_flags), (config_xml, config_flags) = \
+            [c[0] for c in dom.attachDeviceFlags.call_args_list]
+        assert (live_flags, config_flags) == (1, 2)
+        assert 'iothread' not in ET.fromstring(live_xml).find('driver').attrib
+        assert ET.fromstring(config_xml).find('driver').get('iothread') == '1'
@@ -0,0 +1,85 @@
+"""
+Unit tests for views/prometheus.py — the /metrics OpenMetrics endpoint.
+
+Covers:
+  - render()     host gauges, per-VM/per-device counters, job gauges
+  - caching      one render per collection interval
+  - auth         bearer token or session
+"""
+from unittest.mock import patch
+
+import pytest
+
+from views import metrics, metrics_store, prometheus
+
+
+UUID = 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+
+STATS = {
+    'state.state': 1,
+    'cpu.time': 12_500_000_000,
+    'block.count': 1,
+    'block.0.name': 'vda', 'block.0.rd.bytes': 100, 'block.0.wr.bytes': 200,
+    'block.0.rd.reqs': 3, 'block.0.wr.reqs': 4,
+    'net.count': 1,
+    'net.0.name': 'vnet0', 'net.0.rx.bytes': 300, 'net.0.tx.bytes': 400,
+}
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics_store, 'RING_PATH', str(tmp_path / 'ring'))
+    monkeypatch.setattr(metrics_store, '_rings', {})
+    store = metrics_store.TieredStore(len(metrics.HOST_SERIES), metrics.INTERVAL, writable=True)
+    store.append(1000, (12.5, 40.0, 0.5, 1000.0, 2000.0, 0.0, 10.0))
+    monkeypatch.setattr(metrics, 'vm_counters', lambda: {UUID: ['db "1"', STATS]})
+    monkeypatch.setattr(prometheus, '_cache', {'at': 0.0, 'body': ''})
+    jobs = {'j1': {'status': 'running', 'phase': 'Installing', 'progress': 40}}
+    monkeypatch.setattr(prometheus, '_job_tables', lambda: [('openshift', jobs)])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# render
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRender:
+    def test_host_gauges(self, sources):
+        body = prometheus.render()
+        assert '# TYPE hypercloud_host_cpu_usage_percent gauge' in body
+        assert 'hypercloud_host_cpu_usage_percent 12.5\n' in body
+        assert body.endswith('# EOF\n')
+
+    def test_vm_counters_per_device(self, sources):
+        body = prometheus.render()
+        labels = f'uuid="{UUID}",name="db \\"1\\""'
+        assert '# TYPE hypercloud_vm_cpu_seconds counter' in body
+        assert f'hypercloud_vm_cpu_seconds_total{{{labels}}} 12.5' in body
+        assert f'hypercloud_vm_block_write_ops_total{{{labels},device="vda"}} 4' in body
+        assert f'hypercloud_vm_network_receive_bytes_total{{{labels},device="vnet0"}} 300' in body
+
+    def test_job_gauges(self, sources):
+        body = prometheus.render()
+        assert ('hypercloud_job_status{kind="openshift",job_id="j1",'
+                'status="running",phase="Installing"} 1') in body
+        assert 'hypercloud_job_progress_percent{kind="openshift",job_id="j1"} 40' in body
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /metrics endpoint
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestExposition:
+    def test_rendered_once_per_interval(self, client, sources):
+        with patch.object(prometheus, 'render', wraps=prometheus.render) as spy:
+            first = client.get('/metrics')
+            client.get('/metrics')
+        assert first.status_code == 200
+        assert first.content_type.startswith('application/openmetrics-text')
+        assert spy.call_count == 1
+
+    def test_requires_session_or_token(self, anon_client, sources, monkeypatch):
+        assert anon_client.get('/metrics').status_code == 401
+        monkeypatch.setattr(prometheus, 'TOKEN', 's3cret')
+        assert anon_client.get('/metrics', headers={'Authorization': 'Bearer nope'}).status_code == 401
+        ok = anon_client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+        assert ok.status_code == 200
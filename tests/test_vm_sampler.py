@@ -0,0 +1,113 @@
+"""
+Unit tests for views/vm_sampler.py — the ring-buffered per-VM sampler behind
+/api/vms/<uuid>/stats.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from views import vm_sampler
+from views.vm_sampler import _Sample
+
+UUID = '12345678-1234-1234-1234-123456789abc'
+
+
+def _stats(cpu_ns, rd=0, wr=0, rx=0, tx=0, state=1):
+    return {
+        'state.state': state, 'cpu.time': cpu_ns, 'vcpu.current': 2,
+        'balloon.current': 2097152,
+        'block.count': 2,
+        'block.0.name': 'sda', 'block.0.rd.bytes': 7, 'block.0.wr.bytes': 7,
+        'block.1.name': 'vda', 'block.1.rd.bytes': rd, 'block.1.wr.bytes': wr,
+        'net.count': 1, 'net.0.rx.bytes': rx, 'net.0.tx.bytes': tx,
+    }
+
+
+@pytest.fixture(autouse=True)
+def sampler_state():
+    """Fresh rings, no background thread, first disk known to be vda."""
+    import libvirt
+    libvirt.VIR_DOMAIN_RUNNING = 1
+    with patch.object(vm_sampler, '_started', True), \
+         patch.object(vm_sampler, '_rings', {}), \
+         patch.object(vm_sampler, '_leases', {}), \
+         patch.object(vm_sampler, '_disk_targets', {UUID: 'vda'}):
+        yield
+
+
+def _fill(*samples):
+    ring = vm_sampler._rings.setdefault(UUID, vm_sampler.collections.deque(maxlen=10))
+    ring.extend(samples)
+
+
+def _s(ts, cpu_ns, state=1):
+    return _Sample(ts=ts, state=state, cpu_ns=cpu_ns, vcpus=2, mem_kib=2097152,
+                   disk_r=10, disk_w=20, net_rx=30, net_tx=40)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# read()
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRead:
+    def test_cpu_from_last_interval(self):
+        _fill(_s(100.0, 0), _s(101.0, 1e9))
+        with patch('time.time', return_value=101.5):
+            out = vm_sampler.read(UUID)
+        assert out['cpu_usage'] == 50.0     # 1 s of CPU over 1 s on 2 vCPUs
+        assert out['mem_used'] == 2048.0
+        assert out['disk_read'] == 10
+
+    def test_window_averages_over_span(self):
+        _fill(_s(100.0, 0), _s(102.0, 4e9), _s(104.0, 4e9))
+        with patch('time.time', return_value=104.0):
+            assert vm_sampler.read(UUID)['cpu_usage'] == 0.0
+            averaged = vm_sampler.read(UUID, window=4)
+        assert averaged['cpu_usage'] == 50.0
+        assert averaged['window'] == 4.0
+
+    def test_read_subscribes(self):
+        _fill(_s(100.0, 0))
+        with patch('time.time', return_value=100.0):
+            vm_sampler.read(UUID)
+        assert vm_sampler._leases[UUID] == 100.0 + vm_sampler.SUBSCRIPTION_TTL
+
+    def test_stale_ring_samples_inline_without_sleeping(self):
+        dom = MagicMock()
+        dom.UUIDString.return_value = UUID
+        dom.isActive.return_value = True
+        conn = MagicMock()
+        conn.lookupByUUIDString.return_value = dom
+        conn.domainListGetStats.return_value = [(dom, _stats(3e9, rd=111, rx=5))]
+        with patch('views.vm_sampler.get_connection', return_value=conn), \
+             patch('views.vm_sampler._bulk_stat_groups', return_value=0), \
+             patch('time.sleep') as sleep:
+            out = vm_sampler.read(UUID)
+        sleep.assert_not_called()
+        assert out['cpu_usage'] is None    # one sample: no interval to measure yet
+        assert out['disk_read'] == 111     # vda, not the sda cdrom
+        assert out['net_rx'] == 5
+        conn.close.assert_called_once()
+
+    def test_not_running_returns_none(self):
+        dom = MagicMock()
+        dom.isActive.return_value = False
+        conn = MagicMock()
+        conn.lookupByUUIDString.return_value = dom
+        with patch('views.vm_sampler.get_connection', return_value=conn):
+            assert vm_sampler.read(UUID) is None
+
+
+class TestStatsEndpoint:
+    def test_endpoint_returns_sampler_data(self, client):
+        _fill(_s(100.0, 0), _s(101.0, 2e9))
+        clock = MagicMock()
+        clock.time.return_value = 101.0
+        with patch.object(vm_sampler, 'time', clock):   # leave the session clock alone
+            resp = client.get(f'/api/vms/{UUID}/stats')
+        assert resp.status_code == 200
+        assert resp.get_json()['cpu_usage'] == 100.0
+
+    def test_bad_window_is_400(self, client):
+        resp = client.get(f'/api/vms/{UUID}/stats?window=abc')
+        assert resp.status_code == 400
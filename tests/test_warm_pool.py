@@ -0,0 +1,227 @@
+"""
+Unit tests for views/warm_pool.py — pre-provisioned domains for create_vm.
+
+Covers:
+  - match()          create requests equivalent to a template
+  - claim()          renamed, not booted, labels, hit / miss, names already
+                     used by a domain refused
+  - refill_once()    top-up within the storage budget, stale and surplus members
+  - HTTP             configuration routes, 201 from POST /api/vms on a hit
+"""
+import json
+import uuid as _uuid
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+import libvirt
+import pytest
+
+from views import inventory, warm_pool
+
+class _Dom:
+    def __init__(self, conn, xml, state='shutoff'):
+        self.conn, self.state = conn, state
+        self.tree = ET.fromstring(xml)
+        if self.tree.find('uuid') is None:
+            ET.SubElement(self.tree, 'uuid').text = str(_uuid.uuid4())
+
+    def UUIDString(self):
+        return self.tree.findtext('uuid')
+
+    def name(self):
+        return self.tree.findtext('name')
+
+    def XMLDesc(self, flags=0):
+        return ET.tostring(self.tree, encoding='unicode')
+
+    def labels(self):
+        return inventory.parse_labels(self.tree)
+
+    def isActive(self):
+        return self.state in ('running', 'paused')
+
+    def hasManagedSaveImage(self, flags):
+        return self.state == 'saved'
+
+    def rename(self, name, flags):
+        assert not self.isActive()
+        self.tree.find('name').text = name
+
+    def create(self):
+        self.state = 'running'
+
+    def destroy(self):
+        self.state = 'shutoff'
+
+    def managedSaveRemove(self, flags):
+        self.state = 'shutoff'
+
+    def undefine(self):
+        del self.conn.doms[self.UUIDString()]
+
+
+class _Conn:
+    def __init__(self):
+        self.doms = {}
+
+    def add(self, name, tid, state):
+        tree = ET.fromstring(f'<domain><name>{name}</name><devices/></domain>')
+        inventory.set_labels(tree, {warm_pool.POOL_LABEL: tid})
+        return self.defineXML(ET.tostring(tree, encoding='unicode'), state)
+
+    def defineXML(self, xml, state='shutoff'):
+        uuid = ET.fromstring(xml).findtext('uuid')
+        if uuid in self.doms:
+            self.doms[uuid].tree = ET.fromstring(xml)
+            return self.doms[uuid]
+        dom = _Dom(self, xml, state)
+        self.doms[dom.UUIDString()] = dom
+        return dom
+
+    def lookupByUUIDString(self, uuid):
+        return self.doms[uuid]
+
+    def records(self):
+        return [{'uuid': u, 'name': d.name(), 'labels': d.labels()}
+                for u, d in self.doms.items()]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / 'ubuntu.qcow2'
+    path.write_text('')
+    return str(path)
+
+
+@pytest.fixture
+def pool(tmp_path, image, monkeypatch):
+    monkeypatch.setattr(libvirt, 'VIR_DOMAIN_XML_INACTIVE', 2, raising=False)
+    monkeypatch.setattr(warm_pool, 'CONFIG_FILE', str(tmp_path / 'warm_pool.json'))
+    monkeypatch.setattr(warm_pool, 'STORAGE_PATH', str(tmp_path))
+    monkeypatch.setattr(warm_pool, '_cfg', {'mtime': None, 'data': warm_pool.DEFAULT_CONFIG})
+    monkeypatch.setattr(warm_pool, '_stats', {})
+    monkeypatch.setattr(warm_pool, 'ensure_refill', lambda: None)
+    conn = _Conn()
+    with patch.object(warm_pool, 'get_db_connection', return_value=conn), \
+         patch.object(warm_pool.inventory, 'list_domains', side_effect=conn.records), \
+         patch.object(warm_pool.inventory, 'refresh'):
+        yield conn
+
+
+def _configure(image, budget=500, **tpl):
+    template = {'id': 'ci', 'image': image, 'disk_gb': 10, 'cpu': 2, 'ram': 2048,
+                'size': 2, **tpl}
+    warm_pool._save_config({'templates': [template], 'concurrency': 2,
+                            'storage_budget_gb': budget})
+
+
+def _plan(image, size=10):
+    return [(image, '/var/lib/libvirt/images/web1.qcow2', size)]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Matching and claiming
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestClaim:
+    def test_match(self, pool, image):
+        _configure(image)
+        assert warm_pool.match(2048, 2, False, [], _plan(image))['id'] == 'ci'
+        assert warm_pool.match(4096, 2, False, [], _plan(image)) is None
+        assert warm_pool.match(2048, 2, False, ['0000:01:00.0'], _plan(image)) is None
+        assert warm_pool.match(2048, 2, False, [], _plan(image, 20)) is None
+
+    def test_member_is_renamed_not_booted(self, pool, image):
+        _configure(image)
+        pool.add('warm-ci-1', 'ci', 'running')       # not shut off: not ready
+        member = pool.add('warm-ci-2', 'ci', 'shutoff')
+        got = warm_pool.claim('web1', 2048, 2, False, [], _plan(image))
+        assert got == {'uuid': member.UUIDString(), 'name': 'web1', 'template': 'ci'}
+        # same state as a pool miss, which only defines the domain
+        assert member.name() == 'web1' and member.state == 'shutoff'
+        assert member.labels() == {warm_pool.TEMPLATE_LABEL: 'ci'}
+
+        assert warm_pool.claim('web2', 2048, 2, False, [], _plan(image)) is None
+        assert warm_pool._stats['ci'] == {'hits': 1, 'misses': 1}
+
+    def test_taken_name_is_refused(self, pool, image):
+        _configure(image)
+        pool.add('warm-ci-1', 'ci', 'shutoff')
+        pool.add('warm-ci-2', 'ci', 'shutoff')
+        pool.defineXML('<domain><name>db1</name><devices/></domain>')
+        with pytest.raises(warm_pool.NameInUseError):
+            warm_pool.claim('db1', 2048, 2, False, [], _plan(image))
+        warm_pool.claim('web1', 2048, 2, False, [], _plan(image))
+        with pytest.raises(warm_pool.NameInUseError):    # the first member, renamed
+            warm_pool.claim('web1', 2048, 2, False, [], _plan(image))
+        assert sum(warm_pool.POOL_LABEL in d.labels() for d in pool.doms.values()) == 1
+
+    def test_unmatched_request_is_not_counted(self, pool, image):
+        _configure(image)
+        assert warm_pool.claim('web1', 512, 1, False, [], _plan(image)) is None
+        assert warm_pool._stats == {}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Refill
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestRefill:
+    def test_tops_up_within_budget(self, pool, image):
+        _configure(image, size=3, budget=20)
+        with patch.object(warm_pool.subprocess, 'run') as run:
+            assert warm_pool.refill_once() == {'discarded': 0, 'provisioned': 2, 'failed': 0}
+        assert run.call_count == 2
+        assert sorted(d.state for d in pool.doms.values()) == ['shutoff', 'shutoff']
+        assert all(d.labels() == {warm_pool.POOL_LABEL: 'ci'} for d in pool.doms.values())
+
+    def test_discards_stale_and_surplus(self, pool, image):
+        _configure(image, size=1)
+        pool.add('warm-ci-1', 'ci', 'shutoff')
+        pool.add('warm-ci-2', 'ci', 'shutoff')
+        pool.add('warm-ci-3', 'ci', 'running')        # booted by hand
+        pool.add('warm-old-1', 'old', 'shutoff')      # template removed
+        with patch.object(warm_pool.subprocess, 'run'):
+            assert warm_pool.refill_once()['discarded'] == 3
+        assert [d.name() for d in pool.doms.values()] == ['warm-ci-1']
+
+    def test_failed_provision_cleans_up(self, pool, image):
+        _configure(image, size=1)
+        with patch.object(warm_pool.subprocess, 'run'), \
+             patch.object(_Conn, 'defineXML', side_effect=Exception('bad XML')):
+            assert warm_pool.refill_once()['failed'] == 1
+        assert not pool.doms
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestWarmPoolAPI:
+    def test_configure_and_status(self, client, pool, image):
+        bad = {'templates': [{'id': 'ci', 'image': image, 'disk_gb': 10, 'cpu': 2,
+                              'ram': 2048, 'size': 100}]}
+        assert client.put('/api/warm-pool', json=bad).status_code == 400
+
+        good = {'templates': [{**bad['templates'][0], 'size': 2}]}
+        assert client.put('/api/warm-pool', json=good).get_json()['templates'][0]['id'] == 'ci'
+        pool.add('warm-ci-1', 'ci', 'shutoff')
+        body = client.get('/api/warm-pool').get_json()
+        assert body['pools'][0] == {**body['pools'][0], 'template': 'ci', 'members': 1,
+                                    'ready': 1, 'hits': 0, 'misses': 0}
+        assert body['storage_used_gb'] == 10
+
+    def test_create_vm_hit_answers_201(self, client, pool, image):
+        _configure(image)
+        member = pool.add('warm-ci-1', 'ci', 'shutoff')
+        resp = client.post('/api/vms', json={'name': 'web1', 'ram': 2048, 'cpu': 2,
+                                             'disks': [{'path': image, 'size_gb': 10}]})
+        assert resp.status_code == 201
+        assert resp.get_json()['uuid'] == member.UUIDString()
+        assert json.loads(client.get('/api/warm-pool').data)['pools'][0]['hits'] == 1
+        again = client.post('/api/vms', json={'name': 'web1', 'ram': 2048, 'cpu': 2,
+                                              'disks': [{'path': image, 'size_gb': 10}]})
+        assert again.status_code == 409 and 'already exists' in again.get_json()['error']
@@ -0,0 +1,371 @@
+"""
+Alert engine — threshold and trend rules evaluated by the metrics collector.
+
+The collector calls observe() with every new host sample and every per-VM
+sample.  Each (rule, subject) pair keeps an incremental sliding window —
+running sums over a deque, so adding a sample and evicting old ones is O(1)
+and history is never rescanned — from which the rule's aggregate is read:
+
+    last    the newest value
+    avg     mean over the window
+    slope   least-squares trend over the window, in units per minute
+
+A rule goes ok → pending when `aggregate op value` first holds, → firing
+once it has held for `for` seconds, and back to ok only when the aggregate
+crosses `clear` (hysteresis; defaults to `value`).  firing and resolved
+transitions are written to the log sink (ALERT_LOG, JSON lines) and POSTed
+to the optional webhook.  Active alerts are persisted to ALERT_STATE so a
+restart neither forgets nor re-announces them.  Both files live beside
+RULES_FILE ($ALERTS_CONFIG, default <app>/alerts.json).
+
+Only the metrics leader evaluates rules, but any worker may serve the API:
+reload() re-reads RULES_FILE and ALERT_STATE whenever another worker has
+rewritten them, so a PUT reaches the evaluator and every worker lists the
+alerts the leader is tracking.
+
+Rule fields:
+    id, name        identifier and display text
+    scope           'host' or 'vm' (vm rules run per VM; optional 'vm': uuid)
+    series          cpu, memory, load, net_rx, net_tx, disk_read, disk_write
+    agg, window     aggregate and its window in seconds (default 'last', 0)
+    op, value       '>' or '<' and the threshold
+    for, clear      hold time in seconds and the resolve threshold
+
+Routes
+------
+GET  /api/alerts          — rules, webhook, active alerts and recent events
+PUT  /api/alerts/rules    — replace the rule set (and optionally the webhook)
+"""
+
+import collections
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import Blueprint, jsonify, request, session
+
+try:
+    import requests
+    _REQUESTS = True
+except ImportError:
+    _REQUESTS = False
+
+alerts_bp = Blueprint('alerts', __name__)
+log = logging.getLogger(__name__)
+
+_APP_DIR    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RULES_FILE  = os.environ.get('ALERTS_CONFIG', os.path.join(_APP_DIR, 'alerts.json'))
+ALERT_STATE = os.path.join(os.path.dirname(RULES_FILE), '.alerts_state.json')
+ALERT_LOG   = os.path.join(os.path.dirname(RULES_FILE), 'alerts.log')
+
+SERIES = ('cpu', 'memory', 'load', 'net_rx', 'net_tx', 'disk_read', 'disk_write')
+AGGS   = ('last', 'avg', 'slope')
+OPS    = {'>': lambda a, b: a > b, '<': lambda a, b: a < b}
+
+DEFAULT_RULES = [
+    {'id': 'host-cpu-high', 'name': 'Host CPU > 90% for 5 min', 'scope': 'host',
+     'series': 'cpu', 'agg': 'last', 'op': '>', 'value': 90, 'for': 300, 'clear': 80},
+    {'id': 'vm-disk-write-high', 'name': 'VM disk write > 200 MB/s', 'scope': 'vm',
+     'series': 'disk_write', 'agg': 'avg', 'window': 60, 'op': '>',
+     'value': 200 * 1024 * 1024, 'for': 0, 'clear': 150 * 1024 * 1024},
+    {'id': 'host-memory-rising', 'name': 'Host memory pressure rising', 'scope': 'host',
+     'series': 'memory', 'agg': 'slope', 'window': 900, 'op': '>', 'value': 0.5,
+     'for': 300, 'clear': 0.1},
+]
+
+_lock     = threading.RLock()
+_rules    = []
+_webhook  = ''
+_windows  = {}                              # (rule id, subject) → _Window
+_states   = {}                              # (rule id, subject) → state dict
+_events   = collections.deque(maxlen=200)   # recent firing / resolved events
+_mtimes   = {'rules': None, 'state': None}  # of the files as last read or written
+
+
+# ── incremental window ────────────────────────────────────────────────────────
+
+class _Window:
+    """Sliding window with running sums for mean and least-squares slope."""
+
+    __slots__ = ('span', 'points', 'base', 'n', 'sx', 'sy', 'sxx', 'sxy')
+
+    def __init__(self, span: float):
+        self.span   = span
+        self.points = collections.deque()
+        self.base   = None   # x origin keeps the squared sums well-conditioned
+        self.n = self.sx = self.sy = self.sxx = self.sxy = 0.0
+
+    def _add(self, x, y, sign):
+        self.n   += sign
+        self.sx  += sign * x
+        self.sy  += sign * y
+        self.sxx += sign * x * x
+        self.sxy += sign * x * y
+
+    def push(self, ts: float, value: float):
+        if self.base is None:
+            self.base = ts
+        x = ts - self.base
+        self.points.append((x, value))
+        self._add(x, value, 1)
+        while self.points and self.points[0][0] < x - self.span:
+            self._add(*self.points.popleft(), -1)
+
+    def last(self):
+        return self.points[-1][1] if self.points else None
+
+    def avg(self):
+        return self.sy / self.n if self.n else None
+
+    def slope(self):
+        """Units per minute; None until two distinct timestamps are held."""
+        denom = self.n * self.sxx - self.sx * self.sx
+        if self.n < 2 or denom <= 0:
+            return None
+        return (self.n * self.sxy - self.sx * self.sy) / denom * 60
+
+
+# ── rules and persistence ─────────────────────────────────────────────────────
+
+def _validate(rule) -> str:
+    """Error message for a malformed rule, or '' if it is usable."""
+    if not isinstance(rule, dict) or not rule.get('id'):
+        return 'every rule needs an id'
+    if rule.get('scope') not in ('host', 'vm'):
+        return f"{rule['id']}: scope must be 'host' or 'vm'"
+    if rule.get('series') not in SERIES:
+        return f"{rule['id']}: series must be one of {', '.join(SERIES)}"
+    if rule.get('agg', 'last') not in AGGS:
+        return f"{rule['id']}: agg must be one of {', '.join(AGGS)}"
+    if rule.get('op') not in OPS:
+        return f"{rule['id']}: op must be '>' or '<'"
+    for key in ('value', 'clear', 'for', 'window'):
+        if key in rule and not isinstance(rule[key], (int, float)):
+            return f'{rule["id"]}: {key} must be a number'
+    if 'value' not in rule:
+        return f"{rule['id']}: value is required"
+    return ''
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def load_rules():
+    """(Re)load rules and webhook from RULES_FILE, falling back to defaults."""
+    global _rules, _webhook
+    data = {}
+    mtime = _mtime(RULES_FILE)
+    if mtime is not None:
+        try:
+            with open(RULES_FILE) as fh:
+                data = json.load(fh)
+        except Exception:
+            log.warning('alerts: cannot read %s, using default rules', RULES_FILE)
+    rules = [r for r in data.get('rules', DEFAULT_RULES) if not _validate(r)]
+    with _lock:
+        _rules   = rules
+        _webhook = data.get('webhook', '')
+        _mtimes['rules'] = mtime
+        _windows.clear()
+        known = {r['id'] for r in rules}
+        for key in [k for k in _states if k[0] not in known]:
+            _states.pop(key)
+
+
+def _save_rules(rules, webhook):
+    tmp = RULES_FILE + '.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump({'rules': rules, 'webhook': webhook}, fh, indent=2)
+    os.replace(tmp, RULES_FILE)
+
+
+def _load_state():
+    """Replace the active alerts with those saved in ALERT_STATE."""
+    mtime = _mtime(ALERT_STATE)
+    try:
+        with open(ALERT_STATE) as fh:
+            saved = json.load(fh)
+    except (OSError, ValueError):
+        return
+    with _lock:
+        for key in [k for k, st in _states.items() if st['state'] != 'ok']:
+            _states.pop(key)
+        for st in saved:
+            _states[(st['rule'], st['subject'])] = st
+        _mtimes['state'] = mtime
+
+
+def _save_state():
+    """Persist pending / firing alerts (called under _lock)."""
+    active = [st for st in _states.values() if st['state'] != 'ok']
+    try:
+        tmp = ALERT_STATE + '.tmp'
+        with open(tmp, 'w') as fh:
+            json.dump(active, fh)
+        os.replace(tmp, ALERT_STATE)
+    except OSError:
+        return
+    _mtimes['state'] = _mtime(ALERT_STATE)
+
+
+def reload():
+    """Re-read rules and alert state that another worker has rewritten."""
+    if _mtime(RULES_FILE) != _mtimes['rules']:
+        load_rules()
+    if _mtime(ALERT_STATE) not in (None, _mtimes['state']):
+        _load_state()
+
+
+# ── sinks ─────────────────────────────────────────────────────────────────────
+
+def _post_webhook(url, event):
+    try:
+        requests.post(url, json=event, timeout=10)
+    except Exception as e:
+        log.warning('alerts: webhook %s failed: %s', url, e)
+
+
+def _notify(event: dict):
+    _events.append(event)
+    log.warning('alert %s: %s (%s) value=%s', event['status'], event['name'],
+                event['subject_name'], event['value'])
+    try:
+        with open(ALERT_LOG, 'a') as fh:
+            fh.write(json.dumps(event) + '\n')
+    except OSError:
+        pass
+    if _webhook and _REQUESTS:
+        # Off the collector's thread: a slow receiver must not delay sampling
+        threading.Thread(target=_post_webhook, args=(_webhook, event), daemon=True).start()
+
+
+# ── evaluation ────────────────────────────────────────────────────────────────
+
+def _evaluate(rule, subject, subject_name, ts, value):
+    key = (rule['id'], subject)
+    win = _windows.get(key)
+    if win is None:
+        win = _windows[key] = _Window(rule.get('window', 0))
+    win.push(ts, value)
+    agg = getattr(win, rule.get('agg', 'last'))()
+    if agg is None:
+        return
+
+    op     = OPS[rule['op']]
+    st     = _states.get(key)
+    if st is None:
+        st = _states[key] = {'rule': rule['id'], 'subject': subject,
+                             'subject_name': subject_name, 'state': 'ok', 'since': None}
+    before = st['state']
+    st['value'] = round(agg, 3)
+
+    if st['state'] == 'firing':
+        if not op(agg, rule.get('clear', rule['value'])):
+            st.update(state='ok', since=None)
+    elif op(agg, rule['value']):
+        if st['state'] == 'ok':
+            st.update(state='pending', since=ts)
+        if ts - st['since'] >= rule.get('for', 0):
+            st.update(state='firing', since=ts)
+    else:
+        st.update(state='ok', since=None)
+
+    if st['state'] != before:
+        if 'firing' in (before, st['state']):
+            _notify({
+                'status':       'firing' if st['state'] == 'firing' else 'resolved',
+                'rule':         rule['id'],
+                'name':         rule.get('name', rule['id']),
+                'subject':      subject,
+                'subject_name': subject_name,
+                'value':        st['value'],
+                'ts':           ts,
+            })
+        _save_state()
+
+
+def observe(scope: str, subject: str, subject_name: str, ts: float, values: dict):
+    """Feed one sample (series → value) for a host or VM through every rule."""
+    with _lock:
+        for rule in _rules:
+            if rule['scope'] != scope or rule.get('vm', subject) != subject:
+                continue
+            value = values.get(rule['series'])
+            if value is not None:
+                _evaluate(rule, subject, subject_name, ts, value)
+
+
+def forget_vms(present):
+    """Drop state for VMs no longer running; a firing alert on one resolves."""
+    with _lock:
+        gone = [k for k in _states if k[1] != 'host' and k[1] not in present]
+        for key in gone:
+            st = _states.pop(key)
+            _windows.pop(key, None)
+            if st['state'] == 'firing':
+                rule = next((r for r in _rules if r['id'] == key[0]), {})
+                _notify({'status': 'resolved', 'rule': key[0],
+                         'name': rule.get('name', key[0]), 'subject': key[1],
+                         'subject_name': st['subject_name'], 'value': None,
+                         'ts': time.time()})
+        if gone:
+            _save_state()
+
+
+def active_alerts() -> list:
+    with _lock:
+        return [dict(st) for st in _states.values() if st['state'] != 'ok']
+
+
+# ── HTTP API ──────────────────────────────────────────────────────────────────
+
+def _auth():
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+@alerts_bp.route('/api/alerts', methods=['GET'])
+def list_alerts():
+    err = _auth()
+    if err:
+        return err
+    reload()
+    with _lock:
+        return jsonify({
+            'rules':   list(_rules),
+            'webhook': _webhook,
+            'active':  active_alerts(),
+            'events':  list(_events),
+        })
+
+
+@alerts_bp.route('/api/alerts/rules', methods=['PUT'])
+def put_rules():
+    err = _auth()
+    if err:
+        return err
+    data  = request.get_json(silent=True) or {}
+    rules = data.get('rules')
+    if not isinstance(rules, list):
+        return jsonify({'error': 'rules must be a list'}), 400
+    for rule in rules:
+        problem = _validate(rule)
+        if problem:
+            return jsonify({'error': problem}), 400
+    if len({r['id'] for r in rules}) != len(rules):
+        return jsonify({'error': 'rule ids must be unique'}), 400
+    webhook = data.get('webhook', _webhook)
+    _save_rules(rules, webhook)
+    load_rules()
+    return jsonify({'ok': True, 'rules': len(rules)})
+
+
+load_rules()
+_load_state()
@@ -3,10 +3,11 @@ import xml.etree.ElementTree as ET
 import os
 import re
 import subprocess
-import time
 import datetime
 import psutil
+import threading
 import uuid as uuid_module
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import Blueprint, request, jsonify, session, current_app
 from werkzeug.utils import secure_filename
@@ -14,7 +15,9 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
 from .listing import get_db_connection, get_vm_state_string, get_host_devices, parse_pci_id
-from .creation import generate_vm_xml
+from .creation import generate_vm_xml, specialize_vm_xml
+from .libvirt_pool import pool_stats
+from . import capacity, hugepages, inventory, jobs, numa, offload, profiles, vm_sampler, warm_pool
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 limiter = Limiter(key_func=get_remote_address)
@@ -27,6 +30,10 @@ ALLOWED_DISK_FORMATS = {'qcow2', 'raw'}
 VM_NAME_RE = re.compile(r'^[a-zA-Z0-9][a-zA-Z0-9._-]{0,62}$')
 PCI_ID_RE  = re.compile(r'^[0-9a-fA-F]{4}:[0-9a-fA-F]{2}:[0-9a-fA-F]{2}\.[0-9a-fA-F]$')
 MAC_RE     = re.compile(r'^([0-9a-fA-F]{2}:){5}[0-9a-fA-F]{2}$')
+LABEL_KEY_RE = re.compile(r'^[a-zA-Z0-9][a-zA-Z0-9._/-]{0,62}$')
+BATCH_MAX            = 100   # VMs per POST /api/vms/batch
+BATCH_IO_CONCURRENCY = 4     # qemu-img processes at once (default)
+BATCH_MAX_IO         = 16
 
 
 # ---------------------------------------------------------------------------
@@ -139,6 +146,7 @@ def host_info():
             host_info['mem_free_gb'] = round(mem_free_gb, 2)
             host_info['mem_used_gb'] = round(mem_used_gb, 2)
             host_info['mem_percent_used'] = round((mem_used_gb / mem_total_gb) * 100, 1) if mem_total_gb > 0 else 0
+            host_info['hugepages'] = hugepages.host_pools(conn)
 
             storage_pools = []
             for pool_name in conn.listStoragePools():
@@ -161,6 +169,20 @@ def host_info():
     return jsonify(host_info)
 
 
+@api_bp.route('/host/libvirt', methods=['GET'])
+def libvirt_pool_info():
+    """Connection-pool counters for this worker (opens / reuses / failures)."""
+    err = require_auth()
+    if err:
+        return err
+    return jsonify({
+        **pool_stats(),
+        'inventory': inventory.inventory_stats(),
+        'sampler':   vm_sampler.sampler_stats(),
+        'offload':   offload.offload_stats(),
+    })
+
+
 # ---------------------------------------------------------------------------
 # VMs
 # ---------------------------------------------------------------------------
@@ -171,6 +193,18 @@ def list_vms():
     if err:
         return err
 
+    records = inventory.list_domains()
+    if records is not None:
+        return jsonify([{
+            'uuid':       r['uuid'],
+            'name':       r['name'],
+            'state':      r['state'],
+            'state_code': r['state_code'],
+            'memory_mb':  r['memory_mb'],
+            'vcpus':      r['vcpus'],
+        } for r in records])
+
+    # Inventory not ready yet — query libvirt directly
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Could not connect to hypervisor'}), 500
@@ -179,8 +213,6 @@ def list_vms():
     try:
         domains = conn.listAllDomains(0)
         for domain in domains:
-            xml_str = domain.XMLDesc(0)
-            tree = ET.fromstring(xml_str)
             info = domain.info()
             vms_list.append({
                 'uuid': domain.UUIDString(),
@@ -199,6 +231,87 @@ def list_vms():
     return jsonify(vms_list)
 
 
+def _plan_disks(raw_disks, safe_name):
+    """Validate a `disks` list → ([(source, overlay or None, size GB)], None)
+    or (None, error response)."""
+    plan = []
+    for idx, disk_entry in enumerate(raw_disks):
+        disk_path = str(disk_entry.get('path', '')).strip()
+        if not disk_path:
+            continue
+        disk_size_gb = int(disk_entry.get('size_gb', 20))
+        if disk_size_gb < 1 or disk_size_gb > 65536:
+            return None, (jsonify({'error': f'Disk size must be between 1 and 65536 GB (disk {idx+1})'}), 400)
+
+        if not os.path.exists(disk_path):
+            return None, (jsonify({'error': f'Disk image not found: {disk_path}'}), 422)
+
+        if disk_path.lower().endswith('.iso'):
+            # ISO → attach directly as cdrom (read-only, safe to share)
+            plan.append((disk_path, None, disk_size_gb))
+        else:
+            # Cloud / raw image → create a per-VM qcow2 overlay so the base
+            # image is never modified and multiple VMs can share the same base.
+            suffix = '' if idx == 0 else f'-disk{idx+1}'
+            overlay_path = os.path.join(STORAGE_PATH, f"{safe_name}{suffix}.qcow2")
+            if os.path.exists(overlay_path):
+                return None, (jsonify({'error': f'Disk already exists: {os.path.basename(overlay_path)}'}), 409)
+            plan.append((disk_path, overlay_path, disk_size_gb))
+    return plan, None
+
+
+def _parse_hugepages(value, ram_mb):
+    """Request `hugepages` field → (page size in KiB or None, error response or None)."""
+    if value in (None, False, 0, '', 'none'):
+        return None, None
+    try:
+        size = hugepages.parse_size(value)
+    except ValueError as e:
+        return None, (jsonify({'error': str(e)}), 400)
+    if ram_mb is not None and (ram_mb * 1024) % size:
+        return None, (jsonify({'error': f'RAM must be a multiple of the hugepage size ({size} KiB)'}), 400)
+    return size, None
+
+
+def _admit_hugepages(memory_kib, size_kib):
+    """409 response if the host lacks the free hugepages, else None."""
+    try:
+        conn = get_db_connection()
+    except libvirt.libvirtError as e:
+        return jsonify({'error': f'Could not connect to hypervisor: {e}'}), 500
+    try:
+        hugepages.admit(conn, memory_kib, size_kib)
+    except hugepages.HugepageError as e:
+        return jsonify({'error': str(e)}), 409
+    except libvirt.libvirtError as e:
+        return jsonify({'error': f'Hugepage check failed: {e}'}), 500
+    finally:
+        conn.close()
+    return None
+
+
+def _admit_capacity(vms):
+    """409 with the capacity answer if *vms* do not fit the host, else None.
+
+    Admitted VMs stay held (views/capacity.py) until they are defined or the
+    job that builds them calls capacity.release().
+    """
+    try:
+        conn = get_db_connection()
+    except libvirt.libvirtError as e:
+        return jsonify({'error': f'Could not connect to hypervisor: {e}'}), 500
+    try:
+        capacity.admit(conn, vms)
+    except capacity.CapacityError as e:
+        return jsonify({'error': str(e), 'capacity': e.result}), 409
+    except libvirt.libvirtError as e:
+        return jsonify({'error': f'Capacity check failed: {e}'}), 500
+    finally:
+        if conn:
+            conn.close()
+    return None
+
+
 @api_bp.route('/vms', methods=['POST'])
 def create_vm():
     err = require_auth()
@@ -211,6 +324,8 @@ def create_vm():
     cpu = data.get('cpu')
     host_cpu = data.get('host_cpu', False)
     devices = data.get('devices', [])
+    profile = data.get('profile')
+    numa_place = bool(data.get('numa', False))
     # Multi-disk support: `disks` is a list of {path, size_gb}.
     # Legacy single-disk fields (disk_path / disk_size_gb) are still accepted.
     raw_disks = data.get('disks')
@@ -233,231 +348,367 @@ def create_vm():
             return jsonify({'error': 'CPU count must be between 1 and 256'}), 400
     except (ValueError, TypeError):
         return jsonify({'error': 'ram and cpu must be integers'}), 400
+    if profile is not None and profile not in profiles.PROFILES:
+        return jsonify({'error': f'profile must be one of: {", ".join(profiles.PROFILES)}'}), 400
+    hugepage_kib, err = _parse_hugepages(data.get('hugepages'), ram)
+    if err:
+        return err
 
-    # Resolve / create disk images ─────────────────────────────────────────────
-    resolved_disks = []   # final paths passed to generate_vm_xml
-    overlays_created = [] # track for rollback on failure
-    safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', name)
+    # Validate disks up front so bad requests fail before a job is queued ────
+    plan, err = _plan_disks(raw_disks, re.sub(r'[^a-zA-Z0-9._-]', '_', name))
+    if err:
+        return err
+    if hugepage_kib:
+        err = _admit_hugepages(ram * 1024, hugepage_kib)
+        if err:
+            return err
 
-    for idx, disk_entry in enumerate(raw_disks):
-        disk_path = str(disk_entry.get('path', '')).strip()
-        if not disk_path:
-            continue
-        disk_size_gb = int(disk_entry.get('size_gb', 20))
-        if disk_size_gb < 1 or disk_size_gb > 65536:
-            return jsonify({'error': f'Disk size must be between 1 and 65536 GB (disk {idx+1})'}), 400
+    # Refused before anything is claimed or queued; libvirt would only notice
+    # once the overlays are built
+    try:
+        if warm_pool.name_in_use(name):
+            return jsonify({'error': f"A VM named '{name}' already exists"}), 409
+    except libvirt.libvirtError as e:
+        return jsonify({'error': f'Could not connect to hypervisor: {e}'}), 500
 
-        if not os.path.exists(disk_path):
-            return jsonify({'error': f'Disk image not found: {disk_path}'}), 422
+    # A matching pre-provisioned domain from the warm pool needs no job ─────
+    # (nor admission: the pool member is already counted as committed)
+    try:
+        warm = None if profile or numa_place or hugepage_kib else warm_pool.claim(name, ram, cpu, host_cpu, devices, plan)
+    except warm_pool.NameInUseError as e:
+        return jsonify({'error': str(e)}), 409
+    if warm:
+        current_app.logger.info(f"VM created from warm pool {warm['template']}: "
+                                f"{name} by {session.get('username')}")
+        return jsonify(warm), 201
+    err = _admit_capacity([capacity.demand(name, cpu, ram, [(ov, gb) for _, ov, gb in plan if ov])])
+    if err:
+        return err
 
-        if disk_path.lower().endswith('.iso'):
-            # ISO → attach directly as cdrom (read-only, safe to share)
-            resolved_disks.append(disk_path)
-        else:
-            # Cloud / raw image → create a per-VM qcow2 overlay so the base
-            # image is never modified and multiple VMs can share the same base.
-            suffix = '' if idx == 0 else f'-disk{idx+1}'
-            overlay_path = os.path.join(STORAGE_PATH, f"{safe_name}{suffix}.qcow2")
-            if os.path.exists(overlay_path):
-                # Roll back any overlays created so far
-                for p in overlays_created:
-                    try: os.remove(p)
-                    except OSError: pass
-                return jsonify({'error': f'Disk already exists: {os.path.basename(overlay_path)}'}), 409
-            try:
-                cmd = [
-                    'qemu-img', 'create',
-                    '-f', 'qcow2',
-                    '-b', disk_path,
-                    '-F', 'qcow2',
-                    overlay_path,
-                    f"{disk_size_gb}G",
-                ]
-                subprocess.run(cmd, check=True, capture_output=True, text=True)
-                current_app.logger.info(f"Created overlay disk: {overlay_path} backing {disk_path}")
-                resolved_disks.append(overlay_path)
-                overlays_created.append(overlay_path)
-            except subprocess.CalledProcessError as exc:
-                for p in overlays_created:
-                    try: os.remove(p)
-                    except OSError: pass
-                return jsonify({'error': f'Failed to create disk overlay: {exc.stderr.strip()}'}), 500
-
-    seed_iso = None
-
-    # Define the VM ────────────────────────────────────────────────────────────
+    job_id = jobs.submit('vm.create', _create_vm_job, name, ram, cpu, host_cpu, devices, plan,
+                         profile=profile, numa_place=numa_place, hugepage_kib=hugepage_kib,
+                         resource=f'vm:{name}', user=session.get('username'))
+    current_app.logger.info(f"VM create queued: {name} (job {job_id}) by {session.get('username')}")
+    return jobs.accepted(job_id)
+
+
+def _remove_quietly(paths):
+    for p in paths:
+        try: os.remove(p)
+        except OSError: pass
+
+
+def _create_overlay(base, overlay_path, size_gb):
+    """qemu-img create a qcow2 overlay backed by *base*."""
+    cmd = [
+        'qemu-img', 'create',
+        '-f', 'qcow2',
+        '-b', base,
+        '-F', 'qcow2',
+        overlay_path,
+        f"{size_gb}G",
+    ]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as exc:
+        raise RuntimeError(f'Failed to create disk overlay: {exc.stderr.strip()}') from exc
+
+
+def _create_vm_job(job_id, name, ram, cpu, host_cpu, devices, plan, profile=None,
+                   numa_place=False, hugepage_kib=None):
+    """Job body for create_vm: build overlays, then define the domain."""
+    resolved_disks = []   # final paths passed to generate_vm_xml
+    overlays_created = [] # track for rollback on failure
     try:
-        xml_config = generate_vm_xml(name, ram, cpu, None, host_cpu, devices, disks=resolved_disks)
-        conn = libvirt.open('qemu:///system')
+        for n, (disk_path, overlay_path, disk_size_gb) in enumerate(plan):
+            if overlay_path is None:
+                resolved_disks.append(disk_path)
+                continue
+            if os.path.exists(overlay_path):
+                raise RuntimeError(f'Disk already exists: {os.path.basename(overlay_path)}')
+            jobs.progress(job_id, 80 * n / len(plan), f'Creating {os.path.basename(overlay_path)}')
+            _create_overlay(disk_path, overlay_path, disk_size_gb)
+            overlays_created.append(overlay_path)
+            resolved_disks.append(overlay_path)
+            jobs.log(job_id, f'Created overlay disk: {overlay_path} backing {disk_path}')
+
+        # Define the VM ────────────────────────────────────────────────────────
+        jobs.progress(job_id, 90, 'Defining domain')
+        xml_config = generate_vm_xml(name, ram, cpu, None, host_cpu, devices, disks=resolved_disks,
+                                     profile=profile, hugepage_kib=hugepage_kib)
+        conn = get_db_connection()
         if not conn:
             raise RuntimeError('Could not connect to hypervisor')
-        dom = conn.defineXML(xml_config)
-        new_uuid = dom.UUIDString()
-        conn.close()
-        current_app.logger.info(f"VM created: {name} ({new_uuid}) by {session.get('username')}")
-        return jsonify({'uuid': new_uuid}), 201
-    except libvirt.libvirtError as e:
-        for p in overlays_created:
-            try: os.remove(p)
-            except OSError: pass
-        if seed_iso and os.path.exists(seed_iso):
-            try: os.remove(seed_iso)
-            except OSError: pass
-        return jsonify({'error': str(e)}), 500
+        try:
+            if numa_place:
+                tree = ET.fromstring(xml_config)
+                placement = numa.place_new(conn, tree)
+                if hugepage_kib:         # the pages must be free on the chosen cells
+                    hugepages.admit(conn, ram * 1024, hugepage_kib, cells=placement['cells'])
+                xml_config = ET.tostring(tree, encoding='unicode')
+                jobs.log(job_id, f"NUMA placement: node(s) {placement['nodes']}")
+            dom = conn.defineXML(xml_config)
+            new_uuid = dom.UUIDString()
+            inventory.refresh(dom)
+        finally:
+            conn.close()
+        jobs.log(job_id, f'VM created: {name} ({new_uuid})')
+        return {'uuid': new_uuid}
     except Exception:
-        for p in overlays_created:
-            try: os.remove(p)
-            except OSError: pass
-        if seed_iso and os.path.exists(seed_iso):
-            try: os.remove(seed_iso)
-            except OSError: pass
-        current_app.logger.exception("Unexpected error creating VM")
-        return jsonify({'error': 'Failed to create VM'}), 500
+        _remove_quietly(overlays_created)
+        raise
+    finally:
+        capacity.release([name])
 
 
-@api_bp.route('/vms/<uuid>', methods=['GET'])
-def get_vm(uuid):
+@api_bp.route('/vms/batch', methods=['POST'])
+def create_vm_batch():
+    """Create `count` VMs from one template.
+
+    Body: name_pattern ('lab-{n:02d}'), count, start (default 1), ram, cpu,
+    host_cpu, devices, disks, profile, numa, hugepages (as for POST /api/vms) and concurrency — the
+    number of overlays built at once.  The domain XML is generated once and
+    specialized per instance (name, UUID, MAC).  Answers 202; the job
+    result is {'vms': [{name, uuid}]}, and a failure removes everything the
+    batch created.
+    """
     err = require_auth()
     if err:
         return err
 
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'error': 'Could not connect to hypervisor'}), 500
-
+    data = request.get_json() or {}
+    pattern = str(data.get('name_pattern', '')).strip()
     try:
-        dom = conn.lookupByUUIDString(uuid)
-        info = dom.info()
-        available_devices = get_host_devices()
+        count       = int(data.get('count', 0))
+        start       = int(data.get('start', 1))
+        ram         = int(data.get('ram', 0))
+        cpu         = int(data.get('cpu', 0))
+        concurrency = int(data.get('concurrency', BATCH_IO_CONCURRENCY))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'count, start, ram, cpu and concurrency must be integers'}), 400
+    host_cpu = data.get('host_cpu', False)
+    devices  = data.get('devices', [])
+    profile  = data.get('profile')
+    numa_place = bool(data.get('numa', False))
+    raw_disks = data.get('disks') or []
+
+    if '{n' not in pattern:
+        return jsonify({'error': 'name_pattern must contain {n}, e.g. lab-{n:02d}'}), 400
+    if not 1 <= count <= BATCH_MAX:
+        return jsonify({'error': f'count must be between 1 and {BATCH_MAX}'}), 400
+    if ram < 64 or ram > 1048576:
+        return jsonify({'error': 'RAM must be between 64 MB and 1 TB'}), 400
+    if cpu < 1 or cpu > 256:
+        return jsonify({'error': 'CPU count must be between 1 and 256'}), 400
+    if not 1 <= concurrency <= BATCH_MAX_IO:
+        return jsonify({'error': f'concurrency must be between 1 and {BATCH_MAX_IO}'}), 400
+    if profile is not None and profile not in profiles.PROFILES:
+        return jsonify({'error': f'profile must be one of: {", ".join(profiles.PROFILES)}'}), 400
+    hugepage_kib, err = _parse_hugepages(data.get('hugepages'), ram)
+    if err:
+        return err
+    try:
+        names = [pattern.format(n=i) for i in range(start, start + count)]
+    except (KeyError, IndexError, ValueError) as e:
+        return jsonify({'error': f'Invalid name_pattern: {e}'}), 400
+    bad = next((n for n in names if not VM_NAME_RE.match(n)), None)
+    if bad is not None:
+        return jsonify({'error': f'Invalid VM name: {bad}'}), 400
+    if len(set(names)) != len(names):
+        return jsonify({'error': 'name_pattern does not give distinct names'}), 400
+    taken = next((n for n in names if inventory.find_by_name(n)), None)
+    if taken:
+        return jsonify({'error': f'VM already exists: {taken}'}), 409
+
+    # One plan per instance; the first one is the template for the XML ────
+    plans = []
+    for name in names:
+        plan, err = _plan_disks(raw_disks, re.sub(r'[^a-zA-Z0-9._-]', '_', name))
+        if err:
+            return err
+        plans.append(plan)
+    if hugepage_kib:
+        err = _admit_hugepages(count * ram * 1024, hugepage_kib)
+        if err:
+            return err
+    err = _admit_capacity([capacity.demand(name, cpu, ram, [(ov, gb) for _, ov, gb in plan if ov])
+                           for name, plan in zip(names, plans)])
+    if err:
+        return err
+    paths = [[ov or src for src, ov, _ in plan] for plan in plans]
+    base_xml = ET.fromstring(generate_vm_xml(names[0], ram, cpu, None, host_cpu, devices,
+                                             disks=paths[0], profile=profile,
+                                             hugepage_kib=hugepage_kib))
+    macs = set()
+    instances = [(name, plan, specialize_vm_xml(base_xml, name, dict(zip(paths[0], own)), macs))
+                 for name, plan, own in zip(names, plans, paths)]
+
+    job_id = jobs.submit('vm.batch_create', _batch_create_job, instances, concurrency,
+                         numa_place=numa_place, resource=f'batch:{pattern}', user=session.get('username'))
+    current_app.logger.info(f"Batch create queued: {count} x {pattern} (job {job_id}) "
+                            f"by {session.get('username')}")
+    return jobs.accepted(job_id)
+
+
+def _batch_create_job(job_id, instances, concurrency, numa_place=False):
+    """Job body for create_vm_batch: all overlays in parallel, then define all."""
+    try:
+        return _batch_build(job_id, instances, concurrency, numa_place)
+    finally:
+        capacity.release([name for name, _, _ in instances])
 
-        xml_str = dom.XMLDesc(libvirt.VIR_DOMAIN_XML_INACTIVE)
-        tree = ET.fromstring(xml_str)
 
-        # Disks
-        disks = []
-        current_boot = {'1': None, '2': None}
-        for disk in tree.findall('devices/disk'):
-            disk_data = {
-                'device': disk.get('device'),
-                'file': 'N/A',
-                'target': 'N/A',
-                'type': disk.get('type'),
-                'boot_order': 0,
-            }
-            source = disk.find('source')
-            if source is not None:
-                disk_data['file'] = source.get('file') or source.get('dev') or 'N/A'
-            target = disk.find('target')
-            if target is not None:
-                disk_data['target'] = target.get('dev')
-            boot = disk.find('boot')
-            if boot is not None:
-                order = boot.get('order')
-                try:
-                    disk_data['boot_order'] = int(order)
-                except (TypeError, ValueError):
-                    pass
-                if order in ['1', '2']:
-                    current_boot[order] = f"disk|{disk_data['target']}"
-            disks.append(disk_data)
-
-        # Interfaces
-        interfaces = []
-        for iface in tree.findall('devices/interface'):
-            mac = iface.find('mac').get('address') if iface.find('mac') is not None else 'N/A'
-            model = iface.find('model').get('type') if iface.find('model') is not None else 'Default'
-            net_source = "Unknown"
-            source = iface.find('source')
-            if source is not None:
-                net_source = source.get('network') or source.get('bridge') or source.get('dev') or "Unknown"
-            boot = iface.find('boot')
-            if boot is not None:
-                order = boot.get('order')
-                if order in ['1', '2']:
-                    current_boot[order] = "network"
-            interfaces.append({
-                'mac': mac,
-                'model': model,
-                'network': net_source,
-                'type': iface.get('type'),
-                'ips': []
-            })
+def _batch_build(job_id, instances, concurrency, numa_place):
+    overlays = [(src, ov, size) for _, plan, _ in instances for src, ov, size in plan if ov]
+    created, errors = [], []
+    lock = threading.Lock()
 
-        # Host PCI devices
-        hostdevs = []
-        for hdev in tree.findall('devices/hostdev'):
-            if hdev.get('type') == 'pci':
-                src = hdev.find('source/address')
-                if src is not None:
-                    bus = src.get('bus').replace('0x', '')
-                    slot = src.get('slot').replace('0x', '')
-                    func = src.get('function').replace('0x', '')
-                    pci_str = f"0000:{bus}:{slot}.{func}"
-                    name_str = "Unknown PCI Device"
-                    for g in available_devices:
-                        if g['pci_id'].endswith(f":{bus}:{slot}.{func}"):
-                            name_str = g['name']
-                    hostdevs.append({'name': name_str, 'pci_id': pci_str})
-
-        # Live IPs
-        if info[0] == libvirt.VIR_DOMAIN_RUNNING:
+    def build(entry):
+        src, ov, size = entry
+        if errors:                       # one failure dooms the batch: stop early
+            return
+        try:
+            if os.path.exists(ov):
+                raise RuntimeError(f'Disk already exists: {os.path.basename(ov)}')
+            _create_overlay(src, ov, size)
+        except Exception as e:
+            with lock:
+                errors.append(f'{os.path.basename(ov)}: {e}')
+            return
+        with lock:
+            created.append(ov)
+            jobs.progress(job_id, 80 * len(created) / len(overlays),
+                          f'{len(created)} of {len(overlays)} overlays created')
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='batch-io') as pool:
+        list(pool.map(build, overlays))
+    if errors:
+        _remove_quietly(created)
+        raise RuntimeError(f'{len(errors)} of {len(overlays)} overlays failed; '
+                           f'first: {errors[0]}')
+
+    jobs.progress(job_id, 85, f'Defining {len(instances)} domains')
+    conn = get_db_connection()
+    if not conn:
+        _remove_quietly(created)
+        raise RuntimeError('Could not connect to hypervisor')
+    defined = []
+    try:
+        if numa_place:                   # place the batch against one load snapshot
             try:
-                ifaces_info = dom.interfaceAddresses(libvirt.VIR_DOMAIN_INTERFACE_ADDRESSES_SRC_LEASE, 0)
-                for _, val in ifaces_info.items():
-                    for k_iface in interfaces:
-                        if k_iface['mac'] == val.get('hwaddr'):
-                            k_iface['ips'] = [ip['addr'] for ip in val.get('addrs', [])]
-            except libvirt.libvirtError:
-                pass
+                topology = numa.parse_topology(conn.getCapabilities())
+                load = numa.host_load(conn, topology)
+            except (libvirt.libvirtError, ValueError) as e:
+                _remove_quietly(created)
+                raise RuntimeError(f'NUMA placement failed: {e}') from e
+        placed_kib = {}                  # hugepage memory placed per cell by this batch
+        for name, _, xml_config in instances:
+            try:
+                if numa_place:
+                    tree = ET.fromstring(xml_config)
+                    res = numa.domain_resources(tree)
+                    placement = numa.place(topology, load, res['vcpus'], res['memory_kib'])
+                    numa.apply_placement(tree, placement)
+                    size_kib = hugepages.get_hugepages(tree)
+                    if size_kib:         # the pages must be free on the chosen cells
+                        cells = [{'node': c['node'],
+                                  'memory_kib': placed_kib.get(c['node'], 0) + c['memory_kib']}
+                                 for c in placement['cells']]
+                        hugepages.admit(conn, 0, size_kib, cells=cells)
+                        placed_kib.update((c['node'], c['memory_kib']) for c in cells)
+                    xml_config = ET.tostring(tree, encoding='unicode')
+                defined.append(conn.defineXML(xml_config))
+            except Exception as e:
+                jobs.log(job_id, f'Rolling back {len(defined)} domains and {len(created)} overlays')
+                for dom in defined:
+                    try:
+                        uuid = dom.UUIDString()
+                        dom.undefine()
+                        inventory.forget(uuid)
+                    except libvirt.libvirtError:
+                        pass
+                _remove_quietly(created)
+                raise RuntimeError(f'Failed to define {name}: {e}') from e
+        vms = []
+        for dom in defined:
+            inventory.refresh(dom)
+            vms.append({'name': dom.name(), 'uuid': dom.UUIDString()})
+    finally:
+        conn.close()
+    jobs.log(job_id, f'Created {len(vms)} VMs')
+    return {'vms': vms}
+
+
+def _vm_details(record, available_devices):
+    """Shape an inventory record into the /api/vms/<uuid> response."""
+    hostdevs = []
+    for pci_str in record['hostdevs']:
+        suffix = pci_str[4:]   # ':bus:slot.func'
+        name_str = next((g['name'] for g in available_devices
+                         if g['pci_id'].endswith(suffix)), 'Unknown PCI Device')
+        hostdevs.append({'name': name_str, 'pci_id': pci_str})
+
+    # Boot devices list
+    all_boot_options = [{'value': 'network', 'text': 'Network (PXE)'}]
+    for disk in record['disks']:
+        fname = disk['file'].split('/')[-1] if disk['file'] != 'N/A' else disk['target']
+        all_boot_options.append({
+            'value': f"disk|{disk['target']}",
+            'text': f"Disk ({disk['target']}) - {fname}"
+        })
+    option_map = {opt['value']: opt for opt in all_boot_options}
+    current_boot = record['boot']
+    boot_devices = []
+    if current_boot['1'] and current_boot['1'] in option_map:
+        boot_devices.append(option_map[current_boot['1']])
+    if current_boot['2'] and current_boot['2'] in option_map:
+        boot_devices.append(option_map[current_boot['2']])
+    booted_values = {dev['value'] for dev in boot_devices}
+    for option in all_boot_options:
+        if option['value'] not in booted_values:
+            boot_devices.append(option)
+
+    return {
+        'uuid': record['uuid'],
+        'name': record['name'],
+        'state': record['state'],
+        'state_code': record['state_code'],
+        'memory_mb': record['memory_mb'],
+        'vcpus': record['vcpus'],
+        'os_type': record['os_type'],
+        'interfaces': [{k: v for k, v in i.items() if k != 'target'} for i in record['interfaces']],
+        'disks': record['disks'],
+        'host_devices': hostdevs,
+        'available_devices': available_devices,
+        'boot_devices': boot_devices,
+        'snapshots': [{'name': n} for n in record['snapshots']],
+        'labels': record.get('labels', {}),
+        'performance': record.get('performance'),
+        'hugepage_kib': record.get('hugepage_kib'),
+    }
 
-        # Boot devices list
-        all_boot_options = [{'value': 'network', 'text': 'Network (PXE)'}]
-        for disk in disks:
-            fname = disk['file'].split('/')[-1] if disk['file'] != 'N/A' else disk['target']
-            all_boot_options.append({
-                'value': f"disk|{disk['target']}",
-                'text': f"Disk ({disk['target']}) - {fname}"
-            })
-        option_map = {opt['value']: opt for opt in all_boot_options}
-        boot_devices = []
-        if current_boot['1'] and current_boot['1'] in option_map:
-            boot_devices.append(option_map[current_boot['1']])
-        if current_boot['2'] and current_boot['2'] in option_map:
-            boot_devices.append(option_map[current_boot['2']])
-        booted_values = {dev['value'] for dev in boot_devices}
-        for option in all_boot_options:
-            if option['value'] not in booted_values:
-                boot_devices.append(option)
-
-        # Snapshots
-        snapshots = []
-        try:
-            snapshot_names = dom.snapshotListNames(0)
-            snapshots = [{'name': n} for n in snapshot_names]
-        except libvirt.libvirtError:
-            pass
 
-        vm_details = {
-            'uuid': dom.UUIDString(),
-            'name': dom.name(),
-            'state': get_vm_state_string(info[0]),
-            'state_code': info[0],
-            'memory_mb': int(info[1] / 1024),
-            'vcpus': info[3],
-            'os_type': dom.OSType(),
-            'interfaces': interfaces,
-            'disks': disks,
-            'host_devices': hostdevs,
-            'available_devices': available_devices,
-            'boot_devices': boot_devices,
-            'snapshots': snapshots,
-        }
-        return jsonify(vm_details)
+@api_bp.route('/vms/<uuid>', methods=['GET'])
+def get_vm(uuid):
+    err = require_auth()
+    if err:
+        return err
 
-    except libvirt.libvirtError as e:
-        return jsonify({'error': str(e)}), 404
-    finally:
-        conn.close()
+    record = inventory.get_domain(uuid)
+    if record is None:
+        # Not in the inventory (not ready, or a domain defined a moment ago)
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'error': 'Could not connect to hypervisor'}), 500
+        try:
+            dom = conn.lookupByUUIDString(uuid)
+            record = inventory.refresh(dom) or inventory.describe_domain(dom)
+        except libvirt.libvirtError as e:
+            return jsonify({'error': str(e)}), 404
+        finally:
+            conn.close()
+
+    return jsonify(_vm_details(record, get_host_devices()))
 
 
 @api_bp.route('/vms/<uuid>', methods=['PUT'])
@@ -469,6 +720,30 @@ def update_vm(uuid):
     data = request.get_json() or {}
     new_cpu = data.get('cpu')
     new_ram_mb = data.get('ram')
+    new_labels = data.get('labels')
+    new_profile = data.get('profile')
+    hugepages_given = 'hugepages' in data
+    try:
+        if new_ram_mb is not None:
+            new_ram_mb = int(new_ram_mb)
+            if new_ram_mb < 64 or new_ram_mb > 1048576:
+                return jsonify({'error': 'RAM must be between 64 MB and 1 TB'}), 400
+        if new_cpu is not None:
+            new_cpu = int(new_cpu)
+            if new_cpu < 1 or new_cpu > 256:
+                return jsonify({'error': 'CPU count must be between 1 and 256'}), 400
+    except (ValueError, TypeError):
+        return jsonify({'error': 'ram and cpu must be integers'}), 400
+    new_hugepages, err = _parse_hugepages(data.get('hugepages'), new_ram_mb)
+    if err:
+        return err
+    if new_profile is not None and new_profile not in (*profiles.PROFILES, 'default'):
+        return jsonify({'error': f'profile must be one of: {", ".join(profiles.PROFILES)}, default'}), 400
+    if new_labels is not None:
+        if not isinstance(new_labels, dict) or not all(
+                LABEL_KEY_RE.match(str(k)) and isinstance(v, (str, int, float))
+                for k, v in new_labels.items()):
+            return jsonify({'error': 'labels must map keys (letters, digits, ._/-) to values'}), 400
 
     conn = get_db_connection()
     if not conn:
@@ -480,7 +755,6 @@ def update_vm(uuid):
         tree = ET.fromstring(xml_str)
 
         if new_ram_mb is not None:
-            new_ram_mb = int(new_ram_mb)
             mem = tree.find('memory')
             curr = tree.find('currentMemory')
             if mem is not None:
@@ -493,9 +767,36 @@ def update_vm(uuid):
         if new_cpu is not None:
             vcpu = tree.find('vcpu')
             if vcpu is not None:
-                vcpu.text = str(int(new_cpu))
+                vcpu.text = str(new_cpu)
+
+        if new_labels is not None:
+            inventory.set_labels(tree, new_labels)
+
+        # Hugepage-backed memory must fit the free pages it will need at boot
+        size_kib = new_hugepages if hugepages_given else hugepages.get_hugepages(tree)
+        if size_kib and (hugepages_given or new_ram_mb is not None):
+            memory_kib = numa.to_kib(tree.find('memory'))
+            held = 0
+            live = ET.fromstring(dom.XMLDesc(0)) if dom.isActive() else None
+            if live is not None and hugepages.get_hugepages(live) == size_kib:
+                held = hugepages.pages_needed(numa.to_kib(live.find('memory')), size_kib)
+            if memory_kib % size_kib:
+                return jsonify({'error': f'RAM must be a multiple of the hugepage size ({size_kib} KiB)'}), 400
+            try:
+                hugepages.admit(conn, memory_kib, size_kib, held=held)
+            except hugepages.HugepageError as e:
+                return jsonify({'error': str(e)}), 409
+        if hugepages_given:
+            hugepages.set_hugepages(tree, new_hugepages)
+
+        # Queue counts follow the vCPU count, so a CPU change re-applies too
+        if new_profile is not None or (new_cpu is not None and profiles.get_profile(tree)):
+            profiles.apply_profile(tree, new_profile or profiles.get_profile(tree))
 
         conn.defineXML(ET.tostring(tree).decode())
+        inventory.refresh(dom)
+        if (new_profile is not None or hugepages_given) and dom.isActive():
+            return jsonify({'success': True, 'restart_required': True})
         return jsonify({'success': True})
 
     except libvirt.libvirtError as e:
@@ -548,6 +849,7 @@ def delete_vm(uuid):
             dom.undefineFlags(flags)
         except libvirt.libvirtError:
             dom.undefine()   # fallback for older libvirt
+        inventory.forget(uuid)
 
         # Remove disk files — skip backing files (cloud base images)
         deleted, skipped = [], []
@@ -584,6 +886,7 @@ def start_vm(uuid):
     try:
         dom = conn.lookupByUUIDString(uuid)
         dom.create()
+        inventory.refresh(dom)
         return jsonify({'success': True})
     except libvirt.libvirtError as e:
         return jsonify({'error': str(e)}), 500
@@ -605,6 +908,7 @@ def stop_vm(uuid):
         dom = conn.lookupByUUIDString(uuid)
         if dom.isActive():
             dom.destroy()
+        inventory.refresh(dom)
         return jsonify({'success': True})
     except libvirt.libvirtError as e:
         return jsonify({'error': str(e)}), 500
@@ -638,6 +942,38 @@ def stop_all_vms():
 # Disk management
 # ---------------------------------------------------------------------------
 
+def _attach_tuned(dom, tree, device):
+    """Attach a new <disk> or <interface>, tuned for the domain's profile.
+
+    The persistent copy is tuned from *tree*, the inactive XML.  A running
+    domain's copy is tuned from its live XML: a profile applied while it ran
+    (restart_required) is not live yet, and libvirt rejects a hot-plugged
+    disk bound to an iothread the guest does not have.
+    """
+    config_el = ET.fromstring(ET.tostring(device))
+    profiles.tune_device(tree, config_el)
+    config_xml = ET.tostring(config_el).decode()
+    if not dom.isActive():
+        dom.attachDeviceFlags(config_xml, libvirt.VIR_DOMAIN_AFFECT_CONFIG)
+        return
+    live_el = ET.fromstring(ET.tostring(device))
+    profiles.tune_device(ET.fromstring(dom.XMLDesc(0)), live_el)
+    live_xml = ET.tostring(live_el).decode()
+    if live_xml == config_xml:
+        dom.attachDeviceFlags(config_xml, libvirt.VIR_DOMAIN_AFFECT_CONFIG
+                              | libvirt.VIR_DOMAIN_AFFECT_LIVE)
+        return
+    dom.attachDeviceFlags(live_xml, libvirt.VIR_DOMAIN_AFFECT_LIVE)
+    try:
+        dom.attachDeviceFlags(config_xml, libvirt.VIR_DOMAIN_AFFECT_CONFIG)
+    except libvirt.libvirtError:
+        try:
+            dom.detachDeviceFlags(live_xml, libvirt.VIR_DOMAIN_AFFECT_LIVE)
+        except libvirt.libvirtError:
+            pass
+        raise
+
+
 @api_bp.route('/vms/<uuid>/disks', methods=['POST'])
 def add_disk(uuid):
     err = require_auth()
@@ -695,12 +1031,8 @@ def add_disk(uuid):
             ET.SubElement(disk_el, 'driver', name='qemu', type='qcow2')
             ET.SubElement(disk_el, 'source', file=file_path)
             ET.SubElement(disk_el, 'target', dev=target_dev, bus='virtio')
-        xml = ET.tostring(disk_el).decode()
-
-        flags = libvirt.VIR_DOMAIN_AFFECT_CONFIG
-        if dom.isActive():
-            flags |= libvirt.VIR_DOMAIN_AFFECT_LIVE
-        dom.attachDeviceFlags(xml, flags)
+        _attach_tuned(dom, tree, disk_el)
+        inventory.refresh(dom)
         return jsonify({'success': True})
 
     except libvirt.libvirtError as e:
@@ -739,6 +1071,7 @@ def delete_disk(uuid):
             if dom.isActive():
                 flags |= libvirt.VIR_DOMAIN_AFFECT_LIVE
             dom.detachDeviceFlags(disk_xml, flags)
+        inventory.refresh(dom)
         return jsonify({'success': True})
 
     except libvirt.libvirtError as e:
@@ -769,48 +1102,66 @@ def attach_cloud_image(uuid):
     if not conn:
         return jsonify({'error': 'Could not connect to hypervisor'}), 500
 
+    try:
+        vm_name = conn.lookupByUUIDString(uuid).name()
+    except libvirt.libvirtError as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        conn.close()
+
+    safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', vm_name)
+    overlay = os.path.join(STORAGE_PATH, f'{safe_name}.qcow2')
+    if os.path.exists(overlay):
+        return jsonify({'error': f'Overlay already exists: {os.path.basename(overlay)}'}), 409
+
+    job_id = jobs.submit('vm.cloud_image', _attach_cloud_image_job, uuid, base_image,
+                         overlay, disk_size_gb, resource=f'vm:{uuid}',
+                         user=session.get('username'))
+    return jobs.accepted(job_id)
+
+
+def _attach_cloud_image_job(job_id, uuid, base_image, overlay, disk_size_gb):
+    """Job body for attach_cloud_image: create the overlay and attach it."""
+    if os.path.exists(overlay):
+        raise RuntimeError(f'Overlay already exists: {os.path.basename(overlay)}')
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError('Could not connect to hypervisor')
+
     try:
         dom = conn.lookupByUUIDString(uuid)
-        vm_name = dom.name()
-        safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', vm_name)
 
         # Create qcow2 overlay backed by the pre-prepared cloud image
-        overlay = os.path.join(STORAGE_PATH, f'{safe_name}.qcow2')
-        if os.path.exists(overlay):
-            return jsonify({'error': f'Overlay already exists: {os.path.basename(overlay)}'}), 409
+        jobs.progress(job_id, 10, f'Creating {os.path.basename(overlay)}')
         subprocess.run(
             ['qemu-img', 'create', '-f', 'qcow2', '-b', base_image, '-F', 'qcow2', overlay, f'{disk_size_gb}G'],
             check=True, capture_output=True, text=True
         )
 
         # Attach overlay disk
-        flags = libvirt.VIR_DOMAIN_AFFECT_CONFIG
-        if dom.isActive():
-            flags |= libvirt.VIR_DOMAIN_AFFECT_LIVE
-
+        jobs.progress(job_id, 70, 'Attaching disk')
         xml_str = dom.XMLDesc(libvirt.VIR_DOMAIN_XML_INACTIVE)
         tree = ET.fromstring(xml_str)
         used = {d.find('target').get('dev') for d in tree.findall('devices/disk') if d.find('target') is not None}
         idx = next(i for i in range(26) if f'vd{chr(ord("a")+i)}' not in used)
         target = f'vd{chr(ord("a")+idx)}'
-        disk_xml = f"""<disk type='file' device='disk'>
+        disk_el = ET.fromstring(f"""<disk type='file' device='disk'>
   <driver name='qemu' type='qcow2' cache='none'/>
   <source file='{overlay}'/>
   <target dev='{target}' bus='virtio'/>
-</disk>"""
-        dom.attachDeviceFlags(disk_xml, flags)
+</disk>""")
+        _attach_tuned(dom, tree, disk_el)
+        inventory.refresh(dom)
 
-        current_app.logger.info(f'Cloud image overlay attached for {vm_name}: {overlay}')
-        return jsonify({'success': True, 'overlay': overlay}), 200
+        jobs.log(job_id, f'Cloud image overlay attached for {dom.name()}: {overlay}')
+        return {'success': True, 'overlay': overlay}
 
     except subprocess.CalledProcessError as e:
-        try: os.remove(overlay)
-        except OSError: pass
-        return jsonify({'error': f'Disk setup failed: {e.stderr.strip()}'}), 500
-    except libvirt.libvirtError as e:
-        try: os.remove(overlay)
-        except OSError: pass
-        return jsonify({'error': str(e)}), 500
+        _remove_quietly([overlay])
+        raise RuntimeError(f'Disk setup failed: {e.stderr.strip()}') from e
+    except libvirt.libvirtError:
+        _remove_quietly([overlay])
+        raise
     finally:
         conn.close()
 
@@ -875,6 +1226,7 @@ def update_boot_order(uuid):
             apply_order(dev, idx)
 
         conn.defineXML(ET.tostring(tree).decode())
+        inventory.refresh(dom)
         return jsonify({'success': True})
 
     except libvirt.libvirtError as e:
@@ -914,11 +1266,8 @@ def add_interface(uuid):
             iface_el = ET.Element('interface', type='network')
             ET.SubElement(iface_el, 'source', network=source)
         ET.SubElement(iface_el, 'model', type='virtio')
-        xml = ET.tostring(iface_el).decode()
-        flags = libvirt.VIR_DOMAIN_AFFECT_CONFIG
-        if dom.isActive():
-            flags |= libvirt.VIR_DOMAIN_AFFECT_LIVE
-        dom.attachDeviceFlags(xml, flags)
+        _attach_tuned(dom, ET.fromstring(dom.XMLDesc(libvirt.VIR_DOMAIN_XML_INACTIVE)), iface_el)
+        inventory.refresh(dom)
         return jsonify({'success': True})
 
     except libvirt.libvirtError as e:
@@ -957,6 +1306,7 @@ def delete_interface(uuid):
             if dom.isActive():
                 flags |= libvirt.VIR_DOMAIN_AFFECT_LIVE
             dom.detachDeviceFlags(iface_xml, flags)
+        inventory.refresh(dom)
         return jsonify({'success': True})
 
     except libvirt.libvirtError as e:
@@ -1002,6 +1352,7 @@ def attach_device(uuid):
         if dom.isActive():
             flags |= libvirt.VIR_DOMAIN_AFFECT_LIVE
         dom.attachDeviceFlags(xml, flags)
+        inventory.refresh(dom)
         return jsonify({'success': True})
 
     except libvirt.libvirtError as e:
@@ -1038,6 +1389,7 @@ def detach_device(uuid):
         if dom.isActive():
             flags |= libvirt.VIR_DOMAIN_AFFECT_LIVE
         dom.detachDeviceFlags(xml, flags)
+        inventory.refresh(dom)
         return jsonify({'success': True})
 
     except libvirt.libvirtError as e:
@@ -1061,23 +1413,9 @@ def create_snapshot(uuid):
     if not snapshot_name:
         return jsonify({'error': 'snapshot_name is required'}), 400
 
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'error': 'Could not connect to hypervisor'}), 500
-
-    try:
-        dom = conn.lookupByUUIDString(uuid)
-        # Build XML safely with ElementTree (prevents XML injection)
-        snap_el = ET.Element('domainsnapshot')
-        ET.SubElement(snap_el, 'name').text = snapshot_name
-        xml = ET.tostring(snap_el).decode()
-        dom.snapshotCreateXML(xml, 0)
-        return jsonify({'success': True})
-
-    except libvirt.libvirtError as e:
-        return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+    job_id = jobs.submit('snapshot.create', _snapshot_job, uuid, 'create', snapshot_name,
+                         resource=f'vm:{uuid}', user=session.get('username'))
+    return jobs.accepted(job_id)
 
 
 @api_bp.route('/vms/<uuid>/snapshots/<name>/revert', methods=['POST'])
@@ -1086,20 +1424,9 @@ def revert_snapshot(uuid, name):
     if err:
         return err
 
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'error': 'Could not connect to hypervisor'}), 500
-
-    try:
-        dom = conn.lookupByUUIDString(uuid)
-        snapshot = dom.snapshotLookupByName(name, 0)
-        dom.revertToSnapshot(snapshot, 0)
-        return jsonify({'success': True})
-
-    except libvirt.libvirtError as e:
-        return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+    job_id = jobs.submit('snapshot.revert', _snapshot_job, uuid, 'revert', name,
+                         resource=f'vm:{uuid}', user=session.get('username'))
+    return jobs.accepted(job_id)
 
 
 @api_bp.route('/vms/<uuid>/snapshots/<name>', methods=['DELETE'])
@@ -1108,18 +1435,31 @@ def delete_snapshot(uuid, name):
     if err:
         return err
 
+    job_id = jobs.submit('snapshot.delete', _snapshot_job, uuid, 'delete', name,
+                         resource=f'vm:{uuid}', user=session.get('username'))
+    return jobs.accepted(job_id)
+
+
+def _snapshot_job(job_id, uuid, action, name):
+    """Job body for the snapshot endpoints: create, revert or delete *name*."""
     conn = get_db_connection()
     if not conn:
-        return jsonify({'error': 'Could not connect to hypervisor'}), 500
+        raise RuntimeError('Could not connect to hypervisor')
 
     try:
         dom = conn.lookupByUUIDString(uuid)
-        snapshot = dom.snapshotLookupByName(name, 0)
-        snapshot.delete(0)
-        return jsonify({'success': True})
-
-    except libvirt.libvirtError as e:
-        return jsonify({'error': str(e)}), 500
+        jobs.progress(job_id, 10, f'{action.capitalize()} snapshot {name}')
+        if action == 'create':
+            # Build XML safely with ElementTree (prevents XML injection)
+            snap_el = ET.Element('domainsnapshot')
+            ET.SubElement(snap_el, 'name').text = name
+            dom.snapshotCreateXML(ET.tostring(snap_el).decode(), 0)
+        elif action == 'revert':
+            dom.revertToSnapshot(dom.snapshotLookupByName(name, 0), 0)
+        else:
+            dom.snapshotLookupByName(name, 0).delete(0)
+        inventory.refresh(dom)
+        return {'success': True}
     finally:
         conn.close()
 
@@ -1130,78 +1470,26 @@ def delete_snapshot(uuid, name):
 
 @api_bp.route('/vms/<uuid>/stats', methods=['GET'])
 def vm_stats(uuid):
+    """Live stats from the background sampler — never blocks on a sleep.
+
+    Optional ?window=<seconds> averages CPU usage over that span.
+    """
     err = require_auth()
     if err:
         return err
 
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'error': 'Could not connect to hypervisor'}), 500
-
     try:
-        dom = conn.lookupByUUIDString(uuid)
-        if not dom.isActive():
-            return jsonify({'error': 'VM is not running'}), 400
-
-        xml_str = dom.XMLDesc(0)
-        tree = ET.fromstring(xml_str)
-
-        disk_target = None
-        for disk in tree.findall('devices/disk'):
-            if disk.get('device') == 'disk':
-                target = disk.find('target')
-                if target is not None:
-                    disk_target = target.get('dev')
-                    break
-
-        net_target = None
-        net_interfaces = tree.findall('devices/interface')
-        if net_interfaces:
-            target = net_interfaces[0].find('target')
-            if target is not None:
-                net_target = target.get('dev')
-
-        t1 = time.time()
-        c1 = dom.info()[4]
-        time.sleep(1)
-        t2 = time.time()
-        c2 = dom.info()[4]
-        cpu_usage = (c2 - c1) * 100 / ((t2 - t1) * dom.info()[3] * 1e9)
-
-        mem_stats = dom.memoryStats()
-        mem_used = mem_stats.get('actual', 0) / 1024
-
-        disk_read_bytes, disk_write_bytes = 0, 0
-        if disk_target:
-            try:
-                disk_stats = dom.blockStats(disk_target)
-                disk_read_bytes = disk_stats[1]
-                disk_write_bytes = disk_stats[3]
-            except libvirt.libvirtError:
-                pass
-
-        net_rx_bytes, net_tx_bytes = 0, 0
-        if net_target:
-            try:
-                net_stats = dom.interfaceStats(net_target)
-                net_rx_bytes = net_stats[0]
-                net_tx_bytes = net_stats[4]
-            except libvirt.libvirtError:
-                pass
-
-        return jsonify({
-            'cpu_usage': round(cpu_usage, 2),
-            'mem_used': round(mem_used, 2),
-            'disk_read': disk_read_bytes,
-            'disk_write': disk_write_bytes,
-            'net_rx': net_rx_bytes,
-            'net_tx': net_tx_bytes,
-        })
+        window = float(request.args.get('window', 0)) or None
+    except ValueError:
+        return jsonify({'error': 'window must be a number of seconds'}), 400
 
+    try:
+        stats = vm_sampler.read(uuid, window)
     except libvirt.libvirtError as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+    if stats is None:
+        return jsonify({'error': 'VM is not running'}), 400
+    return jsonify(stats)
 
 
 # ---------------------------------------------------------------------------
@@ -1266,13 +1554,22 @@ def create_disk():
     if os.path.exists(full_path):
         return jsonify({'error': 'File already exists'}), 409
 
+    job_id = jobs.submit('disk.create', _create_disk_job, full_path, fmt, size_gb,
+                         resource=f'file:{full_path}', user=session.get('username'))
+    return jobs.accepted(job_id)
+
+
+def _create_disk_job(job_id, full_path, fmt, size_gb):
+    """Job body for create_disk: run qemu-img create."""
+    if os.path.exists(full_path):
+        raise RuntimeError('File already exists')
     try:
         subprocess.run(['qemu-img', 'create', '-f', fmt, full_path, f'{size_gb}G'],
                        check=True, capture_output=True)
-        return jsonify({'success': True})
     except subprocess.CalledProcessError as e:
-        current_app.logger.error(f"qemu-img failed: {e.stderr}")
-        return jsonify({'error': 'Failed to create disk image'}), 500
+        jobs.log(job_id, f"qemu-img failed: {e.stderr}")
+        raise RuntimeError('Failed to create disk image') from e
+    return {'success': True, 'path': full_path}
 
 
 @api_bp.route('/storage/upload', methods=['POST'])
@@ -1433,19 +1730,32 @@ def create_and_attach_disk(uuid):
     if os.path.exists(full_path):
         return jsonify({'error': f'File already exists: {full_path}'}), 409
 
+    job_id = jobs.submit('disk.create_attach', _create_and_attach_disk_job, uuid,
+                         full_path, fmt, size_gb, resource=f'vm:{uuid}',
+                         user=session.get('username'))
+    return jobs.accepted(job_id)
+
+
+def _create_and_attach_disk_job(job_id, uuid, full_path, fmt, size_gb):
+    """Job body for create_and_attach_disk."""
+    if os.path.exists(full_path):
+        raise RuntimeError(f'File already exists: {full_path}')
+
     # Create the disk image
+    jobs.progress(job_id, 10, f'Creating {os.path.basename(full_path)}')
     try:
         subprocess.run(
             ['qemu-img', 'create', '-f', fmt, full_path, f'{size_gb}G'],
             check=True, capture_output=True
         )
     except subprocess.CalledProcessError as e:
-        return jsonify({'error': f'qemu-img failed: {e.stderr.decode()}'}), 500
+        raise RuntimeError(f'qemu-img failed: {e.stderr.decode()}') from e
 
     # Attach it to the VM
+    jobs.progress(job_id, 70, 'Attaching disk')
     conn = get_db_connection()
     if not conn:
-        return jsonify({'error': 'Could not connect to hypervisor'}), 500
+        raise RuntimeError('Could not connect to hypervisor')
 
     try:
         dom = conn.lookupByUUIDString(uuid)
@@ -1460,24 +1770,16 @@ def create_and_attach_disk(uuid):
             None
         )
         if not target_dev:
-            return jsonify({'error': 'No available device names'}), 500
-
-        driver_type = 'raw' if fmt == 'raw' else 'qcow2'
-        disk_xml = f"""
-        <disk type='file' device='disk'>
-          <driver name='qemu' type='{driver_type}'/>
-          <source file='{full_path}'/>
-          <target dev='{target_dev}' bus='virtio'/>
-        </disk>
-        """
-        flags = libvirt.VIR_DOMAIN_AFFECT_CONFIG
-        if dom.isActive():
-            flags |= libvirt.VIR_DOMAIN_AFFECT_LIVE
-        dom.attachDeviceFlags(disk_xml, flags)
-        return jsonify({'success': True, 'path': full_path, 'target': target_dev})
-
-    except libvirt.libvirtError as e:
-        return jsonify({'error': str(e)}), 500
+            raise RuntimeError('No available device names')
+
+        # Build XML safely with ElementTree, tuned like add_disk
+        disk_el = ET.Element('disk', type='file', device='disk')
+        ET.SubElement(disk_el, 'driver', name='qemu', type='raw' if fmt == 'raw' else 'qcow2')
+        ET.SubElement(disk_el, 'source', file=full_path)
+        ET.SubElement(disk_el, 'target', dev=target_dev, bus='virtio')
+        _attach_tuned(dom, tree, disk_el)
+        inventory.refresh(dom)
+        return {'success': True, 'path': full_path, 'target': target_dev}
     finally:
         conn.close()
 
@@ -0,0 +1,249 @@
+"""
+Bulk VM lifecycle — one request acts on many domains in parallel.
+
+POST /api/vms/bulk takes an action and its targets, either explicit UUIDs or a
+label selector, runs the action on up to `concurrency` domains at once and
+streams one result per VM as it finishes (SSE), ending with a summary event.
+Send `Accept: application/json` to get a single JSON body once everything
+is done instead.
+
+Request body:
+    action        start | shutdown | destroy | reboot | snapshot
+    uuids         list of domain UUIDs …
+    selector      … or 'key=value,key!=value' over VM labels, plus the
+                  built-ins name (glob) and state ('Running', 'Shutoff', …)
+    concurrency   parallel actions, 1‥MAX_CONCURRENCY (default 8)
+    stagger       seconds between successive start/reboot launches, so 40
+                  guests do not all hit the disks at the same instant
+    snapshot_name name for the snapshot action (default bulk-<timestamp>)
+
+Routes
+------
+POST /api/vms/bulk   — run an action across many VMs
+"""
+
+import fnmatch
+import json
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+import libvirt
+from flask import Blueprint, Response, jsonify, request, session, stream_with_context
+
+from . import inventory
+from .listing import get_db_connection
+
+bulk_bp = Blueprint('bulk', __name__)
+
+ACTIONS             = ('start', 'shutdown', 'destroy', 'reboot', 'snapshot')
+STAGGERED           = ('start', 'reboot')
+DEFAULT_CONCURRENCY = 8
+MAX_CONCURRENCY     = 32
+MAX_STAGGER         = 300
+
+
+# ── selectors ─────────────────────────────────────────────────────────────────
+
+def parse_selector(text: str) -> list:
+    """'env=lab,tier!=db' → [('env', '=', 'lab'), ('tier', '!=', 'db')]."""
+    terms = []
+    for part in (text or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        op = '!=' if '!=' in part else '='
+        key, sep, value = part.partition(op)
+        if not sep or not key.strip():
+            raise ValueError(f'bad selector term: {part!r}')
+        terms.append((key.strip(), op, value.strip()))
+    if not terms:
+        raise ValueError('selector is empty')
+    return terms
+
+
+def matches(record: dict, terms: list) -> bool:
+    labels = record.get('labels') or {}
+    for key, op, value in terms:
+        if key == 'name':
+            hit = fnmatch.fnmatchcase(record['name'], value)
+        elif key == 'state':
+            hit = record['state'].lower() == value.lower()
+        else:
+            hit = labels.get(key) == value
+        if hit != (op == '='):
+            return False
+    return True
+
+
+def _records():
+    records = inventory.list_domains()
+    if records is not None:
+        return records
+    # Inventory not ready yet — describe every domain directly
+    conn = get_db_connection()
+    try:
+        return [inventory.describe_domain(d) for d in conn.listAllDomains(0)]
+    finally:
+        conn.close()
+
+
+# ── actions ───────────────────────────────────────────────────────────────────
+
+def _apply(dom, action: str, snapshot_name: str) -> str:
+    """Run one action on one domain; returns a short note for the result."""
+    active = dom.isActive()
+    if action == 'start':
+        if active:
+            return 'already running'
+        dom.create()
+    elif action == 'shutdown':
+        if not active:
+            return 'not running'
+        dom.shutdown()
+    elif action == 'destroy':
+        if not active:
+            return 'not running'
+        dom.destroy()
+    elif action == 'reboot':
+        if not active:
+            raise libvirt.libvirtError('domain is not running')
+        dom.reboot(0)
+    else:
+        snap_el = ET.Element('domainsnapshot')
+        ET.SubElement(snap_el, 'name').text = snapshot_name
+        dom.snapshotCreateXML(ET.tostring(snap_el).decode(), 0)
+    return ''
+
+
+def _run_one(uuid: str, action: str, snapshot_name: str, t0: float) -> dict:
+    started = time.monotonic()
+    result = {'uuid': uuid, 'name': None, 'action': action, 'ok': False,
+              'started_at': round(started - t0, 3)}
+    conn = None
+    try:
+        conn = get_db_connection()
+        dom = conn.lookupByUUIDString(uuid)
+        result['name'] = dom.name()
+        note = _apply(dom, action, snapshot_name)
+        inventory.refresh(dom)
+        result['ok'] = True
+        if note:
+            result['note'] = note
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        if conn is not None:
+            conn.close()
+    result['ms'] = round((time.monotonic() - started) * 1e3, 1)
+    return result
+
+
+def run_bulk(uuids, action, concurrency=DEFAULT_CONCURRENCY, stagger=0.0,
+             snapshot_name=None, emit=None) -> list:
+    """Run *action* on every UUID; emit(result) is called as each one finishes."""
+    results = []
+    lock    = threading.Lock()
+    t0      = time.monotonic()
+    delay   = stagger if action in STAGGERED else 0.0
+
+    def one(uuid):
+        res = _run_one(uuid, action, snapshot_name, t0)
+        with lock:
+            results.append(res)
+        if emit:
+            emit(res)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='bulk') as pool:
+        for i, uuid in enumerate(uuids):
+            if delay and i:
+                time.sleep(delay)
+            pool.submit(one, uuid)
+    return results
+
+
+def _summary(results, started):
+    ok = sum(1 for r in results if r['ok'])
+    return {'done': True, 'total': len(results), 'succeeded': ok,
+            'failed': len(results) - ok, 'ms': round((time.monotonic() - started) * 1e3, 1)}
+
+
+# ── HTTP API ──────────────────────────────────────────────────────────────────
+
+def _auth():
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+@bulk_bp.route('/api/vms/bulk', methods=['POST'])
+def vms_bulk():
+    err = _auth()
+    if err:
+        return err
+
+    data   = request.get_json() or {}
+    action = data.get('action')
+    if action not in ACTIONS:
+        return jsonify({'error': f'action must be one of: {", ".join(ACTIONS)}'}), 400
+    try:
+        concurrency = int(data.get('concurrency', DEFAULT_CONCURRENCY))
+        stagger     = float(data.get('stagger', 0))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'concurrency and stagger must be numbers'}), 400
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        return jsonify({'error': f'concurrency must be between 1 and {MAX_CONCURRENCY}'}), 400
+    if not 0 <= stagger <= MAX_STAGGER:
+        return jsonify({'error': f'stagger must be between 0 and {MAX_STAGGER} seconds'}), 400
+    snapshot_name = data.get('snapshot_name') or time.strftime('bulk-%Y%m%d-%H%M%S')
+
+    if data.get('uuids') is not None:
+        uuids = data['uuids']
+        if not isinstance(uuids, list) or not all(isinstance(u, str) for u in uuids):
+            return jsonify({'error': 'uuids must be a list of strings'}), 400
+        uuids = list(dict.fromkeys(uuids))
+    elif data.get('selector'):
+        try:
+            terms = parse_selector(data['selector'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        try:
+            uuids = [r['uuid'] for r in _records() if matches(r, terms)]
+        except libvirt.libvirtError as e:
+            return jsonify({'error': str(e)}), 500
+    else:
+        return jsonify({'error': 'uuids or selector is required'}), 400
+
+    started = time.monotonic()
+    kwargs  = dict(concurrency=concurrency, stagger=stagger, snapshot_name=snapshot_name)
+
+    if request.accept_mimetypes.best == 'application/json':
+        results = run_bulk(uuids, action, **kwargs)
+        return jsonify({**_summary(results, started), 'results': results})
+
+    events = queue.Queue()
+
+    def worker():
+        try:
+            results = run_bulk(uuids, action, emit=events.put, **kwargs)
+            events.put(_summary(results, started))
+        finally:
+            events.put(None)
+
+    threading.Thread(target=worker, daemon=True, name='bulk-dispatch').start()
+
+    def generate():
+        yield f'data: {json.dumps({"action": action, "targets": uuids})}\n\n'
+        while True:
+            ev = events.get()
+            if ev is None:
+                return
+            yield f'data: {json.dumps(ev)}\n\n'
+
+    return Response(
+        stream_with_context(generate()),
+        content_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
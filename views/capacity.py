@@ -0,0 +1,474 @@
+"""
+Capacity — admission control for new VMs against committed host resources.
+
+Three resources are tracked:
+
+    vcpus   vCPUs of defined domains against (host CPUs - reserved_cpus)
+            × cpu_ratio
+    ram     memory of defined domains against (host RAM - reserved_ram_mb)
+            × ram_ratio
+    disk    virtual (thin-provisioned) size of every volume in a storage
+            pool against the pool's capacity × disk_ratio; a pool must also
+            keep min_free_disk_gb physically free
+
+Stopped domains count too: any of them may be started without asking, and
+creating one (even stopped) is where the VM is admitted.  Domains come from
+the inventory; pool usage is rescanned at most every POOL_TTL seconds.
+
+check() answers for a list of VMs about to be created:
+
+    fits          go ahead
+    fits_if       every shortfall has a named fix — raise cpu_ratio to R,
+                  delete stopped VMs a and b, reduce RAM to N MiB per VM, …
+    does_not_fit  something no setting can fix (a VM larger than the host)
+
+admit() raises CapacityError unless the answer is "fits" (or enforce is off)
+and then holds the VMs' resources under their names until domains of those
+names exist or release() is called, so two deploys admitted back to back
+cannot both count on the same headroom.  Holds are per worker process and
+expire after HOLD_TTL.
+
+Routes
+------
+GET  /api/host/capacity        — committed / limit per resource and the ratios
+PUT  /api/host/capacity        — update the ratios and reservations
+POST /api/host/capacity/check  — dry run: {vms: [{name, cpu, ram, disks}]} or
+                                 {cpu, ram, disk_gb, count, storage_path}
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+import libvirt
+from flask import Blueprint, jsonify, request, session
+
+from . import inventory
+from .listing import get_db_connection
+
+capacity_bp = Blueprint('capacity', __name__)
+log = logging.getLogger(__name__)
+
+_APP_DIR     = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE  = os.environ.get('CAPACITY_CONFIG', os.path.join(_APP_DIR, 'capacity.json'))
+STORAGE_PATH = '/var/lib/libvirt/images'
+HOLD_TTL     = 3600           # seconds an admitted VM is held while it is built
+POOL_TTL     = 60             # seconds a storage pool scan is reused
+GIB          = 1024 ** 3
+MIN_RAM_MB   = 512            # smallest per-VM RAM worth suggesting
+RAM_STEP_MB  = 256
+
+DEFAULT_CONFIG = {'cpu_ratio': 4.0, 'ram_ratio': 1.0, 'disk_ratio': 1.5,
+                  'reserved_cpus': 1, 'reserved_ram_mb': 2048, 'min_free_disk_gb': 10,
+                  'enforce': True}
+# key → (low, high) accepted by PUT; suggestions never go past SUGGEST_MAX
+LIMITS      = {'cpu_ratio': (0.1, 32.0), 'ram_ratio': (0.1, 2.0), 'disk_ratio': (0.1, 10.0),
+               'reserved_cpus': (0, 256), 'reserved_ram_mb': (0, 1048576),
+               'min_free_disk_gb': (0, 65536)}
+SUGGEST_MAX = {'cpu_ratio': 8.0, 'disk_ratio': 3.0}
+
+_lock  = threading.Lock()
+_admit_lock = threading.Lock()
+_cfg   = {'mtime': None, 'data': DEFAULT_CONFIG}
+_holds = {}                   # VM name → {'vm': demand, 'at': time, 'defined_at'?}
+_pool_cache = {'at': 0.0, 'pools': None}
+
+
+class CapacityError(Exception):
+    """The host cannot take the VMs; .result is the full check() answer."""
+
+    def __init__(self, result):
+        super().__init__(explain(result))
+        self.result = result
+
+
+# ── configuration ─────────────────────────────────────────────────────────────
+
+def _normalise(data) -> dict:
+    """Validated config; raises ValueError naming the first bad key."""
+    out = dict(DEFAULT_CONFIG)
+    for key, (lo, hi) in LIMITS.items():
+        if key not in data:
+            continue
+        value = data[key]
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not lo <= value <= hi:
+            raise ValueError(f'{key} must be a number between {lo} and {hi}')
+        out[key] = float(value) if key.endswith('_ratio') else int(value)
+    if 'enforce' in data:
+        out['enforce'] = bool(data['enforce'])
+    return out
+
+
+def load_config() -> dict:
+    """The configuration, re-read whenever another worker has replaced it."""
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime
+    except OSError:
+        return DEFAULT_CONFIG
+    with _lock:
+        if mtime != _cfg['mtime']:
+            try:
+                with open(CONFIG_FILE) as fh:
+                    _cfg['data'] = _normalise(json.load(fh))
+            except (OSError, ValueError, TypeError, AttributeError):
+                log.warning('capacity: cannot read %s', CONFIG_FILE)
+                _cfg['data'] = DEFAULT_CONFIG
+            _cfg['mtime'] = mtime
+        return _cfg['data']
+
+
+def _save_config(data):
+    tmp = CONFIG_FILE + '.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(data, fh, indent=2)
+    os.replace(tmp, CONFIG_FILE)
+
+
+# ── demand ────────────────────────────────────────────────────────────────────
+
+def demand(name, vcpus, ram_mb, disks=()) -> dict:
+    """One VM to admit; *disks* is [(path, size GB)] of volumes it will create."""
+    return {'name': name, 'vcpus': int(vcpus), 'ram_mb': int(ram_mb),
+            'disks': [(str(p), int(gb)) for p, gb in disks]}
+
+
+# ── usage ─────────────────────────────────────────────────────────────────────
+
+def _scan_pools(conn) -> list:
+    pools = []
+    for pool in conn.listAllStoragePools(libvirt.VIR_CONNECT_LIST_STORAGE_POOLS_ACTIVE):
+        try:
+            pool.refresh(0)
+        except libvirt.libvirtError:
+            pass
+        info = pool.info()
+        committed = sum(vol.info()[1] for vol in pool.listAllVolumes(0))
+        pools.append({'name': pool.name(),
+                      'path': ET.fromstring(pool.XMLDesc(0)).findtext('target/path'),
+                      'capacity_gb': round(info[1] / GIB, 2),
+                      'available_gb': round(info[3] / GIB, 2),
+                      'committed_gb': round(committed / GIB, 2)})
+    return pools
+
+
+def _pools(conn):
+    """(pools, time scanned) — rescanned at most every POOL_TTL seconds."""
+    with _lock:
+        pools, at = _pool_cache['pools'], _pool_cache['at']
+    if pools is None or time.time() - at > POOL_TTL:
+        at = time.time()
+        pools = _scan_pools(conn)
+        with _lock:
+            _pool_cache.update(pools=pools, at=at)
+    return [dict(p) for p in pools], at
+
+
+def pool_for(pools, path):
+    """The pool whose target directory holds *path*, or None."""
+    folder = os.path.dirname(os.path.abspath(path))
+    best = None
+    for pool in pools:
+        root = (pool['path'] or '').rstrip('/')
+        if root and (folder == root or folder.startswith(root + '/')) \
+                and (best is None or len(root) > len(best['path'].rstrip('/'))):
+            best = pool
+    return best
+
+
+def _domains(conn) -> list:
+    """Every defined domain, from the inventory when it is ready."""
+    records = inventory.list_domains()
+    if records is not None:
+        return [{'name': r['name'], 'vcpus': int(r['vcpus']), 'ram_mb': int(r['memory_mb']),
+                 'active': r['state_code'] != libvirt.VIR_DOMAIN_SHUTOFF} for r in records]
+    domains = []
+    for dom in conn.listAllDomains(0):
+        info = dom.info()
+        domains.append({'name': dom.name(), 'vcpus': int(info[3]),
+                        'ram_mb': int(info[1]) // 1024, 'active': bool(dom.isActive())})
+    return domains
+
+
+def usage(conn, exclude=(), config=None) -> dict:
+    """Committed resources; domains and holds named in *exclude* are left out."""
+    cfg = config or load_config()
+    host = conn.getInfo()
+    host_ram_mb, host_cpus = int(host[1]), int(host[2])
+    domains = _domains(conn)
+    defined = {d['name'] for d in domains}
+    domains = [d for d in domains if d['name'] not in exclude]
+
+    pools, scanned = _pools(conn)
+    held = {'vcpus': 0, 'ram_mb': 0, 'names': []}
+    now = time.time()
+    with _lock:
+        for name, hold in list(_holds.items()):
+            if now - hold['at'] > HOLD_TTL:
+                del _holds[name]
+                continue
+            if name in defined:
+                # the domain now counts its CPU and RAM; its new volumes show
+                # up in the pools from the first scan after it was defined
+                hold.setdefault('defined_at', now)
+                if not hold['vm']['disks'] or scanned > hold['defined_at']:
+                    del _holds[name]
+                    continue
+            if name in exclude:
+                continue
+            held['names'].append(name)
+            if 'defined_at' not in hold:
+                held['vcpus'] += hold['vm']['vcpus']
+                held['ram_mb'] += hold['vm']['ram_mb']
+            for path, gb in hold['vm']['disks']:
+                pool = pool_for(pools, path)
+                if pool is not None:
+                    pool['committed_gb'] = round(pool['committed_gb'] + gb, 2)
+    for pool in pools:
+        pool['limit_gb'] = round(pool['capacity_gb'] * cfg['disk_ratio'], 2)
+
+    usable_cpus = max(0, host_cpus - cfg['reserved_cpus'])
+    usable_mb   = max(0, host_ram_mb - cfg['reserved_ram_mb'])
+    return {
+        'cpu': {'host': host_cpus, 'usable': usable_cpus, 'ratio': cfg['cpu_ratio'],
+                'limit': round(usable_cpus * cfg['cpu_ratio'], 2),
+                'committed': sum(d['vcpus'] for d in domains) + held['vcpus']},
+        'ram': {'host_mb': host_ram_mb, 'usable_mb': usable_mb, 'ratio': cfg['ram_ratio'],
+                'limit_mb': int(usable_mb * cfg['ram_ratio']),
+                'committed_mb': sum(d['ram_mb'] for d in domains) + held['ram_mb']},
+        'pools': pools,
+        'domains': domains,
+        'held': sorted(held['names']),
+    }
+
+
+# ── admission ─────────────────────────────────────────────────────────────────
+
+def _delete_candidates(domains, short_mb):
+    """Fewest stopped domains (largest first) whose RAM covers *short_mb*."""
+    picked, freed = [], 0
+    for d in sorted((d for d in domains if not d['active']), key=lambda d: d['ram_mb'], reverse=True):
+        if freed >= short_mb:
+            break
+        picked.append(d['name'])
+        freed += d['ram_mb']
+    return (picked, freed) if freed >= short_mb else (None, 0)
+
+
+def _check_cpu(u, vms, shortfalls):
+    cpu, need = u['cpu'], sum(v['vcpus'] for v in vms)
+    short = cpu['committed'] + need - cpu['limit']
+    if short <= 0:
+        return
+    entry = {'resource': 'cpu', 'short': round(short, 2), 'fixes': [],
+             'message': f"{need} vCPU requested, {max(0, cpu['limit'] - cpu['committed']):g} "
+                        f"of {cpu['limit']:g} left at cpu_ratio {cpu['ratio']:g}"}
+    if max(v['vcpus'] for v in vms) <= cpu['usable']:
+        ratio = math.ceil((cpu['committed'] + need) / cpu['usable'] * 10) / 10
+        if ratio <= SUGGEST_MAX['cpu_ratio']:
+            entry['fixes'].append(f'raise cpu_ratio to {ratio:g}')
+    shortfalls.append(entry)
+
+
+def _check_ram(u, vms, shortfalls):
+    ram, need = u['ram'], sum(v['ram_mb'] for v in vms)
+    short = ram['committed_mb'] + need - ram['limit_mb']
+    if short <= 0:
+        return
+    entry = {'resource': 'ram', 'short': short, 'fixes': [],
+             'message': f"{need} MiB requested, {max(0, ram['limit_mb'] - ram['committed_mb'])} "
+                        f"of {ram['limit_mb']} MiB left"}
+    if max(v['ram_mb'] for v in vms) <= ram['limit_mb']:
+        names, freed = _delete_candidates(u['domains'], short)
+        if names:
+            entry['fixes'].append(f"delete stopped VMs {', '.join(names)} (frees {freed} MiB)")
+        per = (ram['limit_mb'] - ram['committed_mb']) // len(vms) // RAM_STEP_MB * RAM_STEP_MB
+        if per >= MIN_RAM_MB:
+            entry['fixes'].append(f'reduce RAM to {per} MiB per VM')
+    shortfalls.append(entry)
+
+
+def _check_disk(u, vms, shortfalls, warnings, cfg):
+    need = {}
+    for v in vms:
+        for path, gb in v['disks']:
+            pool = pool_for(u['pools'], path)
+            if pool is None:
+                warnings.append(f'no active storage pool holds {os.path.dirname(path)}; '
+                                f'disk not checked')
+                continue
+            need[pool['name']] = need.get(pool['name'], 0) + gb
+    for pool in u['pools']:
+        if pool['name'] not in need:
+            continue
+        gb = need[pool['name']]
+        short = round(pool['committed_gb'] + gb - pool['limit_gb'], 2)
+        if short > 0:
+            entry = {'resource': 'disk', 'pool': pool['name'], 'short': short, 'fixes': [],
+                     'message': f"{gb} GB requested in pool {pool['name']}, "
+                                f"{max(0, round(pool['limit_gb'] - pool['committed_gb'], 2)):g} "
+                                f"of {pool['limit_gb']:g} GB left at disk_ratio {cfg['disk_ratio']:g}"}
+            if pool['capacity_gb']:
+                ratio = math.ceil((pool['committed_gb'] + gb) / pool['capacity_gb'] * 10) / 10
+                if ratio <= SUGGEST_MAX['disk_ratio']:
+                    entry['fixes'].append(f'raise disk_ratio to {ratio:g}')
+            entry['fixes'].append(f"delete {math.ceil(short)} GB of volumes in pool {pool['name']}")
+            shortfalls.append(entry)
+        if pool['available_gb'] < cfg['min_free_disk_gb']:
+            shortfalls.append({
+                'resource': 'disk', 'pool': pool['name'],
+                'short': round(cfg['min_free_disk_gb'] - pool['available_gb'], 2),
+                'message': f"pool {pool['name']} has {pool['available_gb']:g} GB free, "
+                           f"{cfg['min_free_disk_gb']} GB must stay free",
+                'fixes': [f"free {math.ceil(cfg['min_free_disk_gb'] - pool['available_gb'])} GB "
+                          f"in pool {pool['name']}"]})
+
+
+def check(conn, vms, config=None) -> dict:
+    """Answer whether *vms* (see demand()) fit on the host, without holding them."""
+    cfg = config or load_config()
+    u = usage(conn, exclude={v['name'] for v in vms if v.get('name')}, config=cfg)
+    shortfalls, warnings = [], []
+    if vms:
+        _check_cpu(u, vms, shortfalls)
+        _check_ram(u, vms, shortfalls)
+        _check_disk(u, vms, shortfalls, warnings, cfg)
+    if not shortfalls:
+        verdict = 'fits'
+    elif all(s['fixes'] for s in shortfalls):
+        verdict = 'fits_if'
+    else:
+        verdict = 'does_not_fit'
+    return {'verdict': verdict, 'fits': verdict == 'fits',
+            'demand': {'vms': len(vms), 'vcpus': sum(v['vcpus'] for v in vms),
+                       'ram_mb': sum(v['ram_mb'] for v in vms),
+                       'disk_gb': sum(gb for v in vms for _, gb in v['disks'])},
+            'shortfalls': shortfalls, 'warnings': warnings, 'usage': u}
+
+
+def explain(result) -> str:
+    """One line for logs and error responses."""
+    if result['fits']:
+        return 'fits'
+    parts = [s['message'] for s in result['shortfalls']]
+    text = ("doesn't fit: " if result['verdict'] == 'does_not_fit' else 'fits if ')
+    if result['verdict'] == 'fits_if':
+        return text + ' and '.join(' or '.join(s['fixes']) for s in result['shortfalls']) \
+            + f" ({'; '.join(parts)})"
+    return text + '; '.join(parts)
+
+
+def admit(conn, vms) -> dict:
+    """check() and hold *vms*; raises CapacityError if they do not fit."""
+    cfg = load_config()
+    with _admit_lock:               # check and hold as one step
+        result = check(conn, vms, cfg)
+        if not result['fits']:
+            if cfg['enforce']:
+                raise CapacityError(result)
+            log.warning('capacity: admitting anyway (enforce is off): %s', explain(result))
+        now = time.time()
+        with _lock:
+            for v in vms:
+                _holds[v['name']] = {'vm': v, 'at': now}
+    return result
+
+
+def release(names):
+    """Drop the holds of VMs that were not (or will not be) created.
+
+    The next check rescans the pools, which now hold any volumes they made.
+    """
+    with _lock:
+        for name in names:
+            _holds.pop(name, None)
+        _pool_cache['pools'] = None
+
+
+# ── HTTP API ──────────────────────────────────────────────────────────────────
+
+def _auth():
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+def _parse_vms(data) -> list:
+    """Request body → [demand]; raises ValueError."""
+    try:
+        if 'vms' in data:
+            vms = []
+            for i, v in enumerate(data['vms']):
+                disks = [(d.get('path') or os.path.join(STORAGE_PATH, f'vm{i}-{j}.qcow2'),
+                          d.get('size_gb', 0)) for j, d in enumerate(v.get('disks', []))]
+                vms.append(demand(v.get('name') or f'vm{i}', v['cpu'], v['ram'], disks))
+        else:
+            count = int(data.get('count', 1))
+            if not 1 <= count <= 1000:
+                raise ValueError('count must be between 1 and 1000')
+            folder = data.get('storage_path') or STORAGE_PATH
+            gb = int(data.get('disk_gb', 0))
+            vms = [demand(f'vm{i}', data['cpu'], data['ram'],
+                          [(os.path.join(folder, f'vm{i}.qcow2'), gb)] if gb else [])
+                   for i in range(count)]
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError('each VM needs integer cpu and ram (MiB)') from e
+    if any(v['vcpus'] < 1 or v['ram_mb'] < 1 or any(gb < 0 for _, gb in v['disks']) for v in vms):
+        raise ValueError('cpu, ram and disk sizes must be positive')
+    return vms
+
+
+@capacity_bp.route('/api/host/capacity', methods=['GET'])
+def host_capacity():
+    err = _auth()
+    if err:
+        return err
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Could not connect to hypervisor'}), 500
+    try:
+        return jsonify({'config': load_config(), **usage(conn)})
+    except libvirt.libvirtError as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        conn.close()
+
+
+@capacity_bp.route('/api/host/capacity', methods=['PUT'])
+def update_capacity():
+    err = _auth()
+    if err:
+        return err
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'JSON object required'}), 400
+    try:
+        cfg = _normalise({**load_config(), **data})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    _save_config(cfg)
+    return jsonify({'config': load_config()})
+
+
+@capacity_bp.route('/api/host/capacity/check', methods=['POST'])
+def check_capacity():
+    err = _auth()
+    if err:
+        return err
+    try:
+        vms = _parse_vms(request.get_json(silent=True) or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Could not connect to hypervisor'}), 500
+    try:
+        result = check(conn, vms)
+    except libvirt.libvirtError as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        conn.close()
+    return jsonify({**result, 'summary': explain(result)})
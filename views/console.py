@@ -9,6 +9,9 @@ import socket as _socket
 import xml.etree.ElementTree as ET
 from flask import Blueprint, jsonify, request, session
 
+from .libvirt_pool import get_connection
+from . import inventory
+
 try:
     import libvirt as _libvirt
     _LIBVIRT = True
@@ -35,7 +38,10 @@ def _get_vnc_port(vm_uuid: str):
     """Return the live VNC TCP port for a running VM, or None."""
     if not _LIBVIRT:
         return None
-    conn = _libvirt.open('qemu:///system')
+    rec = inventory.get_domain(vm_uuid)
+    if rec is not None:
+        return rec['vnc_port']
+    conn = get_connection()
     try:
         dom  = conn.lookupByUUIDString(vm_uuid)
         xml  = dom.XMLDesc()
@@ -58,7 +64,7 @@ def vnc_view(vm_uuid):
         return 'Unauthorized', 401
     if not _LIBVIRT:
         return 'libvirt not available', 500
-    conn = _libvirt.open('qemu:///system')
+    conn = get_connection()
     try:
         dom = conn.lookupByUUIDString(vm_uuid)
         vm_name = dom.name()
@@ -1,6 +1,13 @@
+import copy
+import random
+import uuid as uuid_module
+import xml.etree.ElementTree as ET
+
 import libvirt
 from flask import Blueprint
 from .listing import get_host_devices, parse_pci_id
+from .hugepages import set_hugepages
+from .profiles import apply_profile
 
 # VM creation is handled entirely through POST /api/vms (views/api.py).
 # This blueprint is kept so the import in app.py remains valid.
@@ -8,7 +15,8 @@ from .listing import get_host_devices, parse_pci_id
 creation_bp = Blueprint('creation', __name__)
 
 
-def generate_vm_xml(name, memory_mb, vcpus, project=None, host_cpu=False, devices=None, disk_path=None, disks=None):
+def generate_vm_xml(name, memory_mb, vcpus, project=None, host_cpu=False, devices=None, disk_path=None, disks=None,
+                    profile=None, hugepage_kib=None):
     """Generate libvirt domain XML for a new VM.
 
     disks: list of resolved disk paths (strings).
@@ -17,6 +25,9 @@ def generate_vm_xml(name, memory_mb, vcpus, project=None, host_cpu=False, device
 
     disk_path: legacy single-disk shorthand (converted to a 1-element disks list).
     Both can be provided; disk_path is prepended.
+
+    profile: optional performance profile name (views/profiles.py).
+    hugepage_kib: back guest memory with hugepages of this size (2048 / 1048576).
     """
     memory_kib = int(memory_mb) * 1024
 
@@ -84,7 +95,7 @@ def generate_vm_xml(name, memory_mb, vcpus, project=None, host_cpu=False, device
         <boot dev='cdrom'/>
         <boot dev='network'/>"""
 
-    return f"""
+    xml = f"""
     <domain type='kvm'>
       <name>{name}</name>
       {meta_xml}
@@ -117,3 +128,49 @@ def generate_vm_xml(name, memory_mb, vcpus, project=None, host_cpu=False, device
       </devices>
     </domain>
     """
+    if profile or hugepage_kib:
+        tree = ET.fromstring(xml)
+        if profile:
+            apply_profile(tree, profile)
+        if hugepage_kib:
+            set_hugepages(tree, hugepage_kib)
+        xml = ET.tostring(tree, encoding='unicode')
+    return xml
+
+
+def random_mac(taken=None):
+    """A random KVM MAC address (52:54:00:XX:XX:XX) not in *taken*."""
+    while True:
+        mac = '52:54:00:' + ':'.join(f'{random.randint(0, 255):02x}' for _ in range(3))
+        if not taken or mac not in taken:
+            if taken is not None:
+                taken.add(mac)
+            return mac
+
+
+def specialize_vm_xml(template, name, disks=None, macs=None):
+    """Per-instance copy of a generate_vm_xml() result, for batch creation.
+
+    template: the XML string (or a parsed tree, which is left untouched).
+    disks:    {template disk path: this instance's path}.
+    macs:     set of MACs already handed out in the batch; updated.
+
+    The copy gets *name*, a fresh UUID and a fresh MAC on every interface, so
+    generating the XML once and specializing it N times cannot collide.
+    """
+    tree = copy.deepcopy(template) if isinstance(template, ET.Element) else ET.fromstring(template)
+    tree.find('name').text = name
+    uuid_el = tree.find('uuid')
+    if uuid_el is None:
+        uuid_el = ET.Element('uuid')
+        tree.insert(1, uuid_el)
+    uuid_el.text = str(uuid_module.uuid4())
+    for src in tree.findall('devices/disk/source'):
+        if disks and src.get('file') in disks:
+            src.set('file', disks[src.get('file')])
+    for iface in tree.findall('devices/interface'):
+        mac_el = iface.find('mac')
+        if mac_el is None:
+            mac_el = ET.SubElement(iface, 'mac')
+        mac_el.set('address', random_mac(macs if macs is not None else set()))
+    return ET.tostring(tree, encoding='unicode')
@@ -0,0 +1,76 @@
+"""
+Downsampling for metrics history responses.
+
+Charts are a few hundred pixels wide, so the history endpoints accept
+?max_points= and thin each series before it is turned into JSON.  Both
+methods work on a (series × samples) block at once and keep the first and
+last points:
+
+  lttb    Largest-Triangle-Three-Buckets — keeps the visual shape of a line
+          chart; one pass over the buckets, vectorised across series.
+  minmax  Keeps the lowest and highest sample of every bucket, so spikes
+          are never hidden; fully vectorised.
+"""
+
+import numpy as np
+
+METHODS = ('lttb', 'minmax')
+
+
+def _lttb(x, vals, n):
+    """Indices (series × n) chosen by LTTB for a block with shared x."""
+    S, N = vals.shape
+    rows  = np.arange(S)
+    every = (N - 2) / (n - 2)
+    edges = (np.arange(n - 1) * every).astype(np.int64) + 1   # bucket i = [edges[i], edges[i+1])
+    edges[-1] = N - 1
+    idx = np.empty((S, n), dtype=np.int64)
+    idx[:, 0]  = 0
+    idx[:, -1] = N - 1
+    a = np.zeros(S, dtype=np.int64)
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < n - 1 else (N - 1, N)
+        avg_x = x[nlo:nhi].mean()
+        avg_y = vals[:, nlo:nhi].mean(axis=1)
+        ax = x[a][:, None]
+        ay = vals[rows, a][:, None]
+        area = np.abs((ax - avg_x) * (vals[:, lo:hi] - ay)
+                      - (ax - x[lo:hi]) * (avg_y[:, None] - ay))
+        a = lo + area.argmax(axis=1)
+        idx[:, i + 1] = a
+    return idx
+
+
+def _minmax(vals, n):
+    """Indices (series × ≤n) of each bucket's min and max, in time order."""
+    S, N = vals.shape
+    buckets = max(n // 2, 1)
+    bucket  = (np.arange(N) * buckets) // N
+    starts  = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends    = np.r_[starts[1:], N] - 1
+    idx = np.empty((S, 2 * starts.size), dtype=np.int64)
+    for s in range(S):
+        order = np.lexsort((vals[s], bucket))   # by bucket, then value
+        lo, hi = order[starts], order[ends]
+        idx[s, 0::2] = np.minimum(lo, hi)
+        idx[s, 1::2] = np.maximum(lo, hi)
+    return idx
+
+
+def downsample(ts, vals, max_points, method='lttb'):
+    """Thin a (series × samples) block sharing timestamps *ts*.
+
+    Returns (ts, vals), both series × points, so each series may keep
+    different timestamps.  Blocks already within *max_points* are returned
+    unchanged (ts broadcast to one row per series).
+    """
+    vals = np.asarray(vals, dtype=np.float64)
+    S, N = vals.shape
+    if not max_points or N <= max_points or max_points < 3:
+        return np.broadcast_to(ts, (S, N)), vals
+    if method == 'minmax':
+        idx = _minmax(vals, max_points)
+    else:
+        idx = _lttb(np.asarray(ts, dtype=np.float64), vals, max_points)
+    return np.asarray(ts)[idx], np.take_along_axis(vals, idx, axis=1)
@@ -0,0 +1,179 @@
+"""
+Graceful host drain — ACPI shutdown for every running guest, then force.
+
+drain() sends shutdown() to all running domains at once (up to
+`concurrency` RPCs in flight), then waits for their STOPPED lifecycle
+events, which the inventory's event connection delivers, so hundreds of
+guests are not re-polled every second.  When `timeout` seconds have passed,
+whatever is still running is destroyed (unless force is off).  A guest that
+refuses the shutdown is destroyed at once with force, or reported failed
+without it.  On any tick the inventory's event connection is not up — or has
+just come back, having possibly missed events — it falls back to checking
+isActive(), as it does once more before destroying stragglers.
+
+Runs as a job (views/jobs.py); the result lists every VM with how it
+stopped (shutdown / destroyed / failed / still_running) and how long it took.
+
+Routes
+------
+POST /api/host/drain   — {timeout: 120, concurrency: 32, force: true} → 202 + job
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import libvirt
+from flask import Blueprint, jsonify, request, session
+
+from . import inventory, jobs
+from .listing import get_db_connection
+
+drain_bp = Blueprint('drain', __name__)
+
+DEFAULT_TIMEOUT     = 120
+MAX_TIMEOUT         = 3600
+DEFAULT_CONCURRENCY = 32
+MAX_CONCURRENCY     = 128
+WAIT_TICK           = 0.25   # seconds between checks of the stopped set
+
+
+def _name(dom):
+    try:
+        return dom.name()
+    except libvirt.libvirtError:
+        return None
+
+
+def drain(job_id=None, timeout=DEFAULT_TIMEOUT, concurrency=DEFAULT_CONCURRENCY,
+          force=True) -> dict:
+    """Shut down every running domain; destroy stragglers after *timeout*."""
+    stopped = {}                          # uuid → monotonic time of STOPPED event
+    lock    = threading.Lock()
+
+    def on_event(uuid, event):
+        if event == libvirt.VIR_DOMAIN_EVENT_STOPPED:
+            with lock:
+                stopped.setdefault(uuid, time.monotonic())
+
+    inventory.add_listener(on_event)      # before any shutdown is sent
+    events = inventory.ensure_started()
+
+    conn = get_db_connection()
+    try:
+        doms = {d.UUIDString(): d for d in
+                conn.listAllDomains(libvirt.VIR_CONNECT_LIST_DOMAINS_ACTIVE)}
+        t0 = time.monotonic()
+        results = {uuid: {'uuid': uuid, 'name': _name(dom), 'result': 'pending',
+                          'seconds': None} for uuid, dom in doms.items()}
+        if job_id:
+            jobs.progress(job_id, 0, f'Shutting down {len(doms)} domains')
+
+        def send(uuid):
+            try:
+                doms[uuid].shutdown()
+            except libvirt.libvirtError as e:
+                results[uuid]['error'] = str(e)
+
+        def kill(uuid):
+            try:
+                doms[uuid].destroy()
+                results[uuid].update(result='destroyed',
+                                     seconds=round(time.monotonic() - t0, 2))
+            except libvirt.libvirtError as e:
+                results[uuid].update(result='failed', error=str(e))
+
+        def poll():
+            for uuid in [u for u, r in results.items() if r['result'] == 'pending']:
+                try:
+                    if not doms[uuid].isActive():
+                        on_event(uuid, libvirt.VIR_DOMAIN_EVENT_STOPPED)
+                except libvirt.libvirtError:
+                    pass
+
+        def settle():
+            """Record the stops seen so far; the uuids still pending."""
+            with lock:
+                for uuid, at in stopped.items():
+                    r = results.get(uuid)
+                    if r is not None and r['result'] == 'pending':
+                        r.update(result='shutdown', seconds=round(at - t0, 2))
+            return [u for u, r in results.items() if r['result'] == 'pending']
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='drain') as pool:
+            list(pool.map(send, doms))
+            # no point waiting on a refused shutdown
+            refused = [u for u, r in results.items() if 'error' in r]
+            if force:
+                list(pool.map(kill, refused))
+            else:
+                for uuid in refused:
+                    results[uuid]['result'] = 'failed'
+
+        deadline = t0 + timeout
+        while True:
+            live = inventory.ensure_started()
+            if not (live and events):        # no event stream, or one that may have gaps
+                poll()
+            events = live
+            pending = settle()
+            if job_id and results:
+                jobs.progress(job_id, 90 * (len(results) - len(pending)) / len(results),
+                              f'{len(pending)} of {len(results)} still running')
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(WAIT_TICK)
+
+        if pending and force:
+            poll()                           # never destroy a guest that is already off
+            pending = settle()
+        if pending and force:
+            if job_id:
+                jobs.log(job_id, f'Timeout after {timeout}s: destroying {len(pending)} domains')
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='drain') as pool:
+                list(pool.map(kill, pending))
+        for uuid in pending:
+            if results[uuid]['result'] == 'pending':
+                results[uuid]['result'] = 'still_running'
+        for dom in doms.values():
+            inventory.refresh(dom)
+    finally:
+        inventory.remove_listener(on_event)
+        conn.close()
+
+    rows = sorted(results.values(), key=lambda r: (r['seconds'] is None, r['seconds'] or 0))
+    counts = {}
+    for r in rows:
+        counts[r['result']] = counts.get(r['result'], 0) + 1
+    return {'seconds': round(time.monotonic() - t0, 2), 'counts': counts, 'vms': rows}
+
+
+# ── HTTP API ──────────────────────────────────────────────────────────────────
+
+def _auth():
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+@drain_bp.route('/api/host/drain', methods=['POST'])
+def host_drain():
+    err = _auth()
+    if err:
+        return err
+
+    data = request.get_json(silent=True) or {}
+    try:
+        timeout     = float(data.get('timeout', DEFAULT_TIMEOUT))
+        concurrency = int(data.get('concurrency', DEFAULT_CONCURRENCY))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'timeout and concurrency must be numbers'}), 400
+    if not 0 < timeout <= MAX_TIMEOUT:
+        return jsonify({'error': f'timeout must be between 0 and {MAX_TIMEOUT} seconds'}), 400
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        return jsonify({'error': f'concurrency must be between 1 and {MAX_CONCURRENCY}'}), 400
+
+    job_id = jobs.submit('host.drain', drain, timeout=timeout, concurrency=concurrency,
+                         force=bool(data.get('force', True)), resource='host:drain',
+                         user=session.get('username'))
+    return jobs.accepted(job_id)
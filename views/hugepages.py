@@ -0,0 +1,238 @@
+"""
+Hugepages — host pool reporting, guest memory backing and admission.
+
+host_pools() reports, per NUMA cell, the total and free 2 MiB and 1 GiB
+pages: totals from the capabilities XML, free counts from getFreePages().
+When libvirt cannot answer it reads the same numbers from sysfs
+(/sys/devices/system/node/node<N>/hugepages/hugepages-<size>kB/).
+
+A guest backed by hugepages gets
+    <memoryBacking><hugepages><page size='2048' unit='KiB'/></hugepages></memoryBacking>
+and needs memory / page size free pages when it starts.  admit() checks a
+request against the free pages (optionally on specific cells, after NUMA
+placement) and says how many are missing.
+
+reserve() grows or shrinks a host pool with allocPages(); the kernel may
+give back fewer pages than asked for when memory is fragmented or pages
+are in use, so the resulting pools are always returned.
+
+Routes
+------
+GET /api/host/hugepages   — per-cell pools
+PUT /api/host/hugepages   — {size: '2M' | '1G', count: N, node: optional}
+"""
+
+import math
+import os
+import xml.etree.ElementTree as ET
+
+import libvirt
+from flask import Blueprint, jsonify, request, session
+
+from .listing import get_db_connection
+
+hugepages_bp = Blueprint('hugepages', __name__)
+
+SIZES_KIB  = (2048, 1048576)
+SIZE_NAMES = {'2m': 2048, '2mib': 2048, '2048': 2048,
+              '1g': 1048576, '1gib': 1048576, '1048576': 1048576}
+SYSFS_NODES = '/sys/devices/system/node'
+MAX_RESERVE = 1 << 20        # pages per request
+
+
+class HugepageError(Exception):
+    """A request cannot be backed by the host's free hugepages."""
+
+
+def parse_size(value) -> int:
+    """'2M' / '1G' / 2048 / 1048576 → page size in KiB; ValueError otherwise."""
+    size = SIZE_NAMES.get(str(value).strip().lower())
+    if size is None:
+        raise ValueError('hugepage size must be 2M or 1G')
+    return size
+
+
+def pages_needed(memory_kib: int, size_kib: int) -> int:
+    return math.ceil(memory_kib / size_kib)
+
+
+# ── guest XML ─────────────────────────────────────────────────────────────────
+
+def get_hugepages(tree):
+    """Page size in KiB a domain XML tree is backed by, or None."""
+    from .numa import MEMORY_UNITS     # numa → inventory → hugepages at import time
+    page = tree.find('memoryBacking/hugepages/page')
+    if page is not None:
+        unit = MEMORY_UNITS.get((page.get('unit') or 'KiB').lower(), 1)
+        return int(int(page.get('size')) * unit)
+    return 2048 if tree.find('memoryBacking/hugepages') is not None else None
+
+
+def set_hugepages(tree, size_kib):
+    """Back the domain with *size_kib* pages (None removes hugepages), in place."""
+    backing = tree.find('memoryBacking')
+    if backing is not None:
+        for old in backing.findall('hugepages'):
+            backing.remove(old)
+    if size_kib:
+        if backing is None:
+            backing = ET.Element('memoryBacking')
+            mem = tree.find('currentMemory')
+            if mem is None:
+                mem = tree.find('memory')
+            tree.insert(list(tree).index(mem) + 1 if mem is not None else len(tree), backing)
+        hp = ET.Element('hugepages')
+        ET.SubElement(hp, 'page', size=str(size_kib), unit='KiB')
+        backing.insert(0, hp)
+    elif backing is not None and not len(backing):
+        tree.remove(backing)
+
+
+# ── host pools ────────────────────────────────────────────────────────────────
+
+def _from_libvirt(conn) -> list:
+    caps = ET.fromstring(conn.getCapabilities())
+    cells = caps.findall('host/topology/cells/cell')
+    if not cells:
+        raise ValueError('capabilities report no NUMA cells')
+    ids = sorted(int(c.get('id')) for c in cells)
+    free = conn.getFreePages(list(SIZES_KIB), ids[0], len(ids)) or {}
+    pools = []
+    for cell in cells:
+        node = int(cell.get('id'))
+        totals = {int(p.get('size')): int(p.text) for p in cell.findall('pages')}
+        pools.append({'node': node, 'pages': [
+            {'size_kib': size, 'total': totals.get(size, 0),
+             'free': int(free.get(node, {}).get(size, 0))} for size in SIZES_KIB]})
+    return sorted(pools, key=lambda p: p['node'])
+
+
+def _read_int(path) -> int:
+    with open(path) as fh:
+        return int(fh.read().strip() or 0)
+
+
+def _from_sysfs() -> list:
+    pools = []
+    for entry in sorted(os.listdir(SYSFS_NODES)):
+        if not entry.startswith('node') or not entry[4:].isdigit():
+            continue
+        pages = []
+        for size in SIZES_KIB:
+            base = os.path.join(SYSFS_NODES, entry, 'hugepages', f'hugepages-{size}kB')
+            try:
+                pages.append({'size_kib': size, 'total': _read_int(f'{base}/nr_hugepages'),
+                              'free': _read_int(f'{base}/free_hugepages')})
+            except (OSError, ValueError):
+                pages.append({'size_kib': size, 'total': 0, 'free': 0})
+        pools.append({'node': int(entry[4:]), 'pages': pages})
+    return sorted(pools, key=lambda p: p['node'])
+
+
+def host_pools(conn) -> list:
+    """[{'node', 'pages': [{'size_kib', 'total', 'free'}]}] per NUMA cell."""
+    if conn:
+        try:
+            return _from_libvirt(conn)
+        except (libvirt.libvirtError, ValueError, TypeError, AttributeError):
+            pass
+    try:
+        return _from_sysfs()
+    except OSError:
+        return []
+
+
+def free_pages(pools, size_kib: int, nodes=None) -> dict:
+    """node → free pages of *size_kib* (restricted to *nodes* if given)."""
+    return {p['node']: next((x['free'] for x in p['pages'] if x['size_kib'] == size_kib), 0)
+            for p in pools if nodes is None or p['node'] in nodes}
+
+
+def admit(conn, memory_kib: int, size_kib: int, cells=None, held: int = 0):
+    """Raise HugepageError unless the host has the pages a guest needs.
+
+    cells: [{'node', 'memory_kib'}] from NUMA placement, checked per cell;
+           otherwise the free pages of all cells are pooled.
+    held:  pages the guest already holds (a running domain being updated).
+    """
+    pools = host_pools(conn)
+    if cells:
+        free = free_pages(pools, size_kib, [c['node'] for c in cells])
+        for cell in cells:
+            need = pages_needed(cell['memory_kib'], size_kib)
+            if need > free.get(cell['node'], 0):
+                raise HugepageError(
+                    f"NUMA node {cell['node']} has {free.get(cell['node'], 0)} free "
+                    f"{size_kib} KiB hugepages, {need} needed")
+        return
+    need = pages_needed(memory_kib, size_kib)
+    have = sum(free_pages(pools, size_kib).values()) + held
+    if need > have:
+        raise HugepageError(f'{have} free {size_kib} KiB hugepages, {need} needed '
+                            f'({need - have} short)')
+
+
+def reserve(conn, size_kib: int, count: int, node=None) -> list:
+    """Set the pool of *size_kib* pages to *count* (per cell if *node* given,
+    else on every cell); returns the resulting pools."""
+    flag = getattr(libvirt, 'VIR_NODE_ALLOC_PAGES_SET', 1)
+    if node is not None:
+        conn.allocPages({size_kib: count}, node, 1, flag)
+    else:
+        nodes = [p['node'] for p in host_pools(conn)] or [0]
+        conn.allocPages({size_kib: count}, min(nodes), len(nodes), flag)
+    return host_pools(conn)
+
+
+# ── HTTP API ──────────────────────────────────────────────────────────────────
+
+def _auth():
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+@hugepages_bp.route('/api/host/hugepages', methods=['GET'])
+def host_hugepages():
+    err = _auth()
+    if err:
+        return err
+    conn = get_db_connection()
+    try:
+        return jsonify({'nodes': host_pools(conn)})
+    finally:
+        if conn:
+            conn.close()
+
+
+@hugepages_bp.route('/api/host/hugepages', methods=['PUT'])
+def host_hugepages_reserve():
+    err = _auth()
+    if err:
+        return err
+    data = request.get_json(silent=True) or {}
+    try:
+        size = parse_size(data.get('size', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        count = int(data.get('count'))
+        node = None if data.get('node') is None else int(data['node'])
+    except (TypeError, ValueError):
+        return jsonify({'error': 'count and node must be integers'}), 400
+    if not 0 <= count <= MAX_RESERVE:
+        return jsonify({'error': f'count must be between 0 and {MAX_RESERVE}'}), 400
+
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Could not connect to hypervisor'}), 500
+    try:
+        pools = reserve(conn, size, count, node)
+    except libvirt.libvirtError as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        conn.close()
+    got = {p['node']: next(x['total'] for x in p['pages'] if x['size_kib'] == size)
+           for p in pools if node is None or p['node'] == node}
+    return jsonify({'requested': count, 'size_kib': size, 'total': got, 'nodes': pools,
+                    'complete': all(v == count for v in got.values())})
@@ -0,0 +1,362 @@
+"""
+Domain inventory — an in-memory table of every libvirt domain, kept current
+by libvirt lifecycle and device events instead of per-request polling.
+
+A native thread opens a dedicated connection, registers
+domainEventRegisterAny() callbacks (lifecycle, which also covers
+define/undefine, plus device-added / device-removed), performs one full sync
+and then only re-describes the domains named by queued events.  Callbacks
+never call back into libvirt themselves; they just queue the UUID.  A slow
+periodic resync catches anything events cannot report (DHCP lease IPs,
+snapshots taken outside this app).
+
+Readers (/api/vms, /api/vms/<uuid>, console port lookups) call
+list_domains() / get_domain() and get None back while the inventory is not
+ready — no event loop, libvirtd down, first sync still running — in which
+case they fall back to querying libvirt directly via describe_domain().
+"""
+
+import collections
+import time
+import xml.etree.ElementTree as ET
+
+try:
+    import libvirt
+    _LIBVIRT = True
+except ImportError:
+    _LIBVIRT = False
+
+from .libvirt_pool import (
+    URI, KEEPALIVE_INTERVAL, KEEPALIVE_COUNT,
+    event_loop_running, native_sleep, start_native_thread,
+)
+from .listing import get_vm_state_string
+from .hugepages import get_hugepages
+from .profiles import effective as effective_profile
+
+RESYNC_INTERVAL = 120     # seconds between full resyncs
+RETRY_INTERVAL  = 5       # seconds between reconnect attempts
+POLL_INTERVAL   = 0.25    # seconds between drains of the event queue
+
+# VM labels live in the domain's <metadata> under this namespace:
+#   <hc:labels xmlns:hc="…"><hc:label key="env" value="lab"/></hc:labels>
+LABELS_NS = 'https://hypercloud.local/xmlns/labels/1.0'
+ET.register_namespace('hc', LABELS_NS)
+
+_domains: dict = {}       # uuid → record (see describe_domain)
+_ready    = False
+_started  = False
+_conn     = None
+_pending  = collections.deque()   # (uuid, undefined?) queued by event callbacks
+_stats    = {'events': 0, 'refreshes': 0, 'resyncs': 0, 'last_resync': None}
+_listeners = []           # fn(uuid, event) called from the libvirt event thread
+
+
+# ── XML → record ──────────────────────────────────────────────────────────────
+
+def _parse_config(tree) -> dict:
+    """Disks, NICs, PCI hostdevs and boot order from the persistent XML."""
+    disks = []
+    boot  = {'1': None, '2': None}
+    for disk in tree.findall('devices/disk'):
+        d = {
+            'device':     disk.get('device'),
+            'file':       'N/A',
+            'target':     'N/A',
+            'type':       disk.get('type'),
+            'boot_order': 0,
+        }
+        source = disk.find('source')
+        if source is not None:
+            d['file'] = source.get('file') or source.get('dev') or 'N/A'
+        target = disk.find('target')
+        if target is not None:
+            d['target'] = target.get('dev')
+        b = disk.find('boot')
+        if b is not None:
+            order = b.get('order')
+            try:
+                d['boot_order'] = int(order)
+            except (TypeError, ValueError):
+                pass
+            if order in ('1', '2'):
+                boot[order] = f"disk|{d['target']}"
+        disks.append(d)
+
+    interfaces = []
+    for iface in tree.findall('devices/interface'):
+        mac   = iface.find('mac').get('address') if iface.find('mac') is not None else 'N/A'
+        model = iface.find('model').get('type') if iface.find('model') is not None else 'Default'
+        net_source = 'Unknown'
+        source = iface.find('source')
+        if source is not None:
+            net_source = source.get('network') or source.get('bridge') or source.get('dev') or 'Unknown'
+        b = iface.find('boot')
+        if b is not None and b.get('order') in ('1', '2'):
+            boot[b.get('order')] = 'network'
+        interfaces.append({
+            'mac':     mac,
+            'model':   model,
+            'network': net_source,
+            'type':    iface.get('type'),
+            'target':  None,
+            'ips':     [],
+        })
+
+    hostdevs = []
+    for hdev in tree.findall('devices/hostdev'):
+        if hdev.get('type') != 'pci':
+            continue
+        src = hdev.find('source/address')
+        if src is None:
+            continue
+        bus  = src.get('bus').replace('0x', '')
+        slot = src.get('slot').replace('0x', '')
+        func = src.get('function').replace('0x', '')
+        hostdevs.append(f'0000:{bus}:{slot}.{func}')
+
+    return {'disks': disks, 'interfaces': interfaces, 'hostdevs': hostdevs, 'boot': boot,
+            'labels': parse_labels(tree), 'performance': effective_profile(tree),
+            'hugepage_kib': get_hugepages(tree)}
+
+
+def parse_labels(tree) -> dict:
+    """key → value from the labels metadata element (empty if none)."""
+    return {el.get('key'): el.get('value', '')
+            for el in tree.findall(f'metadata/{{{LABELS_NS}}}labels/{{{LABELS_NS}}}label')
+            if el.get('key')}
+
+
+def set_labels(tree, labels: dict):
+    """Replace the labels metadata element in a domain XML tree, in place."""
+    metadata = tree.find('metadata')
+    if metadata is None:
+        metadata = ET.SubElement(tree, 'metadata')
+    for old in metadata.findall(f'{{{LABELS_NS}}}labels'):
+        metadata.remove(old)
+    if labels:
+        holder = ET.SubElement(metadata, f'{{{LABELS_NS}}}labels')
+        for key, value in sorted(labels.items()):
+            ET.SubElement(holder, f'{{{LABELS_NS}}}label', key=str(key), value=str(value))
+
+
+def _parse_live(tree, record: dict):
+    """Fill in runtime-only fields (VNC port, tap device names) from live XML."""
+    g = tree.find('./devices/graphics[@type="vnc"]')
+    if g is not None:
+        try:
+            port = int(g.get('port', -1))
+            record['vnc_port'] = port if port > 0 else None
+        except ValueError:
+            pass
+    by_mac = {i['mac']: i for i in record['interfaces']}
+    for iface in tree.findall('devices/interface'):
+        mac = iface.find('mac')
+        tgt = iface.find('target')
+        if mac is not None and tgt is not None and mac.get('address') in by_mac:
+            by_mac[mac.get('address')]['target'] = tgt.get('dev')
+
+
+def describe_domain(dom) -> dict:
+    """Build the inventory record for one domain (several libvirt round trips)."""
+    info = dom.info()
+    state_code = info[0]
+    record = {
+        'uuid':       dom.UUIDString(),
+        'name':       dom.name(),
+        'state':      get_vm_state_string(state_code),
+        'state_code': state_code,
+        'memory_mb':  int(info[1] / 1024),
+        'vcpus':      info[3],
+        'os_type':    None,
+        'vnc_port':   None,
+        'snapshots':  [],
+        'updated':    time.time(),
+    }
+    record.update(_parse_config(ET.fromstring(dom.XMLDesc(libvirt.VIR_DOMAIN_XML_INACTIVE))))
+
+    try:
+        record['os_type'] = dom.OSType()
+    except libvirt.libvirtError:
+        pass
+    try:
+        record['snapshots'] = list(dom.snapshotListNames(0) or [])
+    except libvirt.libvirtError:
+        pass
+
+    if state_code == libvirt.VIR_DOMAIN_RUNNING:
+        try:
+            _parse_live(ET.fromstring(dom.XMLDesc(0)), record)
+        except (libvirt.libvirtError, ET.ParseError):
+            pass
+        try:
+            leases = dom.interfaceAddresses(libvirt.VIR_DOMAIN_INTERFACE_ADDRESSES_SRC_LEASE, 0)
+            for val in leases.values():
+                for iface in record['interfaces']:
+                    if iface['mac'] == val.get('hwaddr'):
+                        iface['ips'] = [ip['addr'] for ip in val.get('addrs', [])]
+        except libvirt.libvirtError:
+            pass
+    return record
+
+
+# ── table maintenance ─────────────────────────────────────────────────────────
+
+def refresh(dom):
+    """Re-describe one domain now so the next read sees a mutation.
+
+    No-op (returns None) until the inventory is ready — nothing reads the
+    table before then, so there is no point paying for the round trips.
+    """
+    if not _ready:
+        return None
+    try:
+        rec = describe_domain(dom)
+    except libvirt.libvirtError:
+        return None
+    _domains[rec['uuid']] = rec
+    _stats['refreshes'] += 1
+    return rec
+
+
+def forget(uuid: str):
+    _domains.pop(uuid, None)
+
+
+def _resync(conn):
+    global _domains
+    table = {}
+    for dom in conn.listAllDomains(0):
+        try:
+            rec = describe_domain(dom)
+        except libvirt.libvirtError:
+            continue   # domain vanished mid-sync
+        table[rec['uuid']] = rec
+    _domains = table
+    _stats['resyncs'] += 1
+    _stats['last_resync'] = time.time()
+
+
+def _on_lifecycle(conn, dom, event, detail, opaque):
+    _stats['events'] += 1
+    uuid = dom.UUIDString()
+    _pending.append((uuid, event == libvirt.VIR_DOMAIN_EVENT_UNDEFINED))
+    for fn in list(_listeners):
+        try:
+            fn(uuid, event)
+        except Exception:
+            pass
+
+
+def add_listener(fn):
+    """Call fn(uuid, event) on every lifecycle event.
+
+    It runs on the libvirt event thread: record what happened and return,
+    never block or call back into libvirt.
+    """
+    _listeners.append(fn)
+
+
+def remove_listener(fn):
+    try:
+        _listeners.remove(fn)
+    except ValueError:
+        pass
+
+
+def _on_device(conn, dom, dev_alias, opaque):
+    _stats['events'] += 1
+    _pending.append((dom.UUIDString(), False))
+
+
+def _drain(conn):
+    seen = set()
+    while _pending:
+        uuid, undefined = _pending.popleft()
+        if undefined:
+            forget(uuid)
+            seen.discard(uuid)
+            continue
+        if uuid in seen:
+            continue
+        seen.add(uuid)
+        try:
+            refresh(conn.lookupByUUIDString(uuid))
+        except libvirt.libvirtError:
+            forget(uuid)
+
+
+def _on_close(conn, reason, opaque):
+    global _ready
+    _ready = False
+
+
+def _connect():
+    conn = libvirt.open(URI)
+    conn.setKeepAlive(KEEPALIVE_INTERVAL, KEEPALIVE_COUNT)
+    conn.registerCloseCallback(_on_close, None)
+    conn.domainEventRegisterAny(None, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, _on_lifecycle, None)
+    conn.domainEventRegisterAny(None, libvirt.VIR_DOMAIN_EVENT_ID_DEVICE_ADDED, _on_device, None)
+    conn.domainEventRegisterAny(None, libvirt.VIR_DOMAIN_EVENT_ID_DEVICE_REMOVED, _on_device, None)
+    return conn
+
+
+def _run():
+    """Inventory thread: (re)connect, register events, full sync, idle-resync."""
+    global _conn, _ready
+    while True:
+        try:
+            if _conn is None or not _ready:
+                if _conn is not None:
+                    try: _conn.close()
+                    except Exception: pass
+                _conn = _connect()
+                _pending.clear()
+                _resync(_conn)
+                _ready = True
+            elif time.time() - (_stats['last_resync'] or 0) >= RESYNC_INTERVAL:
+                _resync(_conn)
+            _drain(_conn)
+        except Exception:
+            _ready = False
+            native_sleep(RETRY_INTERVAL)
+            continue
+        native_sleep(POLL_INTERVAL)
+
+
+def ensure_started() -> bool:
+    """Start the inventory thread on first use; True once the table is usable."""
+    global _started
+    if not _started and _LIBVIRT and event_loop_running():
+        _started = True
+        start_native_thread(_run, 'domain-inventory')
+    return _ready
+
+
+# ── readers ───────────────────────────────────────────────────────────────────
+
+def list_domains():
+    """All records sorted by name, or None if the inventory is not ready."""
+    if not ensure_started():
+        return None
+    return sorted(list(_domains.values()), key=lambda r: r['name'])
+
+
+def get_domain(uuid: str):
+    """Record for *uuid*; None if unknown or the inventory is not ready."""
+    if not ensure_started():
+        return None
+    return _domains.get(uuid)
+
+
+def find_by_name(name: str):
+    if not ensure_started():
+        return None
+    for rec in list(_domains.values()):
+        if rec['name'] == name:
+            return rec
+    return None
+
+
+def inventory_stats() -> dict:
+    return {'ready': _ready, 'domains': len(_domains), **_stats}
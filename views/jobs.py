@@ -0,0 +1,369 @@
+"""
+Job engine — long-running VM and storage operations off the request path.
+
+submit() records a job and hands it to a bounded pool of JOB_WORKERS
+threads (greenlets under gevent); the endpoint answers 202 with the job id,
+and clients poll GET /api/jobs/<id> or follow /api/jobs/<id>/stream.
+
+Jobs that name a resource ('vm:<uuid>', 'file:<path>', …) run one at a time
+per resource.  Inside a worker a per-resource queue keeps them in order
+without holding a pool slot; across gunicorn workers an flock on
+JOBS_DIR/locks/<hash>.lock keeps them apart.
+
+Every job is a JSON file in JOBS_DIR written only by the worker process that
+owns it, so any worker can answer a status request.  A job left queued or
+running by a process that no longer exists reads as 'interrupted'.
+Finished jobs are pruned after JOB_RETENTION seconds.
+
+The job function is called as fn(job_id, *args, **kwargs).  It reports with
+progress(job_id, pct, message) and log(job_id, msg); its return value becomes
+the job's result, and an exception fails the job with str(exc) as the error.
+
+Routes
+------
+GET    /api/jobs                — recent jobs (?kind=, ?resource=, ?status=)
+GET    /api/jobs/<id>           — one job
+GET    /api/jobs/<id>/stream    — SSE: the job on every change until it ends
+DELETE /api/jobs/<id>           — cancel a job that has not started yet
+"""
+
+import collections
+import contextlib
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid as _uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Blueprint, Response, jsonify, request, session, stream_with_context
+
+jobs_bp = Blueprint('jobs', __name__)
+logger  = logging.getLogger(__name__)
+
+_APP_DIR      = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOBS_DIR      = os.environ.get('JOBS_DIR', os.path.join(_APP_DIR, '.jobs'))
+WORKERS       = int(os.environ.get('JOB_WORKERS', 4))
+JOB_RETENTION = 24 * 3600
+MAX_LOGS      = 200
+LOCK_POLL     = 0.5          # seconds between attempts on a busy resource lock
+STREAM_POLL   = 0.5
+
+FINISHED = ('done', 'error', 'cancelled', 'interrupted')
+
+_lock       = threading.RLock()
+_jobs       = {}                # job id → job dict owned by this process
+_waiting    = {}                # resource → deque of (job id, fn, args, kwargs)
+_busy       = set()             # resources with a job handed to the pool
+_executor   = {'pid': None, 'pool': None}
+_last_prune = 0.0
+
+
+# ── persistence ───────────────────────────────────────────────────────────────
+
+def _path(job_id: str) -> str:
+    return os.path.join(JOBS_DIR, f'{job_id}.json')
+
+
+def _save(job: dict):
+    """Write one job file (called under _lock)."""
+    try:
+        os.makedirs(JOBS_DIR, exist_ok=True)
+        tmp = _path(job['id']) + '.tmp'
+        with open(tmp, 'w') as fh:
+            json.dump(job, fh)
+        os.replace(tmp, _path(job['id']))
+    except OSError:
+        logger.warning('jobs: cannot persist %s', job['id'])
+
+
+def _pid_alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, TypeError):
+        return True
+    return True
+
+
+def _read(job_id: str):
+    try:
+        with open(_path(job_id)) as fh:
+            job = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if job.get('status') not in FINISHED and not _pid_alive(job.get('pid')):
+        job.update(status='interrupted', error='worker exited before the job finished')
+    return job
+
+
+def _prune():
+    global _last_prune
+    now = time.time()
+    if now - _last_prune < 60:
+        return
+    _last_prune = now
+    try:
+        names = os.listdir(JOBS_DIR)
+    except OSError:
+        return
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        job = _read(name[:-5])
+        if job and job['status'] in FINISHED and \
+                (job.get('finished_at') or job['created_at']) < now - JOB_RETENTION:
+            with _lock:
+                _jobs.pop(job['id'], None)
+            try:
+                os.remove(_path(job['id']))
+            except OSError:
+                pass
+
+
+# ── execution ─────────────────────────────────────────────────────────────────
+
+def _pool() -> ThreadPoolExecutor:
+    if _executor['pid'] != os.getpid():     # never reuse a pool across a fork
+        _executor.update(pid=os.getpid(),
+                         pool=ThreadPoolExecutor(WORKERS, thread_name_prefix='job'))
+    return _executor['pool']
+
+
+def _update(job_id: str, **kw):
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job.update(kw)
+            _save(job)
+
+
+@contextlib.contextmanager
+def _resource_lock(job_id, resource):
+    """Hold the cross-process lock for *resource* (no-op for None)."""
+    if not resource:
+        yield
+        return
+    lock_dir = os.path.join(JOBS_DIR, 'locks')
+    os.makedirs(lock_dir, exist_ok=True)
+    name = hashlib.sha1(resource.encode()).hexdigest()[:16]
+    with open(os.path.join(lock_dir, f'{name}.lock'), 'w') as fh:
+        announced = False
+        while True:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if not announced:
+                    _update(job_id, message=f'waiting for {resource}')
+                    announced = True
+                time.sleep(LOCK_POLL)   # cooperative under gevent; flock would not be
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _next(resource):
+    if not resource:
+        return
+    with _lock:
+        queue = _waiting.get(resource)
+        if queue:
+            _pool().submit(_run, *queue.popleft())
+        else:
+            _waiting.pop(resource, None)
+            _busy.discard(resource)
+
+
+def _run(job_id, fn, args, kwargs):
+    job = _jobs[job_id]
+    try:
+        if job['status'] == 'cancelled':
+            return
+        with _resource_lock(job_id, job['resource']):
+            _update(job_id, status='running', started_at=time.time(), message='')
+            result = fn(job_id, *args, **kwargs)
+        _update(job_id, status='done', progress=100, result=result, finished_at=time.time())
+    except Exception as e:
+        logger.exception('job %s (%s) failed', job_id, job['kind'])
+        _update(job_id, status='error', error=str(e) or type(e).__name__,
+                finished_at=time.time())
+    finally:
+        _next(job['resource'])
+
+
+# ── public API ────────────────────────────────────────────────────────────────
+
+def submit(kind: str, fn, *args, resource: str = None, user: str = None, **kwargs) -> str:
+    """Queue fn(job_id, *args, **kwargs) and return the new job id."""
+    job_id = _uuid.uuid4().hex[:12]
+    job = {
+        'id':          job_id,
+        'kind':        kind,
+        'resource':    resource,
+        'user':        user,
+        'status':      'queued',
+        'progress':    0,
+        'message':     '',
+        'result':      None,
+        'error':       None,
+        'logs':        [],
+        'created_at':  time.time(),
+        'started_at':  None,
+        'finished_at': None,
+        'pid':         os.getpid(),
+    }
+    with _lock:
+        _jobs[job_id] = job
+        _save(job)
+        if resource and resource in _busy:
+            _waiting.setdefault(resource, collections.deque()).append((job_id, fn, args, kwargs))
+        else:
+            if resource:
+                _busy.add(resource)
+            _pool().submit(_run, job_id, fn, args, kwargs)
+    _prune()
+    return job_id
+
+
+def progress(job_id: str, pct: float, message: str = None):
+    kw = {'progress': max(0, min(100, round(pct)))}
+    if message is not None:
+        kw['message'] = message
+    _update(job_id, **kw)
+
+
+def log(job_id: str, msg: str):
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job['logs'] = (job['logs'] + [{'ts': time.strftime('%H:%M:%S'), 'msg': msg}])[-MAX_LOGS:]
+            _save(job)
+
+
+def get(job_id: str):
+    """The job as a dict (from memory if this worker owns it), or None."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            return dict(job)
+    return _read(job_id)
+
+
+def list_jobs(kind=None, resource=None, status=None, limit=100) -> list:
+    found = {}
+    try:
+        names = os.listdir(JOBS_DIR)
+    except OSError:
+        names = []
+    for name in names:
+        if name.endswith('.json'):
+            job = _read(name[:-5])
+            if job:
+                found[job['id']] = job
+    with _lock:
+        found.update((k, dict(v)) for k, v in _jobs.items())
+    rows = [j for j in found.values()
+            if (kind is None or j['kind'] == kind)
+            and (resource is None or j['resource'] == resource)
+            and (status is None or j['status'] == status)]
+    rows.sort(key=lambda j: j['created_at'], reverse=True)
+    return rows[:limit]
+
+
+def cancel(job_id: str) -> bool:
+    """Cancel a queued job owned by this worker; False if it cannot be."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None or job['status'] != 'queued':
+            return False
+        job.update(status='cancelled', finished_at=time.time())
+        _save(job)
+        queue = _waiting.get(job['resource'])
+        if queue:
+            for entry in list(queue):
+                if entry[0] == job_id:
+                    queue.remove(entry)
+    return True
+
+
+def accepted(job_id: str):
+    """The 202 response an endpoint returns after submit()."""
+    resp = jsonify({'job_id': job_id, 'status': 'queued', 'status_url': f'/api/jobs/{job_id}'})
+    resp.headers['Location'] = f'/api/jobs/{job_id}'
+    return resp, 202
+
+
+# ── HTTP API ──────────────────────────────────────────────────────────────────
+
+def _auth():
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+@jobs_bp.route('/api/jobs', methods=['GET'])
+def jobs_index():
+    err = _auth()
+    if err:
+        return err
+    return jsonify(list_jobs(request.args.get('kind'), request.args.get('resource'),
+                             request.args.get('status')))
+
+
+@jobs_bp.route('/api/jobs/<job_id>', methods=['GET'])
+def job_detail(job_id):
+    err = _auth()
+    if err:
+        return err
+    job = get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+
+@jobs_bp.route('/api/jobs/<job_id>', methods=['DELETE'])
+def job_cancel(job_id):
+    err = _auth()
+    if err:
+        return err
+    job = get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if not cancel(job_id):
+        return jsonify({'error': f"Job is {job['status']} and cannot be cancelled"}), 409
+    return jsonify({'ok': True})
+
+
+@jobs_bp.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def job_stream(job_id):
+    """SSE stream: the full job each time it changes, ending once it finishes."""
+    err = _auth()
+    if err:
+        return err
+
+    def generate():
+        last = None
+        while True:
+            job = get(job_id)
+            if job is None:
+                yield f'data: {json.dumps({"error": "Job not found"})}\n\n'
+                return
+            body = json.dumps(job)
+            if body != last:
+                yield f'data: {body}\n\n'
+                last = body
+            if job['status'] in FINISHED:
+                return
+            time.sleep(STREAM_POLL)
+
+    return Response(
+        stream_with_context(generate()),
+        content_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
@@ -24,6 +24,9 @@ from pathlib import Path
 from datetime import datetime
 from flask import Blueprint, jsonify, request, session, Response, stream_with_context
 
+from . import capacity
+from .libvirt_pool import get_connection
+
 try:
     import libvirt
     _LIBVIRT = True
@@ -203,7 +206,7 @@ def _create_libvirt_network(net_name, subnet_idx):
     </dhcp>
   </ip>
 </network>"""
-    conn = libvirt.open('qemu:///system')
+    conn = get_connection()
     try:
         net = conn.networkDefineXML(xml)
         net.setAutostart(True)
@@ -255,7 +258,7 @@ def _create_vm(name, disk, cidata, mac, net_name, cpu, ram_mb):
     </rng>
   </devices>
 </domain>"""
-    conn = libvirt.open('qemu:///system')
+    conn = get_connection()
     try:
         dom = conn.defineXML(xml)
         dom.create()
@@ -264,10 +267,22 @@ def _create_vm(name, disk, cidata, mac, net_name, cpu, ram_mb):
         conn.close()
 
 
+def _node_names(cluster_id, w_count):
+    return [f'k8s-{cluster_id[:8]}-{role}'
+            for role in ['control'] + [f'worker{i+1}' for i in range(w_count)]]
+
+
+def _cluster_demand(cluster_id, w_count, size):
+    """capacity.demand() for every node VM of a cluster."""
+    return [capacity.demand(name, size['cpu'], size['ram_mb'],
+                            [(STORAGE_PATH / f'{name}.qcow2', size['disk_gb'])])
+            for name in _node_names(cluster_id, w_count)]
+
+
 def _destroy_cluster_vms(cluster):
     if not _LIBVIRT:
         return
-    conn = libvirt.open('qemu:///system')
+    conn = get_connection()
     try:
         # Destroy and undefine VMs
         all_nodes = []
@@ -613,6 +628,8 @@ ethernets:
 
     except Exception as exc:
         fail(f'{exc}\n{traceback.format_exc()}')
+    finally:
+        capacity.release(_node_names(cluster_id, cfg['worker_count']))
 
 
 # ── API endpoints ─────────────────────────────────────────────────────────────
@@ -685,6 +702,20 @@ def create_cluster():
     import uuid as _uuid
     cluster_id  = _uuid.uuid4().hex[:12]
     job_id      = _uuid.uuid4().hex[:12]
+
+    # Fail fast: every node must fit before the network or any disk is made
+    if _LIBVIRT:
+        try:
+            conn = get_connection()
+            try:
+                capacity.admit(conn, _cluster_demand(cluster_id, w_count, NODE_SIZES[node_size]))
+            finally:
+                conn.close()
+        except capacity.CapacityError as e:
+            return jsonify({'error': str(e), 'capacity': e.result}), 409
+        except libvirt.libvirtError as e:
+            return jsonify({'error': f'Capacity check failed: {e}'}), 500
+
     subnet_idx  = _next_subnet_index()
 
     cfg = {
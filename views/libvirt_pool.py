@@ -0,0 +1,323 @@
+"""
+Shared libvirt connection pool — one small pool per gunicorn worker.
+
+Blueprints used to call libvirt.open('qemu:///system') and close it again on
+every request, which under dashboard polling means hundreds of libvirtd
+handshakes per minute.  get_connection() now hands out a proxy around a
+long-lived connection; calling .close() on the proxy returns the connection to
+the pool instead of tearing it down, so existing ``finally: conn.close()``
+code keeps working unchanged.
+
+Health checking:
+  * a native thread runs the libvirt default event loop so that
+    setKeepAlive() probes and close callbacks are actually serviced
+  * idle connections are checked with isAlive() before being handed out
+  * a read-only call (get*/list*/lookup*/...) that fails because libvirtd
+    went away is retried once on a freshly opened connection (transparent
+    reconnect); anything else — defineXML, createXML, create — may already
+    have taken effect, so the proxy reconnects but re-raises the error
+"""
+
+import logging
+import os
+import threading
+
+try:
+    import libvirt
+    _LIBVIRT = True
+except ImportError:
+    _LIBVIRT = False
+
+URI                = os.environ.get('LIBVIRT_URI', 'qemu:///system')
+POOL_SIZE          = int(os.environ.get('LIBVIRT_POOL_SIZE', 4))   # idle connections kept per worker
+KEEPALIVE_INTERVAL = 5    # seconds between keepalive probes
+KEEPALIVE_COUNT    = 3    # unanswered probes before libvirt drops the link
+EVENT_BACKOFF_MAX  = 30   # seconds between event-loop retries while it keeps failing
+
+# connection methods that are safe to run twice
+RETRY_PREFIXES = ('get', 'list', 'lookup', 'numOf', 'is')
+
+log = logging.getLogger(__name__)
+
+_lock   = threading.RLock()   # re-entrant: __del__ may release during GC
+_idle   = []              # raw virConnect objects ready for reuse
+_dead   = set()           # id() of connections reported closed by libvirt
+_in_use = 0
+_pid    = os.getpid()
+_event_loop_started = False
+_event_loop_running = False
+
+_stats = {
+    'opens':      0,      # new connections opened
+    'reuses':     0,      # requests served from an idle pooled connection
+    'failures':   0,      # libvirt.open() failures
+    'reconnects': 0,      # calls transparently retried on a new connection
+    'discards':   0,      # pooled connections dropped as dead / surplus
+}
+
+
+# ── native threads ────────────────────────────────────────────────────────────
+
+def start_native_thread(target, name):
+    """Run *target* on a real OS thread, even when gevent has patched threading.
+
+    Blocking C calls (libvirt's event loop, mostly) must not run on a greenlet
+    or they would freeze the whole worker.
+    """
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            start_new = monkey.get_original('_thread', 'start_new_thread')
+            return start_new(target, ())
+    except ImportError:
+        pass
+    t = threading.Thread(target=target, daemon=True, name=name)
+    t.start()
+    return t
+
+
+def native_sleep(seconds):
+    """time.sleep() for code running on a native thread started above."""
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('time'):
+            return monkey.get_original('time', 'sleep')(seconds)
+    except ImportError:
+        pass
+    import time
+    time.sleep(seconds)
+
+
+def _ensure_event_loop():
+    """Register libvirt's default event loop once and service it forever."""
+    global _event_loop_started, _event_loop_running
+    if _event_loop_started or not _LIBVIRT:
+        return
+    _event_loop_started = True
+    try:
+        libvirt.virEventRegisterDefaultImpl()
+    except Exception:
+        return   # stub / very old binding — keepalive simply stays disabled
+
+    def _run():
+        delay = 0
+        while True:
+            try:
+                libvirt.virEventRunDefaultImpl()
+                delay = 0
+            except Exception:
+                delay = min(EVENT_BACKOFF_MAX, delay * 2 or 1)
+                log.exception('libvirt event loop failed; retrying in %ss', delay)
+                native_sleep(delay)
+
+    start_native_thread(_run, 'libvirt-events')
+    _event_loop_running = True
+
+
+def event_loop_running() -> bool:
+    """True once libvirt's event loop is serviced — required for domain events."""
+    _ensure_event_loop()
+    return _event_loop_running
+
+
+# ── raw connection handling ───────────────────────────────────────────────────
+
+def _is_conn_error(exc) -> bool:
+    """True if a libvirtError means the connection itself is gone."""
+    get_code = getattr(exc, 'get_error_code', None)
+    if get_code is None:
+        return False
+    codes = {
+        getattr(libvirt, name, None)
+        for name in ('VIR_ERR_SYSTEM_ERROR', 'VIR_ERR_RPC',
+                     'VIR_ERR_NO_CONNECT', 'VIR_ERR_INVALID_CONN')
+    }
+    codes.discard(None)
+    try:
+        return get_code() in codes
+    except Exception:
+        return False
+
+
+def _on_close(conn, reason, opaque):
+    _dead.add(opaque)
+
+
+def _open():
+    try:
+        raw = libvirt.open(URI)
+    except Exception:
+        with _lock:
+            _stats['failures'] += 1
+        raise
+    if raw is None:
+        with _lock:
+            _stats['failures'] += 1
+        raise libvirt.libvirtError(f'Could not connect to {URI}')
+    with _lock:
+        _stats['opens'] += 1
+    try:
+        raw.setKeepAlive(KEEPALIVE_INTERVAL, KEEPALIVE_COUNT)
+    except Exception:
+        pass
+    try:
+        raw.registerCloseCallback(_on_close, id(raw))
+    except Exception:
+        pass
+    return raw
+
+
+def _alive(raw) -> bool:
+    if id(raw) in _dead:
+        return False
+    try:
+        return bool(raw.isAlive())
+    except Exception:
+        return False
+
+
+def _close_quietly(raw):
+    _dead.discard(id(raw))
+    try:
+        raw.unregisterCloseCallback()
+    except Exception:
+        pass
+    try:
+        raw.close()
+    except Exception:
+        pass
+
+
+def _check_fork():
+    """Forget connections inherited across a gunicorn fork (preload_app)."""
+    global _pid, _in_use
+    if os.getpid() != _pid:
+        _pid = os.getpid()
+        _idle.clear()
+        _dead.clear()
+        _in_use = 0
+
+
+def _release(raw):
+    global _in_use
+    with _lock:
+        _in_use = max(0, _in_use - 1)
+        if len(_idle) < POOL_SIZE and _alive(raw):
+            _idle.append(raw)
+            return
+        _stats['discards'] += 1
+    _close_quietly(raw)
+
+
+# ── pooled proxy ──────────────────────────────────────────────────────────────
+
+class _PooledConnection:
+    """Behaves like a virConnect; close() hands the connection back to the pool."""
+
+    __slots__ = ('_raw',)
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def __getattr__(self, name):
+        if name == '_raw':
+            raise AttributeError(name)
+        if self._raw is None:
+            raise libvirt.libvirtError('connection already returned to pool')
+        attr = getattr(self._raw, name)
+        if not callable(attr):
+            return attr
+
+        def _call(*args, **kwargs):
+            try:
+                return getattr(self._raw, name)(*args, **kwargs)
+            except libvirt.libvirtError as e:
+                if not _is_conn_error(e):
+                    raise
+                self._reconnect()
+                if not name.startswith(RETRY_PREFIXES):
+                    raise
+                return getattr(self._raw, name)(*args, **kwargs)
+        return _call
+
+    def _reconnect(self):
+        old, self._raw = self._raw, None
+        with _lock:
+            _stats['reconnects'] += 1
+            _stats['discards'] += 1
+        _close_quietly(old)
+        self._raw = _open()
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            _release(raw)
+        return 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# ── public API ────────────────────────────────────────────────────────────────
+
+def get_connection():
+    """Return a pooled libvirt connection; raises libvirt.libvirtError on failure."""
+    global _in_use
+    _ensure_event_loop()
+    stale = []
+    with _lock:
+        _check_fork()
+        raw = None
+        while _idle:
+            candidate = _idle.pop()
+            if _alive(candidate):
+                raw = candidate
+                _stats['reuses'] += 1
+                break
+            stale.append(candidate)
+            _stats['discards'] += 1
+        _in_use += 1
+    for s in stale:
+        _close_quietly(s)
+    if raw is None:
+        try:
+            raw = _open()
+        except Exception:
+            with _lock:
+                _in_use = max(0, _in_use - 1)
+            raise
+    return _PooledConnection(raw)
+
+
+def pool_stats() -> dict:
+    with _lock:
+        return {
+            'uri':       URI,
+            'pool_size': POOL_SIZE,
+            'idle':      len(_idle),
+            'in_use':    _in_use,
+            **_stats,
+        }
+
+
+def reset_pool():
+    """Close every idle connection and zero the counters."""
+    global _in_use
+    with _lock:
+        idle = list(_idle)
+        _idle.clear()
+        _in_use = 0
+        for k in _stats:
+            _stats[k] = 0
+    for raw in idle:
+        _close_quietly(raw)
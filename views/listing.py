@@ -2,11 +2,13 @@ import libvirt
 import xml.etree.ElementTree as ET
 from flask import Blueprint, Response, request
 
+from .libvirt_pool import get_connection
+
 listing_bp = Blueprint('listing', __name__)
 
 
 def get_db_connection():
-    return libvirt.open('qemu:///system')
+    return get_connection()
 
 
 def get_vm_state_string(state_int):
@@ -103,8 +105,10 @@ def get_host_devices():
 # Legacy virt-viewer .vv file download (kept for desktop virt-viewer users)
 @listing_bp.route('/console/<uuid>')
 def console_vm(uuid):
-    conn = get_db_connection()
-    port = None
+    from . import inventory   # inventory imports this module
+    rec = inventory.get_domain(uuid)
+    port = str(rec['vnc_port']) if rec and rec['vnc_port'] else None
+    conn = get_db_connection() if rec is None else None
     if conn:
         try:
             dom = conn.lookupByUUIDString(uuid)
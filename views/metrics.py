@@ -1,16 +1,29 @@
 """
-Host + VM metrics — pure Python, no external services required.
-
-A daemon thread samples psutil every INTERVAL seconds and stores readings
-in fixed-length deques (ring buffer).  The API endpoints serve current
-snapshots plus the in-memory history.
+Host + VM metrics — no external services required.
+
+A daemon thread in every worker competes for the collector role (see
+metrics_store); the winner samples psutil every INTERVAL seconds into
+memory-mapped tier files (raw, 1 min and 1 h rollups, kept up to a year)
+and per-VM rates into one ring per domain, all of which every worker reads
+history from.  Each worker's thread publishes every new host and VM sample
+once to the worker's live feed, which /api/metrics/stream fans out to
+subscribers over SSE.  The API endpoints serve current snapshots plus the
+history.
 """
 
 import collections
+import json
 import threading
 import time
 import xml.etree.ElementTree as ET
-from flask import Blueprint, jsonify, request, session
+import zlib
+
+import numpy as np
+from flask import Blueprint, Response, jsonify, request, session, stream_with_context
+
+from .libvirt_pool import get_connection
+from . import alerts, inventory, metrics_store
+from .downsample import METHODS as _DOWNSAMPLE_METHODS, downsample
 
 try:
     import psutil
@@ -28,89 +41,198 @@ metrics_bp = Blueprint('metrics', __name__)
 
 # ── ring-buffer config ────────────────────────────────────────────────────────
 INTERVAL    = 15          # seconds between samples
-HISTORY_LEN = 5760        # 5760 × 15 s = 24 hours
-
-_history = {
-    'cpu':        collections.deque(maxlen=HISTORY_LEN),
-    'memory':     collections.deque(maxlen=HISTORY_LEN),
-    'load':       collections.deque(maxlen=HISTORY_LEN),
-    'net_rx':     collections.deque(maxlen=HISTORY_LEN),
-    'net_tx':     collections.deque(maxlen=HISTORY_LEN),
-    'disk_read':  collections.deque(maxlen=HISTORY_LEN),
-    'disk_write': collections.deque(maxlen=HISTORY_LEN),
-}
-_lock      = threading.Lock()
+HISTORY_LEN = 5760        # 5760 × 15 s = 24 hours of per-VM history
+
+# Host series in ring-file order, with the rounding the API has always used
+# (None → whole bytes/s).
+HOST_SERIES = ('cpu', 'memory', 'load', 'net_rx', 'net_tx', 'disk_read', 'disk_write')
+_HOST_ROUND = {'cpu': 1, 'memory': 1, 'load': 2,
+               'net_rx': None, 'net_tx': None, 'disk_read': None, 'disk_write': None}
+
 _prev_net  = None   # (ts, bytes_recv, bytes_sent)
 _prev_disk = None   # (ts, read_bytes, write_bytes)
 
 
-def _collect_loop():
-    """Background daemon thread — runs forever, never raises."""
+# FEATURE: vm-history
+# Per-VM series share names with the host history so the frontend can chart
+# either with the same code.
+VM_SERIES = ('cpu', 'memory', 'net_rx', 'net_tx', 'disk_read', 'disk_write')
+_VM_FIELDS = ('cpu_pct', 'mem_pct', 'net_rx_rate', 'net_tx_rate', 'disk_r_rate', 'disk_w_rate')
+
+
+_vm_hist_prev  = {}   # delta state for the collector, separate from /api/metrics/vms
+_vms_published = 0    # ts of the newest VM tick published
+
+
+def _vm_store(writable: bool = False):
+    return metrics_store.open_vm_store(len(VM_SERIES), HISTORY_LEN, INTERVAL, writable)
+
+
+def vm_counters() -> dict:
+    """uuid → (name, getAllDomainStats record) from the collector's last tick."""
+    latest = _vm_store().latest()
+    return latest.get('counters', {}) if latest else {}
+
+
+def _sample_host(ts: int):
+    """Take one psutil sample and append it to the shared ring (leader only)."""
     global _prev_net, _prev_disk
 
-    # Prime cpu_percent so first real call is non-blocking
-    if _PSUTIL:
-        psutil.cpu_percent(interval=None)
+    # CPU
+    cpu_pct = psutil.cpu_percent(interval=None)
 
-    while True:
-        try:
-            if not _PSUTIL:
-                time.sleep(INTERVAL)
-                continue
+    # Memory
+    mem = psutil.virtual_memory()
 
-            ts = int(time.time())
+    # Load average
+    try:
+        load1 = psutil.getloadavg()[0]
+    except AttributeError:
+        load1 = 0.0
 
-            # CPU
-            cpu_pct = psutil.cpu_percent(interval=None)
+    # Network rates
+    net = psutil.net_io_counters()
+    net_rx_rate = net_tx_rate = 0.0
+    if _prev_net:
+        dt = ts - _prev_net[0]
+        if dt > 0:
+            net_rx_rate = max(0.0, (net.bytes_recv - _prev_net[1]) / dt)
+            net_tx_rate = max(0.0, (net.bytes_sent - _prev_net[2]) / dt)
+    _prev_net = (ts, net.bytes_recv, net.bytes_sent)
+
+    # Disk I/O rates
+    disk_io = psutil.disk_io_counters()
+    disk_r_rate = disk_w_rate = 0.0
+    if _prev_disk and disk_io:
+        dt = ts - _prev_disk[0]
+        if dt > 0:
+            disk_r_rate = max(0.0, (disk_io.read_bytes  - _prev_disk[1]) / dt)
+            disk_w_rate = max(0.0, (disk_io.write_bytes - _prev_disk[2]) / dt)
+    if disk_io:
+        _prev_disk = (ts, disk_io.read_bytes, disk_io.write_bytes)
 
-            # Memory
-            mem = psutil.virtual_memory()
+    store = metrics_store.open_store(len(HOST_SERIES), INTERVAL, writable=True)
+    values = (cpu_pct, mem.percent, load1, net_rx_rate, net_tx_rate, disk_r_rate, disk_w_rate)
+    store.append(ts, values)
+    alerts.reload()             # rules PUT to, or state left by, another worker
+    alerts.observe('host', 'host', 'host', ts, dict(zip(HOST_SERIES, values)))
 
-            # Load average
-            try:
-                load1 = psutil.getloadavg()[0]
-            except AttributeError:
-                load1 = 0.0
-
-            # Network rates
-            net = psutil.net_io_counters()
-            net_rx_rate = net_tx_rate = 0.0
-            if _prev_net:
-                dt = ts - _prev_net[0]
-                if dt > 0:
-                    net_rx_rate = max(0.0, (net.bytes_recv - _prev_net[1]) / dt)
-                    net_tx_rate = max(0.0, (net.bytes_sent - _prev_net[2]) / dt)
-            _prev_net = (ts, net.bytes_recv, net.bytes_sent)
-
-            # Disk I/O rates
-            disk_io = psutil.disk_io_counters()
-            disk_r_rate = disk_w_rate = 0.0
-            if _prev_disk and disk_io:
-                dt = ts - _prev_disk[0]
-                if dt > 0:
-                    disk_r_rate = max(0.0, (disk_io.read_bytes  - _prev_disk[1]) / dt)
-                    disk_w_rate = max(0.0, (disk_io.write_bytes - _prev_disk[2]) / dt)
-            if disk_io:
-                _prev_disk = (ts, disk_io.read_bytes, disk_io.write_bytes)
-
-            with _lock:
-                _history['cpu'].append([ts, round(cpu_pct, 1)])
-                _history['memory'].append([ts, round(mem.percent, 1)])
-                _history['load'].append([ts, round(load1, 2)])
-                _history['net_rx'].append([ts, round(net_rx_rate)])
-                _history['net_tx'].append([ts, round(net_tx_rate)])
-                _history['disk_read'].append([ts, round(disk_r_rate)])
-                _history['disk_write'].append([ts, round(disk_w_rate)])
 
+def _collect_loop():
+    """Background daemon thread — runs forever, never raises."""
+    # Prime cpu_percent so first real call is non-blocking
+    if _PSUTIL:
+        psutil.cpu_percent(interval=None)
+
+    while True:
+        ts = int(time.time())
+        leader = False
+        try:
+            # Only one worker per host samples; the rest just read the stores
+            if metrics_store.try_lead():
+                leader = True
+                if _PSUTIL:
+                    _sample_host(ts)
+            _publish_host()
         except Exception:
             pass   # never crash the thread
 
-        time.sleep(INTERVAL)
+        try:
+            if leader:
+                _collect_vm_history(ts)
+            _publish_vms()
+        except Exception:
+            pass
+
+        time.sleep(INTERVAL if leader else _follower_delay())
 
 
-# Start collector once when this module is first imported
-_thread = threading.Thread(target=_collect_loop, daemon=True, name='metrics-collector')
-_thread.start()
+def _collect_vm_history(ts: int):
+    """Append one tick of per-VM rates for every running domain (leader only)."""
+    if not _LIBVIRT:
+        return
+    conn = get_connection()
+    counters = {}
+    try:
+        vms = _collect_bulk(conn, _vm_hist_prev, counters)
+    finally:
+        conn.close()
+    rows = {
+        vm['uuid']: tuple(np.nan if vm[f] is None else vm[f] for f in _VM_FIELDS)
+        for vm in vms
+    }
+    entries = [
+        {'uuid': vm['uuid'], 'name': vm['name'],
+         **{key: vm[f] for key, f in zip(VM_SERIES, _VM_FIELDS)}}
+        for vm in vms
+    ]
+    _vm_store(writable=True).append(ts, rows, {'ts': ts, 'vms': entries, 'counters': counters})
+    for vm in entries:
+        alerts.observe('vm', vm['uuid'], vm['name'], ts, vm)
+    alerts.forget_vms({vm['uuid'] for vm in entries})
+
+
+def _publish_vms():
+    """Publish the newest VM tick the collector (in any worker) wrote."""
+    global _vms_published
+    latest = _vm_store().latest()
+    if latest and latest['ts'] > _vms_published:
+        _publish('vms', {'ts': latest['ts'], 'vms': latest['vms']})
+        _vms_published = latest['ts']
+
+
+# FEATURE: live-push
+# One feed per worker: the collector publishes each sample once and every
+# /api/metrics/stream subscriber reads it from here.  threading.Condition is
+# gevent-aware once monkey-patched, so waiting subscribers cost a greenlet.
+
+_feed_cond = threading.Condition()
+_feed      = collections.deque(maxlen=64)   # (seq, kind, payload)
+_feed_last = {}                             # kind → newest (seq, kind, payload)
+_feed_seq  = 0
+_host_published = 0                         # ts of the newest host sample published
+
+
+def _publish(kind: str, payload: dict):
+    global _feed_seq
+    with _feed_cond:
+        _feed_seq += 1
+        event = (_feed_seq, kind, payload)
+        _feed.append(event)
+        _feed_last[kind] = event
+        _feed_cond.notify_all()
+
+
+def _feed_after(seq: int, timeout: float) -> list:
+    """Events newer than *seq*, waiting up to *timeout* s for the first one."""
+    with _feed_cond:
+        if _feed_seq <= seq:
+            _feed_cond.wait(timeout)
+        return [e for e in _feed if e[0] > seq]
+
+
+def _publish_host():
+    """Publish host samples the collector (in any worker) wrote since last time."""
+    global _host_published
+    store = metrics_store.open_store(len(HOST_SERIES), INTERVAL)
+    ts, values = store.tiers[0][2].since(_host_published + 1)
+    if _host_published == 0:
+        ts, values = ts[-1:], values[:, -1:]   # just the newest on first run
+    for i, t in enumerate(ts.tolist()):
+        sample = {'ts': t}
+        for key, v in zip(HOST_SERIES, values[:, i].tolist()):
+            nd = _HOST_ROUND[key]
+            sample[key] = round(v, nd) if nd else round(v)
+        _publish('host', sample)
+        _host_published = t
+
+
+def _follower_delay() -> float:
+    """Sleep until just after the leader's next sample, so pushes keep pace."""
+    if not _host_published:
+        return INTERVAL
+    delay = (_host_published + INTERVAL + 1 - time.time()) % INTERVAL
+    return max(delay, 1)
 
 
 # ── helpers ───────────────────────────────────────────────────────────────────
@@ -121,9 +243,56 @@ def _auth():
     return None
 
 
-def _since(key, cutoff):
-    with _lock:
-        return [[ts, v] for ts, v in _history[key] if ts >= cutoff]
+def _cursor_args():
+    """?after=<ts> — only points newer than what the client already holds."""
+    return request.args.get('after', type=int)
+
+
+def _not_modified(last_ts):
+    """ETag for a history response; a 304 if the client already has it.
+
+    History only changes when a new sample lands, so the newest stored
+    timestamp plus the query string identifies the response.
+    """
+    etag = f'{last_ts}-{zlib.crc32(request.query_string):08x}'
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag)
+        return etag, resp
+    return etag, None
+
+
+def _downsample_args():
+    """(max_points, method) from the query string, or an error response."""
+    max_points = request.args.get('max_points', type=int)
+    method     = request.args.get('downsample', 'lttb')
+    if method not in _DOWNSAMPLE_METHODS:
+        allowed = ', '.join(_DOWNSAMPLE_METHODS)
+        return None, (jsonify({'error': f'downsample must be one of: {allowed}'}), 400)
+    return (max_points, method), None
+
+
+def _latest_host(store):
+    """The newest host sample as {series: value}, or None before the first."""
+    newest = store.latest()
+    return dict(zip(HOST_SERIES, newest[1].tolist())) if newest is not None else None
+
+
+def _history_since(cutoff, now=None, max_points=None, method='lttb', after=None):
+    """Every host series as {key: [[ts, value], ...]} plus the tier's step.
+
+    Long windows come from the rollup tiers (bucket averages), and
+    *max_points* thins each series further with downsample().  *after*
+    drops everything up to and including that timestamp.
+    """
+    store = metrics_store.open_store(len(HOST_SERIES), INTERVAL)
+    step, ts, values = store.query(cutoff, now or int(time.time()), after)
+    ts, values = downsample(ts, values, max_points, method)
+    history = {}
+    for key, row_ts, col in zip(HOST_SERIES, ts.tolist(), values.tolist()):
+        nd = _HOST_ROUND[key]
+        history[key] = [[t, round(v, nd) if nd else round(v)] for t, v in zip(row_ts, col)]
+    return history, step
 
 
 # ── /api/metrics/dashboard ───────────────────────────────────────────────────
@@ -137,10 +306,27 @@ def dashboard():
     if not _PSUTIL:
         return jsonify({'error': 'psutil not installed — run: pip install psutil'}), 503
 
-    minutes = int(request.args.get('minutes', 60))
-    cutoff  = int(time.time()) - minutes * 60
+    ds, err = _downsample_args()
+    if err:
+        return err
+
+    # Live gauges below refresh together with the history, i.e. they may lag
+    # by up to INTERVAL for a client revalidating with If-None-Match.
+    store   = metrics_store.open_store(len(HOST_SERIES), INTERVAL)
+    last_ts = store.last_ts() or 0
+    etag, not_modified = _not_modified(last_ts)
+    if not_modified:
+        return not_modified
 
-    cpu_pct = psutil.cpu_percent(interval=0.1)
+    minutes = int(request.args.get('minutes', 60))
+    now     = int(time.time())
+    cutoff  = now - minutes * 60
+    history, resolution = _history_since(cutoff, now, *ds, after=_cursor_args())
+
+    # CPU is the collector's newest sample: measuring it here would block the
+    # worker for the sampling interval
+    latest  = _latest_host(store)
+    cpu_pct = latest['cpu'] if latest else psutil.cpu_percent(interval=None)
     mem     = psutil.virtual_memory()
 
     try:
@@ -156,7 +342,7 @@ def dashboard():
     except AttributeError:
         load1 = load5 = load15 = 0.0
 
-    return jsonify({
+    resp = jsonify({
         'cpu_pct':    round(cpu_pct, 1),
         'mem_pct':    round(mem.percent, 1),
         'mem_used':   mem.used,
@@ -167,16 +353,12 @@ def dashboard():
         'load1':      round(load1,  2),
         'load5':      round(load5,  2),
         'load15':     round(load15, 2),
-        'history': {
-            'cpu':        _since('cpu',        cutoff),
-            'memory':     _since('memory',     cutoff),
-            'load':       _since('load',       cutoff),
-            'net_rx':     _since('net_rx',     cutoff),
-            'net_tx':     _since('net_tx',     cutoff),
-            'disk_read':  _since('disk_read',  cutoff),
-            'disk_write': _since('disk_write', cutoff),
-        },
+        'history':    history,
+        'resolution': resolution,
+        'last_ts':    last_ts,
     })
+    resp.set_etag(etag)
+    return resp
 
 
 # ── /api/metrics/vms ─────────────────────────────────────────────────────────
@@ -184,9 +366,58 @@ def dashboard():
 _vm_samples: dict = {}
 
 
-def _parse_vm_stats(dom):
-    global _vm_samples
+def _vm_rates(uuid, name, sample, now, prev_store=None):
+    """Turn one raw counter sample into the /api/metrics/vms entry.
+
+    Rates are deltas against the previous sample for the same domain kept in
+    *prev_store* (default _vm_samples), so the first call for a domain
+    reports them as None.
+    """
+    if prev_store is None:
+        prev_store = _vm_samples
+    cpu_ns    = sample['cpu_ns']
+    mem_used  = sample['mem_used']
+    mem_total = sample['mem_total']
+
+    prev = prev_store.get(uuid)
+    cpu_pct = disk_r_rate = disk_w_rate = net_rx_rate = net_tx_rate = None
+
+    if prev and cpu_ns is not None:
+        dt = now - prev['ts']
+        if dt > 0:
+            delta_cpu   = cpu_ns - prev.get('cpu_ns', cpu_ns)
+            ncpus       = sample['vcpus'] or 1
+            cpu_pct     = max(0.0, min(100.0 * ncpus, (delta_cpu / 1e9) / dt * 100))
+            disk_r_rate = max(0.0, (sample['disk_r'] - prev.get('disk_r', sample['disk_r'])) / dt)
+            disk_w_rate = max(0.0, (sample['disk_w'] - prev.get('disk_w', sample['disk_w'])) / dt)
+            net_rx_rate = max(0.0, (sample['net_rx'] - prev.get('net_rx', sample['net_rx'])) / dt)
+            net_tx_rate = max(0.0, (sample['net_tx'] - prev.get('net_tx', sample['net_tx'])) / dt)
+
+    prev_store[uuid] = {
+        'ts':     now,
+        'cpu_ns': cpu_ns or 0,
+        'disk_r': sample['disk_r'],
+        'disk_w': sample['disk_w'],
+        'net_rx': sample['net_rx'],
+        'net_tx': sample['net_tx'],
+    }
+
+    return {
+        'uuid':        uuid,
+        'name':        name,
+        'cpu_pct':     round(cpu_pct, 2)     if cpu_pct     is not None else None,
+        'mem_used':    mem_used,
+        'mem_total':   mem_total,
+        'mem_pct':     round(mem_used / mem_total * 100, 1) if mem_used and mem_total else None,
+        'disk_r_rate': round(disk_r_rate, 1) if disk_r_rate is not None else None,
+        'disk_w_rate': round(disk_w_rate, 1) if disk_w_rate is not None else None,
+        'net_rx_rate': round(net_rx_rate, 1) if net_rx_rate is not None else None,
+        'net_tx_rate': round(net_tx_rate, 1) if net_tx_rate is not None else None,
+    }
+
 
+def _parse_vm_stats(dom):
+    """Per-domain fallback: state(), info(), XMLDesc and one RPC per device."""
     try:
         state, _ = dom.state(0)
     except Exception:
@@ -197,12 +428,13 @@ def _parse_vm_stats(dom):
     uuid = dom.UUIDString()
     now  = time.time()
 
-    mem_used = mem_total = cpu_ns = None
+    sample = {'cpu_ns': None, 'vcpus': 1, 'mem_used': None, 'mem_total': None}
     try:
-        info      = dom.info()
-        mem_total = info[1] * 1024
-        mem_used  = info[2] * 1024
-        cpu_ns    = info[4]
+        info = dom.info()
+        sample['mem_total'] = info[1] * 1024
+        sample['mem_used']  = info[2] * 1024
+        sample['vcpus']     = info[3]
+        sample['cpu_ns']    = info[4]
     except Exception:
         pass
 
@@ -244,46 +476,76 @@ def _parse_vm_stats(dom):
     except Exception:
         pass
 
-    prev = _vm_samples.get(uuid)
-    cpu_pct = disk_r_rate = disk_w_rate = net_rx_rate = net_tx_rate = None
+    sample.update(disk_r=disk_r_bytes, disk_w=disk_w_bytes,
+                  net_rx=net_rx_bytes, net_tx=net_tx_bytes)
+    return _vm_rates(uuid, dom.name(), sample, now)
 
-    if prev and cpu_ns is not None:
-        dt = now - prev['ts']
-        if dt > 0:
-            delta_cpu   = cpu_ns - prev.get('cpu_ns', cpu_ns)
-            try:
-                ncpus = dom.info()[3]
-            except Exception:
-                ncpus = 1
-            cpu_pct     = max(0.0, min(100.0 * ncpus, (delta_cpu / 1e9) / dt * 100))
-            disk_r_rate = max(0.0, (disk_r_bytes - prev.get('disk_r', disk_r_bytes)) / dt)
-            disk_w_rate = max(0.0, (disk_w_bytes - prev.get('disk_w', disk_w_bytes)) / dt)
-            net_rx_rate = max(0.0, (net_rx_bytes  - prev.get('net_rx', net_rx_bytes))  / dt)
-            net_tx_rate = max(0.0, (net_tx_bytes  - prev.get('net_tx', net_tx_bytes))  / dt)
 
-    _vm_samples[uuid] = {
-        'ts':     now,
-        'cpu_ns': cpu_ns or 0,
-        'disk_r': disk_r_bytes,
-        'disk_w': disk_w_bytes,
-        'net_rx': net_rx_bytes,
-        'net_tx': net_tx_bytes,
-    }
+# FEATURE: bulk-domain-stats
+
+def _bulk_stat_groups():
+    return (libvirt.VIR_DOMAIN_STATS_STATE | libvirt.VIR_DOMAIN_STATS_CPU_TOTAL |
+            libvirt.VIR_DOMAIN_STATS_BALLOON | libvirt.VIR_DOMAIN_STATS_VCPU |
+            libvirt.VIR_DOMAIN_STATS_INTERFACE | libvirt.VIR_DOMAIN_STATS_BLOCK)
+
+
+def _sample_from_bulk(stats: dict, disk_targets=None) -> dict:
+    """Map one getAllDomainStats() record onto the fields _vm_rates expects.
+
+    *disk_targets* restricts block totals to real disks (cdroms excluded, as
+    in the per-domain path); when unknown every block device is counted.
+    """
+    balloon_cur = stats.get('balloon.current')
+    balloon_max = stats.get('balloon.maximum')
+
+    disk_r = disk_w = 0
+    for i in range(stats.get('block.count', 0)):
+        if disk_targets is not None and stats.get(f'block.{i}.name') not in disk_targets:
+            continue
+        disk_r += stats.get(f'block.{i}.rd.bytes', 0)
+        disk_w += stats.get(f'block.{i}.wr.bytes', 0)
+
+    net_rx = net_tx = 0
+    for i in range(stats.get('net.count', 0)):
+        net_rx += stats.get(f'net.{i}.rx.bytes', 0)
+        net_tx += stats.get(f'net.{i}.tx.bytes', 0)
 
     return {
-        'uuid':        uuid,
-        'name':        dom.name(),
-        'cpu_pct':     round(cpu_pct, 2)     if cpu_pct     is not None else None,
-        'mem_used':    mem_used,
-        'mem_total':   mem_total,
-        'mem_pct':     round(mem_used / mem_total * 100, 1) if mem_used and mem_total else None,
-        'disk_r_rate': round(disk_r_rate, 1) if disk_r_rate is not None else None,
-        'disk_w_rate': round(disk_w_rate, 1) if disk_w_rate is not None else None,
-        'net_rx_rate': round(net_rx_rate, 1) if net_rx_rate is not None else None,
-        'net_tx_rate': round(net_tx_rate, 1) if net_tx_rate is not None else None,
+        'cpu_ns':    stats.get('cpu.time'),
+        'vcpus':     stats.get('vcpu.current', 1),
+        'mem_used':  balloon_cur * 1024 if balloon_cur is not None else None,
+        'mem_total': balloon_max * 1024 if balloon_max is not None else None,
+        'disk_r':    disk_r,
+        'disk_w':    disk_w,
+        'net_rx':    net_rx,
+        'net_tx':    net_tx,
     }
 
 
+def _collect_bulk(conn, prev_store=None, raw=None):
+    """All running domains' stats in a single getAllDomainStats() RPC.
+
+    If *raw* is given it is filled with uuid → (name, stats record) so the
+    caller can keep the untouched counters as well.
+    """
+    records = conn.getAllDomainStats(
+        _bulk_stat_groups(), libvirt.VIR_CONNECT_GET_ALL_DOMAINS_STATS_RUNNING)
+    now = time.time()
+    result = []
+    for dom, stats in records:
+        if stats.get('state.state') != 1:
+            continue
+        uuid = dom.UUIDString()
+        if raw is not None:
+            raw[uuid] = (dom.name(), stats)
+        rec  = inventory.get_domain(uuid)
+        disk_targets = ({d['target'] for d in rec['disks'] if d['device'] == 'disk'}
+                        if rec is not None else None)
+        result.append(_vm_rates(uuid, dom.name(), _sample_from_bulk(stats, disk_targets),
+                                now, prev_store))
+    return result
+
+
 @metrics_bp.route('/api/metrics/vms')
 def vms_stats():
     err = _auth()
@@ -294,17 +556,116 @@ def vms_stats():
         return jsonify({'error': 'libvirt not available'}), 503
 
     try:
-        conn = libvirt.open('qemu:///system')
+        conn = get_connection()
     except Exception as e:
         return jsonify({'error': f'Cannot connect to libvirt: {e}'}), 503
 
     result = []
     try:
-        for dom in conn.listAllDomains(0):
-            stats = _parse_vm_stats(dom)
-            if stats:
-                result.append(stats)
+        try:
+            result = _collect_bulk(conn)
+        except (AttributeError, libvirt.libvirtError):
+            # Driver without bulk stats — fall back to per-domain RPCs
+            for dom in conn.listAllDomains(0):
+                stats = _parse_vm_stats(dom)
+                if stats:
+                    result.append(stats)
     finally:
         conn.close()
 
     return jsonify({'vms': result, 'ts': time.time()})
+
+
+@metrics_bp.route('/api/metrics/vms/<uuid>/history')
+def vm_history(uuid):
+    err = _auth()
+    if err:
+        return err
+
+    ds, err = _downsample_args()
+    if err:
+        return err
+
+    minutes = int(request.args.get('minutes', 60))
+    cutoff  = int(time.time()) - minutes * 60
+    after   = _cursor_args()
+    if after is not None:
+        cutoff = max(cutoff, after + 1)
+
+    store   = _vm_store()
+    last_ts = store.last_ts(uuid)
+    found   = store.since(uuid, cutoff)
+    if found is None:
+        return jsonify({'error': 'No history for this VM'}), 404
+    etag, not_modified = _not_modified(last_ts)
+    if not_modified:
+        return not_modified
+
+    ts, block = found
+    history = {}
+    for i, key in enumerate(VM_SERIES):
+        col  = block[i]
+        keep = ~np.isnan(col)   # gaps differ per series, so thin each on its own
+        row_ts, row = downsample(ts[keep], col[keep][None, :], *ds)
+        history[key] = [[t, round(v, 2)] for t, v in zip(row_ts[0].tolist(), row[0].tolist())]
+
+    resp = jsonify({'uuid': uuid, 'interval': INTERVAL, 'history': history, 'last_ts': last_ts})
+    resp.set_etag(etag)
+    return resp
+
+
+
+# ── /api/metrics/stream ──────────────────────────────────────────────────────
+
+def _filter_event(kind, payload, series, vms):
+    if kind == 'host':
+        return {k: v for k, v in payload.items() if k == 'ts' or series is None or k in series}
+    keep = [
+        {k: v for k, v in vm.items() if k in ('uuid', 'name') or series is None or k in series}
+        for vm in payload['vms'] if vms is None or vm['uuid'] in vms
+    ]
+    return {'ts': payload['ts'], 'vms': keep} if keep else None
+
+
+@metrics_bp.route('/api/metrics/stream')
+def metrics_stream():
+    """SSE stream: a 'host' and a 'vms' event per collector tick.
+
+    ?series=cpu,memory  limits both event kinds to those series
+    ?vms=<uuid>,...     limits 'vms' events to those VMs; ?vms= (empty)
+                        turns them off
+    """
+    err = _auth()
+    if err:
+        return err
+
+    arg = request.args.get('series')
+    series = set(arg.split(',')) if arg else None
+    arg = request.args.get('vms')
+    vms = None if arg is None else set(filter(None, arg.split(',')))
+
+    def generate():
+        with _feed_cond:
+            backlog = sorted(_feed_last.values())
+            seq = _feed_seq
+        while True:
+            for _, kind, payload in backlog:
+                data = _filter_event(kind, payload, series, vms)
+                if data is not None:
+                    yield f'event: {kind}\ndata: {json.dumps(data)}\n\n'
+            if backlog:
+                seq = backlog[-1][0]
+            backlog = _feed_after(seq, INTERVAL * 2)
+            if not backlog:
+                yield ': keepalive\n\n'
+
+    return Response(
+        stream_with_context(generate()),
+        content_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+# Start collector once when this module is first imported
+_thread = threading.Thread(target=_collect_loop, daemon=True, name='metrics-collector')
+_thread.start()
@@ -0,0 +1,404 @@
+"""
+Host metrics history shared by every worker on the host.
+
+Each gunicorn worker imports views/metrics.py, and each used to run its own
+psutil collector with its own in-memory deques, so the dashboard showed
+whatever history the worker behind a given request happened to hold.  Now
+exactly one process — whichever holds an exclusive flock() on LOCK_PATH —
+samples and writes into a memory-mapped ring file at RING_PATH, and every
+worker maps that file read-only to serve history.  The lock is released by
+the kernel when its holder exits, so another worker takes over within one
+interval when the leader is recycled; the file itself outlives them all.
+
+File layout (native byte order):
+
+    header   64 bytes: magic, version, series, length, interval, value size, count
+    ts       int64[length]
+    values   float64 or float32[series][length]
+
+Sample n lives in slot n % length.  The writer fills the slot first and
+bumps count last; readers skip the slot the writer fills next and retry if
+count moved while they were copying, so a torn sample is never returned.
+
+Host history is kept in three such files (see TieredStore): raw samples
+for two days, 1-minute and 1-hour min/avg/max rollups for 30 days and a
+year.  Rollups are computed from the tier below when a bucket closes, so a
+new leader picks up exactly where the old one stopped.
+
+Per-VM history lives beside them in RING_PATH.vms (see VMStore): one raw ring per
+domain, written by the same leader, plus the newest tick as JSON for the
+live feed and the Prometheus exporter of every worker.  Their values are
+float32, 24 h of six series at 15 s costing about 184 KB per domain.
+"""
+
+import fcntl
+import json
+import mmap
+import os
+import re
+import struct
+
+import numpy as np
+
+RING_PATH = os.environ.get(
+    'METRICS_RING',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.metrics.ring'))
+LOCK_PATH = RING_PATH + '.lock'
+
+_MAGIC   = b'HCMR'
+_VERSION = 1
+_HEADER  = struct.Struct('=4sIIIII')  # magic, version, series, length, interval, value size
+_COUNT_OFFSET = 24                    # uint64, 8-byte aligned
+_DATA_OFFSET  = 64
+
+_lock_fd    = None
+_leader_pid = None
+_rings: dict = {}                     # per-process TieredStore / VMStore cache
+
+
+class RingFile:
+    """A fixed-size ring of (ts, values[series]) samples in a mapped file."""
+
+    def __init__(self, path: str, series: int, length: int, interval: int,
+                 writable: bool = False, dtype=np.float64):
+        self.path     = path
+        self.series   = series
+        self.length   = length
+        self.interval = interval
+        self.writable = writable
+        self.dtype    = np.dtype(dtype)
+        self._mm      = None
+        self._ino     = None
+        self._map()
+
+    @property
+    def size(self) -> int:
+        return _DATA_OFFSET + self.length * (8 + self.dtype.itemsize * self.series)
+
+    def _header(self, itemsize: int) -> bytes:
+        return _HEADER.pack(_MAGIC, _VERSION, self.series, self.length, self.interval, itemsize)
+
+    def _create(self):
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(self._header(self.dtype.itemsize))
+            f.truncate(self.size)
+        os.replace(tmp, self.path)
+
+    def _valid(self, st) -> bool:
+        if st.st_size != self.size:
+            return False
+        with open(self.path, 'rb') as f:
+            head = f.read(_HEADER.size)
+        # files written before the value size was recorded hold float64 and a 0 there
+        return head == self._header(self.dtype.itemsize) or \
+            (self.dtype.itemsize == 8 and head == self._header(0))
+
+    def _map(self):
+        """(Re)map the file; a writer creates it if missing or the wrong shape."""
+        try:
+            st = os.stat(self.path)
+            ok = self._valid(st)
+        except FileNotFoundError:
+            st, ok = None, False
+        if not ok:
+            if not self.writable:
+                self._close()
+                return
+            self._create()
+            st = os.stat(self.path)
+        if self._mm is not None and st.st_ino == self._ino:
+            return
+        self._close()
+        with open(self.path, 'r+b' if self.writable else 'rb') as f:
+            access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+            self._mm = mmap.mmap(f.fileno(), self.size, access=access)
+        self._ino   = st.st_ino
+        self._count = np.ndarray((), dtype=np.uint64, buffer=self._mm, offset=_COUNT_OFFSET)
+        self._ts    = np.ndarray((self.length,), dtype=np.int64,
+                                 buffer=self._mm, offset=_DATA_OFFSET)
+        self._vals  = np.ndarray((self.series, self.length), dtype=self.dtype,
+                                 buffer=self._mm, offset=_DATA_OFFSET + 8 * self.length)
+
+    def _close(self):
+        if self._mm is not None:
+            self._count = self._ts = self._vals = None
+            try:
+                self._mm.close()
+            except BufferError:
+                pass   # a reader still holds a view; let GC unmap it
+            self._mm  = None
+            self._ino = None
+
+    def count(self) -> int:
+        return int(self._count) if self._mm is not None else 0
+
+    def last_ts(self):
+        if not self.writable:
+            self._map()
+        n = self.count()
+        return int(self._ts[(n - 1) % self.length]) if n else None
+
+    def latest(self):
+        """(ts, values) of the newest sample without copying the ring, or None."""
+        if not self.writable:
+            self._map()
+        if self._mm is None:
+            return None
+        for _ in range(3):
+            n = self.count()
+            if not n:
+                return None
+            slot = (n - 1) % self.length
+            ts, vals = int(self._ts[slot]), self._vals[:, slot].copy()
+            if self.count() - n < self.length - 1:   # slot not reused while copying
+                break
+        return ts, vals
+
+    def append(self, ts: int, values):
+        n = int(self._count)
+        slot = n % self.length
+        self._ts[slot] = ts
+        self._vals[:, slot] = values
+        self._count[...] = n + 1
+
+    def since(self, cutoff: int):
+        """(ts, values) oldest-first for samples with ts >= cutoff.
+
+        Timestamps ascend in ring order, so the cutoff is found by binary
+        search and only the matching tail of the value block is copied.
+        """
+        if not self.writable:
+            self._map()   # picks up a file recreated by a new leader
+        if self._mm is None:
+            return np.zeros(0, dtype=np.int64), np.zeros((self.series, 0), dtype=self.dtype)
+        for _ in range(3):
+            n = int(self._count)
+            have  = min(n, self.length - 1)   # never the slot written next
+            slots = np.arange(n - have, n) % self.length
+            ts    = self._ts[slots]
+            first = int(np.searchsorted(ts, cutoff))
+            ts, slots = ts[first:], slots[first:]
+            vals  = self._vals[:, slots]
+            if int(self._count) == n:
+                break
+        return ts, vals
+
+
+# ── retention tiers ───────────────────────────────────────────────────────────
+
+# (file suffix, bucket seconds or None for the collector interval, retention s)
+TIERS = (
+    ('',    None, 2 * 86400),
+    ('.1m', 60,   30 * 86400),
+    ('.1h', 3600, 365 * 86400),
+)
+MIN_POINTS = 200   # query() uses the coarsest tier giving at least this many
+
+
+class TieredStore:
+    """Raw ring plus min/avg/max rollup rings, one file per tier.
+
+    Rollup files hold 3 rows per series: row 3*i is the min, 3*i+1 the
+    average and 3*i+2 the max of series i over the bucket.
+    """
+
+    def __init__(self, series: int, interval: int, writable: bool = False):
+        self.series = series
+        self.tiers  = []   # (step, retention, RingFile)
+        self._rolled = {}  # tier step → bucket last checked for closed buckets
+        for suffix, step, retention in TIERS:
+            step = step or interval
+            rows = series if not self.tiers else series * 3
+            ring = RingFile(RING_PATH + suffix, rows, retention // step, step, writable)
+            self.tiers.append((step, retention, ring))
+
+    def append(self, ts: int, values):
+        self.tiers[0][2].append(ts, values)
+        for lower, upper in zip(self.tiers, self.tiers[1:]):
+            self._rollup(lower, upper, ts)
+
+    def _rollup(self, lower, upper, now: int):
+        """Write a rollup for every closed bucket of *lower* not yet in *upper*."""
+        step, _, dst = upper
+        bucket = now // step * step
+        if self._rolled.get(step) == bucket:
+            return   # nothing closed since the last check
+        self._rolled[step] = bucket
+        src   = lower[2]
+        last  = dst.last_ts()
+        start = last + step if last is not None else 0
+        ts, vals = src.since(start)
+        closed = ts < bucket
+        ts, vals = ts[closed], vals[:, closed]
+        if not ts.size:
+            return
+        if src is not self.tiers[0][2]:
+            lo, avg, hi = vals[0::3], vals[1::3], vals[2::3]
+        else:
+            lo = avg = hi = vals
+        buckets = ts // step * step
+        starts  = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts  = np.diff(np.r_[starts, ts.size])
+        rows = np.empty((self.series * 3, starts.size))
+        rows[0::3] = np.minimum.reduceat(lo, starts, axis=1)
+        rows[1::3] = np.add.reduceat(avg, starts, axis=1) / counts
+        rows[2::3] = np.maximum.reduceat(hi, starts, axis=1)
+        for i, b in enumerate(buckets[starts].tolist()):
+            dst.append(b, rows[:, i])
+
+    def last_ts(self):
+        """Timestamp of the newest raw sample (every tier changes with it)."""
+        return self.tiers[0][2].last_ts()
+
+    def latest(self):
+        """(ts, values) of the newest raw sample, or None before the first."""
+        return self.tiers[0][2].latest()
+
+    def query(self, cutoff: int, now: int, after: int = None):
+        """(step, ts, values) from the coarsest tier with enough points.
+
+        The tier is picked for the window starting at *cutoff*; *after*
+        then limits the result to samples newer than that timestamp.
+        *values* is one row per series; rollup tiers return their averages.
+        """
+        window = max(now - cutoff, 1)
+        covering = [t for t in self.tiers if t[1] >= window] or self.tiers[-1:]
+        step, _, ring = next(
+            (t for t in reversed(covering) if window / t[0] >= MIN_POINTS), covering[0])
+        ts, vals = ring.since(cutoff if after is None else max(cutoff, after + 1))
+        if ring is not self.tiers[0][2]:
+            vals = vals[1::3]
+        return step, ts, vals
+
+
+# ── per-VM history ────────────────────────────────────────────────────────────
+
+_UUID_RE   = re.compile(r'[0-9A-Fa-f-]{1,64}')
+PRUNE_EVERY = 3600   # seconds between sweeps for rings of long-gone domains
+
+
+class VMStore:
+    """One raw float32 ring per domain in RING_PATH.vms, plus the newest tick as JSON.
+
+    The leader appends each tick's rates to <uuid>.ring (NaN where a rate
+    is not known yet) and replaces latest.json with that tick's payload.  A
+    ring left unwritten for its whole span belonged to a domain that is
+    gone and is deleted.
+    """
+
+    def __init__(self, series: int, length: int, interval: int, writable: bool = False):
+        self.dir      = RING_PATH + '.vms'
+        self.series   = series
+        self.length   = length
+        self.interval = interval
+        self.writable = writable
+        self._rings   = {}                  # uuid → RingFile
+        self._latest  = (None, None)        # (mtime, payload) of latest.json
+        self._pruned  = 0
+        if writable:
+            os.makedirs(self.dir, exist_ok=True)
+
+    def _path(self, uuid: str) -> str:
+        return os.path.join(self.dir, uuid + '.ring')
+
+    def _ring(self, uuid: str) -> RingFile:
+        ring = self._rings.get(uuid)
+        if ring is None:
+            ring = self._rings[uuid] = RingFile(self._path(uuid), self.series, self.length,
+                                                self.interval, self.writable, np.float32)
+        return ring
+
+    def append(self, ts: int, rows: dict, latest: dict):
+        """Record one tick; *rows* maps uuid → values, *latest* is any JSON."""
+        for uuid, values in rows.items():
+            if _UUID_RE.fullmatch(uuid):
+                self._ring(uuid).append(ts, values)
+        tmp = os.path.join(self.dir, f'latest.json.{os.getpid()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(latest, f)
+        os.replace(tmp, os.path.join(self.dir, 'latest.json'))
+        if ts - self._pruned >= PRUNE_EVERY:
+            self._pruned = ts
+            self._prune(ts)
+
+    def _prune(self, now: int):
+        span = self.length * self.interval
+        for name in os.listdir(self.dir):
+            uuid = name[:-len('.ring')]
+            if not name.endswith('.ring') or not _UUID_RE.fullmatch(uuid):
+                continue
+            last = self._ring(uuid).last_ts()
+            if last is None or now - last > span:
+                self._rings.pop(uuid)._close()
+                try:
+                    os.unlink(self._path(uuid))
+                except OSError:
+                    pass
+
+    def since(self, uuid: str, cutoff: int):
+        """(ts, values) oldest-first for ts >= cutoff, or None for an unknown VM."""
+        if not _UUID_RE.fullmatch(uuid) or not os.path.exists(self._path(uuid)):
+            ring = self._rings.pop(uuid, None)
+            if ring is not None:
+                ring._close()
+            return None
+        return self._ring(uuid).since(cutoff)
+
+    def last_ts(self, uuid: str):
+        if not _UUID_RE.fullmatch(uuid) or not os.path.exists(self._path(uuid)):
+            return None
+        return self._ring(uuid).last_ts()
+
+    def latest(self):
+        """The payload of the newest tick, re-read only when it was replaced."""
+        path = os.path.join(self.dir, 'latest.json')
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        if mtime != self._latest[0]:
+            try:
+                with open(path) as f:
+                    self._latest = (mtime, json.load(f))
+            except (OSError, ValueError):
+                return self._latest[1]
+        return self._latest[1]
+
+
+# ── leadership ────────────────────────────────────────────────────────────────
+
+def try_lead() -> bool:
+    """True if this process is (or has just become) the host's collector."""
+    global _lock_fd, _leader_pid
+    if _lock_fd is not None and _leader_pid == os.getpid():
+        return True
+    # Fresh descriptor after a fork: an inherited one shares the parent's lock
+    fd = os.open(LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    _lock_fd, _leader_pid = fd, os.getpid()
+    return True
+
+
+def is_leader() -> bool:
+    return _lock_fd is not None and _leader_pid == os.getpid()
+
+
+def open_store(series: int, interval: int, writable: bool = False) -> TieredStore:
+    key = ('tiers', writable)
+    store = _rings.get(key)
+    if store is None:
+        store = _rings[key] = TieredStore(series, interval, writable)
+    return store
+
+
+def open_vm_store(series: int, length: int, interval: int, writable: bool = False) -> VMStore:
+    key = ('vms', writable)
+    store = _rings.get(key)
+    if store is None:
+        store = _rings[key] = VMStore(series, length, interval, writable)
+    return store
@@ -7,6 +7,8 @@ import xml.etree.ElementTree as ET
 import yaml
 from flask import Blueprint, jsonify, request, session
 
+from .libvirt_pool import get_connection
+
 try:
     import libvirt as _libvirt
     _HAS_LIBVIRT = True
@@ -304,7 +306,7 @@ def _lv_conn():
     if not _HAS_LIBVIRT:
         return None
     try:
-        return _libvirt.open('qemu:///system')
+        return get_connection()
     except Exception:
         return None
 
@@ -0,0 +1,396 @@
+"""
+NUMA placement — vCPU pinning and memory binding for new and running VMs.
+
+The host topology (cells, their CPUs and memory) comes from
+conn.getCapabilities().  Load is what the running domains already claim:
+every pinned vCPU counts against the host CPUs of its cpuset, unpinned vCPUs
+are spread over all CPUs, and memory is charged to the numatune nodeset (or
+spread over all cells when there is none).
+
+place() puts a VM on the single cell that ends up least loaded, counting
+both CPU and memory pressure, as long as one cell has the CPUs and free
+memory for it.  Larger VMs are split over the fewest least-loaded cells and
+get a matching guest NUMA topology, so the guest kernel sees the split.
+Each vCPU is pinned to the least busy host CPU of its cell; the emulator
+and any iothreads float over the chosen cells' CPUs.
+
+apply_placement() writes <cputune> vcpupin / emulatorpin / iothreadpin,
+<numatune> (memnode per guest cell when split) and the guest <numa> cells.
+rebalance() re-plans every running domain from scratch and re-pins the ones
+whose placement changes, live and in the persistent definition.  Guest NUMA
+cells cannot change on a running domain, so a re-pinned split VM keeps its
+guest topology until it is redefined.
+
+Routes
+------
+GET  /api/host/numa             — topology, per-cell load, per-domain placement
+POST /api/host/numa/rebalance   — {dry_run: false} → plan (dry run) or 202 + job
+"""
+
+import xml.etree.ElementTree as ET
+
+import libvirt
+from flask import Blueprint, jsonify, request, session
+
+from . import inventory, jobs
+from .listing import get_db_connection
+
+numa_bp = Blueprint('numa', __name__)
+
+MEMORY_UNITS = {'b': 1 / 1024, 'bytes': 1 / 1024, 'k': 1, 'kib': 1, 'kb': 1000 / 1024,
+                'm': 1024, 'mib': 1024, 'mb': 1000 ** 2 / 1024,
+                'g': 1024 ** 2, 'gib': 1024 ** 2, 'gb': 1000 ** 3 / 1024}
+
+
+# ── cpusets ───────────────────────────────────────────────────────────────────
+
+def parse_cpuset(text: str) -> set:
+    """'0-3,8,^2' → {0, 1, 3, 8}."""
+    cpus, drop = set(), set()
+    for part in (text or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        target = drop if part.startswith('^') else cpus
+        part = part.lstrip('^')
+        lo, _, hi = part.partition('-')
+        target.update(range(int(lo), int(hi or lo) + 1))
+    return cpus - drop
+
+
+def format_cpuset(cpus) -> str:
+    """{0, 1, 2, 5} → '0-2,5'."""
+    out, run = [], []
+    for c in sorted(cpus):
+        if run and c != run[-1] + 1:
+            out.append(f'{run[0]}-{run[-1]}' if len(run) > 1 else str(run[0]))
+            run = []
+        run.append(c)
+    if run:
+        out.append(f'{run[0]}-{run[-1]}' if len(run) > 1 else str(run[0]))
+    return ','.join(out)
+
+
+# ── topology and load ─────────────────────────────────────────────────────────
+
+def parse_topology(caps_xml: str) -> list:
+    """[{'id', 'cpus': [host CPU ids], 'memory_kib'}] from capabilities XML."""
+    tree = ET.fromstring(caps_xml)
+    cells = []
+    for cell in tree.findall('host/topology/cells/cell'):
+        mem = cell.find('memory')
+        cells.append({
+            'id':         int(cell.get('id')),
+            'cpus':       sorted(int(c.get('id')) for c in cell.findall('cpus/cpu')),
+            'memory_kib': to_kib(mem) if mem is not None else 0,
+        })
+    if not cells:
+        raise ValueError('capabilities report no NUMA cells')
+    return sorted(cells, key=lambda c: c['id'])
+
+
+def to_kib(el) -> int:
+    """A memory-like element (<memory unit='GiB'>4</memory>) in KiB."""
+    return int(int(el.text) * MEMORY_UNITS.get((el.get('unit') or 'KiB').lower(), 1))
+
+
+def domain_resources(tree) -> dict:
+    """vCPUs, memory and current pinning from a domain XML tree."""
+    vcpus = int(tree.findtext('vcpu', '1'))
+    mem = tree.find('memory')
+    numa_mem = tree.find('numatune/memory')
+    return {
+        'vcpus':      vcpus,
+        'memory_kib': to_kib(mem) if mem is not None else 0,
+        'vcpupin':    {int(p.get('vcpu')): sorted(parse_cpuset(p.get('cpuset')))
+                       for p in tree.findall('cputune/vcpupin')},
+        'nodeset':    sorted(parse_cpuset(numa_mem.get('nodeset')))
+                      if numa_mem is not None and numa_mem.get('nodeset') else [],
+    }
+
+
+def new_load(topology) -> dict:
+    return {'cpu': {c: 0.0 for cell in topology for c in cell['cpus']},
+            'mem': {cell['id']: 0 for cell in topology}}
+
+
+def charge(load, topology, res):
+    """Add one domain's current use (domain_resources()) to *load*."""
+    all_cpus = list(load['cpu'])
+    for v in range(res['vcpus']):
+        cpus = res['vcpupin'].get(v) or all_cpus
+        for c in cpus:
+            if c in load['cpu']:
+                load['cpu'][c] += 1 / len(cpus)
+    nodes = [n for n in res['nodeset'] if n in load['mem']] or list(load['mem'])
+    for n in nodes:
+        load['mem'][n] += res['memory_kib'] / len(nodes)
+
+
+def host_load(conn, topology, exclude=()) -> dict:
+    """Load of every running domain except the UUIDs in *exclude*."""
+    load = new_load(topology)
+    for dom in conn.listAllDomains(libvirt.VIR_CONNECT_LIST_DOMAINS_ACTIVE):
+        if dom.UUIDString() not in exclude:
+            charge(load, topology, domain_resources(ET.fromstring(dom.XMLDesc(0))))
+    return load
+
+
+def cell_load(load, topology) -> list:
+    rows = []
+    for cell in topology:
+        pinned = sum(load['cpu'][c] for c in cell['cpus'])
+        rows.append({'id': cell['id'], 'cpus': len(cell['cpus']),
+                     'vcpus': round(pinned, 2),
+                     'cpu_ratio': round(pinned / len(cell['cpus']), 3) if cell['cpus'] else None,
+                     'memory_kib': cell['memory_kib'],
+                     'memory_used_kib': int(load['mem'][cell['id']]),
+                     'mem_ratio': round(load['mem'][cell['id']] / cell['memory_kib'], 3)
+                     if cell['memory_kib'] else None})
+    return rows
+
+
+# ── placement ─────────────────────────────────────────────────────────────────
+
+def _score(cell, load, vcpus=0, memory_kib=0) -> float:
+    cpu = (sum(load['cpu'][c] for c in cell['cpus']) + vcpus) / max(1, len(cell['cpus']))
+    mem = (load['mem'][cell['id']] + memory_kib) / max(1, cell['memory_kib'])
+    return max(cpu, mem)
+
+
+def _fits(cell, load, vcpus, memory_kib) -> bool:
+    return vcpus <= len(cell['cpus']) and \
+        load['mem'][cell['id']] + memory_kib <= cell['memory_kib']
+
+
+def place(topology, load, vcpus: int, memory_kib: int, commit: bool = True) -> dict:
+    """Choose cells and host CPUs for a VM; charges *load* unless commit=False.
+
+    Returns {'nodes': [cell ids], 'vcpupin': {vcpu: host cpu},
+             'cpuset': all CPUs of the chosen cells,
+             'cells': [{'node', 'vcpus': [..], 'memory_kib'}]}  (one per cell).
+
+    A split VM gets each cell's memory in proportion to the cell's free
+    memory; a cell may get no vCPUs when the VM has fewer vCPUs than cells.
+    """
+    single = [c for c in topology if _fits(c, load, vcpus, memory_kib)]
+    if single:
+        chosen = [min(single, key=lambda c: (_score(c, load, vcpus, memory_kib), c['id']))]
+    else:
+        ranked = sorted(topology, key=lambda c: (_score(c, load), c['id']))
+        chosen = ranked             # overcommitted: use every cell
+        for k in range(2, len(ranked) + 1):
+            part = ranked[:k]
+            if sum(len(c['cpus']) for c in part) >= vcpus and \
+                    sum(c['memory_kib'] - load['mem'][c['id']] for c in part) >= memory_kib:
+                chosen = part
+                break
+        chosen = sorted(chosen, key=lambda c: c['id'])
+
+    # vCPUs in proportion to each cell's CPUs; memory in proportion to each
+    # cell's free memory, so no cell is bound to more than it has
+    total = sum(len(c['cpus']) for c in chosen)
+    shares = [len(c['cpus']) * vcpus // total for c in chosen]
+    for i in range(vcpus - sum(shares)):
+        shares[i % len(chosen)] += 1
+    free = [max(0, c['memory_kib'] - load['mem'][c['id']]) for c in chosen]
+    if not sum(free):                # overcommitted everywhere: by cell size
+        free = [c['memory_kib'] for c in chosen]
+    cpu_load = dict(load['cpu']) if not commit else load['cpu']
+    cells, vcpupin, next_vcpu, mem_left = [], {}, 0, memory_kib
+    for i, (cell, share) in enumerate(zip(chosen, shares)):
+        guest = list(range(next_vcpu, next_vcpu + share))
+        next_vcpu += share
+        for v in guest:
+            host = min(cell['cpus'], key=lambda c: (cpu_load[c], c))
+            vcpupin[v] = host
+            cpu_load[host] += 1
+        mem = mem_left if i == len(chosen) - 1 else memory_kib * free[i] // sum(free)
+        mem_left -= mem
+        cells.append({'node': cell['id'], 'vcpus': guest, 'memory_kib': mem})
+        if commit:
+            load['mem'][cell['id']] += mem
+    return {'nodes': [c['id'] for c in chosen], 'vcpupin': vcpupin,
+            'cpuset': sorted(c for cell in chosen for c in cell['cpus']), 'cells': cells}
+
+
+def _child(parent, tag, before=()):
+    """parent's <tag>, created after the last of the *before* siblings present."""
+    el = parent.find(tag)
+    if el is None:
+        el = ET.Element(tag)
+        idx = len(parent)
+        for name in before:
+            prev = parent.find(name)
+            if prev is not None:
+                idx = list(parent).index(prev) + 1
+        parent.insert(idx, el)
+    return el
+
+
+def apply_placement(tree, placement: dict):
+    """Write cputune, numatune and (for split VMs) guest NUMA cells in place."""
+    cputune = _child(tree, 'cputune', before=('vcpu', 'iothreads'))
+    for tag in ('vcpupin', 'emulatorpin', 'iothreadpin'):
+        for old in cputune.findall(tag):
+            cputune.remove(old)
+    for i, (vcpu, host) in enumerate(sorted(placement['vcpupin'].items())):
+        cputune.insert(i, ET.Element('vcpupin', vcpu=str(vcpu), cpuset=str(host)))
+    cpuset = format_cpuset(placement['cpuset'])
+    cputune.append(ET.Element('emulatorpin', cpuset=cpuset))
+    for n in range(1, int(tree.findtext('iothreads', '0') or 0) + 1):
+        cputune.append(ET.Element('iothreadpin', iothread=str(n), cpuset=cpuset))
+
+    old = tree.find('numatune')
+    if old is not None:
+        tree.remove(old)
+    numatune = _child(tree, 'numatune', before=('vcpu', 'iothreads', 'cputune'))
+    ET.SubElement(numatune, 'memory', mode='strict',
+                  nodeset=format_cpuset(placement['nodes']))
+
+    cpu = tree.find('cpu')
+    if cpu is not None:
+        for old in cpu.findall('numa'):
+            cpu.remove(old)
+    # A guest cell needs vCPUs: a VM split for memory alone (more cells than
+    # vCPUs) gets no guest topology, just memory bound to all its nodes
+    if len(placement['cells']) > 1 and all(c['vcpus'] for c in placement['cells']):
+        cpu = _child(tree, 'cpu', before=('features',))
+        numa = ET.SubElement(cpu, 'numa')
+        for i, cell in enumerate(placement['cells']):
+            ET.SubElement(numa, 'cell', id=str(i), cpus=format_cpuset(cell['vcpus']),
+                          memory=str(cell['memory_kib']), unit='KiB')
+            ET.SubElement(numatune, 'memnode', cellid=str(i), mode='strict',
+                          nodeset=str(cell['node']))
+
+
+def place_new(conn, tree):
+    """Place a domain that is about to be defined (its XML *tree*, in place)."""
+    topology = parse_topology(conn.getCapabilities())
+    res = domain_resources(tree)
+    placement = place(topology, host_load(conn, topology), res['vcpus'], res['memory_kib'])
+    apply_placement(tree, placement)
+    return placement
+
+
+# ── rebalance ─────────────────────────────────────────────────────────────────
+
+def plan_rebalance(conn) -> list:
+    """Re-plan every running domain; [{uuid, name, from, to, changed, ...}]."""
+    topology = parse_topology(conn.getCapabilities())
+    doms = []
+    for dom in conn.listAllDomains(libvirt.VIR_CONNECT_LIST_DOMAINS_ACTIVE):
+        doms.append((dom, domain_resources(ET.fromstring(dom.XMLDesc(0)))))
+    # Biggest first, so large VMs get whole cells before the small ones fill them
+    doms.sort(key=lambda d: (d[1]['memory_kib'], d[1]['vcpus']), reverse=True)
+    load, plan = new_load(topology), []
+    for dom, res in doms:
+        p = place(topology, load, res['vcpus'], res['memory_kib'])
+        current = {v: cpus for v, cpus in res['vcpupin'].items()}
+        wanted  = {v: [host] for v, host in p['vcpupin'].items()}
+        plan.append({'uuid': dom.UUIDString(), 'name': dom.name(),
+                     'from': {'nodes': res['nodeset'], 'vcpupin': current},
+                     'to': {'nodes': p['nodes'], 'vcpupin': p['vcpupin'], 'cpuset': p['cpuset']},
+                     'changed': current != wanted or res['nodeset'] != p['nodes'],
+                     '_dom': dom})
+    return plan
+
+
+def _cpumap(cpus, ncpus) -> tuple:
+    cpus = set(cpus)
+    return tuple(c in cpus for c in range(ncpus))
+
+
+def repin(dom, target: dict, ncpus: int):
+    """Pin a running domain to *target* ({'nodes', 'vcpupin', 'cpuset'}) live
+    and in its persistent definition."""
+    flags = libvirt.VIR_DOMAIN_AFFECT_LIVE | libvirt.VIR_DOMAIN_AFFECT_CONFIG
+    for vcpu, host in sorted(target['vcpupin'].items()):
+        dom.pinVcpuFlags(vcpu, _cpumap([host], ncpus), flags)
+    cpumap = _cpumap(target['cpuset'], ncpus)
+    dom.pinEmulator(cpumap, flags)
+    tree = ET.fromstring(dom.XMLDesc(0))
+    for n in range(1, int(tree.findtext('iothreads', '0') or 0) + 1):
+        dom.pinIOThread(n, cpumap, flags)
+    key = getattr(libvirt, 'VIR_DOMAIN_NUMATUNE_NODESET', 'numa_nodeset')
+    dom.setNumaParameters({key: format_cpuset(target['nodes'])}, flags)
+
+
+def rebalance(job_id=None) -> dict:
+    conn = get_db_connection()
+    try:
+        topology = parse_topology(conn.getCapabilities())
+        ncpus = max(c for cell in topology for c in cell['cpus']) + 1
+        plan = plan_rebalance(conn)
+        moves = [p for p in plan if p['changed']]
+        for i, p in enumerate(moves):
+            if job_id:
+                jobs.progress(job_id, 100 * i / len(moves), f"Re-pinning {p['name']}")
+            try:
+                repin(p['_dom'], p['to'], ncpus)
+                p['result'] = 'repinned'
+            except libvirt.libvirtError as e:
+                p['result'] = 'failed'
+                p['error'] = str(e)
+            inventory.refresh(p['_dom'])
+    finally:
+        conn.close()
+    for p in plan:
+        p.pop('_dom')
+        p.setdefault('result', 'unchanged')
+    return {'domains': plan,
+            'repinned': sum(p['result'] == 'repinned' for p in plan),
+            'failed': sum(p['result'] == 'failed' for p in plan)}
+
+
+# ── HTTP API ──────────────────────────────────────────────────────────────────
+
+def _auth():
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+@numa_bp.route('/api/host/numa', methods=['GET'])
+def host_numa():
+    err = _auth()
+    if err:
+        return err
+    conn = get_db_connection()
+    try:
+        topology = parse_topology(conn.getCapabilities())
+        load, domains = new_load(topology), []
+        for dom in conn.listAllDomains(libvirt.VIR_CONNECT_LIST_DOMAINS_ACTIVE):
+            res = domain_resources(ET.fromstring(dom.XMLDesc(0)))
+            charge(load, topology, res)
+            domains.append({'uuid': dom.UUIDString(), 'name': dom.name(), **res})
+    except (libvirt.libvirtError, ValueError) as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        conn.close()
+    return jsonify({'cells': [{**row, 'host_cpus': format_cpuset(cell['cpus'])}
+                              for row, cell in zip(cell_load(load, topology), topology)],
+                    'domains': domains})
+
+
+@numa_bp.route('/api/host/numa/rebalance', methods=['POST'])
+def host_numa_rebalance():
+    err = _auth()
+    if err:
+        return err
+    data = request.get_json(silent=True) or {}
+    if data.get('dry_run'):
+        conn = get_db_connection()
+        try:
+            plan = plan_rebalance(conn)
+        except (libvirt.libvirtError, ValueError) as e:
+            return jsonify({'error': str(e)}), 500
+        finally:
+            conn.close()
+        for p in plan:
+            p.pop('_dom')
+        return jsonify({'domains': plan, 'changes': sum(p['changed'] for p in plan)})
+
+    job_id = jobs.submit('host.numa_rebalance', rebalance, resource='host:numa',
+                         user=session.get('username'))
+    return jobs.accepted(job_id)
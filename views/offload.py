@@ -0,0 +1,173 @@
+"""
+Blocking-call offload — runs libvirt RPCs on a bounded native thread pool so
+they never block the gevent hub.
+
+libvirt-python calls are C calls that wait on libvirtd's reply while holding
+the OS thread.  On the hub thread that freezes every greenlet in the worker:
+one slow pool.refresh(0) or dom.destroy() stalls every console and terminal
+WebSocket.  install() wraps the public methods of the libvirt object classes
+(and libvirt.open*), so when a greenlet calls one it is handed to a gevent
+ThreadPool of OFFLOAD_THREADS threads and the greenlet waits cooperatively.
+Blueprints keep calling libvirt as before.
+
+Each call waits at most LIBVIRT_CALL_TIMEOUT seconds (SLOW_CALLS override
+per method; None = no limit), counting time queued for a free thread, and a
+timeout surfaces as a libvirtError like any other libvirt failure.  The C
+call cannot be cancelled: it keeps its pool thread until libvirtd answers.
+
+Calls made off the hub thread — native threads such as the inventory and
+sampler loops, or the pool threads themselves — run directly, and nothing
+is wrapped unless gevent has monkey-patched threading.
+
+subprocess is not routed here: gevent's patched subprocess already waits
+cooperatively.  run() offloads any other blocking callable.
+"""
+
+import functools
+import inspect
+import os
+import threading
+
+try:
+    import libvirt
+    _LIBVIRT = True
+except ImportError:
+    _LIBVIRT = False
+
+POOL_THREADS         = int(os.environ.get('OFFLOAD_THREADS', 16))
+LIBVIRT_CALL_TIMEOUT = float(os.environ.get('LIBVIRT_CALL_TIMEOUT', 120))
+
+# Long-running by nature: bounded only by libvirt itself
+SLOW_CALLS = {
+    'snapshotCreateXML': None, 'revertToSnapshot': None, 'save': None,
+    'saveFlags': None, 'managedSave': None, 'restore': None, 'restoreFlags': None,
+    'coreDump': None, 'coreDumpWithFormat': None, 'migrate': None, 'migrate2': None,
+    'migrate3': None, 'migrateToURI': None, 'migrateToURI2': None,
+    'migrateToURI3': None, 'blockCommit': None, 'blockPull': None, 'blockCopy': None,
+    'createXML': 600, 'create': 600, 'createWithFlags': 600, 'build': 600,
+}
+
+# Answered from client-side state: not worth a thread hop
+LOCAL_CALLS = {'name', 'UUID', 'UUIDString', 'ID', 'connect', 'c_pointer', 'isAlive'}
+
+_CLASSES = ('virConnect', 'virDomain', 'virDomainSnapshot', 'virNetwork',
+            'virStoragePool', 'virStorageVol', 'virNodeDevice', 'virInterface',
+            'virSecret', 'virNWFilter')
+_OPENERS = ('open', 'openAuth', 'openReadOnly')
+
+_lock  = threading.Lock()
+_state = {'hub': None, 'pool': None, 'installed': False}
+_stats = {'calls': 0, 'timeouts': 0, 'errors': 0, 'in_flight': 0, 'max_in_flight': 0}
+
+
+class OffloadTimeout(TimeoutError):
+    """A blocking call did not finish within its timeout."""
+
+
+def _get_ident():
+    try:
+        from gevent import monkey
+        return monkey.get_original('_thread', 'get_ident')()
+    except ImportError:
+        return threading.get_ident()
+
+
+def on_hub() -> bool:
+    """True when the caller is a greenlet on the gevent hub's thread."""
+    return _state['hub'] is not None and _get_ident() == _state['hub']
+
+
+def enable(threads: int = None):
+    """Offload calls made from this (the hub's) thread from now on."""
+    from gevent.threadpool import ThreadPool
+    _state['hub']  = _get_ident()
+    _state['pool'] = ThreadPool(threads or POOL_THREADS)
+
+
+def disable():
+    pool, _state['pool'] = _state['pool'], None
+    _state['hub'] = None
+    if pool is not None:
+        pool.kill()
+
+
+def run(fn, *args, timeout: float = LIBVIRT_CALL_TIMEOUT, **kwargs):
+    """Call fn(*args, **kwargs) on the thread pool and wait for it cooperatively.
+
+    Off the hub it is just a direct call.  Raises OffloadTimeout after
+    *timeout* seconds (None waits forever).
+    """
+    if not on_hub():
+        return fn(*args, **kwargs)
+    import gevent
+    with _lock:
+        _stats['calls'] += 1
+        _stats['in_flight'] += 1
+        _stats['max_in_flight'] = max(_stats['max_in_flight'], _stats['in_flight'])
+    expired = OffloadTimeout(f'{getattr(fn, "__qualname__", fn)} timed out after {timeout}s')
+    try:
+        with gevent.Timeout(timeout, expired):
+            return _state['pool'].spawn(fn, *args, **kwargs).get()
+    except OffloadTimeout:
+        with _lock:
+            _stats['timeouts'] += 1
+        raise
+    except Exception:
+        with _lock:
+            _stats['errors'] += 1
+        raise
+    finally:
+        with _lock:
+            _stats['in_flight'] -= 1
+
+
+def _offloaded(name, fn, timeout):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not on_hub():
+            return fn(*args, **kwargs)
+        try:
+            return run(fn, *args, timeout=timeout, **kwargs)
+        except OffloadTimeout as e:
+            if _LIBVIRT:
+                raise libvirt.libvirtError(f'libvirt {name}: {e}') from None
+            raise
+    wrapper._offloaded = True
+    return wrapper
+
+
+def install():
+    """Wrap libvirt blocking calls when running under gevent (idempotent).
+
+    Call from the hub thread before perf.init_app(), so request timings
+    include the time spent waiting on the pool.
+    """
+    if _state['installed'] or not _LIBVIRT:
+        return
+    try:
+        from gevent import monkey
+    except ImportError:
+        return
+    if not monkey.is_module_patched('threading'):
+        return
+    _state['installed'] = True
+    enable()
+    for cls_name in _CLASSES:
+        cls = getattr(libvirt, cls_name, None)
+        if not isinstance(cls, type):
+            continue
+        for attr, fn in list(vars(cls).items()):
+            if (attr.startswith('_') or attr in LOCAL_CALLS
+                    or not inspect.isfunction(fn) or getattr(fn, '_offloaded', False)):
+                continue
+            setattr(cls, attr, _offloaded(attr, fn, SLOW_CALLS.get(attr, LIBVIRT_CALL_TIMEOUT)))
+    for attr in _OPENERS:
+        fn = getattr(libvirt, attr, None)
+        if fn is not None and not getattr(fn, '_offloaded', False):
+            setattr(libvirt, attr, _offloaded(attr, fn, LIBVIRT_CALL_TIMEOUT))
+
+
+def offload_stats() -> dict:
+    with _lock:
+        return {'enabled': _state['pool'] is not None, 'threads': POOL_THREADS,
+                'default_timeout': LIBVIRT_CALL_TIMEOUT, **_stats}
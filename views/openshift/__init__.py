@@ -75,6 +75,7 @@ from .vm_ops import (
 
 # ── Deploy ────────────────────────────────────────────────────────────────────
 from .deploy import (
+    _cluster_demand,
     _parse_host_mac,
     _run_deploy,
     _resume_pending_jobs,
@@ -100,7 +101,7 @@ __all__ = [
     # vm ops
     '_make_mac', '_eject_cdroms', '_reboot_vms', '_insert_cdroms',
     # deploy
-    '_parse_host_mac', '_run_deploy',
+    '_cluster_demand', '_parse_host_mac', '_run_deploy',
     # monitoring
     '_collect_credentials', '_monitor_install_thread',
     # iso cache
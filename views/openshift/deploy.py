@@ -18,6 +18,8 @@ from .secrets import _store_job_secrets, _get_job_secrets, _delete_job_secrets
 from .iso_cache import _iso_fingerprint, _get_cached_iso, _store_iso_cache
 from .ai_client import _get_access_token, _ai
 from .vm_ops import _make_mac, _vm_xml, _build_nmstate_yaml, _eject_cdroms, _reboot_vms
+from .. import capacity
+from ..libvirt_pool import get_connection
 
 import requests as _req
 
@@ -45,6 +47,30 @@ def _parse_host_mac(host: dict, mac_to_vm: dict):
     return None
 
 
+# FEATURE: capacity-admission
+
+def _cluster_demand(cfg: dict) -> list:
+    """capacity.demand() for every VM a deployment of *cfg* creates."""
+    name     = cfg['cluster_name']
+    is_sno   = cfg.get('deployment_type', 'sno') == 'sno'
+    n_cp     = 1 if is_sno else int(cfg.get('control_plane_count', 3))
+    n_w      = 0 if is_sno else int(cfg.get('worker_count', 2))
+    disk_dir = Path(cfg.get('storage_path', '/var/lib/libvirt/images'))
+    extra    = [int(e.get('size_gb', 100)) for e in cfg.get('extra_disks', [])]
+    if is_sno:
+        names = [f'{name}-sno']
+    else:
+        names = [f'{name}-master-{i}' for i in range(n_cp)] + [f'{name}-worker-{i}' for i in range(n_w)]
+    vms = []
+    for i, vm in enumerate(names):
+        pre = 'w' if i >= n_cp else 'cp'
+        disks = [(disk_dir / f'{vm}.qcow2', int(cfg.get(f'{pre}_disk_gb', 100 if pre == 'w' else 120)))]
+        disks += [(disk_dir / f'{vm}-extra{e + 1}.qcow2', gb) for e, gb in enumerate(extra)]
+        vms.append(capacity.demand(vm, cfg.get(f'{pre}_vcpus', 4 if pre == 'w' else 8),
+                                   int(cfg.get(f'{pre}_ram_gb', 16 if pre == 'w' else 32)) * 1024, disks))
+    return vms
+
+
 # FEATURE: vm-provisioning
 
 def _run_deploy(job_id: str, cfg: dict):
@@ -288,7 +314,7 @@ def _run_deploy(job_id: str, cfg: dict):
         extra_disk_specs = cfg.get('extra_disks', [])   # list of {size_gb}
 
         try:
-            conn = libvirt.open('qemu:///system')
+            conn = get_connection()
         except Exception as e:
             fail(f'Cannot connect to libvirt: {e}')
             return
@@ -328,6 +354,15 @@ def _run_deploy(job_id: str, cfg: dict):
         if not goto_node_wait:
             phase('Creating KVM virtual machines', 35)
 
+            # The deploy route admitted these VMs, but a resumed, retried or
+            # reinstalled job is checked again here, before any disk is made
+            try:
+                capacity.admit(conn, _cluster_demand(cfg))
+            except (capacity.CapacityError, libvirt.libvirtError) as e:
+                conn.close()
+                fail(f'Not enough host capacity: {e}')
+                return
+
             def _make_disk(path: Path, size_gb: int) -> bool:
                 """Create a qcow2 at path, chmod it. Returns True on success."""
                 if path.exists():
@@ -479,7 +514,7 @@ def _run_deploy(job_id: str, cfg: dict):
                     missing = [n for n in vm_names if not any(n in rn for rn in registered_names)]
                     if missing:
                         try:
-                            lv = libvirt.open('qemu:///system')
+                            lv = get_connection()
                             for vm in missing:
                                 try:
                                     d = lv.lookupByName(vm)
@@ -900,6 +935,7 @@ def _run_deploy(job_id: str, cfg: dict):
 
     finally:
         _running_jobs.discard(job_id)
+        capacity.release([vm['name'] for vm in _cluster_demand(cfg)])
 
 
 # FEATURE: resume-pending-jobs
@@ -23,8 +23,10 @@ from .secrets import _store_job_secrets, _get_job_secrets, _delete_job_secrets
 from .iso_cache import _iso_cache, _iso_lock, _iso_fingerprint, _get_cached_iso, _store_iso_cache, _save_iso_cache
 from .ai_client import _get_access_token, _ai
 from .vm_ops import _eject_cdroms, _insert_cdroms, _reboot_vms
-from .deploy import _run_deploy, _parse_host_mac
+from .deploy import _run_deploy, _parse_host_mac, _cluster_demand
+from .. import capacity
 from .monitoring import _monitor_install_thread, _collect_credentials
+from ..libvirt_pool import get_connection
 
 if _LIBVIRT:
     import libvirt
@@ -153,7 +155,7 @@ def list_networks():
 
     if _LIBVIRT:
         try:
-            conn = libvirt.open('qemu:///system')
+            conn = get_connection()
             libvirt_bridges = set()
             for net in conn.listAllNetworks(0):
                 try:
@@ -222,7 +224,7 @@ def preflight():
 
     if _LIBVIRT:
         try:
-            conn = libvirt.open('qemu:///system')
+            conn = get_connection()
             checks['libvirt'] = conn is not None
             if conn:
                 conn.close()
@@ -266,6 +268,23 @@ def deploy():
     if missing:
         return jsonify({'error': f'Missing fields: {", ".join(missing)}'}), 400
 
+    # Fail fast: the cluster's VMs must fit before the ISO is built
+    if _LIBVIRT:
+        try:
+            vms = _cluster_demand(cfg)
+        except (TypeError, ValueError, AttributeError) as e:
+            return jsonify({'error': f'Invalid node sizing: {e}'}), 400
+        try:
+            conn = get_connection()
+            try:
+                capacity.admit(conn, vms)
+            finally:
+                conn.close()
+        except capacity.CapacityError as e:
+            return jsonify({'error': str(e), 'capacity': e.result}), 409
+        except libvirt.libvirtError as e:
+            return jsonify({'error': f'Capacity check failed: {e}'}), 500
+
     job_id = uuid.uuid4().hex[:8]
     # Omit secrets from the stored config summary shown in the UI
     safe_cfg = {k: v for k, v in cfg.items() if k not in ('pull_secret', 'offline_token')}
@@ -332,7 +351,7 @@ def delete_job(job_id):
 
     if vm_names:
         try:
-            conn = libvirt.open('qemu:///system')
+            conn = get_connection()
             for vm_name in vm_names:
                 try:
                     dom = conn.lookupByName(vm_name)
@@ -650,7 +669,7 @@ def reset_cluster(job_id):
 
         if vm_names:
             try:
-                conn = libvirt.open('qemu:///system')
+                conn = get_connection()
                 for vm_name in vm_names:
                     try:
                         dom = conn.lookupByName(vm_name)
@@ -7,6 +7,7 @@ import uuid
 import xml.etree.ElementTree as ET
 
 from .constants import _LIBVIRT
+from ..libvirt_pool import get_connection
 
 if _LIBVIRT:
     import libvirt
@@ -132,7 +133,7 @@ def _eject_cdroms(vm_names: list, log_fn):
     action: expected to boot from disk' error.
     """
     try:
-        conn = libvirt.open('qemu:///system')
+        conn = get_connection()
     except Exception as e:
         log_fn(f'  Cannot open libvirt for CDROM eject: {e}', 'warn')
         return
@@ -181,7 +182,7 @@ def _insert_cdroms(vm_names: list, iso_path: str, log_fn):
     Also sets the CDROM as boot-order-1 so the next reboot boots from ISO.
     """
     try:
-        conn = libvirt.open('qemu:///system')
+        conn = get_connection()
     except Exception as e:
         log_fn(f'  Cannot open libvirt for CDROM insert: {e}', 'warn')
         return
@@ -228,7 +229,7 @@ def _insert_cdroms(vm_names: list, iso_path: str, log_fn):
 def _reboot_vms(vm_names: list, log_fn):
     """Soft-reboot VMs (used to recover from pending-user-action)."""
     try:
-        conn = libvirt.open('qemu:///system')
+        conn = get_connection()
     except Exception:
         return
     for vm_name in vm_names:
@@ -30,6 +30,9 @@ import libvirt
 import requests
 from flask import Blueprint, jsonify, request, send_file
 
+from . import capacity
+from .libvirt_pool import get_connection
+
 # ── Blueprint ─────────────────────────────────────────────────────────────────
 agent_bp = Blueprint('openshift_agent', __name__)
 
@@ -114,7 +117,7 @@ def _get_libvirt_network_info(network_name: str) -> tuple:
         import socket
         import xml.etree.ElementTree as ET
 
-        conn = libvirt.open('qemu:///system')
+        conn = get_connection()
         net  = conn.networkLookupByName(network_name)
         xml  = net.XMLDesc()
         conn.close()
@@ -290,7 +293,7 @@ def _resolve_bridge(network: str) -> str:
     # Try to resolve as a libvirt network name
     try:
         import xml.etree.ElementTree as ET
-        conn = libvirt.open('qemu:///system')
+        conn = get_connection()
         try:
             net = conn.networkLookupByName(network)
             xml_str = net.XMLDesc()
@@ -345,7 +348,7 @@ def _create_vm(name: str, vcpus: int, ram_mb: int, disk_path: Path,
     <video><model type='vga' vram='16384' heads='1'/></video>
   </devices>
 </domain>"""
-    conn = libvirt.open('qemu:///system')
+    conn = get_connection()
     try:
         dom = conn.defineXML(xml)
         dom.create()
@@ -359,6 +362,39 @@ def _create_vm(name: str, vcpus: int, ram_mb: int, disk_path: Path,
 
 # ── Config YAML generators ────────────────────────────────────────────────────
 
+def _node_size(node: dict, cfg: dict) -> tuple:
+    """(vCPUs, RAM GB, disk GB) of one node: per-node values, else cluster-level config."""
+    is_cp = node.get('role', 'master') == 'master'
+    vcpus = int(node.get('vcpu') or node.get('vcpus') or
+                (cfg.get('cp_vcpus', 8) if is_cp else cfg.get('w_vcpus', 4)))
+    # ram_mb in node takes priority; else use ram_gb cluster config
+    if node.get('ram_mb'):
+        ram_gb = int(node['ram_mb']) // 1024
+    else:
+        ram_gb = int(cfg.get('cp_ram_gb', 16) if is_cp else cfg.get('w_ram_gb', 8))
+    disk_gb = int(node.get('disk_gb') or
+                  (cfg.get('cp_disk_gb', 120) if is_cp else cfg.get('w_disk_gb', 100)))
+    return vcpus, ram_gb, disk_gb
+
+
+def _cluster_demand(cfg: dict) -> list:
+    """capacity.demand() for every node VM of a deployment."""
+    nodes = cfg.get('nodes') or []
+    if not nodes:
+        is_sno = cfg.get('deployment_type', 'sno') == 'sno'
+        n_cp = 1 if is_sno else int(cfg.get('control_plane_count', 3))
+        n_w  = 0 if is_sno else int(cfg.get('worker_count', 2))
+        nodes = [{'hostname': f"{cfg['cluster_name']}-master-{i}", 'role': 'master'} for i in range(n_cp)]
+        nodes += [{'hostname': f"{cfg['cluster_name']}-worker-{i}", 'role': 'worker'} for i in range(n_w)]
+    storage_path = Path(cfg.get('storage_path', '/var/lib/libvirt/images'))
+    vms = []
+    for idx, node in enumerate(nodes):
+        name = node.get('hostname') or node.get('name') or f'node-{idx}'
+        vcpus, ram_gb, disk_gb = _node_size(node, cfg)
+        vms.append(capacity.demand(name, vcpus, ram_gb * 1024, [(storage_path / f'{name}.qcow2', disk_gb)]))
+    return vms
+
+
 def _install_config(cfg: dict) -> str:
     cluster_name = cfg['cluster_name']
     base_domain  = cfg['base_domain']
@@ -869,23 +905,18 @@ def _run_agent_deploy(job_id: str, cfg: dict):
             log(f'  Using bridge: {bridge} ✓')
 
             created_vms = []
-            conn = libvirt.open('qemu:///system')
+            conn = get_connection()
+            # The deploy route admitted these VMs; a resumed or reset job is checked again
+            try:
+                capacity.admit(conn, _cluster_demand(cfg))
+            except (capacity.CapacityError, libvirt.libvirtError) as e:
+                conn.close()
+                fail(f'Not enough host capacity: {e}')
+                return
             try:
                 for idx, node in enumerate(nodes_cfg):
                     nm      = node['hostname']
-                    role    = node.get('role', 'master')
-                    is_cp   = role == 'master'
-                    # Prefer per-node values, fall back to cluster-level config
-                    vcpus   = int(node.get('vcpu') or node.get('vcpus') or
-                                  (cfg.get('cp_vcpus', 8) if is_cp else cfg.get('w_vcpus', 4)))
-                    # ram_mb in node takes priority; else use ram_gb cluster config
-                    ram_mb_node = node.get('ram_mb')
-                    if ram_mb_node:
-                        ram_gb = int(ram_mb_node) // 1024
-                    else:
-                        ram_gb = int(cfg.get('cp_ram_gb', 16) if is_cp else cfg.get('w_ram_gb', 8))
-                    disk_gb = int(node.get('disk_gb') or
-                                  (cfg.get('cp_disk_gb', 120) if is_cp else cfg.get('w_disk_gb', 100)))
+                    vcpus, ram_gb, disk_gb = _node_size(node, cfg)
                     mac     = node['mac']
 
                     # Check if already defined
@@ -908,7 +939,7 @@ def _run_agent_deploy(job_id: str, cfg: dict):
                     except Exception:
                         pass
                     _create_vm(nm, vcpus, ram_gb * 1024, disk_path, iso_path, bridge, mac)
-                    conn = libvirt.open('qemu:///system')
+                    conn = get_connection()
                     log(f'  VM {nm} started ✓')
                     created_vms.append(nm)
 
@@ -1053,6 +1084,7 @@ def _run_agent_deploy(job_id: str, cfg: dict):
         _job_log(job_id, traceback.format_exc(), 'error')
     finally:
         _running_jobs.discard(job_id)
+        capacity.release([vm['name'] for vm in _cluster_demand(cfg)])
 
 
 def _resume_pending_jobs():
@@ -1189,7 +1221,7 @@ def preflight():
 
     # libvirt
     try:
-        conn = libvirt.open('qemu:///system')
+        conn = get_connection()
         conn.close()
         checks.append({'name': 'libvirt', 'ok': True, 'detail': 'Connected'})
     except Exception as e:
@@ -1298,7 +1330,7 @@ def list_networks():
         return err
     try:
         import xml.etree.ElementTree as ET
-        conn    = libvirt.open('qemu:///system')
+        conn    = get_connection()
         bridges = []
         for net in conn.listAllNetworks():
             xml  = ET.fromstring(net.XMLDesc())
@@ -1335,6 +1367,22 @@ def deploy():
     if missing:
         return jsonify({'error': f'Missing required fields: {", ".join(missing)}'}), 400
 
+    # Fail fast: every node must fit before openshift-install builds the ISO
+    try:
+        vms = _cluster_demand(data)
+    except (TypeError, ValueError, AttributeError) as e:
+        return jsonify({'error': f'Invalid node sizing: {e}'}), 400
+    try:
+        conn = get_connection()
+        try:
+            capacity.admit(conn, vms)
+        finally:
+            conn.close()
+    except capacity.CapacityError as e:
+        return jsonify({'error': str(e), 'capacity': e.result}), 409
+    except libvirt.libvirtError as e:
+        return jsonify({'error': f'Capacity check failed: {e}'}), 500
+
     job_id  = uuid.uuid4().hex[:8]
     created = time.time()
 
@@ -1424,7 +1472,7 @@ def delete_job(job_id):
 
     if vm_names:
         try:
-            conn = libvirt.open('qemu:///system')
+            conn = get_connection()
             for nm in vm_names:
                 try:
                     dom = conn.lookupByName(nm)
@@ -1613,7 +1661,7 @@ def reset_job(job_id):
     # Destroy VMs
     if vm_names:
         try:
-            conn = libvirt.open('qemu:///system')
+            conn = get_connection()
             for nm in vm_names:
                 try:
                     dom = conn.lookupByName(nm)
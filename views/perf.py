@@ -0,0 +1,510 @@
+"""
+Request-latency instrumentation — per-endpoint histograms and a per-request
+breakdown of time spent in libvirt, subprocess and HTTP calls.
+
+init_app() hooks before/after_request on the Flask app.  Every request is
+recorded under (method, blueprint, URL rule) into a fixed log-scale
+histogram, so memory stays bounded and p50/p95/p99 are read straight off
+the bucket counts.  Response sizes and 4xx/5xx counts are kept alongside.
+
+install_call_hooks() wraps the public methods of the libvirt object classes
+(virConnect, virDomain, …), subprocess.run and requests.Session.request.
+Inside a request each call adds to that request's breakdown, sent back as a
+Server-Timing header (e.g. `libvirt.XMLDesc;desc="x300";dur=1200.0`) and
+summed per endpoint; outside a request (collector threads) the wrappers
+only cost a context check.
+
+Stats are per worker process.
+
+/api/_perf/profile runs a wall-clock sampling profiler inside the worker
+that serves it: a native OS thread (so it keeps sampling while the gevent
+hub is blocked) snapshots sys._current_frames() — and, if asked, every
+suspended greenlet's stack — HZ times a second, and the result comes back
+as collapsed stacks ready for flamegraph.pl / speedscope.  Only users named
+in ADMIN_USERS may profile; with none configured the endpoint is refused.
+
+Under gevent, init_app() also starts a hub-blocking detector: a heartbeat
+greenlet stamps the time every HUB_BEAT seconds, and a native watchdog
+thread notices when the stamp goes stale for more than HUB_BLOCK_MS — some
+greenlet is running a blocking call and every other request, console and
+terminal in the worker is frozen.  The watchdog grabs the hub thread's stack
+at that moment, logs it with the endpoint being served, and counts stalls
+per call site (the innermost frame in this app's code).
+
+Routes
+------
+GET    /api/_perf           — endpoint latency percentiles and top call sites
+DELETE /api/_perf           — reset the counters (and the stall table)
+GET    /api/_perf/profile   — ?seconds=10&hz=100&greenlets=0&format=collapsed|json
+GET    /api/_perf/blocking  — hub stalls per call site, with the last stack
+"""
+
+import bisect
+import collections
+import functools
+import gc
+import inspect
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from flask import Blueprint, Response, g, has_request_context, jsonify, request, session
+
+from .libvirt_pool import native_sleep, start_native_thread
+
+try:
+    import libvirt
+    _LIBVIRT = True
+except ImportError:
+    _LIBVIRT = False
+
+try:
+    import requests
+    _REQUESTS = True
+except ImportError:
+    _REQUESTS = False
+
+try:
+    import greenlet
+    _GREENLET = True
+except ImportError:
+    _GREENLET = False
+
+perf_bp = Blueprint('perf', __name__)
+log = logging.getLogger(__name__)
+
+# Upper bounds in ms: 0.5 ms … ~2 min, ×1.25 per bucket (last bucket = overflow)
+BUCKETS_MS = [0.5 * 1.25 ** i for i in range(56)]
+SERVER_TIMING_TOP = 8      # call names reported per response
+
+_LIBVIRT_CLASSES = ('virConnect', 'virDomain', 'virDomainSnapshot', 'virNetwork',
+                    'virStoragePool', 'virStorageVol', 'virNodeDevice',
+                    'virInterface', 'virSecret', 'virNWFilter')
+
+PROFILE_MAX_SECONDS = 120
+PROFILE_MAX_HZ      = 1000
+# Comma-separated usernames allowed to profile; empty = nobody
+ADMIN_USERS = {u for u in os.environ.get('ADMIN_USERS', '').split(',') if u}
+
+HUB_BLOCK_MS = float(os.environ.get('HUB_BLOCK_MS', 100))   # 0 disables the detector
+HUB_BEAT     = 0.02        # heartbeat period, seconds
+HUB_STACK_DEPTH = 40       # frames kept per logged stall
+
+_lock      = threading.Lock()
+_endpoints = {}            # (method, blueprint, rule) → _EndpointStats
+_hooked    = False
+_profiling = False         # one profile per worker at a time
+_stalls    = {}            # call site → stall stats
+_hub       = {'on': False, 'beat': 0.0, 'ident': None, 'running': None}
+_serving   = {}            # request greenlet → 'METHOD rule'
+
+
+class _EndpointStats:
+    __slots__ = ('counts', 'n', 'total_ms', 'max_ms', 'bytes', 'errors_4xx',
+                 'errors_5xx', 'call_ms', 'call_n')
+
+    def __init__(self):
+        self.counts     = [0] * (len(BUCKETS_MS) + 1)
+        self.n          = 0
+        self.total_ms   = 0.0
+        self.max_ms     = 0.0
+        self.bytes      = 0
+        self.errors_4xx = 0
+        self.errors_5xx = 0
+        self.call_ms    = collections.Counter()   # call name → total ms
+        self.call_n     = collections.Counter()   # call name → calls
+
+    def add(self, ms, size, status, calls):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.n        += 1
+        self.total_ms += ms
+        self.max_ms    = max(self.max_ms, ms)
+        self.bytes    += size or 0
+        if status >= 500:
+            self.errors_5xx += 1
+        elif status >= 400:
+            self.errors_4xx += 1
+        for name, (count, call_ms) in calls.items():
+            self.call_ms[name] += call_ms
+            self.call_n[name]  += count
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-quantile request."""
+        rank = q * self.n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return round(BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms, 2)
+        return 0.0
+
+    def summary(self):
+        top = self.call_ms.most_common(10)
+        return {
+            'count':      self.n,
+            'p50_ms':     self.percentile(0.50),
+            'p95_ms':     self.percentile(0.95),
+            'p99_ms':     self.percentile(0.99),
+            'max_ms':     round(self.max_ms, 2),
+            'avg_ms':     round(self.total_ms / self.n, 2) if self.n else 0.0,
+            'avg_bytes':  round(self.bytes / self.n) if self.n else 0,
+            'errors_4xx': self.errors_4xx,
+            'errors_5xx': self.errors_5xx,
+            'calls':      [{'name': k, 'count': self.call_n[k], 'total_ms': round(v, 1)}
+                           for k, v in top],
+        }
+
+
+# ── call hooks ────────────────────────────────────────────────────────────────
+
+def _record_call(name, ms):
+    calls = g.get('_perf_calls')
+    if calls is None:
+        return
+    count, total = calls.get(name, (0, 0.0))
+    calls[name] = (count + 1, total + ms)
+
+
+def _timed(name, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not has_request_context():
+            return fn(*args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _record_call(name, (time.perf_counter() - t0) * 1e3)
+    wrapper._perf_wrapped = True
+    return wrapper
+
+
+def install_call_hooks():
+    """Wrap libvirt object methods, subprocess.run and requests (idempotent)."""
+    global _hooked
+    if _hooked:
+        return
+    _hooked = True
+    if _LIBVIRT:
+        for cls_name in _LIBVIRT_CLASSES:
+            cls = getattr(libvirt, cls_name, None)
+            if not isinstance(cls, type):
+                continue
+            for attr, fn in list(vars(cls).items()):
+                if (attr.startswith('_') or not inspect.isfunction(fn)
+                        or getattr(fn, '_perf_wrapped', False)):
+                    continue
+                setattr(cls, attr, _timed(f'libvirt.{attr}', fn))
+    if not getattr(subprocess.run, '_perf_wrapped', False):
+        subprocess.run = _timed('subprocess.run', subprocess.run)
+    if _REQUESTS and not getattr(requests.Session.request, '_perf_wrapped', False):
+        requests.Session.request = _timed('requests', requests.Session.request)
+
+
+# ── request hooks ─────────────────────────────────────────────────────────────
+
+def _before():
+    g._perf_start = time.perf_counter()
+    g._perf_calls = {}
+    if _hub['on']:
+        rule = request.url_rule.rule if request.url_rule else request.path
+        _serving[greenlet.getcurrent()] = f'{request.method} {rule}'
+
+
+def _after(response):
+    start = g.get('_perf_start')
+    if start is None:
+        return response
+    ms    = (time.perf_counter() - start) * 1e3
+    calls = g.get('_perf_calls') or {}
+    rule  = request.url_rule.rule if request.url_rule else '<unmatched>'
+    key   = (request.method, request.blueprint or '', rule)
+    size  = response.content_length if not response.is_streamed else None
+    with _lock:
+        stats = _endpoints.get(key)
+        if stats is None:
+            stats = _endpoints[key] = _EndpointStats()
+        stats.add(ms, size, response.status_code, calls)
+
+    top = sorted(calls.items(), key=lambda kv: kv[1][1], reverse=True)[:SERVER_TIMING_TOP]
+    timing = [f'total;dur={ms:.1f}'] + [
+        f'{name};desc="x{count}";dur={call_ms:.1f}' for name, (count, call_ms) in top
+    ]
+    response.headers['Server-Timing'] = ', '.join(timing)
+    return response
+
+
+def _teardown(_exc):
+    if _hub['on']:
+        _serving.pop(greenlet.getcurrent(), None)
+
+
+def init_app(app):
+    install_call_hooks()
+    app.before_request(_before)
+    app.after_request(_after)
+    app.teardown_request(_teardown)
+    if _gevent_patched():
+        start_hub_monitor()
+
+
+# ── /api/_perf ────────────────────────────────────────────────────────────────
+
+def _auth():
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+@perf_bp.route('/api/_perf', methods=['GET'])
+def perf_report():
+    err = _auth()
+    if err:
+        return err
+    with _lock:
+        rows = [{'method': m, 'blueprint': bp, 'rule': rule, **stats.summary()}
+                for (m, bp, rule), stats in _endpoints.items()]
+    rows.sort(key=lambda r: r['p95_ms'], reverse=True)
+    return jsonify({'pid': os.getpid(), 'endpoints': rows})
+
+
+@perf_bp.route('/api/_perf', methods=['DELETE'])
+def perf_reset():
+    err = _auth()
+    if err:
+        return err
+    with _lock:
+        _endpoints.clear()
+        _stalls.clear()
+    return jsonify({'ok': True})
+
+
+# ── sampling profiler ─────────────────────────────────────────────────────────
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    if path.startswith(_APP_DIR):
+        path = os.path.relpath(path, _APP_DIR)
+    else:
+        path = os.path.basename(path)
+    return f'{code.co_name} ({path}:{frame.f_lineno})'
+
+
+def _collapse(root: str, frame):
+    """'root;outer;…;inner' for one stack, or None for the profiler itself."""
+    labels = []
+    while frame is not None:
+        if frame.f_code is _sample_loop.__code__:
+            return None
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(root)
+    return ';'.join(reversed(labels))
+
+
+def _sample_once(counts, with_greenlets):
+    names = {t.ident: t.name for t in threading.enumerate()}
+    for ident, frame in sys._current_frames().items():
+        stack = _collapse(f'thread:{names.get(ident, ident)}', frame)
+        if stack:
+            counts[stack] += 1
+    if with_greenlets and _GREENLET:
+        for obj in gc.get_objects():
+            if isinstance(obj, greenlet.greenlet) and obj.gr_frame is not None:
+                stack = _collapse(f'greenlet:{type(obj).__name__}', obj.gr_frame)
+                if stack:
+                    counts[stack] += 1
+
+
+def _sample_loop(seconds, hz, with_greenlets, result):
+    counts   = collections.Counter()
+    interval = 1.0 / hz
+    deadline = time.monotonic() + seconds
+    samples  = 0
+    try:
+        while time.monotonic() < deadline:
+            _sample_once(counts, with_greenlets)
+            samples += 1
+            native_sleep(interval)
+    finally:
+        result.update(counts=counts, samples=samples, done=True)
+
+
+def profile(seconds: float, hz: int, with_greenlets: bool = False) -> dict:
+    """Sample this worker for *seconds*; {'counts': Counter, 'samples': n}.
+
+    The sampler runs on a native thread; the caller waits with time.sleep,
+    which yields to the hub when gevent has patched it.
+    """
+    result = {'done': False}
+    start_native_thread(lambda: _sample_loop(seconds, hz, with_greenlets, result),
+                        'perf-profiler')
+    while not result['done']:
+        time.sleep(0.1)
+    return result
+
+
+@perf_bp.route('/api/_perf/profile', methods=['GET'])
+def perf_profile():
+    global _profiling
+    err = _auth()
+    if err:
+        return err
+    if session['username'] not in ADMIN_USERS:
+        return jsonify({'error': 'Forbidden: profiling is limited to ADMIN_USERS'}), 403
+
+    try:
+        seconds = min(float(request.args.get('seconds', 10)), PROFILE_MAX_SECONDS)
+        hz      = min(int(request.args.get('hz', 100)), PROFILE_MAX_HZ)
+    except ValueError:
+        return jsonify({'error': 'seconds and hz must be numbers'}), 400
+    if seconds <= 0 or hz <= 0:
+        return jsonify({'error': 'seconds and hz must be positive'}), 400
+    with_greenlets = request.args.get('greenlets', '0').lower() in ('1', 'true', 'yes')
+    fmt = request.args.get('format', 'collapsed')
+
+    with _lock:
+        if _profiling:
+            return jsonify({'error': 'A profile is already running in this worker'}), 409
+        _profiling = True
+    try:
+        result = profile(seconds, hz, with_greenlets)
+    finally:
+        _profiling = False
+
+    counts = result['counts']
+    if fmt == 'json':
+        return jsonify({
+            'pid':     os.getpid(),
+            'samples': result['samples'],
+            'stacks':  [{'stack': k, 'count': v} for k, v in counts.most_common()],
+        })
+    body = ''.join(f'{stack} {n}\n' for stack, n in counts.most_common())
+    return Response(body, content_type='text/plain; charset=utf-8', headers={
+        'Content-Disposition': f'attachment; filename="profile-{os.getpid()}.folded"',
+    })
+
+
+# ── hub-blocking detector ─────────────────────────────────────────────────────
+
+def _gevent_patched() -> bool:
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+
+def _call_site(frame) -> str:
+    """Innermost frame in this app's code (outside this module), else the innermost."""
+    f = frame
+    while f is not None:
+        path = f.f_code.co_filename
+        if path.startswith(_APP_DIR) and path != __file__ and 'packages/' not in path:
+            return _frame_label(f)
+        f = f.f_back
+    return _frame_label(frame)
+
+
+def _stack_lines(frame) -> list:
+    lines = []
+    while frame is not None and len(lines) < HUB_STACK_DEPTH:
+        lines.append(_frame_label(frame))
+        frame = frame.f_back
+    return lines
+
+
+def _who(glet) -> str:
+    if glet is None:
+        return 'unknown'
+    return _serving.get(glet) or getattr(glet, 'name', None) or type(glet).__name__
+
+
+def _record_stall(stall, ms):
+    with _lock:
+        st = _stalls.get(stall['site'])
+        if st is None:
+            st = _stalls[stall['site']] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                           'endpoints': collections.Counter()}
+        st['count']    += 1
+        st['total_ms'] += ms
+        st['max_ms']    = max(st['max_ms'], ms)
+        st['endpoints'][stall['who']] += 1
+        st['last_stack'] = stall['stack']
+        st['last_at']    = stall['at']
+    log.warning('gevent hub blocked %.0f ms in %s at %s\n  %s', ms, stall['who'],
+                stall['site'], '\n  '.join(stall['stack']))
+
+
+def _switch_trace(event, args):
+    if event in ('switch', 'throw'):
+        _hub['running'] = args[1]
+
+
+def _heartbeat():
+    import gevent
+    while _hub['on']:
+        _hub['beat'] = time.monotonic()
+        gevent.sleep(HUB_BEAT)
+
+
+def _watchdog(threshold):
+    """Native thread: flag a stale heartbeat, then time the stall when it ends."""
+    pending = None
+    while _hub['on']:
+        native_sleep(HUB_BEAT)
+        beat = _hub['beat']
+        if pending is not None and beat != pending['beat']:
+            _record_stall(pending, max(beat - pending['beat'] - HUB_BEAT, 0.0) * 1e3)
+            pending = None
+        if pending is None and time.monotonic() - beat > threshold:
+            frame = sys._current_frames().get(_hub['ident'])
+            if frame is None:
+                continue
+            pending = {'beat': beat, 'at': time.time(), 'site': _call_site(frame),
+                       'stack': _stack_lines(frame), 'who': _who(_hub['running'])}
+
+
+def start_hub_monitor(block_ms: float = None):
+    """Start the heartbeat greenlet and watchdog thread (call from the hub thread)."""
+    import gevent
+    from gevent import monkey
+    threshold = (HUB_BLOCK_MS if block_ms is None else block_ms) / 1e3
+    if _hub['on'] or threshold <= 0 or not _GREENLET:
+        return
+    _hub.update(on=True, beat=time.monotonic(),
+                ident=monkey.get_original('_thread', 'get_ident')(),
+                running=greenlet.getcurrent())
+    greenlet.settrace(_switch_trace)
+    gevent.spawn(_heartbeat)
+    start_native_thread(lambda: _watchdog(threshold), 'perf-hub-watchdog')
+
+
+def stop_hub_monitor():
+    if _hub['on']:
+        _hub['on'] = False
+        greenlet.settrace(None)
+        _serving.clear()
+
+
+@perf_bp.route('/api/_perf/blocking', methods=['GET'])
+def perf_blocking():
+    err = _auth()
+    if err:
+        return err
+    with _lock:
+        rows = [{'site': site, 'count': st['count'], 'total_ms': round(st['total_ms'], 1),
+                 'max_ms': round(st['max_ms'], 1), 'endpoints': dict(st['endpoints']),
+                 'last_at': st['last_at'], 'last_stack': st['last_stack']}
+                for site, st in _stalls.items()]
+    rows.sort(key=lambda r: r['total_ms'], reverse=True)
+    return jsonify({'pid': os.getpid(), 'enabled': _hub['on'],
+                    'threshold_ms': HUB_BLOCK_MS, 'sites': rows})
+
@@ -0,0 +1,169 @@
+"""
+Prometheus / OpenMetrics exposition at /metrics.
+
+Everything is rendered from state the collectors already hold — the newest
+host sample in the shared metrics ring, the per-VM counters from the last
+getAllDomainStats() tick and the in-memory OpenShift / Kubernetes job
+tables — and the rendered text is cached for one collection interval, so
+any number of scrapers never cause a libvirt or psutil call.
+
+Scrapers authenticate with `Authorization: Bearer $METRICS_TOKEN` when that
+variable is set; otherwise a logged-in session is required like every other
+endpoint.
+"""
+
+import hmac
+import os
+import sys
+import threading
+import time
+
+from flask import Blueprint, Response, jsonify, request, session
+
+from . import metrics, metrics_store
+
+prometheus_bp = Blueprint('prometheus', __name__)
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# host series → (metric name, help)
+_HOST_METRICS = {
+    'cpu':        ('hypercloud_host_cpu_usage_percent',       'Host CPU usage'),
+    'memory':     ('hypercloud_host_memory_usage_percent',    'Host memory usage'),
+    'load':       ('hypercloud_host_load1',                   'Host 1-minute load average'),
+    'net_rx':     ('hypercloud_host_network_receive_bytes_per_second',  'Host network receive rate'),
+    'net_tx':     ('hypercloud_host_network_transmit_bytes_per_second', 'Host network transmit rate'),
+    'disk_read':  ('hypercloud_host_disk_read_bytes_per_second',  'Host disk read rate'),
+    'disk_write': ('hypercloud_host_disk_write_bytes_per_second', 'Host disk write rate'),
+}
+
+# per-device VM counters: (metric, help, stats prefix, field)
+_VM_DEVICE_COUNTERS = (
+    ('hypercloud_vm_block_read_bytes',       'Bytes read by the VM disk',      'block', 'rd.bytes'),
+    ('hypercloud_vm_block_write_bytes',      'Bytes written by the VM disk',   'block', 'wr.bytes'),
+    ('hypercloud_vm_block_read_ops',         'Read requests by the VM disk',   'block', 'rd.reqs'),
+    ('hypercloud_vm_block_write_ops',        'Write requests by the VM disk',  'block', 'wr.reqs'),
+    ('hypercloud_vm_network_receive_bytes',  'Bytes received by the VM NIC',   'net',   'rx.bytes'),
+    ('hypercloud_vm_network_transmit_bytes', 'Bytes sent by the VM NIC',       'net',   'tx.bytes'),
+)
+
+_cache      = {'at': 0.0, 'body': ''}
+_cache_lock = threading.Lock()
+
+
+def _auth():
+    if TOKEN:
+        given = request.headers.get('Authorization', '')
+        if hmac.compare_digest(given, f'Bearer {TOKEN}'):
+            return None
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+# ── rendering ─────────────────────────────────────────────────────────────────
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def _family(out: list, name: str, kind: str, help_: str, samples):
+    """Append one metric family; *samples* yields (labels dict, value)."""
+    rows = [(labels, value) for labels, value in samples if value is not None]
+    if not rows:
+        return
+    suffix = '_total' if kind == 'counter' else ''
+    out.append(f'# TYPE {name} {kind}')
+    out.append(f'# HELP {name} {help_}')
+    for labels, value in rows:
+        out.append(f'{name}{suffix}{_labels(**labels)} {value}')
+
+
+def _host(out: list):
+    store = metrics_store.open_store(len(metrics.HOST_SERIES), metrics.INTERVAL)
+    newest = store.latest()
+    if newest is None:
+        return
+    latest = dict(zip(metrics.HOST_SERIES, newest[1].tolist()))
+    for key, (name, help_) in _HOST_METRICS.items():
+        _family(out, name, 'gauge', help_, [({}, latest[key])])
+
+
+def _vms(out: list):
+    counters = metrics.vm_counters()
+    vm_labels = {uuid: {'uuid': uuid, 'name': name} for uuid, (name, _) in counters.items()}
+    _family(out, 'hypercloud_vm_cpu_seconds', 'counter', 'CPU time consumed by the VM', (
+        (vm_labels[uuid], stats['cpu.time'] / 1e9)
+        for uuid, (_, stats) in counters.items() if 'cpu.time' in stats
+    ))
+    for name, help_, prefix, field in _VM_DEVICE_COUNTERS:
+        _family(out, name, 'counter', help_, (
+            ({**vm_labels[uuid], 'device': stats.get(f'{prefix}.{i}.name', str(i))},
+             stats.get(f'{prefix}.{i}.{field}'))
+            for uuid, (_, stats) in counters.items()
+            for i in range(stats.get(f'{prefix}.count', 0))
+        ))
+
+
+def _job_tables():
+    """(kind, {job_id: job}) for every job table that is loaded."""
+    tables = []
+    store = sys.modules.get('views.openshift.job_store')
+    if store is not None:
+        tables.append(('openshift', store._jobs))
+    agent = sys.modules.get('views.openshift_agent')
+    if agent is not None:
+        tables.append(('openshift_agent', agent._jobs))
+    k8s = sys.modules.get('views.kubernetes')
+    if k8s is not None:
+        tables.append(('kubernetes', k8s._JOBS))
+    return tables
+
+
+def _jobs(out: list):
+    status, progress = [], []
+    for kind, table in _job_tables():
+        for job_id, job in list(table.items()):
+            status.append(({'kind': kind, 'job_id': job_id,
+                            'status': job.get('status', ''), 'phase': job.get('phase', '')}, 1))
+            if job.get('progress') is not None:
+                progress.append(({'kind': kind, 'job_id': job_id}, job['progress']))
+    _family(out, 'hypercloud_job_status', 'gauge', 'Deployment job status and phase (always 1)', status)
+    _family(out, 'hypercloud_job_progress_percent', 'gauge', 'Deployment job progress', progress)
+
+
+def render() -> str:
+    out = []
+    for part in (_host, _vms, _jobs):
+        try:
+            part(out)
+        except Exception:
+            pass   # one broken source must not take down the whole scrape
+    out.append('# EOF')
+    return '\n'.join(out) + '\n'
+
+
+def _cached_render() -> str:
+    with _cache_lock:
+        now = time.time()
+        if now - _cache['at'] >= metrics.INTERVAL:
+            _cache['body'] = render()
+            _cache['at']   = now
+        return _cache['body']
+
+
+# ── /metrics ──────────────────────────────────────────────────────────────────
+
+@prometheus_bp.route('/metrics')
+def exposition():
+    err = _auth()
+    if err:
+        return err
+    return Response(_cached_render(), content_type=CONTENT_TYPE)
@@ -13,6 +13,9 @@ import json
 import gevent
 from flask import Blueprint, render_template, request, session, current_app
 
+from .libvirt_pool import get_connection
+from . import inventory
+
 try:
     from geventwebsocket.exceptions import WebSocketError
 except ImportError:
@@ -30,7 +33,10 @@ def _set_pty_size(fd, cols, rows):
 
 
 def get_vnc_port(vm_name):
-    conn = libvirt.open('qemu:///system')
+    rec = inventory.find_by_name(vm_name)
+    if rec is not None:
+        return rec['vnc_port']
+    conn = get_connection()
     if conn is None:
         return None
     try:
@@ -75,7 +81,7 @@ def vm_console_ws():
 
     # Check if VM has a serial/console device; add one if missing
     try:
-        conn = libvirt.open('qemu:///system')
+        conn = get_connection()
         dom = conn.lookupByName(vm_name)
         tree = ET.fromstring(dom.XMLDesc(libvirt.VIR_DOMAIN_XML_INACTIVE))
         has_console = (tree.find('devices/console') is not None or
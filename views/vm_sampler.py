@@ -0,0 +1,234 @@
+"""
+Per-VM live sampler behind /api/vms/<uuid>/stats.
+
+The endpoint used to sleep for a second between two dom.info() reads to
+work out CPU usage, blocking a gevent worker per viewer per poll.  Instead a
+native thread keeps the last HISTORY_LEN samples (CPU time, balloon memory,
+first-disk and first-NIC counters) per domain and the endpoint answers
+immediately from them.
+
+Sampling rate follows interest: every read() renews a short subscription
+lease, subscribed domains are sampled every FAST_INTERVAL seconds with one
+domainListGetStats() call, and everything else that is running gets a single
+getAllDomainStats() sweep every BACKGROUND_INTERVAL seconds.
+"""
+
+import collections
+import time
+import xml.etree.ElementTree as ET
+
+try:
+    import libvirt
+    _LIBVIRT = True
+except ImportError:
+    _LIBVIRT = False
+
+from .libvirt_pool import get_connection, native_sleep, start_native_thread
+from .metrics import _bulk_stat_groups
+from . import inventory
+
+FAST_INTERVAL       = 1     # seconds between samples of subscribed domains
+BACKGROUND_INTERVAL = 60    # seconds between sweeps of all running domains
+SUBSCRIPTION_TTL    = 10    # a read() keeps a domain on the fast path this long
+STALE_AFTER         = 3     # read() samples inline if the newest sample is older
+HISTORY_LEN         = 300   # samples kept per domain (5 min at FAST_INTERVAL)
+
+_Sample = collections.namedtuple(
+    '_Sample', 'ts state cpu_ns vcpus mem_kib disk_r disk_w net_rx net_tx')
+
+_rings: dict = {}          # uuid → deque[_Sample]
+_leases: dict = {}         # uuid → lease expiry timestamp
+_disk_targets: dict = {}   # uuid → target dev of the first device='disk'
+_started = False
+_stats = {'fast_samples': 0, 'background_sweeps': 0, 'inline_samples': 0}
+
+
+# ── sampling ──────────────────────────────────────────────────────────────────
+
+def _first_disk_target(uuid, dom):
+    """Target of the first real disk (not cdrom), as the old endpoint used."""
+    if uuid in _disk_targets:
+        return _disk_targets[uuid]
+    target = None
+    rec = inventory.get_domain(uuid)
+    if rec is not None:
+        target = next((d['target'] for d in rec['disks'] if d['device'] == 'disk'), None)
+    else:
+        try:
+            tree = ET.fromstring(dom.XMLDesc(0))
+            for disk in tree.findall('devices/disk'):
+                if disk.get('device') == 'disk' and disk.find('target') is not None:
+                    target = disk.find('target').get('dev')
+                    break
+        except (libvirt.libvirtError, ET.ParseError):
+            pass
+    _disk_targets[uuid] = target
+    return target
+
+
+def _record(uuid, dom, stats, now):
+    disk_r = disk_w = 0
+    target = _first_disk_target(uuid, dom)
+    names = [stats.get(f'block.{i}.name') for i in range(stats.get('block.count', 0))]
+    if target and target not in names:
+        _disk_targets.pop(uuid, None)   # disks changed since we looked
+        target = _first_disk_target(uuid, dom)
+    if target in names:
+        i = names.index(target)
+        disk_r = stats.get(f'block.{i}.rd.bytes', 0)
+        disk_w = stats.get(f'block.{i}.wr.bytes', 0)
+
+    ring = _rings.get(uuid)
+    if ring is None:
+        ring = _rings[uuid] = collections.deque(maxlen=HISTORY_LEN)
+    ring.append(_Sample(
+        ts=now,
+        state=stats.get('state.state'),
+        cpu_ns=stats.get('cpu.time', 0),
+        vcpus=stats.get('vcpu.current', 1),
+        mem_kib=stats.get('balloon.current', 0),
+        disk_r=disk_r,
+        disk_w=disk_w,
+        net_rx=stats.get('net.0.rx.bytes', 0) if stats.get('net.count') else 0,
+        net_tx=stats.get('net.0.tx.bytes', 0) if stats.get('net.count') else 0,
+    ))
+
+
+def _sample_domains(conn, doms):
+    now = time.time()
+    for dom, stats in conn.domainListGetStats(doms, _bulk_stat_groups()):
+        _record(dom.UUIDString(), dom, stats, now)
+
+
+def _sweep_running(conn):
+    now = time.time()
+    seen = set()
+    for dom, stats in conn.getAllDomainStats(
+            _bulk_stat_groups(), libvirt.VIR_CONNECT_GET_ALL_DOMAINS_STATS_RUNNING):
+        uuid = dom.UUIDString()
+        seen.add(uuid)
+        _record(uuid, dom, stats, now)
+    # Domains that stopped keep their ring until their lease lapses
+    for uuid in list(_rings):
+        if uuid not in seen and _leases.get(uuid, 0) < now:
+            _rings.pop(uuid, None)
+            _disk_targets.pop(uuid, None)
+
+
+def _run():
+    conn = None
+    doms = {}              # uuid → virDomain bound to *conn*
+    last_sweep = 0.0
+    while True:
+        try:
+            if conn is None:
+                conn = get_connection()
+                doms = {}
+            now = time.time()
+            for uuid, expiry in list(_leases.items()):
+                if expiry < now:
+                    _leases.pop(uuid, None)
+                    doms.pop(uuid, None)
+            wanted = []
+            for uuid in list(_leases):
+                if uuid not in doms:
+                    try:
+                        doms[uuid] = conn.lookupByUUIDString(uuid)
+                    except libvirt.libvirtError:
+                        _leases.pop(uuid, None)
+                        continue
+                wanted.append(doms[uuid])
+            if wanted:
+                _sample_domains(conn, wanted)
+                _stats['fast_samples'] += 1
+            if now - last_sweep >= BACKGROUND_INTERVAL:
+                _sweep_running(conn)
+                _stats['background_sweeps'] += 1
+                last_sweep = now
+        except Exception:
+            if conn is not None:
+                try: conn.close()
+                except Exception: pass
+            conn = None
+        native_sleep(FAST_INTERVAL)
+
+
+def ensure_started():
+    global _started
+    if not _started and _LIBVIRT:
+        _started = True
+        start_native_thread(_run, 'vm-sampler')
+
+
+# ── readers ───────────────────────────────────────────────────────────────────
+
+def subscribe(uuid: str):
+    """Keep *uuid* on the fast sampling path for another SUBSCRIPTION_TTL s."""
+    _leases[uuid] = time.time() + SUBSCRIPTION_TTL
+    ensure_started()
+
+
+def samples(uuid: str) -> list:
+    ring = _rings.get(uuid)
+    return list(ring) if ring else []
+
+
+def read(uuid: str, window: float = None):
+    """Current stats for *uuid* from the ring; None if the VM is not running.
+
+    *window* (seconds) averages CPU usage over that span instead of the
+    last sampling interval; cpu_usage is None until two samples exist.  Raises libvirt.libvirtError if the domain has
+    no fresh samples and cannot be sampled inline either.
+    """
+    subscribe(uuid)
+    ring = samples(uuid)
+    if not ring or time.time() - ring[-1].ts > STALE_AFTER:
+        conn = get_connection()
+        try:
+            dom = conn.lookupByUUIDString(uuid)
+            if not dom.isActive():
+                return None
+            _sample_domains(conn, [dom])
+            _stats['inline_samples'] += 1
+        finally:
+            conn.close()
+        ring = samples(uuid)
+    if not ring or ring[-1].state != libvirt.VIR_DOMAIN_RUNNING:
+        return None
+
+    latest = ring[-1]
+    base = None
+    if window:
+        cutoff = latest.ts - window
+        base = next((s for s in ring if s.ts >= cutoff and s is not latest), None)
+    elif len(ring) >= 2:
+        base = ring[-2]
+
+    # One sample has no interval to measure over: report "unknown" rather
+    # than a 0 % that looks like an idle VM
+    cpu_usage = None
+    span = 0.0
+    if base is not None:
+        span = latest.ts - base.ts
+        if span > 0:
+            cpu_usage = round(max(0.0, (latest.cpu_ns - base.cpu_ns) * 100 /
+                                  (span * (latest.vcpus or 1) * 1e9)), 2)
+
+    return {
+        'cpu_usage':  cpu_usage,
+        'mem_used':   round(latest.mem_kib / 1024, 2),
+        'disk_read':  latest.disk_r,
+        'disk_write': latest.disk_w,
+        'net_rx':     latest.net_rx,
+        'net_tx':     latest.net_tx,
+        'window':     round(span, 2),
+        'ts':         latest.ts,
+    }
+
+
+def sampler_stats() -> dict:
+    return {
+        'subscribed': len(_leases),
+        'domains':    len(_rings),
+        **_stats,
+    }
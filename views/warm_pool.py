@@ -0,0 +1,514 @@
+"""
+Warm pool — pre-provisioned domains handed out by POST /api/vms.
+
+A template describes one VM shape (base image, disk size, vCPUs, RAM,
+host CPU passthrough).  For each template the pool keeps `size` domains
+ready: overlay built and domain defined, shut off.
+
+create_vm() asks claim() first; a request whose disks, vCPUs, RAM and host
+CPU match a template takes a ready member, renames it to the requested name
+and answers 201 at once, leaving it defined and shut off exactly as the
+normal create job would.  Anything else (or an empty pool) goes through that
+job.  Members are never pre-booted: libvirt only renames inactive domains,
+and a running or saved member would keep its pool name for good.  A name
+already used by a domain is refused (NameInUseError) before anything is
+taken.
+
+Members are ordinary domains labelled warm-pool=<template id>, so the pool
+survives restarts; claiming removes the label (warm-template=<id> stays for
+reference) under an flock shared by all gunicorn workers.  One worker — the
+holder of CONFIG_FILE.leader — refills in the background: at most
+`concurrency` members are provisioned at once and the disk sizes of all
+members never exceed `storage_budget_gb`.  Members that are not shut off
+when a pass starts are discarded, as are members beyond a template's size.
+
+Hit / miss counters are per worker process.
+
+Routes
+------
+GET /api/warm-pool   — templates, members per template, hit / miss stats
+PUT /api/warm-pool   — replace the configuration
+"""
+
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+import uuid as _uuid
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+import libvirt
+from flask import Blueprint, jsonify, request, session
+
+from . import inventory
+from .creation import generate_vm_xml
+from .listing import get_db_connection
+
+warm_pool_bp = Blueprint('warm_pool', __name__)
+log = logging.getLogger(__name__)
+
+_APP_DIR        = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE     = os.environ.get('WARM_POOL_CONFIG', os.path.join(_APP_DIR, 'warm_pool.json'))
+STORAGE_PATH    = '/var/lib/libvirt/images'
+REFILL_INTERVAL = 15          # seconds between refill passes on the leader
+LOCK_POLL       = 0.05
+
+POOL_LABEL     = 'warm-pool'
+TEMPLATE_LABEL = 'warm-template'
+TEMPLATE_ID_RE = re.compile(r'^[a-z0-9][a-z0-9-]{0,31}$')
+
+DEFAULT_CONFIG = {'templates': [], 'concurrency': 2, 'storage_budget_gb': 500}
+
+_lock    = threading.Lock()
+_cfg     = {'mtime': None, 'data': DEFAULT_CONFIG}
+_stats   = {}                   # template id → {'hits', 'misses'}
+_refill  = {'passes': 0, 'provisioned': 0, 'failed': 0, 'discarded': 0, 'last_error': None}
+_thread  = {'pid': None}
+_leader  = {'fd': None, 'pid': None}
+
+
+class NameInUseError(Exception):
+    """A domain already has the requested name."""
+
+
+# ── configuration ─────────────────────────────────────────────────────────────
+
+def _validate_template(t) -> str:
+    """Error message for one template, or '' if it is usable."""
+    if not isinstance(t, dict):
+        return 'template must be an object'
+    if not TEMPLATE_ID_RE.match(str(t.get('id', ''))):
+        return 'id must be 1-32 lowercase letters, digits or dashes'
+    image = str(t.get('image', ''))
+    if not image or image.lower().endswith('.iso') or not os.path.exists(image):
+        return f"{t['id']}: image must be an existing disk image"
+    for key, lo, hi in (('cpu', 1, 256), ('ram', 64, 1048576), ('disk_gb', 1, 65536),
+                        ('size', 0, 64)):
+        value = t.get(key)
+        if not isinstance(value, int) or isinstance(value, bool) or not lo <= value <= hi:
+            return f"{t['id']}: {key} must be an integer between {lo} and {hi}"
+    return ''
+
+
+def _normalise(data) -> dict:
+    templates = []
+    for t in data.get('templates', []):
+        err = _validate_template(t)
+        if err:
+            log.warning('warm pool: ignoring template: %s', err)
+            continue
+        templates.append({'id': t['id'], 'image': t['image'], 'disk_gb': t['disk_gb'],
+                          'cpu': t['cpu'], 'ram': t['ram'], 'host_cpu': bool(t.get('host_cpu')),
+                          'size': t['size']})
+    return {'templates': templates,
+            'concurrency': int(data.get('concurrency', DEFAULT_CONFIG['concurrency'])),
+            'storage_budget_gb': int(data.get('storage_budget_gb',
+                                              DEFAULT_CONFIG['storage_budget_gb']))}
+
+
+def load_config() -> dict:
+    """The configuration, re-read whenever another worker has replaced it."""
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime
+    except OSError:
+        return DEFAULT_CONFIG
+    with _lock:
+        if mtime != _cfg['mtime']:
+            try:
+                with open(CONFIG_FILE) as fh:
+                    _cfg['data'] = _normalise(json.load(fh))
+            except (OSError, ValueError, TypeError):
+                log.warning('warm pool: cannot read %s', CONFIG_FILE)
+                _cfg['data'] = DEFAULT_CONFIG
+            _cfg['mtime'] = mtime
+        return _cfg['data']
+
+
+def _save_config(data):
+    tmp = CONFIG_FILE + '.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(data, fh, indent=2)
+    os.replace(tmp, CONFIG_FILE)
+
+
+def match(ram, cpu, host_cpu, devices, plan):
+    """The template a create request is equivalent to, or None."""
+    if devices or len(plan) != 1 or plan[0][1] is None:
+        return None
+    image, _, size = plan[0]
+    for t in load_config()['templates']:
+        if (t['image'], t['disk_gb'], t['cpu'], t['ram'], t['host_cpu']) == \
+                (image, size, cpu, ram, bool(host_cpu)):
+            return t
+    return None
+
+
+# ── members ───────────────────────────────────────────────────────────────────
+
+@contextlib.contextmanager
+def _pool_lock():
+    """Cross-process lock around taking members out of the pool."""
+    with open(CONFIG_FILE + '.lock', 'w') as fh:
+        while True:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                time.sleep(LOCK_POLL)   # cooperative under gevent; flock would not be
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _ready(dom) -> bool:
+    """Shut off without a managed save image — the only state libvirt renames."""
+    return not dom.isActive() and not dom.hasManagedSaveImage(0)
+
+
+def _members(conn) -> dict:
+    """template id → list of member domains, from the labels."""
+    records = inventory.list_domains()
+    if records is None:
+        records = [inventory.describe_domain(d) for d in conn.listAllDomains(0)]
+    found = {}
+    for rec in records:
+        tid = (rec.get('labels') or {}).get(POOL_LABEL)
+        if tid:
+            try:
+                found.setdefault(tid, []).append(conn.lookupByUUIDString(rec['uuid']))
+            except libvirt.libvirtError:
+                pass                    # gone since the inventory last saw it
+    return found
+
+
+def name_in_use(name: str, conn=None) -> bool:
+    """True if a domain is called *name*."""
+    records = inventory.list_domains()
+    if records is None:
+        own = conn is None
+        conn = conn or get_db_connection()
+        try:
+            records = [inventory.describe_domain(d) for d in conn.listAllDomains(0)]
+        finally:
+            if own:
+                conn.close()
+    return any(rec['name'] == name for rec in records)
+
+
+def _take(conn, dom, tid: str) -> bool:
+    """Remove *dom* from template *tid*'s pool; False if it is no longer there.
+
+    Called under _pool_lock() — the label re-read here is what keeps two
+    workers from claiming the same member.
+    """
+    tree = ET.fromstring(dom.XMLDesc(libvirt.VIR_DOMAIN_XML_INACTIVE))
+    labels = inventory.parse_labels(tree)
+    if labels.get(POOL_LABEL) != tid:
+        return False
+    labels.pop(POOL_LABEL)
+    labels[TEMPLATE_LABEL] = tid
+    inventory.set_labels(tree, labels)
+    conn.defineXML(ET.tostring(tree, encoding='unicode'))
+    return True
+
+
+def _discard(dom):
+    """Stop, undefine and delete the overlays of a member (best effort)."""
+    try:
+        tree = ET.fromstring(dom.XMLDesc(libvirt.VIR_DOMAIN_XML_INACTIVE))
+        overlays = [s.get('file') for s in tree.findall("devices/disk[@device='disk']/source")
+                    if s.get('file')]
+        if dom.isActive():
+            dom.destroy()
+        if dom.hasManagedSaveImage(0):
+            dom.managedSaveRemove(0)
+        dom.undefine()
+    except libvirt.libvirtError as e:
+        log.warning('warm pool: cannot discard member: %s', e)
+        return
+    for path in overlays:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    with _lock:
+        _refill['discarded'] += 1
+
+
+def _count(tid: str, key: str):
+    with _lock:
+        _stats.setdefault(tid, {'hits': 0, 'misses': 0})[key] += 1
+
+
+# ── claiming ──────────────────────────────────────────────────────────────────
+
+def claim(name, ram, cpu, host_cpu, devices, plan):
+    """Hand a ready member matching the request over, renamed to *name*.
+
+    Returns {'uuid', 'name', 'template'} on a hit — the domain is defined
+    and shut off, as after the normal create job — or None when the request
+    matches no template or its pool is empty (the caller then creates the
+    VM the normal way).  Raises NameInUseError if *name* is taken.
+    """
+    tpl = match(ram, cpu, host_cpu, devices, plan)
+    if tpl is None:
+        return None
+    ensure_refill()
+    result = None
+    conn = get_db_connection()
+    try:
+        with _pool_lock():
+            # checked and renamed under the lock, so two claims cannot share a name
+            if name_in_use(name, conn):
+                raise NameInUseError(f"A VM named '{name}' already exists")
+            for dom in _members(conn).get(tpl['id'], []):
+                try:
+                    if not (_ready(dom) and _take(conn, dom, tpl['id'])):
+                        continue
+                except libvirt.libvirtError:
+                    continue
+                try:
+                    dom.rename(name, 0)
+                    inventory.refresh(dom)
+                except libvirt.libvirtError as e:
+                    log.warning('warm pool: cannot rename claimed member of %s: %s', tpl['id'], e)
+                    _discard(dom)
+                    break
+                result = {'uuid': dom.UUIDString(), 'name': name, 'template': tpl['id']}
+                break
+    finally:
+        conn.close()
+    _count(tpl['id'], 'hits' if result else 'misses')
+    return result
+
+
+# ── refilling ─────────────────────────────────────────────────────────────────
+
+def _provision(tpl: dict):
+    """Build the overlay of one member of *tpl* and define it."""
+    name    = f"warm-{tpl['id']}-{_uuid.uuid4().hex[:6]}"
+    overlay = os.path.join(STORAGE_PATH, f'{name}.qcow2')
+    cmd = ['qemu-img', 'create', '-f', 'qcow2', '-b', tpl['image'], '-F', 'qcow2',
+           overlay, f"{tpl['disk_gb']}G"]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as exc:
+        raise RuntimeError(f'Failed to create disk overlay: {exc.stderr.strip()}') from exc
+
+    tree = ET.fromstring(generate_vm_xml(name, tpl['ram'], tpl['cpu'], None, tpl['host_cpu'],
+                                         None, disks=[overlay]))
+    inventory.set_labels(tree, {POOL_LABEL: tpl['id']})
+    conn = get_db_connection()
+    dom = None
+    try:
+        dom = conn.defineXML(ET.tostring(tree, encoding='unicode'))
+        inventory.refresh(dom)
+    except Exception:
+        if dom is not None:
+            _discard(dom)
+        else:
+            try:
+                os.remove(overlay)
+            except OSError:
+                pass
+        raise
+    finally:
+        conn.close()
+
+
+def refill_once() -> dict:
+    """One pass: discard stale and surplus members, then top pools up.
+
+    Returns {'discarded': n, 'provisioned': n, 'failed': n} for this pass.
+    """
+    cfg    = load_config()
+    by_id  = {t['id']: t for t in cfg['templates']}
+    conn   = get_db_connection()
+    stale  = []
+    keep   = {}
+    try:
+        with _pool_lock():
+            for tid, doms in _members(conn).items():
+                tpl = by_id.get(tid)
+                ready = []
+                for dom in doms:
+                    try:
+                        ok = tpl is not None and _ready(dom)
+                    except libvirt.libvirtError:
+                        ok = False
+                    if ok:
+                        ready.append(dom)
+                    else:
+                        stale.append((dom, tid))
+                size = tpl['size'] if tpl else 0
+                stale.extend((dom, tid) for dom in ready[size:])
+                keep[tid] = len(ready[:size])
+            stale = [dom for dom, tid in stale if _take(conn, dom, tid)]
+    finally:
+        conn.close()
+    discarded_before = _refill['discarded']
+    for dom in stale:
+        _discard(dom)
+
+    # Round-robin over templates so one large pool cannot starve the others
+    used = sum(by_id[tid]['disk_gb'] * n for tid, n in keep.items() if tid in by_id)
+    todo, want = [], {t['id']: t['size'] - keep.get(t['id'], 0) for t in cfg['templates']}
+    while any(n > 0 for n in want.values()):
+        for t in cfg['templates']:
+            if want[t['id']] > 0:
+                want[t['id']] -= 1
+                if used + t['disk_gb'] <= cfg['storage_budget_gb']:
+                    used += t['disk_gb']
+                    todo.append(t)
+
+    failed = []
+
+    def one(tpl):
+        try:
+            _provision(tpl)
+        except Exception as e:
+            log.warning('warm pool: provisioning %s failed: %s', tpl['id'], e)
+            failed.append(str(e))
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, cfg['concurrency']),
+                                thread_name_prefix='warm-pool') as pool:
+            list(pool.map(one, todo))
+    with _lock:
+        _refill['passes']      += 1
+        _refill['provisioned'] += len(todo) - len(failed)
+        _refill['failed']      += len(failed)
+        if failed:
+            _refill['last_error'] = failed[-1]
+    return {'discarded': _refill['discarded'] - discarded_before,
+            'provisioned': len(todo) - len(failed), 'failed': len(failed)}
+
+
+def _try_lead() -> bool:
+    """True if this process is (or has just become) the pool's refiller."""
+    if _leader['fd'] is not None and _leader['pid'] == os.getpid():
+        return True
+    fd = os.open(CONFIG_FILE + '.leader', os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    _leader.update(fd=fd, pid=os.getpid())
+    return True
+
+
+def _refill_loop():
+    while True:
+        try:
+            if load_config()['templates'] and _try_lead():
+                refill_once()
+        except Exception as e:
+            log.exception('warm pool: refill pass failed')
+            with _lock:
+                _refill['last_error'] = str(e)
+        time.sleep(REFILL_INTERVAL)
+
+
+def ensure_refill():
+    """Start this process's refill thread once a template is configured."""
+    with _lock:
+        if _thread['pid'] == os.getpid():
+            return
+        _thread['pid'] = os.getpid()
+    threading.Thread(target=_refill_loop, daemon=True, name='warm-pool-refill').start()
+
+
+# ── HTTP API ──────────────────────────────────────────────────────────────────
+
+def _auth():
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    return None
+
+
+@warm_pool_bp.route('/api/warm-pool', methods=['GET'])
+def warm_pool_status():
+    err = _auth()
+    if err:
+        return err
+    cfg = load_config()
+    by_id = {t['id']: t for t in cfg['templates']}
+    conn = get_db_connection()
+    try:
+        members = _members(conn)
+        pools, used = [], 0
+        for tid in sorted(set(by_id) | set(members)):
+            tpl = by_id.get(tid)
+            doms = members.get(tid, [])
+            ready = 0
+            for dom in doms:
+                try:
+                    ready += bool(tpl and _ready(dom))
+                except libvirt.libvirtError:
+                    pass
+            if tpl:
+                used += tpl['disk_gb'] * len(doms)
+            with _lock:
+                st = dict(_stats.get(tid, {'hits': 0, 'misses': 0}))
+            total = st['hits'] + st['misses']
+            pools.append({'template': tid, 'configured': tpl is not None,
+                          'size': tpl['size'] if tpl else 0, 'members': len(doms),
+                          'ready': ready, **st,
+                          'hit_rate': round(st['hits'] / total, 3) if total else None})
+    except libvirt.libvirtError as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        conn.close()
+    with _lock:
+        refill = dict(_refill)
+    return jsonify({'config': cfg, 'pools': pools, 'storage_used_gb': used,
+                    'refill': refill, 'leader': _leader['pid'] == os.getpid(),
+                    'pid': os.getpid()})
+
+
+@warm_pool_bp.route('/api/warm-pool', methods=['PUT'])
+def warm_pool_configure():
+    err = _auth()
+    if err:
+        return err
+    data = request.get_json(silent=True) or {}
+    templates = data.get('templates', [])
+    if not isinstance(templates, list):
+        return jsonify({'error': 'templates must be a list'}), 400
+    for t in templates:
+        msg = _validate_template(t)
+        if msg:
+            return jsonify({'error': msg}), 400
+    if len({t['id'] for t in templates}) != len(templates):
+        return jsonify({'error': 'template ids must be unique'}), 400
+    try:
+        concurrency = int(data.get('concurrency', DEFAULT_CONFIG['concurrency']))
+        budget      = int(data.get('storage_budget_gb', DEFAULT_CONFIG['storage_budget_gb']))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'concurrency and storage_budget_gb must be integers'}), 400
+    if not 1 <= concurrency <= 16:
+        return jsonify({'error': 'concurrency must be between 1 and 16'}), 400
+    if budget < 0:
+        return jsonify({'error': 'storage_budget_gb must not be negative'}), 400
+
+    cfg = _normalise({'templates': templates, 'concurrency': concurrency,
+                      'storage_budget_gb': budget})
+    try:
+        _save_config(cfg)
+    except OSError as e:
+        return jsonify({'error': f'Cannot save configuration: {e}'}), 500
+    if cfg['templates']:
+        ensure_refill()
+    return jsonify(load_config())
+
+
+if load_config()['templates']:
+    ensure_refill()